@@ -12,9 +12,14 @@ from sqlalchemy import inspect
 
 from services import merge_csv_sku
 from utils.database_connection import engine
-from utils.database_helper_methods import is_table_empty_or_missing, assign_table_primary_key
+from utils.database_helper_methods import is_table_empty_or_missing, assign_table_primary_key, assign_index
 from utils.sql_constant_queries import SELECT_SKU_NUMBER_QUERY
 
+# Index of the ERP API latest inventory parameters of a SKU ('sku_number' filter, 'created_at' order)
+INVENTORY_PARAMS_DEVELOPMENT_INDEXES = {
+    'idx_inventory_params_development_sku_number_created_at': ['sku_number', 'created_at'],
+}
+
 
 # ========================================================
 # Data Processing Functions
@@ -128,6 +133,7 @@ def main():
 
     This function checks if the source table exists and contains data, processes and merges data,
     and finally creates a new table with synthetic inventory parameters in the database.
+    In both cases, the missing indexes of the ERP API queries are added.
     """
     print("\n" + "---- create_inventory_params_development_db_table.py ----")
     try:
@@ -146,6 +152,8 @@ def main():
             create_db_table_with_index_label(final_merged_df, new_table_name, 'id')
             print(f"Data successfully inserted into the table: '{new_table_name}'")
         else:
-            print("Table '{}' already exists and contains data, no further action needed!".format(new_table_name))
+            print("Table '{}' already exists and contains data, checking its indexes...".format(new_table_name))
+        for index_name, columns in INVENTORY_PARAMS_DEVELOPMENT_INDEXES.items():
+            assign_index(new_table_name, index_name, columns)
     except Exception as e:
         print("\n" + "Error:", str(e))
@@ -10,7 +10,18 @@ from sqlalchemy import inspect
 
 from services import merge_csv_sku
 from utils.database_connection import engine
-from utils.database_helper_methods import is_table_empty_or_missing, assign_table_primary_key
+from utils.database_helper_methods import is_table_empty_or_missing, assign_table_primary_key, assign_index
+
+# Indexes of the ERP API queries: 'sku_number' + 'order_date' range filters, and the (order_date, id) page order
+SKU_ORDER_DEVELOPMENT_INDEXES = {
+    'idx_sku_order_development_sku_number_order_date': ['sku_number', 'order_date'],
+    'idx_sku_order_development_order_date_id': ['order_date', 'id'],
+}
+# FULLTEXT (n-gram) indexes of the ERP API name search (one per column, the columns are filtered separately)
+SKU_ORDER_DEVELOPMENT_FULLTEXT_INDEXES = {
+    'ftx_sku_order_development_sku_name': ['sku_name'],
+    'ftx_sku_order_development_class_display_name': ['class_display_name'],
+}
 
 
 def create_db_table(df, table_name, pk_column):
@@ -33,10 +44,23 @@ def create_db_table(df, table_name, pk_column):
     assign_table_primary_key(table_name, pk_column)
 
 
+def assign_sku_order_development_indexes(table_name):
+    """
+    Adds the missing indexes of the ERP API queries to the table (already existing indexes are kept).
+
+    :param table_name: The name of the 'sku_order_development' table.
+    """
+    for index_name, columns in SKU_ORDER_DEVELOPMENT_INDEXES.items():
+        assign_index(table_name, index_name, columns)
+    for index_name, columns in SKU_ORDER_DEVELOPMENT_FULLTEXT_INDEXES.items():
+        assign_index(table_name, index_name, columns, fulltext=True)
+
+
 def main():
     """
     Main entry point of the script that checks if the 'sku_order_development' table exists and is populated.
     If the table is empty or missing, it populates the table with data and assigns a primary key.
+    In both cases, the missing indexes of the ERP API queries are added.
 
     This function first checks if the specified table exists and contains data. If not, the second function
     fetches the data from the CSV file and writes it to the database, then assigns the primary key to
@@ -52,7 +76,8 @@ def main():
             create_db_table(sku_order_development_df, table_name, 'id')
             print(f"Data successfully inserted into the table: '{table_name}'")
         else:
-            print(f"Table '{table_name}' already exists and contains data, no further action needed!")
+            print(f"Table '{table_name}' already exists and contains data, checking its indexes...")
+        assign_sku_order_development_indexes(table_name)
     except Exception as e:
         # Instead, save the merged DataFrame to CSV file
         print("\n" + "Error: " + str(e))
@@ -0,0 +1,155 @@
+"""
+/*
+ * Copyright 2025 DOTSOFT SA, Inc All Rights Reserved.
+ *
+ * Author: Georgios Karanasios R&D Software Engineer
+ */
+"""
+
+import argparse
+import re
+import statistics
+
+from sqlalchemy import text
+
+from utils.database_connection import engine
+
+''' EXPLAIN ANALYZE benchmark of the indexes of the ERP API queries (MySQL 8.0.18+).
+
+Every query of the ERP API is run with and without its index (through 'IGNORE INDEX', so that the database is
+not altered), on parameters picked from the data itself (the median row), so that two runs on the same data
+compare the same plans. Run it from the app folder: 'python -m services.explain_development_db_indexes' '''
+
+# (label, table, index, query): '{hint}' is replaced by the 'IGNORE INDEX' hint (or nothing)
+INDEXED_QUERIES = [
+    (
+        "SKU orders of a SKU from a date (fetch_all_skus)",
+        "sku_order_development",
+        "idx_sku_order_development_sku_number_order_date",
+        "SELECT * FROM sku_order_development {hint} "
+        "WHERE sku_number = :sku_number AND order_date >= :order_date "
+        "ORDER BY order_date, id LIMIT :page_size"
+    ),
+    (
+        "Keyset page of the SKU orders (fetch_all_skus with cursor)",
+        "sku_order_development",
+        "idx_sku_order_development_order_date_id",
+        "SELECT * FROM sku_order_development {hint} "
+        "WHERE order_date >= :order_date AND (order_date > :order_date OR (order_date = :order_date AND id > :id)) "
+        "ORDER BY order_date, id LIMIT :page_size"
+    ),
+    (
+        "Latest inventory parameters of a SKU (fetch_latest_by_sku_number)",
+        "inventory_params_development",
+        "idx_inventory_params_development_sku_number_created_at",
+        "SELECT * FROM inventory_params_development {hint} "
+        "WHERE sku_number = :sku_number ORDER BY created_at DESC LIMIT 1"
+    ),
+]
+
+# (label, query without the FULLTEXT index, query with the FULLTEXT index) of the name search
+NAME_SEARCH_QUERIES = [
+    (
+        "SKU name search (fetch_all_skus with sku_name)",
+        "SELECT * FROM sku_order_development WHERE sku_name LIKE :name_pattern "
+        "ORDER BY order_date, id LIMIT :page_size",
+        "SELECT * FROM sku_order_development "
+        "WHERE MATCH (sku_name) AGAINST (:name_phrase IN BOOLEAN MODE) AND sku_name LIKE :name_pattern "
+        "ORDER BY order_date, id LIMIT :page_size"
+    ),
+]
+
+# The median row of 'sku_order_development' (the source of the query parameters)
+MEDIAN_ROW_QUERY = """
+SELECT id, sku_number, order_date, sku_name
+FROM sku_order_development
+ORDER BY id
+LIMIT 1 OFFSET {offset};
+"""
+
+ACTUAL_TIME_PATTERN = re.compile(r"actual time=[\d.]+\.\.([\d.]+)")
+
+
+def get_query_params(connection, page_size: int) -> dict:
+    """
+    Picks the query parameters from the median row of 'sku_order_development' (reproducible on the same data).
+
+    :param connection: The database connection.
+    :param page_size: The page size (LIMIT) of the paginated queries.
+    :return: The query parameters.
+    """
+    count = connection.execute(text("SELECT COUNT(*) FROM sku_order_development;")).scalar()
+    row = connection.execute(text(MEDIAN_ROW_QUERY.format(offset=count // 2))).mappings().one()
+    # A part of the first word of the name (the search is a 'contains' search)
+    name = next((word for word in (row["sku_name"] or "").split() if len(word) >= 2), "ab")[:4]
+    return {
+        "id": row["id"],
+        "sku_number": row["sku_number"],
+        "order_date": row["order_date"],
+        "page_size": page_size,
+        "name_pattern": f"%{name}%",
+        "name_phrase": f'"{name}"',
+    }
+
+
+def explain_analyze(connection, query: str, params: dict, repeat: int) -> tuple[float, str]:
+    """
+    Runs 'EXPLAIN ANALYZE' on a query (the query is executed).
+
+    :param connection: The database connection.
+    :param query: The query.
+    :param params: The query parameters.
+    :param repeat: The number of runs (the first one warms up the buffer pool).
+    :return: The median actual time (ms) of the runs, and the plan of the last run.
+    """
+    times, plan = [], ""
+    for _ in range(repeat):
+        plan = connection.execute(text(f"EXPLAIN ANALYZE {query}"), params).scalar()
+        times.append(float(ACTUAL_TIME_PATTERN.search(plan).group(1)))
+    return statistics.median(times[1:] or times), plan
+
+
+def print_comparison(label: str, without_index: tuple[float, str], with_index: tuple[float, str], verbose: bool):
+    """
+    Prints the times (and the plans) of a query without and with its index.
+
+    :param label: The query label.
+    :param without_index: The (time, plan) of the query without the index.
+    :param with_index: The (time, plan) of the query with the index.
+    :param verbose: True to print the full plans, False for their top line only.
+    """
+    print("\n" + label)
+    for name, (time_ms, plan) in (("without index", without_index), ("with index", with_index)):
+        print(f"  {name:<14} {time_ms:>10.3f} ms   {plan if verbose else plan.splitlines()[0]}")
+    print(f"  speedup        {without_index[0] / max(with_index[0], 0.001):>10.1f}x")
+
+
+def main():
+    """
+    Main entry point of the script that compares the ERP API queries without and with their indexes.
+    The indexes must exist (created by 'main.py').
+    """
+    parser = argparse.ArgumentParser(description="EXPLAIN ANALYZE benchmark of the ERP API indexes")
+    parser.add_argument("--page-size", type=int, default=100, help="LIMIT of the paginated queries")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per query (the median is reported)")
+    parser.add_argument("--verbose", action="store_true", help="Print the full query plans")
+    args = parser.parse_args()
+
+    print("\n" + "---- explain_development_db_indexes.py ----")
+    with engine.connect() as connection:
+        params = get_query_params(connection, args.page_size)
+        print("Query parameters:", params)
+        for label, table_name, index_name, query in INDEXED_QUERIES:
+            without_index = explain_analyze(
+                connection, query.format(hint=f"IGNORE INDEX ({index_name})"), params, args.repeat
+            )
+            with_index = explain_analyze(connection, query.format(hint=""), params, args.repeat)
+            print_comparison(f"{label} - {table_name}.{index_name}", without_index, with_index, args.verbose)
+        for label, query_without_index, query_with_index in NAME_SEARCH_QUERIES:
+            without_index = explain_analyze(connection, query_without_index, params, args.repeat)
+            with_index = explain_analyze(connection, query_with_index, params, args.repeat)
+            print_comparison(label, without_index, with_index, args.verbose)
+
+
+if __name__ == "__main__":
+    main()
@@ -12,7 +12,8 @@ from sqlalchemy.exc import SQLAlchemyError
 from .database_connection import engine, engine_super
 from .sql_constant_queries import PRIMARY_KEY_QUERY, TABLE_COUNT_QUERY, UNIQUE_KEY_QUERY, FOREIGN_KEY_QUERY, \
     CREATE_USER_QUERY, CHECK_USER_EXISTS_QUERY, GRANT_PRIVILEGES_QUERY, FLUSH_PRIVILEGES_QUERY, \
-    MODIFY_TEXT_TO_VARCHAR_QUERY
+    MODIFY_TEXT_TO_VARCHAR_QUERY, CHECK_INDEX_EXISTS_QUERY, CREATE_INDEX_QUERY, CREATE_FULLTEXT_INDEX_QUERY, \
+    DISABLE_FULLTEXT_STOPWORDS_QUERY
 
 
 def is_table_empty_or_missing(inspector, table_name):
@@ -156,3 +157,31 @@ def convert_type_text_to_varchar(table_name: str, column_name: str):
             print(f"Converted '{column_name}' to VARCHAR(255) in '{table_name}'.")
     except Exception as e:
         print(f"Failed to convert '{column_name}' to VARCHAR(255) in '{table_name}': {e}")
+
+
+def assign_index(table_name: str, index_name: str, columns: list[str], fulltext: bool = False):
+    """
+    Adds a (composite or FULLTEXT n-gram) index to a table, if the table does not have it yet.
+
+    @param table_name: The name of the table to be altered.
+    @param index_name: The name of the index.
+    @param columns: The indexed columns, in the order of the index.
+    @param fulltext: True for a FULLTEXT index with the n-gram parser (name search), False for a B-tree index.
+    """
+    try:
+        with engine.connect() as connection:
+            # Check if the index already exists (the script also runs on already populated tables)
+            check_query = CHECK_INDEX_EXISTS_QUERY.format(table_name=table_name, index_name=index_name)
+            if connection.execute(text(check_query)).scalar():
+                return
+            index_query = CREATE_FULLTEXT_INDEX_QUERY if fulltext else CREATE_INDEX_QUERY
+            if fulltext:
+                connection.execute(text(DISABLE_FULLTEXT_STOPWORDS_QUERY))
+            connection.execute(text(index_query.format(
+                table_name=table_name,
+                index_name=index_name,
+                columns=", ".join(columns)
+            )))
+            print(f"Index added: {table_name}.{index_name} ({', '.join(columns)})")
+    except Exception as e:
+        print(f"Failed to add index '{index_name}' to '{table_name}': {e}")
@@ -60,3 +60,29 @@ MODIFY_TEXT_TO_VARCHAR_QUERY = """
 ALTER TABLE {table_name}
 MODIFY COLUMN {column_name} VARCHAR(255) NOT NULL;
 """
+
+# Query to check if an index exists
+CHECK_INDEX_EXISTS_QUERY = """
+SELECT COUNT(*)
+FROM information_schema.statistics
+WHERE table_schema = DATABASE() AND table_name = '{table_name}' AND index_name = '{index_name}';
+"""
+
+# Query to create a (composite) index
+CREATE_INDEX_QUERY = """
+CREATE INDEX {index_name}
+ON {table_name} ({columns});
+"""
+
+# Query to create a FULLTEXT index with the n-gram parser (substring search, also for non-space separated text)
+CREATE_FULLTEXT_INDEX_QUERY = """
+CREATE FULLTEXT INDEX {index_name}
+ON {table_name} ({columns})
+WITH PARSER ngram;
+"""
+
+# Query to disable the stopwords of the FULLTEXT indexes created in the session: the n-gram parser drops every
+# token that contains a stopword (e.g., any token containing 'a'), which would hide rows from the name search
+DISABLE_FULLTEXT_STOPWORDS_QUERY = """
+SET SESSION innodb_ft_enable_stopword = OFF;
+"""
@@ -6,12 +6,17 @@
  */
 """
 
-from fastapi import APIRouter, Depends
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, Query, Response, status
 
 from ..models.dto_models import ResponseWithUserID
 from ..models.page_criteria_models import PageParams, VehicleDevelopmentCriteria, RouteDevelopmentCriteria, \
     LocationDevelopmentCriteria
-from ..services.facades.distribution_routing_service_facade import DistributionRoutingServiceFacade
+from ..repositories.location_development_repository import LocationDevelopmentRepository
+from ..repositories.route_development_repository import RouteDevelopmentRepository
+from ..repositories.vehicle_development_repository import VehicleDevelopmentRepository
+from ..services.facades.distribution_routing_service_facade import DistributionRoutingServiceFacade, MatrixFormat
 from ..services.location_development_service import LocationDevelopmentService
 from ..services.route_development_service import RouteDevelopmentService
 from ..services.vehicle_development_service import VehicleDevelopmentService
@@ -21,6 +26,7 @@ from ..utils.dependency_injection_container import (
     get_route_development_service,
     get_location_development_service,
 )
+from ..utils.pagination import next_page_cursor
 from ..utils.settings import settings
 
 router = APIRouter()
@@ -28,17 +34,28 @@ router = APIRouter()
 
 @router.get("/distribution_routing_data", response_model=ResponseWithUserID)
 async def get_distribution_routing_data(
+        matrix_format: MatrixFormat = Query("dense"),
+        if_none_match: Optional[str] = Header(None),
         facade: DistributionRoutingServiceFacade = Depends(get_distribution_routing_facade)
-) -> ResponseWithUserID:
+) -> Response:
     """
     Returns the JSON data model for distribution routing,
     assembled from location, route, and vehicle tables.
+    The data model is cached per version of the tables, and the version is returned as the ETag:
+    a request with an up-to-date 'If-None-Match' gets a 304 (Not Modified) without a body.
 
+    @param matrix_format: 'dense' (distance_matrix / traffic_factors) or 'sparse' (edges, see 'build_data_model').
+    @param if_none_match: The ETag of the data model already held by the client (optional).
     @param facade: The DistributionRoutingServiceFacade dependency
-    @return: The JSON data model with user_id included
+    @return: The JSON data model with user_id included (or 304)
     """
-    data_model = await facade.build_data_model()
-    return ResponseWithUserID(user_id=settings.CLIENT_DEVELOPMENT_USER_ID, data=data_model)
+    version = await facade.get_data_model_version()
+    etag = f'"{settings.CLIENT_DEVELOPMENT_USER_ID}-{version}-{matrix_format}"'
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}  # Clients revalidate with 'If-None-Match'
+    if if_none_match is not None and etag in (tag.strip().removeprefix("W/") for tag in if_none_match.split(",")):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    content = await facade.get_data_model_response(settings.CLIENT_DEVELOPMENT_USER_ID, version, matrix_format)
+    return Response(content=content, media_type="application/json", headers=headers)
 
 
 @router.get("/vehicle_development", response_model=ResponseWithUserID)
@@ -56,7 +73,11 @@ async def list_vehicle_development(
     @return: A list of VehicleDevelopment models with user_id included.
     """
     response = await service.get_all_vehicles(page_params, criteria)
-    return ResponseWithUserID(user_id=settings.CLIENT_DEVELOPMENT_USER_ID, data=response)
+    return ResponseWithUserID(
+        user_id=settings.CLIENT_DEVELOPMENT_USER_ID,
+        data=response,
+        next_cursor=next_page_cursor(response, page_params, VehicleDevelopmentRepository.page_order)
+    )
 
 
 @router.get("/route_development", response_model=ResponseWithUserID)
@@ -74,7 +95,11 @@ async def list_route_development(
     @return: A list of RouteDevelopment models with user_id included.
     """
     response = await service.get_all_routes(page_params, criteria)
-    return ResponseWithUserID(user_id=settings.CLIENT_DEVELOPMENT_USER_ID, data=response)
+    return ResponseWithUserID(
+        user_id=settings.CLIENT_DEVELOPMENT_USER_ID,
+        data=response,
+        next_cursor=next_page_cursor(response, page_params, RouteDevelopmentRepository.page_order)
+    )
 
 
 @router.get("/location_development", response_model=ResponseWithUserID)
@@ -92,4 +117,8 @@ async def list_location_development(
     @return: A list of LocationDevelopment models with user_id included.
     """
     response = await service.get_all_locations(page_params, criteria)
-    return ResponseWithUserID(user_id=settings.CLIENT_DEVELOPMENT_USER_ID, data=response)
+    return ResponseWithUserID(
+        user_id=settings.CLIENT_DEVELOPMENT_USER_ID,
+        data=response,
+        next_cursor=next_page_cursor(response, page_params, LocationDevelopmentRepository.page_order)
+    )
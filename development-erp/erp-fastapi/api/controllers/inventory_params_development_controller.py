@@ -10,8 +10,10 @@ from fastapi import APIRouter, Depends, Body
 
 from ..models.dto_models import ResponseWithUserID, InventoryParamsDTO, ResponseInventoryParamsDevelopmentWithUserID
 from ..models.page_criteria_models import PageParams, InventoryParamsCriteria
+from ..repositories.inventory_params_development_repository import InventoryParamsDevelopmentRepository
 from ..services.inventory_params_development_service import InventoryParamsDevelopmentService
 from ..utils.dependency_injection_container import get_inventory_params_development_service
+from ..utils.pagination import next_page_cursor
 from ..utils.settings import settings
 
 router = APIRouter()
@@ -32,7 +34,11 @@ async def list_inventory_params_development(
     @return: A ResponseWithUserID model containing the user_id and inventory parameter records.
     """
     response = await service.get_all_inventory_params(page_params, criteria)
-    return ResponseWithUserID(user_id=settings.CLIENT_DEVELOPMENT_USER_ID, data=response)
+    return ResponseWithUserID(
+        user_id=settings.CLIENT_DEVELOPMENT_USER_ID,
+        data=response,
+        next_cursor=next_page_cursor(response, page_params, InventoryParamsDevelopmentRepository.page_order)
+    )
 
 
 @router.post("/get_inventory_params_development_latest", response_model=ResponseInventoryParamsDevelopmentWithUserID)
@@ -0,0 +1,25 @@
+"""
+/*
+ * Copyright 2025 DOTSOFT SA, Inc All Rights Reserved.
+ *
+ * Author: Georgios Karanasios R&D Software Engineer
+ */
+"""
+
+from fastapi import APIRouter
+
+from ..models.dto_models import DatabasePoolMetricsDTO
+from ..utils.database_session_manager import db_manager
+
+router = APIRouter()
+
+
+@router.get("/metrics/db_pool", response_model=DatabasePoolMetricsDTO)
+async def get_db_pool_metrics() -> DatabasePoolMetricsDTO:
+    """
+    Returns the usage of the database connection pool (connections in use, idle, overflow) and the wait time
+    of the connection checkouts, to size DB_POOL_SIZE / DB_MAX_OVERFLOW against the real traffic.
+
+    @return: The metrics of the connection pool.
+    """
+    return DatabasePoolMetricsDTO(**db_manager.pool_metrics())
@@ -6,12 +6,23 @@
  */
 """
 
-from fastapi import APIRouter, Depends, Body
+from typing import AsyncIterator, List, Literal, Optional, Union
+
+import pyarrow as pa
+from fastapi import APIRouter, Depends, Body, Query, HTTPException, status
+from fastapi.responses import Response, StreamingResponse
+from sqlalchemy import Column
 
 from ..models.dto_models import ResponseWithUserID, ListIdsDTO, ResponseSkuOrderDevelopmentWithUserID
 from ..models.page_criteria_models import PageParams, SkuOrderDevelopmentCriteria
+from ..models.schema import SkuOrderDevelopmentORM
+from ..repositories.sku_order_development_repository import SkuOrderDevelopmentRepository
 from ..services.sku_order_development_service import SkuOrderDevelopmentService
-from ..utils.dependency_injection_container import get_sku_order_development_service
+from ..utils.arrow_export import ARROW_STREAM_MEDIA_TYPE, PARQUET_MEDIA_TYPE, arrow_ipc_stream, arrow_schema, \
+    parquet_file
+from ..utils.dependency_injection_container import get_sku_order_development_service, \
+    sku_order_development_service_scope
+from ..utils.pagination import next_page_cursor
 from ..utils.settings import settings
 
 router = APIRouter()
@@ -21,18 +32,108 @@ router = APIRouter()
 async def list_sku_order_development(
         page_params: PageParams = Depends(),
         criteria: SkuOrderDevelopmentCriteria = Depends(),
+        stream: bool = Query(False, description="Stream the records as NDJSON (one JSON record per line)"),
         service: SkuOrderDevelopmentService = Depends(get_sku_order_development_service),
-) -> ResponseWithUserID:
+) -> Union[ResponseWithUserID, StreamingResponse]:
     """
     Retrieve SKU records from the 'sku_order_development' table with pagination and filtering.
 
+    With 'stream=true' the records are streamed as NDJSON ('application/x-ndjson', one SkuOrderDevelopment
+    per line, the user_id in the 'X-User-ID' header) from a server-side cursor, so the memory of the request
+    stays constant whatever the number of records (e.g., the full order history without page_size).
+
     @param page_params: The query parameters for pagination.
     @param criteria: The query parameters for filtering.
+    @param stream: True to stream the records as NDJSON.
     @param service: The SkuOrderDevelopmentService that contains business logic and data access.
-    @return: A ResponseWithUserID model containing the user_id and the list of SkuOrderDevelopment models.
+    @return: A ResponseWithUserID model containing the user_id, the list of SkuOrderDevelopment models
+             and the next_cursor (keyset pagination) of the next page, or the NDJSON StreamingResponse.
     """
+    if stream:
+        return StreamingResponse(
+            _stream_sku_order_development_ndjson(page_params, criteria),
+            media_type="application/x-ndjson",
+            headers={"X-User-ID": str(settings.CLIENT_DEVELOPMENT_USER_ID)}
+        )
     response = await service.get_all_skus(page_params, criteria)
-    return ResponseWithUserID(user_id=settings.CLIENT_DEVELOPMENT_USER_ID, data=response)
+    return ResponseWithUserID(
+        user_id=settings.CLIENT_DEVELOPMENT_USER_ID,
+        data=response,
+        next_cursor=next_page_cursor(response, page_params, SkuOrderDevelopmentRepository.page_order)
+    )
+
+
+async def _stream_sku_order_development_ndjson(
+        page_params: PageParams,
+        criteria: SkuOrderDevelopmentCriteria
+) -> AsyncIterator[str]:
+    """
+    Yields the NDJSON body of 'list_sku_order_development', one chunk per batch of records.
+
+    @param page_params: The query parameters for pagination.
+    @param criteria: The query parameters for filtering.
+    @return: An async generator of NDJSON chunks.
+    """
+    async with sku_order_development_service_scope() as service:
+        async for records in service.stream_all_skus(page_params, criteria):
+            yield "".join(f"{record.model_dump_json()}\n" for record in records)
+
+
+@router.get("/sku_order_development/export")
+async def export_sku_order_development(
+        criteria: SkuOrderDevelopmentCriteria = Depends(),
+        columns: Optional[List[str]] = Query(None, description="The exported columns (default: all)"),
+        export_format: Literal["arrow", "parquet"] = Query("arrow", alias="format"),
+) -> Response:
+    """
+    Bulk export of SKU records (e.g., a 'start_order_date'/'end_order_date' range) for the ML training and
+    enrichment pipelines, in a typed columnar format instead of per-row JSON with datetimes as strings:
+    - 'arrow' (default): an Arrow IPC stream, streamed batch by batch (constant memory).
+    - 'parquet': a Parquet file.
+    The records are ordered by order_date and id, and the user_id is returned in the 'X-User-ID' header.
+
+    @param criteria: The query parameters for filtering.
+    @param columns: The columns to export (the names of the SkuOrderDevelopment fields, default: all).
+    @param export_format: The format of the export ('arrow' or 'parquet').
+    @return: The Arrow IPC stream (StreamingResponse) or the Parquet file.
+    @raises HTTPException: 400 if a column does not exist.
+    """
+    table_columns = SkuOrderDevelopmentORM.__table__.columns
+    unknown_columns = sorted(set(columns or []) - set(table_columns.keys()))
+    if unknown_columns:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Unknown columns: {unknown_columns}")
+    export_columns = [table_columns[name] for name in columns] if columns else list(table_columns)
+    schema = arrow_schema(export_columns)
+    headers = {"X-User-ID": str(settings.CLIENT_DEVELOPMENT_USER_ID)}
+
+    if export_format == "parquet":
+        async with sku_order_development_service_scope() as service:
+            content = await parquet_file(service.stream_sku_columns(export_columns, criteria), schema)
+        return Response(content=content, media_type=PARQUET_MEDIA_TYPE, headers=headers)
+
+    return StreamingResponse(
+        _stream_sku_order_development_arrow(export_columns, criteria, schema),
+        media_type=ARROW_STREAM_MEDIA_TYPE,
+        headers=headers
+    )
+
+
+async def _stream_sku_order_development_arrow(
+        export_columns: List[Column],
+        criteria: SkuOrderDevelopmentCriteria,
+        schema: pa.Schema
+) -> AsyncIterator[bytes]:
+    """
+    Yields the Arrow IPC stream of 'export_sku_order_development', one chunk per record batch.
+
+    @param export_columns: The exported columns.
+    @param criteria: The query parameters for filtering.
+    @param schema: The Arrow schema of the exported columns.
+    @return: An async generator of the chunks of the Arrow IPC stream.
+    """
+    async with sku_order_development_service_scope() as service:
+        async for chunk in arrow_ipc_stream(service.stream_sku_columns(export_columns, criteria), schema):
+            yield chunk
 
 
 @router.post("/sku_order_latest", response_model=ResponseSkuOrderDevelopmentWithUserID)
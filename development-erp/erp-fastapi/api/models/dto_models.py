@@ -16,6 +16,7 @@ from api.models.models import SkuOrderDevelopment, InventoryParamsDevelopment
 class ResponseWithUserID(BaseModel):
     user_id: int
     data: Union[List, dict]
+    next_cursor: Optional[str] = None  # the cursor of the next page (None on the last page or without page_size)
 
 
 class ResponseSkuOrderDevelopmentWithUserID(BaseModel):
@@ -34,3 +35,17 @@ class ListIdsDTO(BaseModel):
 
 class InventoryParamsDTO(BaseModel):
     sku_number: int
+
+
+class DatabasePoolMetricsDTO(BaseModel):
+    pool_size: int  # connections kept open
+    max_overflow: int  # extra connections allowed under burst load
+    in_use: int  # connections checked out by the sessions
+    idle: int  # connections waiting in the pool
+    overflow_in_use: int  # checked out connections beyond pool_size
+    checkouts: int  # since the start (or the last reset of the pool)
+    checkout_timeouts: int  # checkouts that failed after DB_POOL_TIMEOUT
+    checkout_wait_avg_ms: float
+    checkout_wait_p50_ms: float  # of the latest 1024 checkouts
+    checkout_wait_p95_ms: float  # of the latest 1024 checkouts
+    checkout_wait_max_ms: float
@@ -15,6 +15,7 @@ from pydantic import BaseModel, Field
 class PageParams(BaseModel):
     page: Optional[int] = Field(1, ge=1)  # greater than (ge 1)
     page_size: Optional[int] = Field(default=None, ge=1)  # no limit on the default page size
+    cursor: Optional[str] = None  # the 'next_cursor' of the previous page (keyset pagination, used instead of page)
 
 
 class SkuOrderDevelopmentCriteria(BaseModel):
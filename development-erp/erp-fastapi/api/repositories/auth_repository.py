@@ -6,6 +6,8 @@
  */
 """
 
+from typing import Optional
+
 import bcrypt
 
 from ..models.models import User
@@ -13,8 +15,33 @@ from ..utils.settings import settings
 
 
 class AuthRepository:
-    @staticmethod
-    async def get_user() -> User:
+    # The bcrypt hash of the password, computed (or loaded from API_PASSWORD_HASH) once per process
+    _password_hash: Optional[str] = None
+
+    @classmethod
+    def load_password_hash(cls) -> str:
+        """
+        Returns the bcrypt hash of the password from the .env configuration. API_PASSWORD_HASH is used as is,
+        otherwise API_PASSWORD is hashed on the first call only (called on startup, see main.py), since hashing
+        is deliberately slow and must not run on every login request.
+
+        @return: The hashed password.
+        @raises ValueError: If neither API_PASSWORD_HASH nor API_PASSWORD is configured.
+        """
+        if cls._password_hash is None:
+            if settings.API_PASSWORD_HASH:
+                cls._password_hash = settings.API_PASSWORD_HASH
+            elif settings.API_PASSWORD:
+                cls._password_hash = bcrypt.hashpw(
+                    settings.API_PASSWORD.encode("utf-8"),
+                    bcrypt.gensalt()
+                ).decode("utf-8")
+            else:
+                raise ValueError("Either API_PASSWORD or API_PASSWORD_HASH must be configured.")
+        return cls._password_hash
+
+    @classmethod
+    async def get_user(cls) -> User:
         """
         Retrieves a single user with a hashed password from the .env configuration.
         Repository that provides the single user (from .env) in a manner that
@@ -22,10 +49,4 @@ class AuthRepository:
 
         @return: A User object containing the username and hashed password.
         """
-        username = settings.API_USERNAME
-        hashed_password = bcrypt.hashpw(
-            settings.API_PASSWORD.encode("utf-8"),
-            bcrypt.gensalt()  # Ensures users with identical passwords have unique hashes
-        ).decode("utf-8")
-
-        return User(username=username, password=hashed_password)
+        return User(username=settings.API_USERNAME, password=cls.load_password_hash())
@@ -14,6 +14,7 @@ from sqlalchemy.future import select
 from ..models.models import InventoryParamsDevelopment
 from ..models.page_criteria_models import PageParams, InventoryParamsCriteria
 from ..models.schema import InventoryParamsDevelopmentORM
+from ..utils.pagination import paginate
 
 
 class InventoryParamsDevelopmentRepository:
@@ -21,6 +22,9 @@ class InventoryParamsDevelopmentRepository:
     Repository that handles CRUD operations for the 'inventory_params_development' table.
     """
 
+    # The sort key of the paginated queries (see 'paginate')
+    page_order = (InventoryParamsDevelopmentORM.id,)
+
     def __init__(self, session: AsyncSession):
         self.session = session
 
@@ -32,7 +36,7 @@ class InventoryParamsDevelopmentRepository:
         """
         Retrieves inventory parameters from the database with optional pagination and filtering.
 
-        @param page_params: The pagination parameters (page, page_size).
+        @param page_params: The pagination parameters (page, page_size, cursor).
         @param criteria: The filtering criteria (sku_number, week_number).
         @return: A list of inventory parameter records as Pydantic models.
         """
@@ -43,9 +47,7 @@ class InventoryParamsDevelopmentRepository:
             query = query.where(InventoryParamsDevelopmentORM.sku_number == criteria.sku_number)
 
         # Apply pagination
-        if page_params.page_size is not None:
-            offset = (page_params.page - 1) * page_params.page_size
-            query = query.offset(offset).limit(page_params.page_size)
+        query = paginate(query, page_params, self.page_order)
 
         # Execute query
         result = await self.session.execute(query)
@@ -6,7 +6,7 @@
  */
 """
 
-from typing import List
+from typing import List, Optional, Tuple
 
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
@@ -14,6 +14,8 @@ from sqlalchemy.future import select
 from ..models.models import LocationDevelopment
 from ..models.page_criteria_models import PageParams, LocationDevelopmentCriteria
 from ..models.schema import LocationDevelopmentORM
+from ..utils.pagination import paginate
+from ..utils.table_version import table_version_query
 
 
 class LocationDevelopmentRepository:
@@ -21,6 +23,9 @@ class LocationDevelopmentRepository:
     Repository that handles CRUD operations for the 'location_development' table.
     """
 
+    # The sort key of the paginated queries (see 'paginate')
+    page_order = (LocationDevelopmentORM.id,)
+
     def __init__(self, session: AsyncSession):
         self.session = session
 
@@ -32,7 +37,7 @@ class LocationDevelopmentRepository:
         """
         Retrieves location records from the database with optional pagination and filtering.
 
-        @param page_params: The pagination parameters (page, page_size).
+        @param page_params: The pagination parameters (page, page_size, cursor).
         @param criteria: The filtering criteria (location_id).
         @return: A list of location records as Pydantic models.
         """
@@ -45,9 +50,7 @@ class LocationDevelopmentRepository:
             query = query.where(LocationDevelopmentORM.location_name.ilike(f"%{criteria.location_name}%"))
 
         # Apply pagination
-        if page_params.page_size is not None:
-            offset = (page_params.page - 1) * page_params.page_size
-            query = query.offset(offset).limit(page_params.page_size)
+        query = paginate(query, page_params, self.page_order)
 
         # Execute query
         result = await self.session.execute(query)
@@ -55,3 +58,14 @@ class LocationDevelopmentRepository:
 
         # Convert ORM instances to Pydantic models
         return [LocationDevelopment.from_orm(row) for row in rows]
+
+    async def fetch_table_version(self) -> Tuple[int, Optional[int]]:
+        """
+        Retrieves the version (fingerprint) of the 'location_development' table: it changes when rows are inserted,
+        deleted or updated (see 'table_version_query').
+
+        @return: The number of rows and the checksum of their content.
+        """
+        result = await self.session.execute(table_version_query(LocationDevelopmentORM.__table__))
+        count, checksum = result.one()
+        return count, checksum
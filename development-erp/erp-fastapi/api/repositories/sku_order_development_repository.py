@@ -6,15 +6,23 @@
  */
 """
 
-from typing import List, Optional
+from typing import AsyncIterator, List, Optional, Sequence
 
-from sqlalchemy import desc
+from sqlalchemy import Column, Select, and_, desc
+from sqlalchemy.dialects.mysql import match
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 
 from ..models.models import SkuOrderDevelopment
 from ..models.page_criteria_models import PageParams, SkuOrderDevelopmentCriteria
 from ..models.schema import SkuOrderDevelopmentORM
+from ..utils.pagination import paginate
+
+# The number of rows fetched at a time by 'stream_all_skus' and 'stream_sku_columns'
+STREAM_BATCH_SIZE = 1000
+EXPORT_BATCH_SIZE = 10000
+# The MySQL 'ngram_token_size' (default): shorter search terms cannot use the FULLTEXT n-gram indexes
+NGRAM_TOKEN_SIZE = 2
 
 
 class SkuOrderDevelopmentRepository:
@@ -22,49 +30,134 @@ class SkuOrderDevelopmentRepository:
     Repository that handles CRUD operations for the 'sku_order_development' table.
     """
 
-    def __init__(self, session: AsyncSession):
-        self.session = session
+    # The sort key of the paginated queries (see 'paginate')
+    page_order = (SkuOrderDevelopmentORM.order_date, SkuOrderDevelopmentORM.id)
 
-    async def fetch_all_skus(
-            self,
-            page_params: PageParams,
-            criteria: SkuOrderDevelopmentCriteria
-    ) -> List[SkuOrderDevelopment]:
+    def __init__(self, session: AsyncSession, name_search_fulltext: bool = False):
         """
-        Retrieves SKU records from the database with optional pagination and filtering.
+        @param session: The database session.
+        @param name_search_fulltext: True to search the names through their FULLTEXT n-gram indexes
+            (created by the create-erp-development-db-tables-app), False for a plain 'ILIKE' scan.
+        """
+        self.session = session
+        self.name_search_fulltext = name_search_fulltext
 
-        @param page_params: An object containing pagination parameters (page, page_size).
-        @param criteria: An object containing filtering criteria (sku_number, sku_name, class_display_name, order_date).
-        @return: A list of SKU records mapped to Pydantic models.
+    def _name_contains(self, column: Column, value: str):
         """
+        Builds the 'contains' condition of the name search ('ILIKE %value%').
 
-        query = select(SkuOrderDevelopmentORM)
+        @param column: The searched name column (sku_name, class_display_name).
+        @param value: The searched text.
+        @return: The condition.
+        """
+        condition = column.ilike(f"%{value}%")
+        phrase = value.replace('"', ' ').strip()
+        if not self.name_search_fulltext or len(phrase) < NGRAM_TOKEN_SIZE:
+            return condition
+        # The n-gram phrase finds the candidate rows through the index, 'ILIKE' keeps the exact substring semantics
+        return and_(match(column, against=f'"{phrase}"').in_boolean_mode(), condition)
+
+    def _apply_criteria(self, query: Select, criteria: SkuOrderDevelopmentCriteria) -> Select:
+        """
+        Applies the filtering criteria to a select query of the 'sku_order_development' table.
 
-        # Filtering based on criteria
+        @param query: The select query.
+        @param criteria: An object containing filtering criteria (sku_number, sku_name, class_display_name, order_date).
+        @return: The filtered select query.
+        """
         if criteria.sku_number is not None:
             query = query.where(SkuOrderDevelopmentORM.sku_number == criteria.sku_number)
         if criteria.sku_name is not None:
-            query = query.where(SkuOrderDevelopmentORM.sku_name.ilike(f"%{criteria.sku_name}%"))
+            query = query.where(self._name_contains(SkuOrderDevelopmentORM.sku_name, criteria.sku_name))
         if criteria.class_display_name is not None:
-            query = query.where(SkuOrderDevelopmentORM.class_display_name.ilike(f"%{criteria.class_display_name}%"))
+            query = query.where(
+                self._name_contains(SkuOrderDevelopmentORM.class_display_name, criteria.class_display_name)
+            )
         if criteria.order_date is not None:
             query = query.where(SkuOrderDevelopmentORM.order_date == criteria.order_date)
         if criteria.start_order_date is not None:
             query = query.where(SkuOrderDevelopmentORM.order_date >= criteria.start_order_date)
         if criteria.end_order_date is not None:
             query = query.where(SkuOrderDevelopmentORM.order_date <= criteria.end_order_date)
+        return query
 
-        # Pagination
-        if page_params.page_size is not None:
-            offset = (page_params.page - 1) * page_params.page_size
-            query = query.offset(offset).limit(page_params.page_size)
+    def _build_query(self, page_params: PageParams, criteria: SkuOrderDevelopmentCriteria) -> Select:
+        """
+        Builds the (filtered and paginated) select query of 'fetch_all_skus' and 'stream_all_skus'.
 
-        result = await self.session.execute(query)
+        @param page_params: An object containing pagination parameters (page, page_size, cursor).
+        @param criteria: An object containing filtering criteria (sku_number, sku_name, class_display_name, order_date).
+        @return: The select query.
+        """
+        query = self._apply_criteria(select(SkuOrderDevelopmentORM), criteria)
+        return paginate(query, page_params, self.page_order)
+
+    async def fetch_all_skus(
+            self,
+            page_params: PageParams,
+            criteria: SkuOrderDevelopmentCriteria
+    ) -> List[SkuOrderDevelopment]:
+        """
+        Retrieves SKU records from the database with optional pagination and filtering.
+
+        @param page_params: An object containing pagination parameters (page, page_size, cursor).
+        @param criteria: An object containing filtering criteria (sku_number, sku_name, class_display_name, order_date).
+        @return: A list of SKU records mapped to Pydantic models.
+        """
+        result = await self.session.execute(self._build_query(page_params, criteria))
         rows = result.scalars().all()
 
         # Convert each ORM instance to a Pydantic model
         return [SkuOrderDevelopment.from_orm(row) for row in rows]
 
+    async def stream_all_skus(
+            self,
+            page_params: PageParams,
+            criteria: SkuOrderDevelopmentCriteria,
+            batch_size: int = STREAM_BATCH_SIZE
+    ) -> AsyncIterator[List[SkuOrderDevelopment]]:
+        """
+        Streams the SKU records of 'fetch_all_skus' in batches, over a server-side cursor: only one batch
+        is held in memory at a time, whatever the number of matching records.
+
+        @param page_params: An object containing pagination parameters (page, page_size, cursor).
+        @param criteria: An object containing filtering criteria (sku_number, sku_name, class_display_name, order_date).
+        @param batch_size: The number of rows fetched from the cursor (and yielded) at a time.
+        @return: An async generator of lists of SKU records mapped to Pydantic models.
+        """
+        query = self._build_query(page_params, criteria).execution_options(yield_per=batch_size)
+        result = await self.session.stream_scalars(query)
+        try:
+            async for rows in result.partitions():
+                yield [SkuOrderDevelopment.from_orm(row) for row in rows]
+        finally:
+            # Release the cursor (and its connection) if the client disconnects in the middle of the stream
+            await result.close()
+
+    async def stream_sku_columns(
+            self,
+            columns: Sequence[Column],
+            criteria: SkuOrderDevelopmentCriteria,
+            batch_size: int = EXPORT_BATCH_SIZE
+    ) -> AsyncIterator[List[tuple]]:
+        """
+        Streams the given columns of the SKU records (bulk export, ordered by order_date and id) in batches of
+        plain tuples, over a server-side cursor: no ORM instances, one batch in memory at a time.
+
+        @param columns: The columns of the 'sku_order_development' table to export.
+        @param criteria: An object containing filtering criteria (sku_number, sku_name, class_display_name, order_date).
+        @param batch_size: The number of rows fetched from the cursor (and yielded) at a time.
+        @return: An async generator of lists of rows (tuples in the order of the columns).
+        """
+        query = self._apply_criteria(select(*columns), criteria).order_by(*self.page_order)
+        result = await self.session.stream(query.execution_options(yield_per=batch_size))
+        try:
+            async for rows in result.partitions():
+                yield [tuple(row) for row in rows]
+        finally:
+            # Release the cursor (and its connection) if the client disconnects in the middle of the export
+            await result.close()
+
     async def fetch_latest_sku_order_by_ids(
             self,
             ids: List[int]
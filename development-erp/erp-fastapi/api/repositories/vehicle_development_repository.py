@@ -6,7 +6,7 @@
  */
 """
 
-from typing import List
+from typing import List, Optional, Tuple
 
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
@@ -14,6 +14,8 @@ from sqlalchemy.future import select
 from ..models.models import VehicleDevelopment
 from ..models.page_criteria_models import PageParams, VehicleDevelopmentCriteria
 from ..models.schema import VehicleDevelopmentORM
+from ..utils.pagination import paginate
+from ..utils.table_version import table_version_query
 
 
 class VehicleDevelopmentRepository:
@@ -21,6 +23,9 @@ class VehicleDevelopmentRepository:
     Repository that handles CRUD operations for the 'vehicle_development' table.
     """
 
+    # The sort key of the paginated queries (see 'paginate')
+    page_order = (VehicleDevelopmentORM.id,)
+
     def __init__(self, session: AsyncSession):
         self.session = session
 
@@ -32,7 +37,7 @@ class VehicleDevelopmentRepository:
         """
         Retrieves vehicle records from the database with optional pagination and filtering.
 
-        @param page_params: The pagination parameters (page, page_size).
+        @param page_params: The pagination parameters (page, page_size, cursor).
         @param criteria: The filtering criteria (vehicle_id).
         @return: A list of vehicle records as Pydantic models.
         """
@@ -43,9 +48,7 @@ class VehicleDevelopmentRepository:
             query = query.where(VehicleDevelopmentORM.vehicle_id == criteria.vehicle_id)
 
         # Apply pagination
-        if page_params.page_size is not None:
-            offset = (page_params.page - 1) * page_params.page_size
-            query = query.offset(offset).limit(page_params.page_size)
+        query = paginate(query, page_params, self.page_order)
 
         # Execute query
         result = await self.session.execute(query)
@@ -53,3 +56,14 @@ class VehicleDevelopmentRepository:
 
         # Convert ORM instances to Pydantic models
         return [VehicleDevelopment.from_orm(row) for row in rows]
+
+    async def fetch_table_version(self) -> Tuple[int, Optional[int]]:
+        """
+        Retrieves the version (fingerprint) of the 'vehicle_development' table: it changes when rows are inserted,
+        deleted or updated (see 'table_version_query').
+
+        @return: The number of rows and the checksum of their content.
+        """
+        result = await self.session.execute(table_version_query(VehicleDevelopmentORM.__table__))
+        count, checksum = result.one()
+        return count, checksum
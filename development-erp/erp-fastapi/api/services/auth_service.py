@@ -6,6 +6,7 @@
  */
 """
 
+import asyncio
 from datetime import datetime, timedelta, timezone
 
 import bcrypt
@@ -32,7 +33,8 @@ class AuthService:
         env_user = await self.auth_repository.get_user()
         if env_user.username != username:
             return None
-        if not self._verify_password(user_password, env_user.password):
+        # bcrypt is CPU-bound (~hundreds of ms): verify in a worker thread to keep the event loop responsive
+        if not await asyncio.to_thread(self._verify_password, user_password, env_user.password):
             return None
         return env_user
 
@@ -6,39 +6,113 @@
  */
 """
 
-from typing import Dict
+import asyncio
+import hashlib
+from typing import AsyncContextManager, Awaitable, Callable, Dict, List, Literal, TypeVar, Union
 
 from ..location_development_service import LocationDevelopmentService
 from ..route_development_service import RouteDevelopmentService
 from ..vehicle_development_service import VehicleDevelopmentService
+from ...models.dto_models import ResponseWithUserID
 from ...models.page_criteria_models import PageParams, LocationDevelopmentCriteria, RouteDevelopmentCriteria, \
     VehicleDevelopmentCriteria
+from ...utils.response_cache import InMemoryResponseCache, RedisResponseCache
+
+Service = TypeVar("Service")
+Result = TypeVar("Result")
+# A factory of 'async with' blocks yielding a service on its own database session
+ServiceScope = Callable[[], AsyncContextManager[Service]]
+# 'dense': distance_matrix / traffic_factors (N x N lists), 'sparse': the edges (routes) only
+MatrixFormat = Literal["dense", "sparse"]
+# The key of the data model version in the version cache
+DATA_MODEL_VERSION_CACHE_KEY = "distribution_routing_data_version"
 
 
 class DistributionRoutingServiceFacade:
     """
     Facade that collects data from location, route, and vehicle services
     to build a JSON model similar to create_data_model().
+    The three tables are read concurrently, each on its own session (an AsyncSession runs one query at a time).
     """
 
     def __init__(
             self,
-            location_service: LocationDevelopmentService,
-            route_service: RouteDevelopmentService,
-            vehicle_service: VehicleDevelopmentService
+            location_service_scope: ServiceScope[LocationDevelopmentService],
+            route_service_scope: ServiceScope[RouteDevelopmentService],
+            vehicle_service_scope: ServiceScope[VehicleDevelopmentService],
+            response_cache: Union[InMemoryResponseCache, RedisResponseCache],
+            version_cache: InMemoryResponseCache
     ):
-        self.location_service = location_service
-        self.route_service = route_service
-        self.vehicle_service = vehicle_service
+        self.location_service_scope = location_service_scope
+        self.route_service_scope = route_service_scope
+        self.vehicle_service_scope = vehicle_service_scope
+        self.response_cache = response_cache
+        # The last computed version, reused for DATA_VERSION_TTL_SECONDS (see 'get_data_model_version')
+        self.version_cache = version_cache
+
+    @staticmethod
+    async def _read(service_scope: ServiceScope[Service], read: Callable[[Service], Awaitable[Result]]) -> Result:
+        """
+        @param service_scope: The scope of the service to read with.
+        @param read: The read, given the service.
+        @return: The result of the read (on a session of its own).
+        """
+        async with service_scope() as service:
+            return await read(service)
+
+    async def get_data_model_version(self) -> str:
+        """
+        Builds the version of the data model from the versions of the location, route and vehicle tables
+        (three aggregate queries instead of three full-table queries; a version follows every insert, delete and
+        update of its table). Used as the cache key and the ETag.
+
+        The aggregate queries still scan the three tables, so the version is reused for DATA_VERSION_TTL_SECONDS
+        (the requests and the 304 revalidations within that interval do not query the tables): a change is
+        visible at most that much later.
+
+        @return: The version (a hex digest).
+        """
+        cached_version = await self.version_cache.get(DATA_MODEL_VERSION_CACHE_KEY)
+        if cached_version is not None:
+            return cached_version.decode("ascii")
+        table_versions = await asyncio.gather(
+            self._read(self.location_service_scope, lambda service: service.get_table_version()),
+            self._read(self.route_service_scope, lambda service: service.get_table_version()),
+            self._read(self.vehicle_service_scope, lambda service: service.get_table_version()),
+        )
+        version = hashlib.sha256(repr(list(table_versions)).encode("utf-8")).hexdigest()[:32]
+        await self.version_cache.set(DATA_MODEL_VERSION_CACHE_KEY, version.encode("ascii"))
+        return version
+
+    async def get_data_model_response(self, user_id: int, version: str, matrix_format: MatrixFormat = "dense") -> bytes:
+        """
+        Returns the serialized (JSON) response of the data model, built once per version (see 'response_cache').
 
-    async def build_data_model(self) -> Dict:
+        @param user_id: The user ID included in the response.
+        @param version: The version of the data model (see 'get_data_model_version').
+        @param matrix_format: The representation of the distances and traffic factors (see 'build_data_model').
+        @return: The JSON response (ResponseWithUserID).
+        """
+        cache_key = f"distribution_routing_data:{user_id}:{version}:{matrix_format}"
+        response = await self.response_cache.get(cache_key)
+        if response is None:
+            data_model = await self.build_data_model(matrix_format)
+            response = ResponseWithUserID(user_id=user_id, data=data_model).model_dump_json().encode("utf-8")
+            await self.response_cache.set(cache_key, response)
+        return response
+
+    async def build_data_model(self, matrix_format: MatrixFormat = "dense") -> Dict:
         """
         Builds a data model that includes distance_matrix, traffic_factors, demands,
         vehicle_capacities, cost_per_trip_per_vehicle, num_vehicles, location_id/name and depot index.
 
+        @param matrix_format: 'dense' for distance_matrix and traffic_factors, or 'sparse' for the edges only
+                              (the pairs of locations without a route are 0.0 distance and 1.0 traffic factor).
         @return: A dictionary with the following keys:
-                 - distance_matrix (List[List[float]])
-                 - traffic_factors (List[List[float]])
+                 - distance_matrix (List[List[float]]) - 'dense' only
+                 - traffic_factors (List[List[float]]) - 'dense' only
+                 - edges (Dict[str, List]) - 'sparse' only: the parallel lists 'source', 'destination'
+                   (indices in the location array), 'distance' and 'traffic_factor' of the routes
                  - demands (List[int])
                  - vehicle_capacities (List[int])
                  - cost_per_trip_per_vehicle (List[float])
@@ -49,10 +123,20 @@ class DistributionRoutingServiceFacade:
                     - location_name (Optional[str]): Name of the location.
         """
 
-        # 1. Fetch all locations (with demands, is_depot, etc.)
-        all_locations = await self.location_service.get_all_locations(
-            page_params=PageParams(page=1, page_size=9999),
-            criteria=LocationDevelopmentCriteria()
+        # 1. Fetch all locations, routes and vehicles (concurrently)
+        all_locations, all_routes, all_vehicles = await asyncio.gather(
+            self._read(self.location_service_scope, lambda service: service.get_all_locations(
+                page_params=PageParams(page=1, page_size=9999),
+                criteria=LocationDevelopmentCriteria()
+            )),
+            self._read(self.route_service_scope, lambda service: service.get_all_routes(
+                page_params=PageParams(page=1, page_size=9999),
+                criteria=RouteDevelopmentCriteria()
+            )),
+            self._read(self.vehicle_service_scope, lambda service: service.get_all_vehicles(
+                page_params=PageParams(page=1, page_size=9999),
+                criteria=VehicleDevelopmentCriteria()
+            )),
         )
         # Separate depot(s) from non-depots
         depot_locs = [loc for loc in all_locations if loc.is_depot]
@@ -73,44 +157,33 @@ class DistributionRoutingServiceFacade:
             # Must have a location_id to map
             if loc.location_id is not None:
                 location_index_map[loc.location_id] = idx
-        # 2. Initialize distance_matrix and traffic_factors with 0's
-        size = len(final_locations)
-        distance_matrix = [[0.0] * size for _ in range(size)]
-        traffic_factors = [[1.0] * size for _ in range(size)]
-        # 3. Fetch all routes (with distance, traffic_factor, source/destination IDs)
-        all_routes = await self.route_service.get_all_routes(
-            page_params=PageParams(page=1, page_size=9999),
-            criteria=RouteDevelopmentCriteria()
-        )
-        # Fill distance_matrix / traffic_factors
+        # 2. Collect the edges (distance / traffic_factor of the routes between known locations)
+        edges = {"source": [], "destination": [], "distance": [], "traffic_factor": []}
         for route in all_routes:
             src_id = route.source_location_id
             dst_id = route.destination_location_id
             if src_id in location_index_map and dst_id in location_index_map:
-                i = location_index_map[src_id]
-                j = location_index_map[dst_id]
-                distance_matrix[i][j] = route.distance or 0.0
-                traffic_factors[i][j] = route.traffic_factor or 1.0
-        # 4. Fetch all vehicles
-        all_vehicles = await self.vehicle_service.get_all_vehicles(
-            page_params=PageParams(page=1, page_size=9999),
-            criteria=VehicleDevelopmentCriteria()
-        )
-        # Extract capacities and cost_per_trip
+                edges["source"].append(location_index_map[src_id])
+                edges["destination"].append(location_index_map[dst_id])
+                edges["distance"].append(route.distance or 0.0)
+                edges["traffic_factor"].append(route.traffic_factor or 1.0)
+        # 3. Extract capacities and cost_per_trip
         vehicle_capacities = [v.capacity if v.capacity else 0 for v in all_vehicles]
         cost_per_trip_per_vehicle = [v.cost_per_trip if v.cost_per_trip else 0 for v in all_vehicles]
         num_vehicles = len(all_vehicles)
-        # 5. Build the final dictionary
-        data = {
-            "distance_matrix": distance_matrix,
-            "traffic_factors": traffic_factors,
+        # 4. Build the final dictionary
+        if matrix_format == "sparse":
+            data = {"edges": edges}
+        else:
+            data = self._dense_matrices(len(final_locations), edges)
+        data.update({
             "demands": demands,
             "vehicle_capacities": vehicle_capacities,
             "cost_per_trip_per_vehicle": cost_per_trip_per_vehicle,
             "num_vehicles": num_vehicles,
             "depot": 0  # Depot is explicitly set to index 0
-        }
-        # 6. Build location_data as a list of dictionaries with location_id and location_name
+        })
+        # 5. Build location_data as a list of dictionaries with location_id and location_name
         location_data = [
             {"location_id": loc.location_id, "location_name": loc.location_name}
             for loc in final_locations
@@ -118,3 +191,19 @@ class DistributionRoutingServiceFacade:
         data["location_data"] = location_data  # Add the new key to the data dictionary
         # Return the JSON input for the ML Algorithm
         return data
+
+    @staticmethod
+    def _dense_matrices(size: int, edges: Dict[str, List]) -> Dict[str, List[List[float]]]:
+        """
+        @param size: The number of locations.
+        @param edges: The edges (see 'build_data_model').
+        @return: The distance_matrix and traffic_factors (0.0 and 1.0 for the pairs without a route).
+        """
+        distance_matrix = [[0.0] * size for _ in range(size)]
+        traffic_factors = [[1.0] * size for _ in range(size)]
+        for i, j, distance, traffic_factor in zip(
+                edges["source"], edges["destination"], edges["distance"], edges["traffic_factor"]
+        ):
+            distance_matrix[i][j] = distance
+            traffic_factors[i][j] = traffic_factor
+        return {"distance_matrix": distance_matrix, "traffic_factors": traffic_factors}
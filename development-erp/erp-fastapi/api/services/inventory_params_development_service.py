@@ -29,7 +29,7 @@ class InventoryParamsDevelopmentService:
         """
         Retrieves a list of inventory parameters with pagination and filtering.
 
-        @param page_params: The pagination parameters (page, page_size).
+        @param page_params: The pagination parameters (page, page_size, cursor).
         @param criteria: The filtering criteria (sku_number, week_number).
         @return: A list of inventory parameter records as Pydantic models.
         """
@@ -6,7 +6,7 @@
  */
 """
 
-from typing import List
+from typing import List, Optional, Tuple
 
 from ..models.models import LocationDevelopment
 from ..models.page_criteria_models import PageParams, LocationDevelopmentCriteria
@@ -29,8 +29,16 @@ class LocationDevelopmentService:
         """
         Retrieves a list of locations with pagination and filtering.
 
-        @param page_params: The pagination parameters (page, page_size).
+        @param page_params: The pagination parameters (page, page_size, cursor).
         @param criteria: The filtering criteria (location_id).
         @return: A list of location records as Pydantic models.
         """
         return await self.repository.fetch_all_locations(page_params, criteria)
+
+    async def get_table_version(self) -> Tuple[int, Optional[int]]:
+        """
+        Retrieves the version (fingerprint) of the 'location_development' table.
+
+        @return: The number of rows and the checksum of their content.
+        """
+        return await self.repository.fetch_table_version()
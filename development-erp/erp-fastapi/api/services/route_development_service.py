@@ -6,7 +6,7 @@
  */
 """
 
-from typing import List
+from typing import List, Optional, Tuple
 
 from ..models.models import RouteDevelopment
 from ..models.page_criteria_models import PageParams, RouteDevelopmentCriteria
@@ -29,8 +29,16 @@ class RouteDevelopmentService:
         """
         Retrieves a list of routes with pagination and filtering.
 
-        @param page_params: The pagination parameters (page, page_size).
+        @param page_params: The pagination parameters (page, page_size, cursor).
         @param criteria: The filtering criteria (route_id).
         @return: A list of route records as Pydantic models.
         """
         return await self.repository.fetch_all_routes(page_params, criteria)
+
+    async def get_table_version(self) -> Tuple[int, Optional[int]]:
+        """
+        Retrieves the version (fingerprint) of the 'route_development' table.
+
+        @return: The number of rows and the checksum of their content.
+        """
+        return await self.repository.fetch_table_version()
@@ -6,7 +6,9 @@
  */
 """
 
-from typing import List, Optional
+from typing import AsyncIterator, List, Optional, Sequence
+
+from sqlalchemy import Column
 
 from ..models.models import SkuOrderDevelopment
 from ..models.page_criteria_models import PageParams, SkuOrderDevelopmentCriteria
@@ -29,12 +31,40 @@ class SkuOrderDevelopmentService:
         """
         Retrieves a list of SKUs with pagination and filtering.
 
-        @param page_params: The pagination parameters (page, page_size).
+        @param page_params: The pagination parameters (page, page_size, cursor).
         @param criteria: The filtering criteria (sku_number, sku_name, etc.).
         @return: A list of SKU records as Pydantic models.
         """
         return await self.repository.fetch_all_skus(page_params, criteria)
 
+    def stream_all_skus(
+            self,
+            page_params: PageParams,
+            criteria: SkuOrderDevelopmentCriteria
+    ) -> AsyncIterator[List[SkuOrderDevelopment]]:
+        """
+        Streams the SKUs of 'get_all_skus' in batches, without loading all of them in memory.
+
+        @param page_params: The pagination parameters (page, page_size, cursor).
+        @param criteria: The filtering criteria (sku_number, sku_name, etc.).
+        @return: An async generator of lists of SKU records as Pydantic models.
+        """
+        return self.repository.stream_all_skus(page_params, criteria)
+
+    def stream_sku_columns(
+            self,
+            columns: Sequence[Column],
+            criteria: SkuOrderDevelopmentCriteria
+    ) -> AsyncIterator[List[tuple]]:
+        """
+        Streams the given columns of the filtered SKUs in batches of rows (bulk export).
+
+        @param columns: The columns of the 'sku_order_development' table to export.
+        @param criteria: The filtering criteria (start_order_date, end_order_date, etc.).
+        @return: An async generator of lists of rows (tuples in the order of the columns).
+        """
+        return self.repository.stream_sku_columns(columns, criteria)
+
     async def get_latest_sku_order_by_ids(
             self,
             ids: List[int]
@@ -6,7 +6,7 @@
  */
 """
 
-from typing import List
+from typing import List, Optional, Tuple
 
 from ..models.models import VehicleDevelopment
 from ..models.page_criteria_models import PageParams, VehicleDevelopmentCriteria
@@ -29,8 +29,16 @@ class VehicleDevelopmentService:
         """
         Retrieves a list of vehicles with pagination and filtering.
 
-        @param page_params: The pagination parameters (page, page_size).
+        @param page_params: The pagination parameters (page, page_size, cursor).
         @param criteria: The filtering criteria (vehicle_id).
         @return: A list of vehicle records as Pydantic models.
         """
         return await self.repository.fetch_all_vehicles(page_params, criteria)
+
+    async def get_table_version(self) -> Tuple[int, Optional[int]]:
+        """
+        Retrieves the version (fingerprint) of the 'vehicle_development' table.
+
+        @return: The number of rows and the checksum of their content.
+        """
+        return await self.repository.fetch_table_version()
@@ -0,0 +1,88 @@
+"""
+/*
+ * Copyright 2025 DOTSOFT SA, Inc All Rights Reserved.
+ *
+ * Author: Georgios Karanasios R&D Software Engineer
+ */
+"""
+
+import io
+from typing import AsyncIterator, List, Sequence
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+from sqlalchemy import Boolean, Column, Date, DateTime, Double, Integer, String, Text
+
+''' Columnar (Arrow IPC / Parquet) encoding of the bulk export endpoints '''
+
+ARROW_STREAM_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+PARQUET_MEDIA_TYPE = "application/vnd.apache.parquet"
+
+# The Arrow type of every SQLAlchemy column type of the schema
+_ARROW_TYPES = {
+    Integer: pa.int64(),
+    Double: pa.float64(),
+    Text: pa.string(),
+    String: pa.string(),
+    Boolean: pa.bool_(),
+    DateTime: pa.timestamp("us"),
+    Date: pa.date32(),
+}
+
+
+def arrow_schema(columns: Sequence[Column]) -> pa.Schema:
+    """
+    Builds the Arrow schema of the exported columns (typed, so that the readers do not parse anything).
+
+    @param columns: The exported table columns.
+    @return: The Arrow schema.
+    """
+    return pa.schema([pa.field(column.key, _ARROW_TYPES[type(column.type)]) for column in columns])
+
+
+def _record_batch(rows: List[tuple], schema: pa.Schema) -> pa.RecordBatch:
+    """
+    @param rows: A batch of rows (tuples in the order of the schema fields).
+    @param schema: The Arrow schema.
+    @return: The rows as an Arrow record batch.
+    """
+    values = list(zip(*rows)) if rows else [[] for _ in schema]
+    return pa.RecordBatch.from_arrays(
+        [pa.array(column_values, type=field.type) for column_values, field in zip(values, schema)],
+        schema=schema
+    )
+
+
+async def arrow_ipc_stream(batches: AsyncIterator[List[tuple]], schema: pa.Schema) -> AsyncIterator[bytes]:
+    """
+    Encodes batches of rows as an (zstd compressed) Arrow IPC stream, yielding every record batch as soon as
+    it is encoded: the memory stays constant whatever the number of rows.
+
+    @param batches: An async generator of batches of rows (tuples in the order of the schema fields).
+    @param schema: The Arrow schema.
+    @return: An async generator of the chunks of the Arrow IPC stream.
+    """
+    sink = io.BytesIO()
+    with pa.ipc.new_stream(sink, schema, options=pa.ipc.IpcWriteOptions(compression="zstd")) as writer:
+        async for rows in batches:
+            writer.write_batch(_record_batch(rows, schema))
+            yield sink.getvalue()
+            sink.seek(0)
+            sink.truncate()
+    yield sink.getvalue()  # The schema (if there were no rows) and the end-of-stream marker
+
+
+async def parquet_file(batches: AsyncIterator[List[tuple]], schema: pa.Schema) -> bytes:
+    """
+    Encodes batches of rows as a (zstd compressed) Parquet file, one row group per batch. A Parquet file
+    ends with its footer, so (unlike 'arrow_ipc_stream') the whole compressed file is built in memory.
+
+    @param batches: An async generator of batches of rows (tuples in the order of the schema fields).
+    @param schema: The Arrow schema.
+    @return: The Parquet file.
+    """
+    sink = io.BytesIO()
+    with pq.ParquetWriter(sink, schema, compression="zstd") as writer:
+        async for rows in batches:
+            writer.write_batch(_record_batch(rows, schema))
+    return sink.getvalue()
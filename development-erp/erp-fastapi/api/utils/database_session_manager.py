@@ -7,21 +7,53 @@
 """
 
 from contextlib import asynccontextmanager
+from typing import Dict, Union
 
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, AsyncEngine
 from sqlalchemy.orm import sessionmaker
 
+from api.utils.pool_metrics import MeteredAsyncAdaptedQueuePool, pool_metrics
 from api.utils.settings import settings
 
 
 class DatabaseSessionManager:
-    def __init__(self, database_url: str):
+    def __init__(
+            self,
+            database_url: str,
+            pool_size: int = 5,
+            max_overflow: int = 10,
+            pool_timeout: int = 30,
+            pool_recycle: int = -1,
+            pool_pre_ping: bool = False
+    ):
+        """
+        @param database_url: The SQLAlchemy database URL.
+        @param pool_size: The number of connections kept open in the pool.
+        @param max_overflow: The number of connections opened beyond pool_size under burst load (closed when returned).
+        @param pool_timeout: The seconds a session waits for a connection before failing.
+        @param pool_recycle: The age (seconds) after which a connection is replaced (-1: never).
+        @param pool_pre_ping: True to test (and replace if dropped) every connection on checkout.
+        """
         self.database_url = database_url
+        self.pool_size = pool_size
+        self.max_overflow = max_overflow
+        self.pool_timeout = pool_timeout
+        self.pool_recycle = pool_recycle
+        self.pool_pre_ping = pool_pre_ping
         self.async_engine: AsyncEngine | None = None
         self.session_maker = None
 
     def start_engine(self) -> AsyncEngine:
-        self.async_engine = create_async_engine(self.database_url, echo=False)
+        self.async_engine = create_async_engine(
+            self.database_url,
+            echo=False,
+            poolclass=MeteredAsyncAdaptedQueuePool,
+            pool_size=self.pool_size,
+            max_overflow=self.max_overflow,
+            pool_timeout=self.pool_timeout,
+            pool_recycle=self.pool_recycle,
+            pool_pre_ping=self.pool_pre_ping
+        )
         self.session_maker = sessionmaker(bind=self.async_engine,
                                           class_=AsyncSession,
                                           expire_on_commit=False,
@@ -39,6 +71,20 @@ class DatabaseSessionManager:
         if self.async_engine:
             await self.async_engine.dispose()
 
+    def pool_metrics(self) -> Dict[str, Union[int, float]]:
+        """
+        @return: The current usage and the checkout metrics of the connection pool (see 'pool_metrics').
+        """
+        assert self.async_engine, "DatabaseSessionManager is not initialized"
+        return pool_metrics(self.async_engine.pool, self.max_overflow)
+
 
 # Global Initialization
-db_manager = DatabaseSessionManager(settings.sqlalchemy_database_url)
+db_manager = DatabaseSessionManager(
+    settings.sqlalchemy_database_url,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT,
+    pool_recycle=settings.DB_POOL_RECYCLE,
+    pool_pre_ping=settings.DB_POOL_PRE_PING
+)
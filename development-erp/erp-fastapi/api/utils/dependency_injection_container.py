@@ -6,6 +6,9 @@
  */
 """
 
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
 from fastapi import Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -23,6 +26,13 @@ from ..services.route_development_service import RouteDevelopmentService
 from ..services.sku_order_development_service import SkuOrderDevelopmentService
 from ..services.vehicle_development_service import VehicleDevelopmentService
 from ..utils.database_session_manager import db_manager
+from ..utils.response_cache import InMemoryResponseCache, create_response_cache
+from ..utils.settings import settings
+
+# Shared by all the requests of the process (see 'response_cache')
+response_cache = create_response_cache(settings.RESPONSE_CACHE_TTL_SECONDS, settings.RESPONSE_CACHE_REDIS_URL)
+# The version of the routing data, per process (see 'DistributionRoutingServiceFacade.get_data_model_version')
+version_cache = InMemoryResponseCache(settings.DATA_VERSION_TTL_SECONDS, max_entries=1)
 
 
 # -----------------------
@@ -56,7 +66,7 @@ async def get_db() -> AsyncSession:
 def get_sku_order_development_repo(
         session: AsyncSession = Depends(get_db)  # <-- Inject the session here
 ) -> SkuOrderDevelopmentRepository:
-    return SkuOrderDevelopmentRepository(session)
+    return SkuOrderDevelopmentRepository(session, name_search_fulltext=settings.NAME_SEARCH_FULLTEXT)
 
 
 def get_sku_order_development_service(
@@ -65,6 +75,18 @@ def get_sku_order_development_service(
     return SkuOrderDevelopmentService(repo)
 
 
+@asynccontextmanager
+async def sku_order_development_service_scope() -> AsyncIterator[SkuOrderDevelopmentService]:
+    """
+    Yields a SkuOrderDevelopmentService on its own session, for a StreamingResponse body:
+    FastAPI closes the request's session (get_db) before the body is sent.
+    """
+    async with db_manager.get_db() as session:
+        yield SkuOrderDevelopmentService(
+            SkuOrderDevelopmentRepository(session, name_search_fulltext=settings.NAME_SEARCH_FULLTEXT)
+        )
+
+
 # -----------------------
 # INVENTORY_PARAMS_DEVELOPMENT DEPS
 # -----------------------
@@ -125,13 +147,39 @@ def get_route_development_service(
     return RouteDevelopmentService(repo)
 
 
-def get_distribution_routing_facade(
-        location_service: LocationDevelopmentService = Depends(get_location_development_service),
-        route_service: RouteDevelopmentService = Depends(get_route_development_service),
-        vehicle_service: VehicleDevelopmentService = Depends(get_vehicle_development_service),
-) -> DistributionRoutingServiceFacade:
+@asynccontextmanager
+async def location_development_service_scope() -> AsyncIterator[LocationDevelopmentService]:
+    """
+    Yields a LocationDevelopmentService on its own session (see DistributionRoutingServiceFacade).
+    """
+    async with db_manager.get_db() as session:
+        yield LocationDevelopmentService(LocationDevelopmentRepository(session))
+
+
+@asynccontextmanager
+async def route_development_service_scope() -> AsyncIterator[RouteDevelopmentService]:
+    """
+    Yields a RouteDevelopmentService on its own session (see DistributionRoutingServiceFacade).
+    """
+    async with db_manager.get_db() as session:
+        yield RouteDevelopmentService(RouteDevelopmentRepository(session))
+
+
+@asynccontextmanager
+async def vehicle_development_service_scope() -> AsyncIterator[VehicleDevelopmentService]:
+    """
+    Yields a VehicleDevelopmentService on its own session (see DistributionRoutingServiceFacade).
+    """
+    async with db_manager.get_db() as session:
+        yield VehicleDevelopmentService(VehicleDevelopmentRepository(session))
+
+
+def get_distribution_routing_facade() -> DistributionRoutingServiceFacade:
+    # The facade reads the three tables concurrently, each on its own session (instead of the request's session)
     return DistributionRoutingServiceFacade(
-        location_service=location_service,
-        route_service=route_service,
-        vehicle_service=vehicle_service
+        location_service_scope=location_development_service_scope,
+        route_service_scope=route_development_service_scope,
+        vehicle_service_scope=vehicle_development_service_scope,
+        response_cache=response_cache,
+        version_cache=version_cache
     )
@@ -0,0 +1,114 @@
+"""
+/*
+ * Copyright 2025 DOTSOFT SA, Inc All Rights Reserved.
+ *
+ * Author: Georgios Karanasios R&D Software Engineer
+ */
+"""
+
+import base64
+import json
+from datetime import date, datetime
+from typing import Any, List, Optional, Sequence
+
+from fastapi import HTTPException, status
+from sqlalchemy import Column, Select, and_, or_
+
+from ..models.page_criteria_models import PageParams
+
+''' Offset ('page') and keyset ('cursor') pagination of the list endpoints.
+
+A keyset page continues right after the sort key of the last record of the previous page
+('WHERE (order_date, id) > (:last_order_date, :last_id)'), so the database seeks in the index instead of
+scanning and throwing away all the preceding rows like 'OFFSET' does. Both modes use the same order,
+so a client can start with 'page' and continue with the returned 'next_cursor'. '''
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """
+    Encodes the sort key of a record as an opaque (URL-safe) cursor.
+
+    @param values: The values of the sort key columns (e.g., [order_date, id]).
+    @return: The cursor.
+    """
+    payload = json.dumps([value.isoformat() if isinstance(value, (date, datetime)) else value for value in values])
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, order_columns: Sequence[Column]) -> List[Any]:
+    """
+    Decodes a cursor (see 'encode_cursor') back to the values of the sort key columns.
+
+    @param cursor: The cursor returned as 'next_cursor' by the previous page.
+    @param order_columns: The sort key columns of the query.
+    @return: The values of the sort key columns (None for NULL).
+    @raises HTTPException: 400 if the cursor is malformed or belongs to another endpoint.
+    """
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        if not isinstance(values, list) or len(values) != len(order_columns):
+            raise ValueError("Wrong number of values.")
+        decoded = []
+        for column, value in zip(order_columns, values):
+            python_type = column.type.python_type
+            if value is not None and python_type in (date, datetime):
+                value = python_type.fromisoformat(value)
+            elif value is not None:
+                value = python_type(value)
+            decoded.append(value)
+        return decoded
+    except (TypeError, ValueError, UnicodeDecodeError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid pagination cursor")
+
+
+def _after(column: Column, value: Any):
+    # MySQL sorts NULL first in ascending order: every non-NULL value comes after NULL
+    return column.is_not(None) if value is None else column > value
+
+
+def _equal(column: Column, value: Any):
+    return column.is_(None) if value is None else column == value
+
+
+def paginate(query: Select, page_params: PageParams, order_columns: Sequence[Column]) -> Select:
+    """
+    Applies the order and the pagination (keyset if a cursor is given, else offset) to a query.
+    Without 'page_size' the query is returned as is (no limit).
+
+    @param query: The (filtered) select query.
+    @param page_params: The pagination parameters (page, page_size, cursor).
+    @param order_columns: The sort key columns, ending with a unique one (e.g., [order_date, id]).
+    @return: The paginated query.
+    """
+    if page_params.page_size is None:
+        return query
+    # A stable order, so that walking the pages does not skip or repeat records
+    query = query.order_by(*order_columns)
+    if page_params.cursor is not None:
+        values = decode_cursor(page_params.cursor, order_columns)
+        # Lexicographic '(c1, c2, ...) > (v1, v2, ...)', spelled out so that NULL values are comparable
+        query = query.where(or_(*(
+            and_(*(_equal(column, value) for column, value in zip(order_columns[:i], values[:i])),
+                 _after(order_columns[i], values[i]))
+            for i in range(len(order_columns))
+        )))
+        if values[0] is not None:
+            # Redundant with the above, but lets the optimizer seek the index instead of scanning it
+            query = query.where(order_columns[0] >= values[0])
+    else:
+        query = query.offset((page_params.page - 1) * page_params.page_size)
+    return query.limit(page_params.page_size)
+
+
+def next_page_cursor(records: Sequence[Any], page_params: PageParams, order_columns: Sequence[Column]) -> Optional[str]:
+    """
+    Builds the cursor of the page after the given records.
+
+    @param records: The records of the current page (Pydantic models, in the order of the query).
+    @param page_params: The pagination parameters of the current page.
+    @param order_columns: The sort key columns of the query (see 'paginate').
+    @return: The cursor, or None if there is no next page (no page_size, or a page shorter than page_size).
+    """
+    if page_params.page_size is None or len(records) < page_params.page_size:
+        return None
+    return encode_cursor([getattr(records[-1], column.key) for column in order_columns])
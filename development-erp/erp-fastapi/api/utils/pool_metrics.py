@@ -0,0 +1,107 @@
+"""
+/*
+ * Copyright 2025 DOTSOFT SA, Inc All Rights Reserved.
+ *
+ * Author: Georgios Karanasios R&D Software Engineer
+ */
+"""
+
+import time
+from collections import deque
+from typing import Dict, Union
+
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+''' Metrics of the database connection pool, to size it ('DB_POOL_SIZE', 'DB_MAX_OVERFLOW') against real traffic.
+
+The checkout wait is the time a session waits for a connection: near zero while the pool has idle connections,
+the connect time for a new (overflow) connection, and the queueing time once the pool and its overflow are
+all in use (up to 'DB_POOL_TIMEOUT', then the checkout fails). '''
+
+# The number of the latest checkout waits kept for the percentiles
+RECENT_CHECKOUTS = 1024
+
+
+class CheckoutMetrics:
+    """
+    Counters and recent wait times of the connection checkouts of a pool.
+    """
+
+    def __init__(self):
+        self.checkouts = 0
+        self.timeouts = 0
+        self.total_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+        self.recent_wait_seconds: deque[float] = deque(maxlen=RECENT_CHECKOUTS)
+
+    def record(self, wait_seconds: float, timed_out: bool) -> None:
+        """
+        @param wait_seconds: The time waited for a connection.
+        @param timed_out: True if no connection was available within the pool timeout.
+        @return: None
+        """
+        self.checkouts += 1
+        self.timeouts += int(timed_out)
+        self.total_wait_seconds += wait_seconds
+        self.max_wait_seconds = max(self.max_wait_seconds, wait_seconds)
+        self.recent_wait_seconds.append(wait_seconds)
+
+    def percentile_ms(self, percentile: float) -> float:
+        """
+        @param percentile: The percentile (0-100).
+        @return: The percentile of the recent checkout waits in milliseconds (0.0 without checkouts).
+        """
+        if not self.recent_wait_seconds:
+            return 0.0
+        waits = sorted(self.recent_wait_seconds)
+        return waits[min(len(waits) - 1, int(len(waits) * percentile / 100))] * 1000
+
+
+class MeteredPoolMixin:
+    """
+    Records the wait time of every connection checkout of a QueuePool (see 'CheckoutMetrics').
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.checkout_metrics = CheckoutMetrics()
+
+    def _do_get(self):
+        start = time.perf_counter()
+        timed_out = False
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            timed_out = True
+            raise
+        finally:
+            self.checkout_metrics.record(time.perf_counter() - start, timed_out)
+
+
+class MeteredAsyncAdaptedQueuePool(MeteredPoolMixin, AsyncAdaptedQueuePool):
+    """
+    The default pool of the async engines, with checkout metrics.
+    """
+
+
+def pool_metrics(pool: MeteredPoolMixin, max_overflow: int) -> Dict[str, Union[int, float]]:
+    """
+    @param pool: The metered connection pool of the engine.
+    @param max_overflow: The maximum number of connections beyond the pool size.
+    @return: The current usage of the pool and its checkout metrics.
+    """
+    metrics = pool.checkout_metrics
+    return {
+        "pool_size": pool.size(),
+        "max_overflow": max_overflow,
+        "in_use": pool.checkedout(),
+        "idle": pool.checkedin(),
+        "overflow_in_use": max(0, pool.overflow()),
+        "checkouts": metrics.checkouts,
+        "checkout_timeouts": metrics.timeouts,
+        "checkout_wait_avg_ms": metrics.total_wait_seconds / metrics.checkouts * 1000 if metrics.checkouts else 0.0,
+        "checkout_wait_p50_ms": metrics.percentile_ms(50),
+        "checkout_wait_p95_ms": metrics.percentile_ms(95),
+        "checkout_wait_max_ms": metrics.max_wait_seconds * 1000,
+    }
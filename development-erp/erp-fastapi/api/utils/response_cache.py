@@ -0,0 +1,113 @@
+"""
+/*
+ * Copyright 2025 DOTSOFT SA, Inc All Rights Reserved.
+ *
+ * Author: Georgios Karanasios R&D Software Engineer
+ */
+"""
+
+import logging
+import time
+from collections import OrderedDict
+from typing import Optional
+
+''' Cache of the (serialized) responses of the endpoints whose data rarely changes.
+
+The keys contain the version (fingerprint) of the source tables, so a changed table (insert, delete or in-place
+update) gives a new key instead of a stale response. The TTL only bounds the memory of the outdated versions. '''
+
+logger = logging.getLogger(__name__)
+
+
+class InMemoryResponseCache:
+    """
+    In-process TTL cache (per worker), bounded to 'max_entries' (the least recently used entry is dropped first).
+    """
+
+    def __init__(self, ttl_seconds: int, max_entries: int = 32):
+        """
+        @param ttl_seconds: The lifetime of an entry.
+        @param max_entries: The maximum number of entries.
+        """
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[bytes, float]] = OrderedDict()
+
+    async def get(self, key: str) -> Optional[bytes]:
+        """
+        @param key: The cache key.
+        @return: The cached value, or None if it is missing or expired.
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: bytes) -> None:
+        """
+        @param key: The cache key.
+        @param value: The value to cache.
+        @return: None
+        """
+        self._entries[key] = (value, time.monotonic() + self.ttl_seconds)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+
+class RedisResponseCache:
+    """
+    TTL cache on a Redis-compatible server (e.g., a local Redis or Valkey), shared by all the workers.
+    The cache is best-effort: if the server is unreachable, the response is built as if the entry was missing.
+    """
+
+    def __init__(self, url: str, ttl_seconds: int, key_prefix: str = "erp_fastapi:"):
+        """
+        @param url: The Redis URL (e.g., redis://localhost:6379/0).
+        @param ttl_seconds: The lifetime of an entry.
+        @param key_prefix: The prefix of the keys (the server may be shared with other apps).
+        """
+        # Optional dependency, only needed with RESPONSE_CACHE_REDIS_URL
+        from redis import asyncio as redis_asyncio
+
+        self.client = redis_asyncio.from_url(url)
+        self.ttl_seconds = ttl_seconds
+        self.key_prefix = key_prefix
+
+    async def get(self, key: str) -> Optional[bytes]:
+        """
+        @param key: The cache key.
+        @return: The cached value, or None if it is missing, expired or the server is unreachable.
+        """
+        try:
+            return await self.client.get(self.key_prefix + key)
+        except Exception as e:
+            logger.warning(f"Response cache read failed: {e}")
+            return None
+
+    async def set(self, key: str, value: bytes) -> None:
+        """
+        @param key: The cache key.
+        @param value: The value to cache.
+        @return: None
+        """
+        try:
+            await self.client.set(self.key_prefix + key, value, ex=self.ttl_seconds)
+        except Exception as e:
+            logger.warning(f"Response cache write failed: {e}")
+
+
+def create_response_cache(ttl_seconds: int, redis_url: Optional[str] = None):
+    """
+    @param ttl_seconds: The lifetime of an entry.
+    @param redis_url: The URL of a Redis-compatible server, or None for the in-process cache.
+    @return: The response cache (RedisResponseCache or InMemoryResponseCache).
+    """
+    if redis_url:
+        return RedisResponseCache(redis_url, ttl_seconds)
+    return InMemoryResponseCache(ttl_seconds)
@@ -11,6 +11,7 @@ from fastapi import APIRouter, Depends
 from ..controllers.auth_controller import router as auth_router, verify_jwt
 from ..controllers.distribution_routing_controller import router as distribution_routing_router
 from ..controllers.inventory_params_development_controller import router as inventory_params_development_router
+from ..controllers.metrics_controller import router as metrics_router
 from ..controllers.sku_order_development_controller import router as sku_order_development_router
 
 # Create main router
@@ -21,3 +22,4 @@ api_router.include_router(auth_router, prefix="/auth", tags=["auth"])
 api_router.include_router(sku_order_development_router, prefix="/api", dependencies=[Depends(verify_jwt)])
 api_router.include_router(inventory_params_development_router, prefix="/api", dependencies=[Depends(verify_jwt)])
 api_router.include_router(distribution_routing_router, prefix="/api", dependencies=[Depends(verify_jwt)])
+api_router.include_router(metrics_router, prefix="/api", tags=["metrics"], dependencies=[Depends(verify_jwt)])
@@ -6,6 +6,8 @@
  */
 """
 
+from typing import Optional
+
 from dotenv import load_dotenv
 from pydantic_settings import BaseSettings
 
@@ -18,7 +20,8 @@ load_dotenv()
 class Settings(BaseSettings):
     # API Configuration
     API_USERNAME: str
-    API_PASSWORD: str
+    API_PASSWORD: Optional[str] = None
+    API_PASSWORD_HASH: Optional[str] = None  # bcrypt hash of the password (used instead of API_PASSWORD if set)
     API_PORT: int
     API_HOST: str
     SECRET_KEY: str
@@ -31,6 +34,18 @@ class Settings(BaseSettings):
     DB_HOST: str
     DB_PORT: int
     DB_NAME: str
+    # Connection Pool Configuration (see GET /api/metrics/db_pool to size it)
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT: int = 30
+    DB_POOL_RECYCLE: int = 1800  # below the MySQL 'wait_timeout' (and the idle timeout of proxies / load balancers)
+    DB_POOL_PRE_PING: bool = True
+    # Name search through the FULLTEXT n-gram indexes (requires the indexes of the create-erp-development-db-tables-app)
+    NAME_SEARCH_FULLTEXT: bool = False
+    # Response Cache Configuration (in-process, or on a Redis-compatible server if RESPONSE_CACHE_REDIS_URL is set)
+    RESPONSE_CACHE_TTL_SECONDS: int = 3600
+    RESPONSE_CACHE_REDIS_URL: Optional[str] = None
+    DATA_VERSION_TTL_SECONDS: int = 10  # the routing data version is reused this long (0: queried on every request)
 
     @property
     def sqlalchemy_database_url(self) -> str:
@@ -0,0 +1,25 @@
+"""
+/*
+ * Copyright 2025 DOTSOFT SA, Inc All Rights Reserved.
+ *
+ * Author: Georgios Karanasios R&D Software Engineer
+ */
+"""
+
+from sqlalchemy import Select, String, Table, cast, func, select
+
+# Stands for NULL in the row checksums (CONCAT_WS would skip a NULL, so (NULL, 'a') and ('a', NULL) would match)
+NULL_MARKER = "\\N"
+
+
+def table_version_query(table: Table) -> Select:
+    """
+    Builds the query of the version (fingerprint) of a table: the number of rows and a checksum of the content of
+    every row (MySQL: BIT_XOR of the CRC32 of every row). The checksum is computed by the database in a single
+    aggregate query, and it changes on inserts, deletes and in-place updates of any column.
+
+    @param table: The table (e.g., 'RouteDevelopmentORM.__table__').
+    @return: The query, returning one row: (count, checksum).
+    """
+    row = func.concat_ws("|", *(func.ifnull(cast(column, String), NULL_MARKER) for column in table.columns))
+    return select(func.count(), func.bit_xor(func.crc32(row))).select_from(table)
@@ -0,0 +1,122 @@
+"""
+/*
+ * Copyright 2025 DOTSOFT SA, Inc All Rights Reserved.
+ *
+ * Author: Georgios Karanasios R&D Software Engineer
+ */
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+import bcrypt
+import httpx
+from fastapi import FastAPI
+
+from api.controllers.auth_controller import router as auth_router
+from api.models.models import User
+from api.repositories.auth_repository import AuthRepository
+from api.services.auth_service import AuthService
+from api.utils.dependency_injection_container import get_auth_service
+from api.utils.settings import settings
+
+''' Benchmark of the '/auth/login-token' endpoint: the login of the previous implementation ('before': the password
+is hashed on every request and verified on the event loop) against the current one ('after': hashed once, verified
+in a worker thread).
+
+The requests go through an in-process ASGI client (no server, no database), with the credentials of the .env
+configuration (API_USERNAME and API_PASSWORD). A probe task measures how long the event loop is blocked, i.e., how
+long every other request of the API would wait. Run it from the app folder:
+'python benchmark_login.py --logins 40 --concurrency 4' '''
+
+# The interval of the event loop probe (seconds)
+PROBE_INTERVAL_SECONDS = 0.01
+
+
+class PerRequestHashAuthRepository(AuthRepository):
+    """The previous 'get_user': the password is hashed on every call."""
+
+    @classmethod
+    async def get_user(cls) -> User:
+        hashed_password = bcrypt.hashpw(settings.API_PASSWORD.encode("utf-8"), bcrypt.gensalt()).decode("utf-8")
+        return User(username=settings.API_USERNAME, password=hashed_password)
+
+
+class EventLoopAuthService(AuthService):
+    """The previous 'authenticate_user': the password is verified on the event loop."""
+
+    async def authenticate_user(self, username: str, user_password: str) -> User | None:
+        env_user = await self.auth_repository.get_user()
+        if env_user.username != username or not self._verify_password(user_password, env_user.password):
+            return None
+        return env_user
+
+
+async def get_previous_auth_service() -> AuthService:
+    return EventLoopAuthService(PerRequestHashAuthRepository())
+
+
+async def run_logins(app: FastAPI, logins: int, concurrency: int) -> dict:
+    """
+    Sends the login requests, at most 'concurrency' at the same time.
+
+    @param app: The app with the '/auth' routes.
+    @param logins: The number of login requests.
+    @param concurrency: The maximum number of requests in flight.
+    @return: The throughput (req/s), the median latency (ms) and the longest event loop stall (ms).
+    """
+    credentials = {"username": settings.API_USERNAME, "password": settings.API_PASSWORD}
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies, stalls = [], []
+    probing = True
+
+    async def login():
+        async with semaphore:
+            start = time.perf_counter()
+            response = await client.post("/auth/login-token", data=credentials)
+            latencies.append(time.perf_counter() - start)
+            response.raise_for_status()
+
+    async def probe():
+        while probing:
+            start = time.perf_counter()
+            await asyncio.sleep(PROBE_INTERVAL_SECONDS)
+            stalls.append(time.perf_counter() - start - PROBE_INTERVAL_SECONDS)
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://benchmark") as client:
+        await client.post("/auth/login-token", data=credentials)  # Warm up (and the hash of the current login)
+        probe_task = asyncio.create_task(probe())
+        start = time.perf_counter()
+        await asyncio.gather(*(login() for _ in range(logins)))
+        elapsed = time.perf_counter() - start
+        probing = False
+        await probe_task
+    return {
+        "throughput": logins / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "max_stall_ms": max(stalls, default=0.0) * 1000,
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Benchmark of the login endpoint (before / after)")
+    parser.add_argument("--logins", type=int, default=40, help="Number of login requests per run")
+    parser.add_argument("--concurrency", type=int, default=4, help="Login requests in flight at the same time")
+    args = parser.parse_args()
+    if not settings.API_PASSWORD:
+        raise ValueError("API_PASSWORD must be configured (the benchmark logs in with it).")
+
+    app = FastAPI()
+    app.include_router(auth_router, prefix="/auth")
+    print(f"{args.logins} logins, {args.concurrency} concurrent")
+    print(f"{'':<8}{'req/s':>8}{'p50 (ms)':>12}{'max event-loop stall (ms)':>28}")
+    for label, auth_service_dependency in (("before", get_previous_auth_service), ("after", None)):
+        app.dependency_overrides = {get_auth_service: auth_service_dependency} if auth_service_dependency else {}
+        result = await run_logins(app, args.logins, args.concurrency)
+        print(f"{label:<8}{result['throughput']:>8.1f}{result['p50_ms']:>12.0f}{result['max_stall_ms']:>28.0f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
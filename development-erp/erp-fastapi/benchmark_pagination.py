@@ -0,0 +1,159 @@
+"""
+/*
+ * Copyright 2025 DOTSOFT SA, Inc All Rights Reserved.
+ *
+ * Author: Georgios Karanasios R&D Software Engineer
+ */
+"""
+
+import argparse
+import asyncio
+import random
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import insert, select, text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
+
+from api.models.page_criteria_models import PageParams, SkuOrderDevelopmentCriteria
+from api.models.schema import SkuOrderDevelopmentORM
+from api.repositories.sku_order_development_repository import SkuOrderDevelopmentRepository
+from api.utils.pagination import encode_cursor
+from api.utils.settings import settings
+
+''' Benchmark of the deep pages of '/api/sku_order_development': offset ('page') against keyset ('cursor')
+pagination, on a generated 'sku_order_development' table of several million rows (MySQL).
+
+The table is created in a scratch database (dropped at the end), with the '(order_date, id)' index of the ERP
+schema, so the data of the ERP is not touched; the rows are generated with a fixed seed (reproducible). Every page
+is read through the query of the API ('SkuOrderDevelopmentRepository', 'paginate'), and both modes are checked to
+return the same rows. Run it from the app folder: 'python benchmark_pagination.py --rows 3000000' '''
+
+BENCHMARK_DATABASE = "erp_pagination_benchmark"
+# The index of the keyset pages (see 'idx_sku_order_development_order_date_id' of the ERP schema)
+ORDER_DATE_ID_INDEX_QUERY = "CREATE INDEX idx_sku_order_development_order_date_id " \
+                            "ON {database}.sku_order_development (order_date, id)"
+# Rows inserted per statement while generating the table
+INSERT_BATCH_SIZE = 10000
+# Runs of every query (the best run is reported, so that a cold cache does not decide the result)
+QUERY_REPEATS = 3
+# The generated orders span this many days (to the minute, so that orders share an 'order_date')
+ORDER_DATE_SPAN_DAYS = 730
+
+
+def generate_rows(start: int, count: int, rnd: random.Random) -> list[dict]:
+    """
+    @param start: The number of the first row (the 'id' is assigned by the database).
+    @param count: The number of rows.
+    @param rnd: The seeded random generator.
+    @return: The generated 'sku_order_development' rows.
+    """
+    first_order_date = datetime(2023, 1, 1)
+    return [
+        {
+            "sku_number": rnd.randrange(1, 5000),
+            "sku_name": f"SKU {number % 5000}",
+            "class_display_name": f"Class {number % 50}",
+            "order_item_price_in_main_currency": round(rnd.uniform(1, 500), 2),
+            "order_item_unit_count": rnd.randrange(1, 20),
+            "order_date": first_order_date + timedelta(minutes=rnd.randrange(ORDER_DATE_SPAN_DAYS * 24 * 60)),
+            "cl_price": round(rnd.uniform(1, 500), 2),
+        }
+        for number in range(start, start + count)
+    ]
+
+
+async def create_benchmark_table(engine: AsyncEngine, rows: int, seed: int) -> None:
+    """
+    Creates the scratch database with the 'sku_order_development' table, its '(order_date, id)' index and the rows.
+
+    @param engine: The engine of the scratch database (see 'schema_translate_map' in 'main').
+    @param rows: The number of rows to generate.
+    @param seed: The seed of the generated rows.
+    """
+    table = SkuOrderDevelopmentORM.__table__
+    async with engine.begin() as connection:
+        await connection.execute(text(f"DROP DATABASE IF EXISTS {BENCHMARK_DATABASE}"))
+        await connection.execute(text(f"CREATE DATABASE {BENCHMARK_DATABASE}"))
+        await connection.run_sync(lambda sync_connection: table.create(sync_connection))
+    rnd = random.Random(seed)
+    start = time.perf_counter()
+    for batch_start in range(0, rows, INSERT_BATCH_SIZE):
+        async with engine.begin() as connection:
+            await connection.execute(
+                insert(table), generate_rows(batch_start, min(INSERT_BATCH_SIZE, rows - batch_start), rnd))
+        if (batch_start // INSERT_BATCH_SIZE) % 50 == 0:
+            print(f"  {batch_start + INSERT_BATCH_SIZE:,} / {rows:,} rows ({time.perf_counter() - start:.0f} s)")
+    async with engine.begin() as connection:
+        await connection.execute(text(ORDER_DATE_ID_INDEX_QUERY.format(database=BENCHMARK_DATABASE)))
+        await connection.execute(text(f"ANALYZE TABLE {BENCHMARK_DATABASE}.sku_order_development"))
+    print(f"Generated {rows:,} rows in {time.perf_counter() - start:.0f} s")
+
+
+async def cursor_of_page(session: AsyncSession, page: int, page_size: int) -> PageParams:
+    """
+    @param session: The session of the scratch database.
+    @param page: The page number.
+    @param page_size: The page size.
+    @return: The keyset pagination parameters of the page (the cursor of the last row of the previous page).
+    """
+    if page == 1:
+        return PageParams(page_size=page_size)
+    order_columns = SkuOrderDevelopmentRepository.page_order
+    previous_row = (await session.execute(
+        select(*order_columns).order_by(*order_columns).offset((page - 1) * page_size - 1).limit(1)
+    )).one()
+    return PageParams(page_size=page_size, cursor=encode_cursor(list(previous_row)))
+
+
+async def time_page(session: AsyncSession, page_params: PageParams) -> tuple[float, list[int]]:
+    """
+    @param session: The session of the scratch database.
+    @param page_params: The pagination parameters of the page.
+    @return: The best time (ms) of the page query of the API, and the ids of the page.
+    """
+    repository = SkuOrderDevelopmentRepository(session)
+    query = repository._build_query(page_params, SkuOrderDevelopmentCriteria())
+    best_ms, ids = float("inf"), []
+    for _ in range(QUERY_REPEATS):
+        start = time.perf_counter()
+        records = (await session.execute(query)).scalars().all()
+        best_ms = min(best_ms, (time.perf_counter() - start) * 1000)
+        ids = [record.id for record in records]
+    return best_ms, ids
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Benchmark of the offset and keyset (cursor) pagination")
+    parser.add_argument("--rows", type=int, default=3000000, help="Rows of the generated table")
+    parser.add_argument("--page-size", type=int, default=5000, help="Records per page")
+    parser.add_argument("--seed", type=int, default=42, help="Seed of the generated rows")
+    parser.add_argument("--keep", action="store_true", help="Keep the scratch database (reused with --reuse)")
+    parser.add_argument("--reuse", action="store_true", help="Reuse the scratch database of a previous --keep run")
+    args = parser.parse_args()
+
+    engine = create_async_engine(
+        settings.sqlalchemy_database_url, execution_options={"schema_translate_map": {None: BENCHMARK_DATABASE}})
+    try:
+        if not args.reuse:
+            await create_benchmark_table(engine, args.rows, args.seed)
+        last_page = -(-args.rows // args.page_size)
+        pages = sorted({1, last_page // 4, last_page // 2, last_page * 3 // 4, last_page} - {0})
+        print(f"{args.rows:,} rows, page_size {args.page_size}, best of {QUERY_REPEATS}")
+        print(f"{'page':>8}{'offset':>14}{'OFFSET (ms)':>14}{'cursor (ms)':>14}")
+        async with AsyncSession(engine) as session:
+            for page in pages:
+                offset_ms, offset_ids = await time_page(session, PageParams(page=page, page_size=args.page_size))
+                cursor_ms, cursor_ids = await time_page(session, await cursor_of_page(session, page, args.page_size))
+                if offset_ids != cursor_ids:
+                    raise ValueError(f"The offset and the cursor page {page} returned different rows.")
+                print(f"{page:>8}{(page - 1) * args.page_size:>14,}{offset_ms:>14.1f}{cursor_ms:>14.1f}")
+    finally:
+        if not args.keep:
+            async with engine.begin() as connection:
+                await connection.execute(text(f"DROP DATABASE IF EXISTS {BENCHMARK_DATABASE}"))
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
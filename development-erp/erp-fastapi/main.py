@@ -10,6 +10,7 @@ import uvicorn
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from api.repositories.auth_repository import AuthRepository
 from api.utils.database_session_manager import db_manager
 from api.utils.exception_handlers import add_global_exception_handlers
 from api.utils.routes import api_router as controllers_routes
@@ -25,6 +26,8 @@ add_global_exception_handlers(app)
 async def startup():
     # Begin the database session manager which sets up the database engine and session maker
     db_manager.start_engine()
+    # Hash the API password once (or load API_PASSWORD_HASH), instead of on every login request
+    AuthRepository.load_password_hash()
 
 
 async def shutdown():
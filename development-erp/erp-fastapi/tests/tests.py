@@ -6,14 +6,36 @@
  */
 """
 
+import asyncio
+import json
 import os
 import sys
-from unittest.mock import AsyncMock
-
+from contextlib import asynccontextmanager
+from datetime import datetime
+from unittest.mock import AsyncMock, MagicMock
+
+# The required settings of 'api.utils.settings' (the tests run without a .env file)
+for setting_name, setting_value in {
+    "API_USERNAME": "test", "API_PORT": "7000", "API_HOST": "localhost", "SECRET_KEY": "test", "ALGORITHM": "HS256",
+    "ACCESS_TOKEN_EXPIRE_MINUTES": "30", "CLIENT_DEVELOPMENT_USER_ID": "1", "DB_USERNAME": "test",
+    "DB_PASSWORD": "test", "DB_HOST": "localhost", "DB_PORT": "3306", "DB_NAME": "test",
+}.items():
+    os.environ.setdefault(setting_name, setting_value)
+
+import bcrypt
+import pyarrow as pa
+import pyarrow.parquet as pq
 import pytest
 import pytest_asyncio
 from factory import Factory, Faker
-
+from fastapi import HTTPException
+from sqlalchemy import create_engine, select
+from sqlalchemy.dialects import mysql
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import QueuePool
+
+from api.repositories.auth_repository import AuthRepository
 from api.models.page_criteria_models import SkuOrderDevelopmentCriteria, PageParams, InventoryParamsCriteria, \
     VehicleDevelopmentCriteria, LocationDevelopmentCriteria, RouteDevelopmentCriteria
 from api.repositories.inventory_params_development_repository import InventoryParamsDevelopmentRepository
@@ -22,8 +44,16 @@ from api.repositories.route_development_repository import RouteDevelopmentReposi
 from api.repositories.vehicle_development_repository import VehicleDevelopmentRepository
 from api.services.inventory_params_development_service import InventoryParamsDevelopmentService
 from api.services.location_development_service import LocationDevelopmentService
+from api.services.facades.distribution_routing_service_facade import DistributionRoutingServiceFacade
 from api.services.route_development_service import RouteDevelopmentService
 from api.services.vehicle_development_service import VehicleDevelopmentService
+from api.models.schema import Base, RouteDevelopmentORM, SkuOrderDevelopmentORM
+from api.utils.arrow_export import arrow_ipc_stream, arrow_schema, parquet_file
+from api.utils.pagination import encode_cursor, decode_cursor, paginate, next_page_cursor
+from api.utils.pool_metrics import MeteredPoolMixin, pool_metrics
+from api.utils.settings import settings
+from api.utils.response_cache import InMemoryResponseCache
+from api.utils.table_version import table_version_query
 
 project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.append(project_root)
@@ -287,6 +317,28 @@ async def test_get_latest_sku_order_by_ids_not_found(sku_service, mock_repositor
     mock_repository.fetch_latest_sku_order_by_ids.assert_awaited_once_with(ids_list)
 
 
+@pytest.mark.asyncio
+async def test_stream_all_skus(sku_service, mock_repository):
+    """
+    Test that the service streams the batches of the repository as they come.
+    """
+    # Given
+    fake_batches = [SkuOrderDevelopmentFactory.build_batch(2), SkuOrderDevelopmentFactory.build_batch(1)]
+
+    async def fake_stream(page_params, criteria):
+        for batch in fake_batches:
+            yield batch
+
+    mock_repository.stream_all_skus = MagicMock(side_effect=fake_stream)
+    # When
+    page_params = PageParams()
+    criteria = SkuOrderDevelopmentCriteria(sku_name="Widget")
+    batches = [batch async for batch in sku_service.stream_all_skus(page_params, criteria)]
+    # Then
+    assert batches == fake_batches
+    mock_repository.stream_all_skus.assert_called_once_with(page_params, criteria)
+
+
 # -------------- TESTS - INVENTORY_PARAMS_DEVELOPMENT_SERVICE -------------- #
 @pytest.mark.asyncio
 async def test_get_all_inventory_params_empty(inventory_service, mock_repository):
@@ -573,3 +625,356 @@ async def test_get_all_routes_filter_by_source_and_destination(route_service, mo
     assert routes[0].source_location_id == 1
     assert routes[0].destination_location_id == 2
     mock_repository.fetch_all_routes.assert_awaited_once_with(page_params, criteria)
+
+
+# -------------- TESTS - PAGINATION -------------- #
+
+def test_cursor_round_trip():
+    """
+    Test that a cursor decodes back to the sort key values (datetime and NULL included).
+    """
+    page_order = SkuOrderDevelopmentRepository.page_order
+    assert decode_cursor(encode_cursor([datetime(2024, 5, 1, 10, 30), 42]), page_order) == [datetime(2024, 5, 1, 10, 30), 42]
+    assert decode_cursor(encode_cursor([None, 7]), page_order) == [None, 7]
+
+
+def test_decode_cursor_invalid():
+    """
+    Test that a malformed cursor, or a cursor of another endpoint, is rejected with 400.
+    """
+    for cursor in ["not-a-cursor", encode_cursor([1])]:
+        with pytest.raises(HTTPException) as exc_info:
+            decode_cursor(cursor, SkuOrderDevelopmentRepository.page_order)
+        assert exc_info.value.status_code == 400
+
+
+def test_keyset_pages_match_offset_pages():
+    """
+    Test that walking the pages with 'next_cursor' returns the same records as walking them with 'page',
+    including records with the same or a NULL order_date.
+    """
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine, tables=[SkuOrderDevelopmentORM.__table__])
+    order_dates = [None, datetime(2024, 1, 2), datetime(2024, 1, 1), None, datetime(2024, 1, 2)] * 5
+    page_order = SkuOrderDevelopmentRepository.page_order
+    with Session(engine) as session:
+        session.add_all([SkuOrderDevelopmentORM(id=i + 1, order_date=d) for i, d in enumerate(order_dates)])
+        session.commit()
+
+        def fetch(page_params):
+            rows = session.execute(paginate(select(SkuOrderDevelopmentORM), page_params, page_order)).scalars()
+            return [SkuOrderDevelopment.from_orm(row) for row in rows]
+
+        offset_ids, keyset_ids, page, cursor = [], [], 1, None
+        while records := fetch(PageParams(page=page, page_size=4)):
+            offset_ids += [record.id for record in records]
+            page += 1
+        while True:
+            page_params = PageParams(page_size=4, cursor=cursor)
+            records = fetch(page_params)
+            keyset_ids += [record.id for record in records]
+            cursor = next_page_cursor(records, page_params, page_order)
+            if cursor is None:
+                break
+    assert len(offset_ids) == len(order_dates)
+    assert keyset_ids == offset_ids
+
+
+def test_next_page_cursor_last_page():
+    """
+    Test that there is no next_cursor after a short page, or without page_size.
+    """
+    records = SkuOrderDevelopmentFactory.build_batch(3)
+    page_order = SkuOrderDevelopmentRepository.page_order
+    assert next_page_cursor(records, PageParams(page_size=4), page_order) is None
+    assert next_page_cursor(records, PageParams(), page_order) is None
+    assert next_page_cursor(records, PageParams(page_size=3), page_order) is not None
+
+
+# -------------- TESTS - RESPONSE CACHE -------------- #
+
+@pytest.mark.asyncio
+async def test_in_memory_response_cache_ttl_and_bound(monkeypatch):
+    """
+    Test that the entries expire after the TTL and that the least recently used entry is dropped first.
+    """
+    now = [1000.0]
+    monkeypatch.setattr("api.utils.response_cache.time.monotonic", lambda: now[0])
+    cache = InMemoryResponseCache(ttl_seconds=60, max_entries=2)
+    await cache.set("a", b"1")
+    await cache.set("b", b"2")
+    assert await cache.get("a") == b"1"  # 'a' is now the most recently used
+    await cache.set("c", b"3")
+    assert await cache.get("b") is None
+    assert await cache.get("a") == b"1"
+    now[0] += 60
+    assert await cache.get("a") is None
+    assert await cache.get("c") is None
+
+
+def _service_scope(service):
+    """
+    Returns a service scope (see DistributionRoutingServiceFacade) yielding the given (mocked) service.
+    """
+    @asynccontextmanager
+    async def scope():
+        yield service
+    return scope
+
+
+def _routing_facade(location_service, route_service, vehicle_service, version_ttl_seconds=0):
+    return DistributionRoutingServiceFacade(_service_scope(location_service), _service_scope(route_service),
+                                            _service_scope(vehicle_service), InMemoryResponseCache(ttl_seconds=60),
+                                            InMemoryResponseCache(ttl_seconds=version_ttl_seconds, max_entries=1))
+
+
+@pytest.mark.asyncio
+async def test_distribution_routing_data_model_cached_per_version(location_service, route_service, vehicle_service,
+                                                                  mock_repository):
+    """
+    Test that the data model is built once per version of the tables, and that the version follows the tables.
+    """
+    facade = _routing_facade(location_service, route_service, vehicle_service)
+    facade.build_data_model = AsyncMock(return_value={"depot": 0, "distance_matrix": [[0.0]]})
+    mock_repository.fetch_table_version.return_value = (3, 1234)
+    version = await facade.get_data_model_version()
+    first = await facade.get_data_model_response(2, version)
+    second = await facade.get_data_model_response(2, version)
+    assert first == second
+    assert json.loads(first) == {"user_id": 2, "data": {"depot": 0, "distance_matrix": [[0.0]]}, "next_cursor": None}
+    facade.build_data_model.assert_awaited_once()
+    # An updated row (same count, new checksum) gives a new version (and a new build)
+    mock_repository.fetch_table_version.return_value = (3, 5678)
+    new_version = await facade.get_data_model_version()
+    assert new_version != version
+    await facade.get_data_model_response(2, new_version)
+    assert facade.build_data_model.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_distribution_routing_data_version_reused_within_ttl(location_service, route_service, vehicle_service,
+                                                                   mock_repository, monkeypatch):
+    """
+    Test that the version is computed once per DATA_VERSION_TTL_SECONDS (the tables are not queried again).
+    """
+    now = [1000.0]
+    monkeypatch.setattr("api.utils.response_cache.time.monotonic", lambda: now[0])
+    facade = _routing_facade(location_service, route_service, vehicle_service, version_ttl_seconds=10)
+    mock_repository.fetch_table_version.return_value = (3, 1234)
+    version = await facade.get_data_model_version()
+    mock_repository.fetch_table_version.return_value = (3, 5678)
+    assert await facade.get_data_model_version() == version
+    assert mock_repository.fetch_table_version.await_count == 3  # once per table
+    now[0] += 10
+    assert await facade.get_data_model_version() != version
+    assert mock_repository.fetch_table_version.await_count == 6
+
+
+def test_table_version_query_checksums_every_column():
+    """
+    Test that the table version is a row count and a checksum over every column (NULLs included), so that an
+    in-place update (e.g., of 'traffic_factor') changes it.
+    """
+    sql = str(table_version_query(RouteDevelopmentORM.__table__).compile(dialect=mysql.dialect()))
+    assert sql.startswith("SELECT count(*) AS count_1, bit_xor(crc32(concat_ws(")
+    for column in RouteDevelopmentORM.__table__.columns:
+        assert f"ifnull(CAST(route_development.{column.name} AS CHAR)" in sql
+    assert sql.endswith("FROM route_development")
+
+
+@pytest.mark.asyncio
+async def test_distribution_routing_sparse_matches_dense():
+    """
+    Test that the sparse edges hold the same distances / traffic factors as the dense matrices
+    (depot first, routes to unknown locations ignored).
+    """
+    locations = [
+        LocationDevelopmentFactory(location_id=2, is_depot=False, demand=5),
+        LocationDevelopmentFactory(location_id=1, is_depot=True, demand=0),
+        LocationDevelopmentFactory(location_id=3, is_depot=False, demand=7),
+    ]
+    routes = [
+        RouteDevelopmentFactory(source_location_id=1, destination_location_id=3, distance=4.0, traffic_factor=1.5),
+        RouteDevelopmentFactory(source_location_id=3, destination_location_id=2, distance=2.0, traffic_factor=None),
+        RouteDevelopmentFactory(source_location_id=1, destination_location_id=99, distance=9.0, traffic_factor=2.0),
+    ]
+    facade = _routing_facade(
+        AsyncMock(get_all_locations=AsyncMock(return_value=locations)),
+        AsyncMock(get_all_routes=AsyncMock(return_value=routes)),
+        AsyncMock(get_all_vehicles=AsyncMock(return_value=VehicleDevelopmentFactory.build_batch(2))),
+    )
+    dense = await facade.build_data_model("dense")
+    sparse = await facade.build_data_model("sparse")
+    assert sparse["edges"] == {"source": [0, 2], "destination": [2, 1], "distance": [4.0, 2.0],
+                               "traffic_factor": [1.5, 1.0]}
+    assert dense["distance_matrix"] == [[0.0, 0.0, 4.0], [0.0, 0.0, 0.0], [0.0, 2.0, 0.0]]
+    assert dense["traffic_factors"] == [[1.0, 1.0, 1.5], [1.0, 1.0, 1.0], [1.0, 1.0, 1.0]]
+    common_keys = ["demands", "vehicle_capacities", "cost_per_trip_per_vehicle", "num_vehicles", "depot",
+                   "location_data"]
+    assert {key: dense[key] for key in common_keys} == {key: sparse[key] for key in common_keys}
+    assert dense["demands"] == [0, 5, 7]
+
+
+@pytest.mark.asyncio
+async def test_distribution_routing_reads_concurrently():
+    """
+    Test that the location, route and vehicle tables are read concurrently.
+    """
+    running, max_running = 0, 0
+
+    async def read(result):
+        nonlocal running, max_running
+        running += 1
+        max_running = max(max_running, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return result
+
+    facade = _routing_facade(
+        AsyncMock(get_all_locations=lambda **_: read([LocationDevelopmentFactory(location_id=1, is_depot=True)])),
+        AsyncMock(get_all_routes=lambda **_: read([])),
+        AsyncMock(get_all_vehicles=lambda **_: read([])),
+    )
+    await facade.build_data_model()
+    assert max_running == 3
+
+
+# -------------- TESTS - POOL METRICS -------------- #
+
+class MeteredQueuePool(MeteredPoolMixin, QueuePool):
+    """The (sync) QueuePool with the checkout metrics of MeteredAsyncAdaptedQueuePool."""
+
+
+def test_pool_metrics_in_use_and_checkout_timeout(tmp_path):
+    """
+    Test that the pool metrics count the connections in use and the checkouts that waited until the pool timeout.
+    """
+    engine = create_engine(f"sqlite:///{tmp_path / 'pool.db'}", poolclass=MeteredQueuePool, pool_size=1,
+                           max_overflow=0, pool_timeout=0.05)
+    with engine.connect():
+        assert pool_metrics(engine.pool, 0)["in_use"] == 1
+        with pytest.raises(PoolTimeoutError):
+            engine.connect()
+    metrics = pool_metrics(engine.pool, 0)
+    assert metrics["in_use"] == 0
+    assert metrics["idle"] == 1
+    assert metrics["checkouts"] == 2
+    assert metrics["checkout_timeouts"] == 1
+    assert metrics["checkout_wait_max_ms"] >= 50
+    assert metrics["checkout_wait_p50_ms"] <= metrics["checkout_wait_p95_ms"] <= metrics["checkout_wait_max_ms"]
+
+
+# -------------- TESTS - NAME SEARCH -------------- #
+
+def _name_search_sql(name_search_fulltext, criteria):
+    repository = SkuOrderDevelopmentRepository(MagicMock(), name_search_fulltext=name_search_fulltext)
+    query = repository._apply_criteria(select(SkuOrderDevelopmentORM), criteria)
+    return str(query.compile(dialect=mysql.dialect(), compile_kwargs={"literal_binds": True}))
+
+
+def test_name_search_fulltext():
+    """
+    Test that the FULLTEXT name search narrows the 'ILIKE' search with an n-gram phrase (quotes removed).
+    """
+    sql = _name_search_sql(True, SkuOrderDevelopmentCriteria(sku_name='Wid"get', class_display_name="Tools"))
+    assert "MATCH (sku_order_development.sku_name) AGAINST ('\"Wid get\"' IN BOOLEAN MODE)" in sql
+    assert "MATCH (sku_order_development.class_display_name) AGAINST ('\"Tools\"' IN BOOLEAN MODE)" in sql
+    assert "lower(sku_order_development.sku_name) LIKE lower('%%Wid\"get%%')" in sql
+
+
+def test_name_search_without_fulltext():
+    """
+    Test that the name search stays a plain 'ILIKE' when disabled, or for terms shorter than an n-gram.
+    """
+    assert "MATCH" not in _name_search_sql(False, SkuOrderDevelopmentCriteria(sku_name="Widget"))
+    assert "MATCH" not in _name_search_sql(True, SkuOrderDevelopmentCriteria(sku_name="W"))
+
+
+# -------------- TESTS - ARROW EXPORT -------------- #
+
+EXPORT_COLUMNS = [SkuOrderDevelopmentORM.id, SkuOrderDevelopmentORM.order_date, SkuOrderDevelopmentORM.sku_name,
+                  SkuOrderDevelopmentORM.cl_price]
+EXPORT_BATCHES = [
+    [(1, datetime(2024, 1, 1, 8, 0), "Widget", 9.5), (2, None, None, None)],
+    [(3, datetime(2024, 1, 2, 9, 30), "Gadget", 12.0)],
+]
+
+
+async def _iter_export_batches(batches):
+    for batch in batches:
+        yield batch
+
+
+@pytest.mark.asyncio
+async def test_arrow_ipc_stream_round_trip():
+    """
+    Test that the Arrow IPC stream decodes back to the typed rows (datetimes and NULLs included).
+    """
+    schema = arrow_schema(EXPORT_COLUMNS)
+    content = b"".join([chunk async for chunk in arrow_ipc_stream(_iter_export_batches(EXPORT_BATCHES), schema)])
+    table = pa.ipc.open_stream(content).read_all()
+    assert table.schema == schema
+    assert table.schema.field("order_date").type == pa.timestamp("us")
+    assert [tuple(row.values()) for row in table.to_pylist()] == EXPORT_BATCHES[0] + EXPORT_BATCHES[1]
+
+
+@pytest.mark.asyncio
+async def test_arrow_ipc_stream_empty():
+    """
+    Test that an export without rows is still a valid Arrow IPC stream (with the schema).
+    """
+    schema = arrow_schema(EXPORT_COLUMNS)
+    content = b"".join([chunk async for chunk in arrow_ipc_stream(_iter_export_batches([]), schema)])
+    table = pa.ipc.open_stream(content).read_all()
+    assert table.num_rows == 0
+    assert table.schema == schema
+
+
+@pytest.mark.asyncio
+async def test_parquet_file_round_trip():
+    """
+    Test that the Parquet file decodes back to the typed rows.
+    """
+    schema = arrow_schema(EXPORT_COLUMNS)
+    content = await parquet_file(_iter_export_batches(EXPORT_BATCHES), schema)
+    table = pq.read_table(pa.BufferReader(content))
+    assert [tuple(row.values()) for row in table.to_pylist()] == EXPORT_BATCHES[0] + EXPORT_BATCHES[1]
+
+
+# -------------- TESTS - AUTH -------------- #
+
+def test_load_password_hash_hashes_once(monkeypatch):
+    """
+    Test that API_PASSWORD is hashed on the first call only (the same hash is returned afterwards).
+    """
+    monkeypatch.setattr(AuthRepository, "_password_hash", None)
+    monkeypatch.setattr(settings, "API_PASSWORD", "secret")
+    monkeypatch.setattr(settings, "API_PASSWORD_HASH", None)
+    hashpw = MagicMock(wraps=bcrypt.hashpw)
+    monkeypatch.setattr(bcrypt, "hashpw", hashpw)
+    password_hash = AuthRepository.load_password_hash()
+    assert AuthRepository.load_password_hash() == password_hash
+    assert hashpw.call_count == 1
+    assert bcrypt.checkpw(b"secret", password_hash.encode("utf-8"))
+
+
+def test_load_password_hash_prefers_configured_hash(monkeypatch):
+    """
+    Test that API_PASSWORD_HASH is used as is, even if API_PASSWORD is set.
+    """
+    configured_hash = bcrypt.hashpw(b"other", bcrypt.gensalt(rounds=4)).decode("utf-8")
+    monkeypatch.setattr(AuthRepository, "_password_hash", None)
+    monkeypatch.setattr(settings, "API_PASSWORD", "secret")
+    monkeypatch.setattr(settings, "API_PASSWORD_HASH", configured_hash)
+    assert AuthRepository.load_password_hash() == configured_hash
+
+
+def test_load_password_hash_without_password(monkeypatch):
+    """
+    Test that a ValueError is raised when neither API_PASSWORD nor API_PASSWORD_HASH is set.
+    """
+    monkeypatch.setattr(AuthRepository, "_password_hash", None)
+    monkeypatch.setattr(settings, "API_PASSWORD", None)
+    monkeypatch.setattr(settings, "API_PASSWORD_HASH", None)
+    with pytest.raises(ValueError):
+        AuthRepository.load_password_hash()
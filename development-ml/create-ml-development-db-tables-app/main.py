@@ -9,12 +9,20 @@
 import asyncio
 
 import bcrypt
-from sqlalchemy import select
+from sqlalchemy import select, text
 
 from models import LoginUser, UserErpApi
 from utils.database_connection import engine, Base, AsyncSessionLocal
 from utils.settings import settings
 
+# Idempotent schema changes for tables that already exist ('create_all' does not alter existing tables)
+SCHEMA_UPGRADE_QUERIES = [
+    "ALTER TABLE ml_model ADD COLUMN IF NOT EXISTS preprocessor_file BYTEA",
+    "ALTER TABLE ml_model ADD COLUMN IF NOT EXISTS model_format VARCHAR",
+    "ALTER TABLE ml_model ADD COLUMN IF NOT EXISTS model_path VARCHAR",
+    "ALTER TABLE ml_model ALTER COLUMN model_file DROP NOT NULL",
+]
+
 
 def hash_password(password) -> str:
     """
@@ -124,6 +132,21 @@ async def create_tables() -> None:
         print("Error: " + str(e))
 
 
+async def upgrade_tables() -> None:
+    """
+    Applies the (idempotent) schema changes of SCHEMA_UPGRADE_QUERIES, e.g., new columns of existing tables.
+
+    :return: None
+    """
+    try:
+        async with engine.begin() as conn:
+            for query in SCHEMA_UPGRADE_QUERIES:
+                await conn.execute(text(query))
+            print("The tables upgrade attempt was successfully completed!")
+    except Exception as e:
+        print("Error: " + str(e))
+
+
 async def main() -> None:
     """
     Main entry point for the script.
@@ -133,6 +156,7 @@ async def main() -> None:
     :return: None
     """
     await create_tables()
+    await upgrade_tables()
     await create_user()
     await create_user_erp_api()
 
@@ -0,0 +1,120 @@
+"""
+/*
+ * Copyright 2025 DOTSOFT SA, Inc All Rights Reserved.
+ *
+ * Author: Georgios Karanasios R&D Software Engineer
+ */
+"""
+import argparse
+import asyncio
+import time
+from typing import Optional
+
+from models.models import MlModel
+from repositories.ml_repositories import MlModelRepository
+from services.model_storage import MODEL_FORMATS, serialize_model, deserialize_model, load_stored_model, \
+    model_store_path, write_model_store_file, remove_model_store_file, resolve_compress_level, benchmark_model_formats
+from utils.database_connection import AsyncSessionLocal
+from utils.settings import settings
+
+''' Re-serialize the stored 'ml_model' rows to another storage format (and/or to the model store) '''
+
+
+def _print_benchmark(ml_model: MlModel, model) -> None:
+    """
+    Print the size and load time of a stored model in every applicable format.
+
+    @param ml_model: The stored MlModel.
+    @param model: The deserialized model.
+    @return: None
+    """
+    print(f"\n📏 user_id={ml_model.user_id}, {ml_model.model_type} ({ml_model.model_name}):")
+    for result in benchmark_model_formats(model):
+        print(f"  - {result['format']:<8} compress={result['compress']}: {result['size_bytes'] / 1024:>10.1f} KB, "
+              f"dump {result['dump_seconds'] * 1000:>8.1f} ms, load {result['load_seconds'] * 1000:>8.1f} ms")
+
+
+async def _migrate_ml_model(
+        ml_model: MlModel,
+        model,
+        model_format: str,
+        compress: Optional[int],
+        model_store_dir
+) -> None:
+    """
+    Re-serialize a model and store it in the database row, or in the model store if 'model_store_dir' is given.
+    A previous model store file is removed once the row points to the migrated model.
+
+    @param ml_model: The stored MlModel.
+    @param model: The deserialized model.
+    @param model_format: The target format (the native XGBoost formats only apply to XGBoost models).
+    @param compress: The target joblib compression level (None for the default of the target storage).
+    @param model_store_dir: The model store directory (None keeps the model in the database).
+    @return: None
+    """
+    old_size = len(ml_model.model_file) if ml_model.model_file else None
+    model_bytes, model_format = serialize_model(model, model_format,
+                                                resolve_compress_level(compress, model_store_dir))
+    start_time = time.perf_counter()
+    deserialize_model(model_bytes, model_format)
+    load_seconds = time.perf_counter() - start_time
+    if model_store_dir:
+        model_path = model_store_path(ml_model.user_id, ml_model.model_type, model_format, model_bytes)
+        write_model_store_file(model_store_dir, model_path, model_bytes)
+        migrated = ml_model.model_copy(update={"model_file": None, "model_format": model_format,
+                                               "model_path": model_path})
+    else:
+        migrated = ml_model.model_copy(update={"model_file": model_bytes, "model_format": model_format,
+                                               "model_path": None})
+    async with AsyncSessionLocal() as session:
+        await MlModelRepository(session).update_ml_model_storage(migrated)
+    if ml_model.model_path and ml_model.model_path != migrated.model_path:
+        remove_model_store_file(settings.model_store_dir, ml_model.model_path)
+    print(f"✅ user_id={ml_model.user_id}, {ml_model.model_type}: "
+          f"{ml_model.model_format or 'joblib (legacy)'} {old_size or ml_model.model_path} bytes -> "
+          f"{model_format} {len(model_bytes)} bytes{f' at {migrated.model_path}' if migrated.model_path else ''} "
+          f"(load {load_seconds * 1000:.1f} ms)")
+
+
+async def main(model_format: str, compress: int, to_store: bool, dry_run: bool) -> None:
+    """
+    Migrate (or, with 'dry_run', only benchmark) every stored ML model.
+
+    @param model_format: The target format.
+    @param compress: The target joblib compression level.
+    @param to_store: Move the model files to the model store ('MODEL_STORE_DIR') instead of the database.
+    @param dry_run: Only print the size/load time of every format, without changing anything.
+    @return: None
+    """
+    if to_store and not settings.model_store_dir:
+        raise ValueError("'--to-store' requires the MODEL_STORE_DIR setting.")
+    async with AsyncSessionLocal() as session:
+        ml_models = await MlModelRepository(session).get_all_ml_models()
+    if not ml_models:
+        print("No stored ML models found. Exiting.")
+        return
+    for ml_model in ml_models:
+        try:
+            model = load_stored_model(ml_model, settings.model_store_dir)
+            if dry_run:
+                _print_benchmark(ml_model, model)
+            else:
+                await _migrate_ml_model(ml_model, model, model_format, compress,
+                                        settings.model_store_dir if to_store else None)
+        except Exception as e:
+            print(f"❌ user_id={ml_model.user_id}, {ml_model.model_type}: {e}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Migrate the storage format of the stored ML models.")
+    parser.add_argument("--format", choices=MODEL_FORMATS, default=settings.model_storage_format,
+                        help="Target format (the native XGBoost formats only apply to XGBoost models).")
+    parser.add_argument("--compress", type=int, choices=range(10), default=settings.model_compress_level,
+                        help="Target joblib compression level (0 = none, required for mmap loading; "
+                             "default: MODEL_COMPRESS_LEVEL, else 0 with --to-store and 3 in the database).")
+    parser.add_argument("--to-store", action="store_true",
+                        help="Move the model files to MODEL_STORE_DIR instead of the database.")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="Only print the size/load time of every format, without changing anything.")
+    args = parser.parse_args()
+    asyncio.run(main(args.format, args.compress, args.to_store, args.dry_run))
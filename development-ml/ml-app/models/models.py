@@ -52,6 +52,9 @@ class MlModel(BaseModel):
     mape: Optional[float] = None
     mae: Optional[float] = None
     model_features: Optional[str] = None
+    preprocessor_file: Optional[bytes] = None  # fitted preprocessing pipeline (ColumnTransformer)
+    model_format: Optional[str] = None  # storage format of the model (None = legacy joblib)
+    model_path: Optional[str] = None  # relative path in the model store (instead of 'model_file')
     updated_at: Optional[datetime] = None
     user_id: int
 
@@ -75,3 +78,19 @@ class UserErpApi(BaseModel):
     user_id: int
 
     model_config = {"from_attributes": True}
+
+
+class ErpSyncState(BaseModel):
+    """
+    The ERP sync state of a consumer (e.g., 'sku_metric') for a given user: the high-water mark
+    ('order_date', 'id') of the latest synced ERP record and the time of the last full reconciliation.
+    """
+    id: Optional[int] = None
+    consumer: str
+    last_order_date: Optional[datetime] = None
+    last_record_id: Optional[int] = None
+    last_full_sync_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+    user_id: int
+
+    model_config = {"from_attributes": True}
@@ -66,6 +66,9 @@ class MlModelORM(Base):
     mape = Column(Float, nullable=True)  # Mean Absolute Percentage Error
     mae = Column(Float, nullable=True)  # Mean Absolute Error
     model_features = Column(String, nullable=True)  # features used for training
+    preprocessor_file = Column(LargeBinary, nullable=True)  # fitted preprocessing pipeline (ColumnTransformer)
+    model_format = Column(String, nullable=True)  # storage format of the model (NULL = legacy joblib)
+    model_path = Column(String, nullable=True)  # relative path in the model store (instead of 'model_file')
     updated_at = Column(TIMESTAMP, server_default=func.now(), onupdate=func.now(), nullable=False)
 
     user_id = Column(Integer, ForeignKey('login_user.id', ondelete="CASCADE"), nullable=False)
@@ -94,3 +97,18 @@ class UserErpApiORM(Base):
     user_id = Column(Integer, ForeignKey('login_user.id', ondelete="CASCADE"), nullable=False, unique=True)
 
     user = relationship("LoginUserORM", back_populates="user_erp_api")
+
+
+class ErpSyncStateORM(Base):
+    __tablename__ = 'erp_sync_state'
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    consumer = Column(String, nullable=False)  # e.g., 'sku_metric' or 'sku_order_quantity_prediction_ml_model'
+    last_order_date = Column(TIMESTAMP, nullable=True)  # High-water mark: 'order_date' of the latest synced record
+    last_record_id = Column(Integer, nullable=True)  # High-water mark: ERP 'id' of the latest synced record
+    last_full_sync_at = Column(TIMESTAMP, nullable=True)  # Last full (reconciliation) fetch of the ERP history
+    updated_at = Column(TIMESTAMP, server_default=func.now(), onupdate=func.now(), nullable=False)
+    user_id = Column(Integer, ForeignKey('login_user.id', ondelete="CASCADE"), nullable=False)
+
+    # One sync state per consumer and user
+    __table_args__ = (UniqueConstraint('consumer', 'user_id', name='uq_erp_sync_state_consumer_user'),)
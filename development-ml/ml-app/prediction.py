@@ -7,65 +7,76 @@
  */
 """
 import asyncio
-import io
 import json
+import os
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
+from datetime import datetime
+from typing import Optional
 
-import joblib
-import numpy as np
 import pandas as pd
-from sklearn.ensemble import RandomForestRegressor
-from sklearn.impute import SimpleImputer
-from sklearn.linear_model import LinearRegression, Ridge, BayesianRidge
-from sklearn.metrics import mean_absolute_percentage_error, mean_absolute_error
-from sklearn.model_selection import train_test_split, RandomizedSearchCV
-from sklearn.preprocessing import OneHotEncoder
-from sklearn.svm import SVR
-from sklearn.tree import DecisionTreeRegressor
-from xgboost import XGBRegressor
+from sklearn.compose import ColumnTransformer
+from sklearn.model_selection import train_test_split
 
 from models.models import MlModel, UserErpApi
 from repositories.ml_repositories import MlModelRepository
 from repositories.user_erp_api_repository import UserErpApiRepository
 from repositories.user_repository import UserRepository
-from services.create_df_development import create_df_development
+from services import erp_sync
+from services.create_df_development import create_df_development, create_df_development_delta
+from services.incremental_training import supports_warm_start, evaluate_model, is_drift_detected, \
+    warm_start_model, split_holdout
+from services.model_storage import serialize_model, load_stored_model, model_store_path, \
+    write_model_store_file, remove_model_store_file, resolve_compress_level
+from services.preprocessing import TARGET_COLUMN, add_week_column, fit_preprocessor, serialize_preprocessor, \
+    load_preprocessor
+from services.tenant_scheduler import run_tenants_concurrently, print_tenant_summary
+from services.training_engine import run_model_family_searches
 from utils.constants import SKU_ORDER_QUANTITY_PREDICTION_MODEL_TYPE
 from utils.database_connection import AsyncSessionLocal
+from utils.settings import settings
 
 
-def _preprocess_data(df: pd.DataFrame) -> pd.DataFrame:
+def _training_n_jobs() -> int:
     """
-    Handle missing values, encode categorical columns, and extract 'week' from 'order_date'.
-    This mirrors the original snippet's data-loading approach but uses the in-memory DataFrame.
+    Number of workers of a tenant's training. Up to 'training_max_workers' tenants train at the same time,
+    so by default every training gets its share of the CPU cores instead of all of them.
+
+    @return: 'training_n_jobs', or the CPU cores divided by 'training_max_workers' (at least 1) if not set.
+    @raises ValueError: If 'training_n_jobs' is negative (all/most CPU cores) and more than one tenant trains
+                        at the same time (the CPU would be oversubscribed).
+    """
+    if settings.training_n_jobs is None:
+        return max(1, (os.cpu_count() or 1) // settings.training_max_workers)
+    if settings.training_n_jobs < 0 and settings.training_max_workers > 1:
+        raise ValueError(
+            f"training_n_jobs={settings.training_n_jobs} uses all the CPU cores in each of the "
+            f"{settings.training_max_workers} training workers. Set a positive value or leave it unset."
+        )
+    return settings.training_n_jobs
+
+
+def _preprocess_data(df: pd.DataFrame) -> tuple[pd.DataFrame, ColumnTransformer]:
+    """
+    Extract 'week' from 'order_date', then fit the preprocessing pipeline (imputation of the numeric columns,
+    one-hot encoding of the categorical columns) on the features and apply it.
+    The fitted pipeline is persisted with the model, so that the inference applies exactly the same features.
 
     @param df: The DataFrame to preprocess.
-    @return: The processed DataFrame with encoded categorical values and imputed missing data.
-    """
-
-    # Convert 'order_date' to datetime and extract 'week'
-    if 'order_date' in df.columns:
-        df['order_date'] = pd.to_datetime(df['order_date'], errors='coerce')
-        df['week'] = df['order_date'].dt.isocalendar().week
-        df.drop('order_date', axis=1, inplace=True)
-    # Separate numeric and categorical columns
-    numeric_columns = df.select_dtypes(include=[np.number]).columns.tolist()
-    categorical_columns = list(set(df.columns) - set(numeric_columns))
-    # Impute numeric columns
-    df[numeric_columns] = SimpleImputer(strategy='mean').fit_transform(df[numeric_columns])
-    # One-hot encode categorical columns (if any)
-    if categorical_columns:
-        encoder = OneHotEncoder(handle_unknown='ignore')
-        encoded = encoder.fit_transform(df[categorical_columns]).toarray()
-        category_labels = encoder.get_feature_names_out(categorical_columns)
-        encoded_df = pd.DataFrame(encoded, columns=category_labels, index=df.index)
-        df = pd.concat([df.drop(categorical_columns, axis=1), encoded_df], axis=1)
-    # Return final DataFrame
-    return df
+    @return: The processed DataFrame (features + target column) and the fitted preprocessing pipeline.
+    """
+    df = add_week_column(df)
+    X = df.drop(TARGET_COLUMN, axis=1)
+    preprocessor = fit_preprocessor(X)
+    df_processed = preprocessor.transform(X)
+    df_processed[TARGET_COLUMN] = df[TARGET_COLUMN].to_numpy()
+    return df_processed, preprocessor
 
 
 def _train_and_best(df: pd.DataFrame) -> tuple[str, object, float, float]:
     """
-    Train multiple regression models using RandomizedSearchCV, select the best model based on
-    the lowest Mean Absolute Error (MAE), and return model performance metrics.
+    Train multiple regression models using RandomizedSearchCV (in parallel, see 'training_engine'),
+    select the best model based on the lowest Mean Absolute Error (MAE), and return model performance metrics.
 
     @param df: The preprocessed DataFrame used for training and prediction.
     @return:
@@ -84,61 +95,17 @@ def _train_and_best(df: pd.DataFrame) -> tuple[str, object, float, float]:
     y = df['order_item_unit_count']
 
     # Split train/test
-    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.3, random_state=42)
-
-    # Define parameter distributions for RandomizedSearchCV
-    param_distributions = {
-        'RandomForestRegressor': {
-            'n_estimators': [100, 200, 300],
-            'max_depth': [None, 10, 20, 30],
-            'min_samples_leaf': [1, 2, 4]
-        },
-        'DecisionTreeRegressor': {
-            'max_depth': [None, 10, 20, 30],
-            'min_samples_leaf': [1, 2, 4]
-        },
-        'LinearRegression': {},
-        'Ridge': {
-            'alpha': np.logspace(-4, 4, 10)
-        },
-        'BayesianRidge': {
-            'alpha_1': np.logspace(-6, -1, 6),
-            'alpha_2': np.logspace(-6, -1, 6),
-            'lambda_1': np.logspace(-6, -1, 6),
-            'lambda_2': np.logspace(-6, -1, 6)
-        },
-        'SVR': {
-            'C': np.logspace(-4, 4, 9),
-            'gamma': ['scale', 'auto']
-        },
-        'XGBRegressor': {
-            'n_estimators': [100, 200],
-            'max_depth': [3, 5, 7],
-            'learning_rate': [0.01, 0.1, 0.2]
-        }
-    }
-
-    # Define models
-    models = {
-        "RandomForestRegressor": RandomForestRegressor(),
-        "XGBRegressor": XGBRegressor(),
-        "DecisionTreeRegressor": DecisionTreeRegressor(),
-        "LinearRegression": LinearRegression(),
-        "Ridge": Ridge(),
-        "BayesianRidge": BayesianRidge(),
-        "SVR": SVR()
-    }
-
-    # Train and evaluate each model
-    results = {}
-    for name, model in models.items():
-        search = RandomizedSearchCV(model, param_distributions[name], n_iter=10, cv=5,
-                                    scoring='neg_mean_absolute_error', random_state=42)
-        search.fit(X_train, y_train)
-        y_pred = search.best_estimator_.predict(X_test)
-        mape = mean_absolute_percentage_error(y_test, y_pred)
-        mae = mean_absolute_error(y_test, y_pred)
-        results[name] = (search.best_estimator_, mape, mae)
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.3,
+                                                        random_state=settings.training_random_state)
+
+    # Train and evaluate each model family in parallel (process pool)
+    start_time = time.perf_counter()
+    results = run_model_family_searches(X_train, y_train, X_test, y_test,
+                                        n_jobs=_training_n_jobs(),
+                                        random_state=settings.training_random_state,
+                                        search_strategy=settings.training_search_strategy,
+                                        xgb_early_stopping_rounds=settings.training_xgb_early_stopping_rounds)
+    print(f"All model families trained in {time.perf_counter() - start_time:.2f}s")
 
     best_model_name = min(results, key=lambda x: results[x][2])  # Select based on the lowest MAE
     best_model = results[best_model_name][0]
@@ -148,58 +115,215 @@ def _train_and_best(df: pd.DataFrame) -> tuple[str, object, float, float]:
     return best_model_name, best_model, best_mape, best_mae
 
 
-async def train_sku_order_quantity_prediction_model(
-        df: pd.DataFrame,
-        user_id: int
-) -> None:
+def _fit_sku_order_quantity_prediction_model(df: pd.DataFrame) -> tuple[str, bytes, str, float, float, str, bytes]:
     """
-    1. Preprocess the DataFrame.
+    CPU-heavy part of the training (runs in a worker process of the training pool):
+
+    1. Preprocess the DataFrame (fit the preprocessing pipeline).
     2. Train multiple models and select the best.
-    3. Save the best model locally and then load it as bytes.
-    4. Store the model along with its performance metrics and expected feature list in the database.
+    3. Serialize the best model (in the configured storage format) and the preprocessing pipeline as bytes.
 
     @param df: The (df_development) DataFrame used as input for the ML algorithm.
-    @param user_id: The ID of the user to whom the predictions correspond.
-    @return: None
+    @return: (best_model_name, model_bytes, model_format, best_mape, best_mae, model_features_json,
+              preprocessor_bytes)
     """
-
     # 1. Preprocess the data
-    df_processed = _preprocess_data(df)
+    df_processed, preprocessor = _preprocess_data(df)
     # Store the list of expected feature names (excluding the target column)
     model_features = df_processed.drop("order_item_unit_count", axis=1).columns.tolist()
     model_features_json = json.dumps(model_features)  # serialize as JSON
     # 2. Train and select the best model
     best_model_name, best_model, best_mape, best_mae = _train_and_best(df_processed)
-    # 3. Serialize the model in memory
-    buffer = io.BytesIO()
-    joblib.dump(best_model, buffer)
-    model_bytes = buffer.getvalue()
-    # 4. Store the model, performance metrics, and expected features in the database.
+    # 3. Serialize the model and the preprocessing pipeline in memory
+    model_bytes, model_format = serialize_model(best_model, settings.model_storage_format,
+                                                resolve_compress_level(settings.model_compress_level,
+                                                                       settings.model_store_dir))
+    return (best_model_name, model_bytes, model_format, best_mape, best_mae, model_features_json,
+            serialize_preprocessor(preprocessor))
+
+
+async def _store_ml_model(ml_model: MlModel, model_bytes: bytes, previous_model_path: Optional[str]) -> None:
+    """
+    Store a model either in the 'ml_model' row (default) or in the model store ('model_store_dir'), in which case
+    the row only keeps the relative path of the model version and the web app can memory-map the file.
+
+    The new version is written to its own file before the row is committed, and the row switches to it with the
+    rest of the model (preprocessing pipeline, features, metrics) in the same commit. The previous file is removed
+    only after the commit; if the commit fails, the new file is removed and the row keeps pointing to the previous
+    version.
+
+    @param ml_model: The MlModel to store (model_format and the rest of the fields, without the model itself).
+    @param model_bytes: The serialized model.
+    @param previous_model_path: The model store path of the currently stored version (None if there is none).
+    @return: None
+    """
+    if settings.model_store_dir:
+        model_path = model_store_path(ml_model.user_id, ml_model.model_type, ml_model.model_format, model_bytes)
+        await asyncio.to_thread(write_model_store_file, settings.model_store_dir, model_path, model_bytes)
+        ml_model = ml_model.model_copy(update={"model_file": None, "model_path": model_path})
+    else:
+        ml_model = ml_model.model_copy(update={"model_file": model_bytes, "model_path": None})
+    try:
+        async with AsyncSessionLocal() as session:
+            await MlModelRepository(session).create_or_update_ml_model(ml_model)
+    except Exception:
+        # The row still points to the previous version, the new file is not referenced
+        if ml_model.model_path and ml_model.model_path != previous_model_path:
+            await asyncio.to_thread(remove_model_store_file, settings.model_store_dir, ml_model.model_path)
+        raise
+    # The previous version is not referenced any more
+    if settings.model_store_dir and previous_model_path and previous_model_path != ml_model.model_path:
+        await asyncio.to_thread(remove_model_store_file, settings.model_store_dir, previous_model_path)
+
+
+async def train_sku_order_quantity_prediction_model(
+        df: pd.DataFrame,
+        user_id: int,
+        executor: Optional[Executor] = None
+) -> None:
+    """
+    1. Preprocess the DataFrame, train multiple models and select the best (in the training pool).
+    2. Store the model along with its preprocessing pipeline, performance metrics and expected feature list
+       in the database.
+
+    @param df: The (df_development) DataFrame used as input for the ML algorithm.
+    @param user_id: The ID of the user to whom the predictions correspond.
+    @param executor: (Optional) The process pool of the CPU-heavy training (default: the loop's executor).
+    @return: None
+    """
+
+    # 1. Preprocess, train and serialize the best model, without blocking the event loop
+    loop = asyncio.get_running_loop()
+    (best_model_name, model_bytes, model_format, best_mape, best_mae, model_features_json,
+     preprocessor_bytes) = await loop.run_in_executor(executor, _fit_sku_order_quantity_prediction_model, df)
+    # 2. Store the model, preprocessing pipeline, performance metrics, and expected features in the database.
     async with AsyncSessionLocal() as session:
-        ml_repo = MlModelRepository(session)
-        ml_model_data = MlModel(
-            user_id=user_id,
-            model_type=SKU_ORDER_QUANTITY_PREDICTION_MODEL_TYPE,
-            model_name=best_model_name,
-            model_file=model_bytes,
-            mape=best_mape,
-            mae=best_mae,
-            model_features=model_features_json
+        stored_ml_model = await MlModelRepository(session).get_ml_model(
+            user_id, SKU_ORDER_QUANTITY_PREDICTION_MODEL_TYPE
         )
-        # Insert or update in DB
-        await ml_repo.create_or_update_ml_model(ml_model_data)
-        print(f"Model successfully stored in the database with MAPE: {best_mape}, MAE: {best_mae}")
+    ml_model_data = MlModel(
+        user_id=user_id,
+        model_type=SKU_ORDER_QUANTITY_PREDICTION_MODEL_TYPE,
+        model_name=best_model_name,
+        mape=best_mape,
+        mae=best_mae,
+        model_features=model_features_json,
+        preprocessor_file=preprocessor_bytes,
+        model_format=model_format
+    )
+    # Insert or update in DB
+    await _store_ml_model(ml_model_data, model_bytes, stored_ml_model.model_path if stored_ml_model else None)
+    print(f"Model successfully stored in the database with MAPE: {best_mape}, MAE: {best_mae}")
 
 
-async def run_sku_order_quantity_prediction(user_erp_api: UserErpApi) -> None:
+def _warm_start_sku_order_quantity_prediction_model(
+        df: pd.DataFrame,
+        ml_model: MlModel
+) -> Optional[tuple[bytes, str, float, float]]:
+    """
+    CPU-heavy part of the incremental retraining (runs in a worker process of the training pool):
+
+    1. Preprocess the new rows with the stored preprocessing pipeline (transform only).
+    2. Evaluate the stored model on the new rows (drift detection against the stored MAE).
+    3. Warm start the model with most of the new rows (if its family supports it), evaluate the updated model
+       on the held-out rest and serialize it as bytes (in the configured storage format).
+
+    @param df: The (df_development) DataFrame, containing only the rows newer than the stored model.
+    @param ml_model: The stored MlModel (model_file, preprocessor_file, mae, etc.).
+    @return: (model_bytes, model_format, mape, mae) of the updated model, or None if a full training is needed
+             (drift, unsupported model or no stored preprocessing pipeline). The metrics are the error of the
+             updated model on the held-out new rows (the stored metrics, if the new rows are too few to hold out).
+    """
+    if not ml_model.preprocessor_file:
+        print("No preprocessing pipeline stored with the model. Full training is needed.")
+        return None
+    model = load_stored_model(ml_model, settings.model_store_dir)
+    if not supports_warm_start(model):
+        print(f"Model '{ml_model.model_name}' does not support warm start. Full training is needed.")
+        return None
+    # 1. Preprocess the new rows with the stored (fitted) preprocessing pipeline
+    df = add_week_column(df)
+    y = df[TARGET_COLUMN]
+    X = load_preprocessor(ml_model.preprocessor_file).transform(df.drop(TARGET_COLUMN, axis=1))
+    # 2. Drift detection, the new rows have not been seen by the stored model
+    mape, mae = evaluate_model(model, X, y)
+    if is_drift_detected(mae, ml_model.mae, settings.training_drift_threshold):
+        print(f"Drift detected (MAE on new rows: {mae}, stored MAE: {ml_model.mae}). Full training is needed.")
+        return None
+    # 3. Warm start the model with the new rows, except the held-out ones
+    X_train, X_holdout, y_train, y_holdout = split_holdout(X, y, settings.training_random_state)
+    start_time = time.perf_counter()
+    updated_model = warm_start_model(model, X_train, y_train, settings.training_incremental_estimators)
+    print(f"Model '{ml_model.model_name}' incrementally trained on {len(X_train)} new rows "
+          f"in {time.perf_counter() - start_time:.2f}s")
+    # The error of the updated model on rows it has not seen (the reference of the next drift detection)
+    if X_holdout is not None:
+        mape, mae = evaluate_model(updated_model, X_holdout, y_holdout)
+    else:
+        mape, mae = ml_model.mape, ml_model.mae
+    model_bytes, model_format = serialize_model(updated_model, settings.model_storage_format,
+                                                resolve_compress_level(settings.model_compress_level,
+                                                                       settings.model_store_dir))
+    return model_bytes, model_format, mape, mae
+
+
+async def update_sku_order_quantity_prediction_model(
+        df: pd.DataFrame,
+        ml_model: MlModel,
+        executor: Optional[Executor] = None
+) -> bool:
+    """
+    Incremental retraining: update the stored model with the new rows only (no hyperparameter search).
+
+    1. Drift detection and warm start of the stored model (in the training pool).
+    2. Store the updated model in the database, along with its error on the held-out new rows.
+
+    @param df: The (df_development) DataFrame, containing only the rows newer than the stored model.
+    @param ml_model: The stored MlModel (model_file, preprocessor_file, mae, etc.).
+    @param executor: (Optional) The process pool of the CPU-heavy training (default: the loop's executor).
+    @return: True if the model was updated, False if a full training is needed (drift or unsupported model).
+    """
+    # 1. Drift detection and warm start, without blocking the event loop
+    loop = asyncio.get_running_loop()
+    result = await loop.run_in_executor(executor, _warm_start_sku_order_quantity_prediction_model, df, ml_model)
+    if result is None:
+        return False
+    model_bytes, model_format, mape, mae = result
+    # 2. Store the updated model
+    await _store_ml_model(
+        ml_model.model_copy(update={"model_format": model_format, "mape": mape, "mae": mae}),
+        model_bytes,
+        ml_model.model_path
+    )
+    print(f"Model successfully updated in the database with MAPE: {mape}, MAE: {mae}")
+    return True
+
+
+def _is_full_training_due() -> bool:
+    """
+    Check if the monthly full training (hyperparameter search from scratch) is due.
+    The scheduler runs weekly, so the first run of every month falls within its first days.
+
+    @return: True if today is within the first 'training_full_retrain_days' days of the month.
+    """
+    return datetime.now().day <= settings.training_full_retrain_days
+
+
+async def run_sku_order_quantity_prediction(
+        user_erp_api: UserErpApi,
+        executor: Optional[Executor] = None
+) -> None:
     """
     Main entry point for running the entire prediction pipeline:
 
     1. Build relevant URLs from configs.
-    2. Call create_df_development to get the DataFrame.
-    3. Run the SKU quantity prediction routine on that DataFrame.
+    2. (Incremental mode) Update the stored model with the rows after its ERP high-water mark (delta fetch),
+       unless drift is detected or the monthly full training is due.
+    3. Call create_df_development to get the DataFrame (full ERP history).
+    4. Run the SKU quantity prediction routine on that DataFrame, and store the new high-water mark.
 
     @param user_erp_api: A 'UserErpApi' object containing ERP API configuration for the user.
+    @param executor: (Optional) The process pool of the CPU-heavy training (default: the loop's executor).
     @return: None
     """
     user_id = user_erp_api.user_id
@@ -213,10 +337,46 @@ async def run_sku_order_quantity_prediction(user_erp_api: UserErpApi) -> None:
                 f"User with ID {user_id} does not exist (or inactive) in the database."
             )
     # Build URLs based on the ERP API configuration (data) from the database.
-    start_order_date = "?start_order_date=2023-01-01T00:00:00"  # Get data from 2023 onward
     erp_api_get_sku_order_development_url = user_erp_api.sku_order_url
-    full_erp_api_get_sku_order_development_url = f"{erp_api_get_sku_order_development_url}{start_order_date}"
     auth_url = user_erp_api.login_token_url
+    # ERP high-water mark of the rows the stored model has been trained on
+    erp_sync_state = await erp_sync.load_erp_sync_state(user_id, SKU_ORDER_QUANTITY_PREDICTION_MODEL_TYPE)
+    # Incremental retraining: only the rows after the high-water mark (full training on drift or monthly)
+    if settings.training_incremental and not _is_full_training_due():
+        async with AsyncSessionLocal() as session:
+            ml_model = await MlModelRepository(session).get_ml_model(
+                user_id, SKU_ORDER_QUANTITY_PREDICTION_MODEL_TYPE
+            )
+        if ml_model and ml_model.updated_at:
+            if erp_sync_state and erp_sync_state.last_order_date:
+                delta_erp_api_get_sku_order_development_url = erp_sync.build_erp_sync_url(
+                    erp_api_get_sku_order_development_url, erp_sync_state, full_sync=False
+                )
+            else:  # Model trained before the sync state existed: the rows newer than the model
+                since = ml_model.updated_at.strftime("%Y-%m-%dT%H:%M:%S")
+                delta_erp_api_get_sku_order_development_url = \
+                    f"{erp_api_get_sku_order_development_url}?start_order_date={since}"
+            try:
+                # The rows after the high-water mark, and the mark up to which they are complete
+                df_new, high_water_mark = await create_df_development_delta(
+                    delta_erp_api_get_sku_order_development_url, auth_url, user_id, erp_sync_state
+                )
+            except ValueError:
+                df_new = pd.DataFrame()  # No new data returned from the ERP API
+            if df_new.empty:
+                print(f"No new data ({delta_erp_api_get_sku_order_development_url}, by ERP or SKUMetric). "
+                      f"Model is up to date.")
+                return
+            if await update_sku_order_quantity_prediction_model(df_new, ml_model, executor):
+                await erp_sync.save_erp_sync_state(
+                    user_id, SKU_ORDER_QUANTITY_PREDICTION_MODEL_TYPE, erp_sync_state, high_water_mark,
+                    full_sync=False
+                )
+                return
+    # Full training on the full ERP history (also the reconciliation of the high-water mark)
+    full_erp_api_get_sku_order_development_url = erp_sync.build_erp_sync_url(
+        erp_api_get_sku_order_development_url, erp_sync_state, full_sync=True
+    )
     # Create the Development DataFrame
     df = await create_df_development(full_erp_api_get_sku_order_development_url, auth_url, user_id)
     if df.empty:
@@ -224,13 +384,20 @@ async def run_sku_order_quantity_prediction(user_erp_api: UserErpApi) -> None:
         return
     else:
         print("Development DataFrame temporarily created for 'SKU_Order_Quantity_Prediction' model")
+    high_water_mark = erp_sync.rows_high_water_mark(df)  # Before the training changes the rows
     # Run the prediction routine
-    await train_sku_order_quantity_prediction_model(df, user_id)
+    await train_sku_order_quantity_prediction_model(df, user_id, executor)
+    # The full fetch replaces the high-water mark (no previous state)
+    await erp_sync.save_erp_sync_state(
+        user_id, SKU_ORDER_QUANTITY_PREDICTION_MODEL_TYPE, None, high_water_mark, full_sync=True
+    )
 
 
 async def main() -> None:
     """
     Execute the SKU quantity prediction process for all users that have an ERP API configuration.
+    The tenants run concurrently (bounded, with a timeout each) and share a bounded process pool for the
+    CPU-heavy training. A failing tenant does not abort the others. A summary is printed at the end.
     @return: None
     """
     async with AsyncSessionLocal() as session:
@@ -241,9 +408,17 @@ async def main() -> None:
         print("No ERP API configurations found. Exiting.")
         return
 
-    # Iterate over each ERP API configuration
-    for user_erp_api in user_erp_api_list:
-        await run_sku_order_quantity_prediction(user_erp_api)
+    # Run every ERP API configuration (tenant) concurrently
+    print(f"Training pool: {settings.training_max_workers} workers x {_training_n_jobs()} jobs")
+    start_time = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=settings.training_max_workers) as executor:
+        results = await run_tenants_concurrently(
+            user_erp_api_list,
+            lambda user_erp_api: run_sku_order_quantity_prediction(user_erp_api, executor),
+            max_concurrency=settings.tenant_max_concurrency,
+            timeout_seconds=settings.tenant_timeout_seconds
+        )
+    print_tenant_summary(results, time.perf_counter() - start_time)
 
 
 if __name__ == "__main__":
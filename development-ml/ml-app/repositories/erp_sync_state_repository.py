@@ -0,0 +1,66 @@
+"""
+/*
+ * Copyright 2025 DOTSOFT SA, Inc All Rights Reserved.
+ *
+ * Author: Georgios Karanasios R&D Software Engineer
+ */
+"""
+from typing import Optional
+
+from sqlalchemy import select, func
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models.models import ErpSyncState
+from models.orm_schema import ErpSyncStateORM
+
+
+class ErpSyncStateRepository:
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def get_erp_sync_state(self, user_id: int, consumer: str) -> Optional[ErpSyncState]:
+        """
+        Retrieves the ERP sync state of a consumer for the specified user_id.
+
+        @param user_id: The user ID of the sync state.
+        @param consumer: The consumer of the ERP data (e.g., 'sku_metric').
+        @return: The ErpSyncState object, or None if the consumer never synced the user's ERP data.
+        """
+        try:
+            result = await self.session.execute(
+                select(ErpSyncStateORM).where(
+                    ErpSyncStateORM.user_id == user_id,
+                    ErpSyncStateORM.consumer == consumer
+                )
+            )
+            record = result.scalars().first()
+            return ErpSyncState.model_validate(record) if record else None
+        except Exception as e:
+            raise Exception(f"get_erp_sync_state(): {e}")
+
+    async def save_erp_sync_state(self, erp_sync_state: ErpSyncState) -> None:
+        """
+        Creates or updates (on the unique consumer + user_id) the ERP sync state of a consumer.
+
+        @param erp_sync_state: A pydantic ErpSyncState object containing the new high-water mark.
+        """
+        values = {
+            "last_order_date": erp_sync_state.last_order_date,
+            "last_record_id": erp_sync_state.last_record_id,
+            "last_full_sync_at": erp_sync_state.last_full_sync_at,
+        }
+        try:
+            await self.session.execute(
+                insert(ErpSyncStateORM)
+                .values(user_id=erp_sync_state.user_id, consumer=erp_sync_state.consumer, **values)
+                .on_conflict_do_update(
+                    constraint="uq_erp_sync_state_consumer_user",
+                    set_={**values, "updated_at": func.now()}
+                )
+            )
+            await self.session.commit()
+        except Exception as e:
+            await self.session.rollback()
+            raise Exception(f"save_erp_sync_state(): {e}")
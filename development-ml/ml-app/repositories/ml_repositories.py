@@ -5,9 +5,11 @@
  * Author: Georgios Karanasios R&D Software Engineer
  */
 """
-from typing import List
+from datetime import datetime
+from typing import List, Optional
 
-from sqlalchemy import select
+import pandas as pd
+from sqlalchemy import select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from models.models import SkuMetric, \
@@ -20,18 +22,24 @@ class SkuMetricRepository:
     def __init__(self, session: AsyncSession):
         self.session = session
 
-    async def get_all_sku_metrics_by_user_id(self, user_id: int) -> List[SkuMetric]:
+    async def get_all_sku_metrics_by_user_id(
+            self,
+            user_id: int,
+            updated_after: Optional[datetime] = None
+    ) -> List[SkuMetric]:
         """
         Retrieves all SkuMetric records for the specified user_id.
 
         @param user_id: The user ID to filter SkuMetric records.
+        @param updated_after: (Optional) Keep only the records created/updated after this timestamp.
         @return: A list of SkuMetric objects corresponding to the user_id.
         """
         try:
             # Query to fetch all SkuMetric records matching the given user_id
-            result = await self.session.execute(
-                select(SkuMetricORM).where(SkuMetricORM.user_id == user_id)
-            )
+            query = select(SkuMetricORM).where(SkuMetricORM.user_id == user_id)
+            if updated_after is not None:
+                query = query.where(SkuMetricORM.updated_at > updated_after)
+            result = await self.session.execute(query)
             sku_metric_records = result.scalars().all()
 
             # Convert ORM objects to Pydantic models
@@ -40,16 +48,62 @@ class SkuMetricRepository:
         except Exception as e:
             raise Exception(f"get_all_sku_metrics_by_user_id(): {e}")
 
+    async def get_sku_metrics_frame_by_user_id(
+            self,
+            columns: List[str],
+            user_id: int,
+            updated_after: Optional[datetime] = None
+    ) -> pd.DataFrame:
+        """
+        Retrieves only the given SkuMetric columns for the specified user_id, straight into a DataFrame
+        (no ORM objects or Pydantic models are built per row).
+
+        @param columns: The SkuMetric columns to select (e.g., ['sku_order_record_id', 'is_weekend']).
+        @param user_id: The user ID to filter SkuMetric records.
+        @param updated_after: (Optional) Keep only the records created/updated after this timestamp.
+        @return: A DataFrame with one row per SkuMetric record and the given columns.
+        """
+        try:
+            query = select(*(getattr(SkuMetricORM, column) for column in columns)) \
+                .where(SkuMetricORM.user_id == user_id)
+            if updated_after is not None:
+                query = query.where(SkuMetricORM.updated_at > updated_after)
+            result = await self.session.execute(query)
+            return pd.DataFrame.from_records(result.all(), columns=columns)
+
+        except Exception as e:
+            raise Exception(f"get_sku_metrics_frame_by_user_id(): {e}")
+
 
 class MlModelRepository:
 
     def __init__(self, session: AsyncSession):
         self.session = session
 
+    async def get_ml_model(self, user_id: int, model_type: str) -> Optional[MlModel]:
+        """
+        Retrieves the stored ML model of the given type for the specified user_id.
+
+        @param user_id: The user ID of the model.
+        @param model_type: The type of the model (e.g., 'sku_order_quantity_prediction_ml_model').
+        @return: The MlModel object, or None if no model is stored yet.
+        """
+        try:
+            result = await self.session.execute(
+                select(MlModelORM).where(
+                    MlModelORM.user_id == user_id,
+                    MlModelORM.model_type == model_type
+                )
+            )
+            record = result.scalars().first()
+            return MlModel.from_orm(record) if record else None
+        except Exception as e:
+            raise Exception(f"get_ml_model(): {e}")
+
     async def create_or_update_ml_model(self, ml_model: MlModel):
         """
         Creates a new ML model record if it doesn't exist,
-        or updates the 'model_file' if it does.
+        or updates the model file (or store path), name, metrics, features and preprocessing pipeline if it does.
 
         @param ml_model: A pydantic MlModel object containing the binary file and metadata.
         """
@@ -63,8 +117,15 @@ class MlModelRepository:
             )
             existing_record = result.scalars().first()
             if existing_record:
-                # Modify the model_file to trigger an update
+                # Modify the model (file, name, metrics, features and preprocessor) to trigger an update
                 existing_record.model_file = ml_model.model_file
+                existing_record.model_name = ml_model.model_name
+                existing_record.mape = ml_model.mape
+                existing_record.mae = ml_model.mae
+                existing_record.model_features = ml_model.model_features
+                existing_record.preprocessor_file = ml_model.preprocessor_file
+                existing_record.model_format = ml_model.model_format
+                existing_record.model_path = ml_model.model_path
                 # Add it back to the session to ensure update is detected
                 self.session.add(existing_record)
             else:
@@ -76,3 +137,36 @@ class MlModelRepository:
         except Exception as exc:
             await self.session.rollback()
             raise exc
+
+    async def get_all_ml_models(self) -> List[MlModel]:
+        """
+        Retrieves all the stored ML models (of all users and types).
+
+        @return: A list of MlModel objects.
+        """
+        try:
+            result = await self.session.execute(select(MlModelORM).order_by(MlModelORM.id))
+            return [MlModel.from_orm(record) for record in result.scalars().all()]
+        except Exception as e:
+            raise Exception(f"get_all_ml_models(): {e}")
+
+    async def update_ml_model_storage(self, ml_model: MlModel):
+        """
+        Updates only the storage of a model (model_file, model_format, model_path), e.g., on a format migration.
+        'updated_at' is kept as is, since the model itself (and the data it was trained on) did not change.
+
+        @param ml_model: A pydantic MlModel object (with its id) containing the new storage fields.
+        """
+        try:
+            await self.session.execute(
+                update(MlModelORM).where(MlModelORM.id == ml_model.id).values(
+                    model_file=ml_model.model_file,
+                    model_format=ml_model.model_format,
+                    model_path=ml_model.model_path,
+                    updated_at=MlModelORM.updated_at
+                )
+            )
+            await self.session.commit()
+        except Exception as exc:
+            await self.session.rollback()
+            raise exc
@@ -6,87 +6,179 @@
  */
 """
 
-from typing import Optional
+from datetime import datetime, timedelta
+from typing import AsyncIterator, Optional
 
 import pandas as pd
 
+from models.models import ErpSyncState
 from repositories.ml_repositories import SkuMetricRepository
-from services.fetch_erp_development_service import fetch_erp_development_data
+from services import erp_sync
+from services.erp_sync import HighWaterMark
+from services.fetch_erp_development_service import iter_erp_development_frames, iter_erp_development_pages
 from utils.database_connection import AsyncSessionLocal
+from utils.settings import settings
 
 
-async def create_df_development(full_url: str, auth_url: str, user_id: int) -> pd.DataFrame:
+# ERP columns of the development DataFrame (the ERP record 'id' is the join key)
+ERP_COLUMNS = [
+    "id",
+    "order_date",
+    "sku_number",
+    "sku_name",
+    "class_display_name",
+    "order_item_price_in_main_currency",
+    "order_item_unit_count",
+    "cl_price",
+]
+# SkuMetric columns of the development DataFrame
+SKU_METRIC_COLUMNS = [
+    "is_weekend",
+    "is_holiday",
+    "mean_temperature",
+    "rain",
+    "average_competition_price_external",
+    "review_sentiment_score",
+    "review_sentiment_timestamp",
+    "trend_value",
+]
+DEVELOPMENT_COLUMNS = ERP_COLUMNS + SKU_METRIC_COLUMNS
+
+
+async def create_df_development(
+        full_url: str,
+        auth_url: str,
+        user_id: int,
+        updated_after: Optional[datetime] = None
+) -> pd.DataFrame:
     """
-    1. Fetch all SkuMetric records for the given user_id.
-    2. Fetch ERP development data using the provided URLs.
-    3. Filter ERP data to keep only entries with 'id' matching SkuMetric.sku_order_record_id.
-    4. Merge matching data into a single dictionary.
-    5. Return a DataFrame with the specified columns in the desired order.
+    1. Load the SkuMetric columns of the given user_id into a DataFrame (only the needed columns).
+    2. Fetch the ERP development data using the provided URLs: typed DataFrames from the ERP Arrow export
+       (or, if 'erp_arrow_export' is disabled, JSON pages turned into DataFrames).
+    3. Inner-join every DataFrame ('id') with the SkuMetric records ('sku_order_record_id'),
+       keeping the order of the ERP records.
+    4. Return a DataFrame with the specified columns in the desired order.
 
     @param full_url: The URL to fetch ERP data.
     @param auth_url: The URL to fetch the ERP API auth token.
     @param user_id: The user ID to filter SkuMetric records.
+    @param updated_after: (Optional) Keep only the SkuMetric records created/updated after this timestamp.
+
+    @return: A pandas DataFrame with columns DEVELOPMENT_COLUMNS
+    """
+
+    # 1. Query the SkuMetric columns by user_id
+    sku_metrics_df = await _load_sku_metrics_frame(user_id, updated_after)
+    # 2. Fetch ERP data chunk by chunk, and 3. filter and merge every chunk as soon as it arrives
+    #    (only the matching rows of a chunk are kept)
+    merged_frames = [
+        _merge_erp_frame(erp_df, sku_metrics_df) async for erp_df in _iter_erp_frames(full_url, auth_url, user_id)
+    ]
+    # 4. Construct the DataFrame in the specified column order
+    return pd.concat(merged_frames, ignore_index=True)[DEVELOPMENT_COLUMNS]
+
+
+async def create_df_development_delta(
+        delta_url: str,
+        auth_url: str,
+        user_id: int,
+        erp_sync_state: Optional[ErpSyncState]
+) -> tuple[pd.DataFrame, Optional[HighWaterMark]]:
+    """
+    Delta version of 'create_df_development': the rows after the ERP high-water mark, and the mark to store once
+    the model has been trained on them.
 
-    @return: A pandas DataFrame with columns
+    The SkuMetric records are not filtered by their 'updated_at': an ERP record after the mark is new to the model,
+    however old its SkuMetric record is. An ERP record after the mark is not trained on yet when it has no SkuMetric
+    record (Step 1 of the SKU Metrics App has not run on it) or when any of its SKU_METRIC_COLUMNS is still NULL
+    (Steps 2-5 fill them after Step 1, Step 2 retries the missing weather): the rows and the mark stop before the
+    first of them and the next delta fetches it again. A step that finds nothing (e.g., no competition price)
+    leaves its column NULL for good, so a NULL column stops the mark only for the orders of the last
+    'erp_enrichment_wait_days' days; older orders are trained on as they are (the preprocessor imputes the NULLs).
+    The monthly full training reconciles any record that is never enriched.
+
+    @param delta_url: The URL to fetch the ERP data from the 'order_date' of the high-water mark onward.
+    @param auth_url: The URL to fetch the ERP API auth token.
+    @param user_id: The user ID to filter SkuMetric records.
+    @param erp_sync_state: The stored ErpSyncState (None if the model was trained before the sync state existed).
+    @return: (DataFrame with columns DEVELOPMENT_COLUMNS, high-water mark of its rows or None if there are none)
+    @raises ValueError: If the ERP returned no data.
+    """
+    sku_metrics_df = await _load_sku_metrics_frame(user_id)
+    enrichment_cutoff = datetime.now() - timedelta(days=settings.erp_enrichment_wait_days)
+    merged_frames = []
+    first_unjoined_mark = None
+    async for erp_df in _iter_erp_frames(delta_url, auth_url, user_id):
+        erp_df = erp_sync.keep_rows_after_mark(erp_df, erp_sync_state)
+        merged_df = _merge_erp_frame(erp_df, sku_metrics_df)
+        unjoined_df = pd.concat([
+            erp_df[erp_df["id"].notna() & ~erp_df["id"].isin(sku_metrics_df["sku_order_record_id"])],
+            _rows_not_enriched(merged_df, enrichment_cutoff),
+        ])
+        first_unjoined_mark = min(
+            filter(None, (first_unjoined_mark, erp_sync.rows_low_water_mark(unjoined_df))), default=None
+        )
+        merged_frames.append(merged_df)
+    df = pd.concat(merged_frames, ignore_index=True)[DEVELOPMENT_COLUMNS]
+    if first_unjoined_mark is not None:
+        df = erp_sync.keep_rows_before_mark(df, first_unjoined_mark)
+        print(f"ERP records not enriched yet from {first_unjoined_mark[0]} (id {first_unjoined_mark[1]}) "
+              f"onward: they are left for the next run.")
+    return df, erp_sync.rows_high_water_mark(df) if not df.empty else None
+
+
+def _rows_not_enriched(merged_df: pd.DataFrame, enrichment_cutoff: datetime) -> pd.DataFrame:
+    """
+    @param merged_df: Merged rows (see '_merge_erp_frame').
+    @param enrichment_cutoff: The orders before this date are not waited for.
+    @return: The rows ordered on or after the cutoff with any of SKU_METRIC_COLUMNS still NULL.
     """
+    pending = merged_df[SKU_METRIC_COLUMNS].isna().any(axis=1)
+    return merged_df[pending & (pd.to_datetime(merged_df["order_date"]) >= enrichment_cutoff)]
 
-    # 1. Query SkuMetric records by user_id
+
+async def _load_sku_metrics_frame(user_id: int, updated_after: Optional[datetime] = None) -> pd.DataFrame:
+    """
+    @param user_id: The user ID to filter SkuMetric records.
+    @param updated_after: (Optional) Keep only the SkuMetric records created/updated after this timestamp.
+    @return: The SkuMetric columns (SKU_METRIC_COLUMNS and an int64 'sku_order_record_id') of the user.
+    """
     async with AsyncSessionLocal() as session:
         sku_metric_repo = SkuMetricRepository(session)
-        sku_metrics = await sku_metric_repo.get_all_sku_metrics_by_user_id(user_id)
-    # 2. Fetch ERP data
-    data_records = await fetch_erp_development_data(full_url, auth_url, user_id)
-    # 3. Build a dict of {sku_order_record_id: SkuMetric} for faster access
-    sku_metric_dict = {
-        metric.sku_order_record_id: metric for metric in sku_metrics if metric.sku_order_record_id is not None
-    }
-    # 4. Filter and merge
-    rows = []
-    for record in data_records:
-        record_id: Optional[int] = record.get("id")
-        # Check if the ERP record ID exists in the SKU metric dictionary
-        if record_id in sku_metric_dict:
-            sku_metric = sku_metric_dict[record_id]  # Retrieve the corresponding SKU metric object from dict
-            # Merge data from ERP + SkuMetric
-            merged_data = {
-                "id": record_id,
-                "order_date": record.get("order_date"),
-                "sku_number": record.get("sku_number"),
-                "sku_name": record.get("sku_name"),
-                "class_display_name": record.get("class_display_name"),
-                "order_item_price_in_main_currency": record.get("order_item_price_in_main_currency"),
-                "order_item_unit_count": record.get("order_item_unit_count"),
-                "cl_price": record.get("cl_price"),
-                "is_weekend": sku_metric.is_weekend,
-                "is_holiday": sku_metric.is_holiday,
-                "mean_temperature": sku_metric.mean_temperature,
-                "rain": sku_metric.rain,
-                "average_competition_price_external": sku_metric.average_competition_price_external,
-                "review_sentiment_score": sku_metric.review_sentiment_score,
-                "review_sentiment_timestamp": sku_metric.review_sentiment_timestamp,
-                "trend_value": sku_metric.trend_value,
-            }
-            # Append the merged record as (future) rows for the Dataframe
-            rows.append(merged_data)
-
-    # 5. Construct the DataFrame in the specified column order
-    df = pd.DataFrame(rows, columns=[
-        "id",
-        "order_date",
-        "sku_number",
-        "sku_name",
-        "class_display_name",
-        "order_item_price_in_main_currency",
-        "order_item_unit_count",
-        "cl_price",
-        "is_weekend",
-        "is_holiday",
-        "mean_temperature",
-        "rain",
-        "average_competition_price_external",
-        "review_sentiment_score",
-        "review_sentiment_timestamp",
-        "trend_value",
-    ])
-
-    return df
+        sku_metrics_df = await sku_metric_repo.get_sku_metrics_frame_by_user_id(
+            ["sku_order_record_id", *SKU_METRIC_COLUMNS], user_id, updated_after
+        )
+    return sku_metrics_df.astype({"sku_order_record_id": "int64"})
+
+
+def _iter_erp_frames(full_url: str, auth_url: str, user_id: int) -> AsyncIterator[pd.DataFrame]:
+    """
+    @param full_url: The URL to fetch ERP data.
+    @param auth_url: The URL to fetch the ERP API auth token.
+    @param user_id: The user ID of the ERP API configuration.
+    @return: The ERP records chunk by chunk (columns ERP_COLUMNS): typed DataFrames from the ERP Arrow export,
+             or, if 'erp_arrow_export' is disabled, JSON pages turned into DataFrames.
+    """
+    if settings.erp_arrow_export:
+        return iter_erp_development_frames(full_url, auth_url, user_id, ERP_COLUMNS)
+    # Records without an 'id' are dropped first (they can not match), so the integer columns stay int
+    return (
+        pd.DataFrame.from_records(
+            [record for record in data_records if record.get("id") is not None], columns=ERP_COLUMNS
+        )
+        async for data_records in iter_erp_development_pages(full_url, auth_url, user_id)
+    )
+
+
+def _merge_erp_frame(erp_df: pd.DataFrame, sku_metrics_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Inner-join a chunk of ERP records with the SkuMetric records, keeping the order of the ERP records.
+
+    @param erp_df: A chunk of ERP records (columns ERP_COLUMNS).
+    @param sku_metrics_df: The SkuMetric columns (with an int64 'sku_order_record_id').
+    @return: The merged rows of the chunk.
+    """
+    # Records without an 'id' can not match any SkuMetric record
+    erp_df = erp_df[erp_df["id"].notna()].astype({"id": "int64"})
+    # An inner merge keeps the order of the left keys
+    return erp_df.merge(sku_metrics_df, how="inner", left_on="id", right_on="sku_order_record_id", sort=False)
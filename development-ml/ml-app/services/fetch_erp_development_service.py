@@ -5,76 +5,142 @@
  * Author: Georgios Karanasios R&D Software Engineer
  */
 """
-import requests
+from typing import AsyncIterator, Callable, Sequence
+
+import httpx
+import pandas as pd
 
 from repositories.user_erp_api_repository import UserErpApiRepository
 from repositories.user_repository import UserRepository
 from utils.database_connection import AsyncSessionLocal
 from utils.django_decryption import decrypt_django_user_password
+from utils.erp_client import ErpClient
+from utils.erp_token_manager import erp_token_manager
 
 
-async def fetch_erp_development_data(full_url: str, auth_url: str, user_id: int) -> dict:
+async def iter_erp_development_pages(full_url: str, auth_url: str, user_id: int) -> AsyncIterator[list[dict]]:
     """
-    Fetches and validates ERP data for a specific client.
+    Fetches and validates ERP data for a specific client, page by page.
 
     Steps:
-    1. Use the provided URLs to fetch ERP data from the API.
-    2. Extract the user ID and data records from the response.
-    3. Validate that the user exists in the database.
+    1. Validate that the user exists in the database.
+    2. Use the provided URLs to fetch the ERP data pages from the API (one pooled HTTP client).
+    3. Yield every (non-empty) page of data records, as soon as it arrives.
 
     @param full_url: str - The full endpoint URL to fetch ERP data.
     @param auth_url: str - The authentication URL for the ERP API.
     @param user_id: The ID of the user associated with the 'development' data.
 
-    @return: dict - data_records
+    @return: An async generator of pages (lists of data records).
+    @raises ValueError: If the ERP API returns no data at all.
+    """
+    async for data_records in _iter_erp_api(
+            full_url, auth_url, user_id, lambda erp_client, headers: erp_client.iter_pages(full_url, headers)
+    ):
+        yield data_records
+
+
+async def iter_erp_development_frames(
+        full_url: str,
+        auth_url: str,
+        user_id: int,
+        columns: Sequence[str]
+) -> AsyncIterator[pd.DataFrame]:
     """
+    Fetches and validates ERP data for a specific client, in bulk from the Arrow export of the ERP API
+    (typed columns: much smaller and faster to read than the JSON pages of 'iter_erp_development_pages').
+    If the ERP API has no Arrow export (404), the JSON pages are turned into DataFrames instead.
 
-    # Fetch data from ERP API
-    data_records = await _fetch_erp_development_data(full_url, auth_url, user_id)
-    # Extract 'user_id' and 'sku_order_data' from erp_data
-    if not user_id or not data_records:
-        raise ValueError("No (all) data returned from ERP API.")
-    # Check if the user exists in the database
-    if not await _is_user_exists_and_active(user_id):
-        raise Exception(f"User with ID {user_id} does not exist (or inactive) in the database.")
-    return data_records
+    @param full_url: str - The full endpoint URL to fetch ERP data (with its filters, e.g., 'start_order_date').
+    @param auth_url: str - The authentication URL for the ERP API.
+    @param user_id: The ID of the user associated with the 'development' data.
+    @param columns: The ERP columns to fetch.
 
+    @return: An async generator of (non-empty) DataFrames with the given columns.
+    @raises ValueError: If the ERP API returns no data at all.
+    """
+    async for erp_df in _iter_erp_api(
+            full_url, auth_url, user_id,
+            lambda erp_client, headers: _iter_arrow_or_json_frames(erp_client, headers, full_url, columns)
+    ):
+        yield erp_df
+
+
+async def _iter_arrow_or_json_frames(
+        erp_client: ErpClient,
+        headers: dict,
+        full_url: str,
+        columns: Sequence[str]
+) -> AsyncIterator[pd.DataFrame]:
+    """
+    Yield the ERP data from the Arrow export, or from the JSON pages if the ERP API has no export (404, returned
+    before any data).
 
-async def _fetch_erp_development_data(full_url: str, auth_url: str, user_id: int) -> dict:
+    @param erp_client: The ERP API client.
+    @param headers: The request headers (e.g., the Bearer token).
+    @param full_url: str - The full endpoint URL to fetch ERP data.
+    @param columns: The ERP columns to fetch.
+    @return: An async generator of DataFrames with the given columns.
     """
-    Fetch data from the ERP API using the access token.
+    try:
+        async for erp_df in erp_client.iter_arrow_frames(full_url, headers, columns):
+            yield erp_df
+        return
+    except httpx.HTTPStatusError as http_err:
+        if http_err.response.status_code != 404:
+            raise
+    print(f"No Arrow export on the ERP API ({full_url}), falling back to the JSON pages.")
+    async for data_records in erp_client.iter_pages(full_url, headers):
+        yield pd.DataFrame.from_records(data_records, columns=columns)
+
+
+async def _iter_erp_api(
+        full_url: str,
+        auth_url: str,
+        user_id: int,
+        iter_data: Callable[[ErpClient, dict], AsyncIterator]
+) -> AsyncIterator:
+    """
+    Validate the user, get the (cached) ERP API token and yield every non-empty chunk of data of 'iter_data'.
 
-    @param full_url: The client's ERP API URL for getting the data
-    @param auth_url: The client's API URL for getting the auth token
+    @param full_url: str - The full endpoint URL to fetch ERP data.
+    @param auth_url: str - The authentication URL for the ERP API.
     @param user_id: The ID of the user associated with the 'development' data.
-    @return: A dictionary containing user_id and data records.
-    @raises Exception: If the request fails or the response is empty.
+    @param iter_data: Iterates the chunks of data (pages or DataFrames) with the ERP client and the request headers.
+
+    @return: An async generator of the non-empty chunks of data.
+    @raises ValueError: If the ERP API returns no data at all.
     """
+
+    # Check if the user exists in the database
+    if not user_id or not await _is_user_exists_and_active(user_id):
+        raise Exception(f"User with ID {user_id} does not exist (or inactive) in the database.")
+    has_data = False
     try:
-        # Await the asynchronous token retrieval
-        token = await _get_erp_api_token(auth_url, user_id)
-        headers = {"Authorization": f"Bearer {token}"}
-        response = requests.get(full_url, headers=headers)
-        response.raise_for_status()
-        erp_data = response.json()
-        # Extract data from json
-        data_records = erp_data.get("data", [])
-        # Check if the response is empty
-        if not user_id or not data_records:
-            return {}
-        # Return data records
-        return data_records
-    except requests.HTTPError as http_err:
+        async with ErpClient() as erp_client:
+            # The cached token of the tenant (a login only if there is none or it is about to expire)
+            token = await erp_token_manager.get_token(
+                user_id, auth_url, lambda: _get_erp_api_token(erp_client, auth_url, user_id)
+            )
+            headers = {"Authorization": f"Bearer {token}"}
+            async for data in iter_data(erp_client, headers):
+                if len(data):
+                    has_data = True
+                    yield data
+    except httpx.HTTPError as http_err:
+        if isinstance(http_err, httpx.HTTPStatusError) and http_err.response.status_code == 401:
+            erp_token_manager.invalidate(user_id, auth_url)  # Rejected token: log in again on the next call
         raise Exception(f"fetch_erp_development_data(): {http_err}")
-    except Exception as exc:
-        raise Exception(f"fetch_erp_development_data(): {exc}")
+    if not has_data:
+        raise ValueError("No (all) data returned from ERP API.")
 
 
-async def _get_erp_api_token(auth_url: str, erp_user_id: int) -> str:
+async def _get_erp_api_token(erp_client: ErpClient, auth_url: str, erp_user_id: int) -> str:
     """
     Fetch an access token from the ERP API authentication endpoint.
     If a 401 Unauthorized error occurs, attempt to decrypt the password and retry.
 
+    @param erp_client: The ERP API client (its pooled connection is reused for the data requests).
     @param auth_url: The client's API URL for getting the auth token.
     @param erp_user_id: The ID of the user associated with the ERP API configuration.
     @return: A string representing the Bearer token.
@@ -95,17 +161,15 @@ async def _get_erp_api_token(auth_url: str, erp_user_id: int) -> str:
     }
 
     try:
-        response = requests.post(auth_url, data=payload)
-        response.raise_for_status()  # raise if response status is not 200
-    except requests.HTTPError as http_err:
+        response = await erp_client.post(auth_url, data=payload)  # raise if response status is not 2xx
+    except httpx.HTTPStatusError as http_err:
         # Check if the error is 401 Unauthorized
         if http_err.response.status_code == 401:
             # Attempt to decrypt the password considering as a Django account
             decrypted_password = decrypt_django_user_password()
             if decrypted_password:
                 payload["password"] = decrypted_password
-                response = requests.post(auth_url, data=payload)
-                response.raise_for_status()
+                response = await erp_client.post(auth_url, data=payload)
             else:
                 raise Exception("Failed to decrypt ERP API password to recover from 401 error.")
         else:
@@ -0,0 +1,101 @@
+"""
+/*
+ * Copyright 2025 DOTSOFT SA, Inc All Rights Reserved.
+ *
+ * Author: Georgios Karanasios R&D Software Engineer
+ */
+"""
+import pandas as pd
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.metrics import mean_absolute_percentage_error, mean_absolute_error
+from sklearn.model_selection import train_test_split
+from xgboost import XGBRegressor
+
+HOLDOUT_SIZE = 0.3  # Part of the new rows held out to evaluate the updated model
+MIN_HOLDOUT_ROWS = 5  # Fewer held-out rows give no reliable error: the stored metrics are kept
+
+
+def supports_warm_start(model) -> bool:
+    """
+    Check if a trained model can be updated with new data without a full hyperparameter search.
+
+    @param model: The trained model (deserialized from 'ml_model.model_file').
+    @return: True for XGBoost, RandomForest and models exposing 'partial_fit', False otherwise.
+    """
+    return isinstance(model, (XGBRegressor, RandomForestRegressor)) or hasattr(model, "partial_fit")
+
+
+def evaluate_model(model, X: pd.DataFrame, y: pd.Series) -> tuple[float, float]:
+    """
+    Evaluate a trained model on (unseen) data.
+
+    @param model: The trained model.
+    @param X: Features, aligned to the model's expected features.
+    @param y: Target.
+    @return: (mape, mae)
+    """
+    y_pred = model.predict(X)
+    return mean_absolute_percentage_error(y, y_pred), mean_absolute_error(y, y_pred)
+
+
+def split_holdout(X: pd.DataFrame, y: pd.Series, random_state: int):
+    """
+    Split the new rows into the rows the model is updated with and the rows it is evaluated on afterwards,
+    so that the stored metrics are the error of the updated model on rows it has not seen.
+
+    @param X: New features.
+    @param y: New target.
+    @param random_state: Seed of the split.
+    @return: (X_train, X_holdout, y_train, y_holdout), the holdout is None when the new rows are too few
+             (the model is then updated with all of them).
+    """
+    if len(X) * HOLDOUT_SIZE < MIN_HOLDOUT_ROWS:
+        return X, None, y, None
+    return train_test_split(X, y, test_size=HOLDOUT_SIZE, random_state=random_state)
+
+
+def is_drift_detected(current_mae: float, reference_mae: float, threshold: float) -> bool:
+    """
+    Detect (concept) drift by comparing the error of the stored model on the new rows with the error
+    it had when it was stored.
+
+    @param current_mae: MAE of the stored model on the new rows.
+    @param reference_mae: MAE stored alongside the model.
+    @param threshold: Allowed relative increase of the MAE (e.g., 0.25 = 25%).
+    @return: True if the MAE grew more than the threshold allows.
+    """
+    if reference_mae is None:
+        return True
+    return current_mae > reference_mae * (1 + threshold)
+
+
+def warm_start_model(model, X: pd.DataFrame, y: pd.Series, n_new_estimators: int):
+    """
+    Update a trained model with new rows, depending on what its family supports:
+
+    - XGBRegressor: continue boosting from the stored booster ('xgb_model=') with 'n_new_estimators' rounds.
+    - RandomForestRegressor: add 'n_new_estimators' trees fitted on the new rows ('warm_start').
+    - Models exposing 'partial_fit' (e.g., SGDRegressor): a single 'partial_fit' pass over the new rows.
+
+    @param model: The trained model.
+    @param X: New features, aligned to the model's expected features.
+    @param y: New target.
+    @param n_new_estimators: Number of boosting rounds / trees to add.
+    @return: The updated model.
+    @raises ValueError: If the model family does not support warm starting.
+    """
+    if isinstance(model, XGBRegressor):
+        params = model.get_params()
+        params.update(n_estimators=n_new_estimators, early_stopping_rounds=None)
+        updated_model = XGBRegressor(**params)
+        updated_model.fit(X, y, xgb_model=model.get_booster())
+        return updated_model
+    if isinstance(model, RandomForestRegressor):
+        model.set_params(warm_start=True, n_estimators=model.n_estimators + n_new_estimators)
+        model.fit(X, y)
+        model.set_params(warm_start=False)
+        return model
+    if hasattr(model, "partial_fit"):
+        model.partial_fit(X, y)
+        return model
+    raise ValueError(f"Model '{type(model).__name__}' does not support warm start.")
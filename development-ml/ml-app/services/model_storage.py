@@ -0,0 +1,204 @@
+"""
+/*
+ * Copyright 2025 DOTSOFT SA, Inc All Rights Reserved.
+ *
+ * Author: Georgios Karanasios R&D Software Engineer
+ */
+"""
+import hashlib
+import io
+import json
+import os
+import tempfile
+import time
+from typing import Optional
+
+import joblib
+from xgboost import XGBRegressor
+
+from models.models import MlModel
+from utils.constants import MODEL_FORMAT_JOBLIB, MODEL_FORMAT_XGB_JSON, MODEL_FORMAT_XGB_UBJ
+
+# Native XGBoost formats (the booster's own serialization, independent of the pickled Python classes)
+XGB_RAW_FORMATS = {MODEL_FORMAT_XGB_JSON: "json", MODEL_FORMAT_XGB_UBJ: "ubj"}
+MODEL_FORMATS = (MODEL_FORMAT_JOBLIB, *XGB_RAW_FORMATS)
+# Booster attribute holding the scikit-learn hyperparameters (the native formats keep only the trees)
+XGB_PARAMS_ATTRIBUTE = "sklearn_params"
+MODEL_FILE_EXTENSIONS = {MODEL_FORMAT_JOBLIB: "joblib", MODEL_FORMAT_XGB_JSON: "json", MODEL_FORMAT_XGB_UBJ: "ubj"}
+# joblib compression level of the models stored in the database (the model store files are not compressed, so that
+# the web app can memory-map them)
+DATABASE_COMPRESS_LEVEL = 3
+# Hex digits of the content hash in the model store file names
+MODEL_VERSION_HASH_LENGTH = 16
+
+
+def resolve_compress_level(compress: Optional[int], model_store_dir: Optional[str]) -> int:
+    """
+    Resolve the joblib compression level of a model: the configured one, or by default none for the model store
+    (memory-mapped by the web app) and DATABASE_COMPRESS_LEVEL for the 'ml_model.model_file' column.
+
+    @param compress: The configured compression level (None for the default).
+    @param model_store_dir: The root directory of the model store (None if the models are stored in the database).
+    @return: The compression level, 0 (none) to 9.
+    """
+    if compress is not None:
+        return compress
+    return 0 if model_store_dir else DATABASE_COMPRESS_LEVEL
+
+
+def resolve_model_format(model, model_format: str) -> str:
+    """
+    Resolve the storage format of a model: the native XGBoost formats only apply to XGBoost models,
+    every other model family is stored with joblib.
+
+    @param model: The trained model.
+    @param model_format: The requested format (one of MODEL_FORMATS).
+    @return: The format the model will be stored with.
+    @raises ValueError: If the format is unknown.
+    """
+    if model_format not in MODEL_FORMATS:
+        raise ValueError(f"Unknown model format '{model_format}'.")
+    if model_format in XGB_RAW_FORMATS and not isinstance(model, XGBRegressor):
+        return MODEL_FORMAT_JOBLIB
+    return model_format
+
+
+def serialize_model(model, model_format: str = MODEL_FORMAT_JOBLIB, compress: int = 0) -> tuple[bytes, str]:
+    """
+    Serialize a trained model for 'ml_model.model_file'.
+
+    - 'joblib': joblib pickle, zlib-compressed when 'compress' > 0 (joblib detects the compression on load).
+    - 'xgb_json' / 'xgb_ubj': the native XGBoost booster (JSON or Universal Binary JSON), with the
+      scikit-learn hyperparameters stored as a booster attribute (needed by the incremental training).
+
+    @param model: The trained model.
+    @param model_format: The requested format (one of MODEL_FORMATS).
+    @param compress: The joblib compression level, 0 (none) to 9 (ignored by the native XGBoost formats).
+    @return: (model_bytes, model_format), the format is the resolved one (see 'resolve_model_format').
+    """
+    model_format = resolve_model_format(model, model_format)
+    if model_format in XGB_RAW_FORMATS:
+        booster = model.get_booster().copy()
+        params = {key: value for key, value in model.get_params().items()
+                  if value is None or isinstance(value, (bool, int, float, str))}
+        booster.set_attr(**{XGB_PARAMS_ATTRIBUTE: json.dumps(params)})
+        return bytes(booster.save_raw(raw_format=XGB_RAW_FORMATS[model_format])), model_format
+    buffer = io.BytesIO()
+    joblib.dump(model, buffer, compress=compress)
+    return buffer.getvalue(), model_format
+
+
+def deserialize_model(model_file: bytes, model_format: Optional[str] = None):
+    """
+    Deserialize a stored model.
+
+    @param model_file: The stored bytes (from 'ml_model.model_file' or the model store).
+    @param model_format: The stored format (None for the legacy rows, which are joblib files).
+    @return: The trained model.
+    """
+    if model_format in XGB_RAW_FORMATS:
+        model = XGBRegressor()
+        model.load_model(bytearray(model_file))
+        params = model.get_booster().attr(XGB_PARAMS_ATTRIBUTE)
+        if params:
+            model.set_params(**json.loads(params))
+        return model
+    return joblib.load(io.BytesIO(model_file))
+
+
+def model_store_path(user_id: int, model_type: str, model_format: str, model_file: bytes) -> str:
+    """
+    Relative path of a model version in the model store (the same relative path is resolved by the Django backend
+    against its own mount of the store). The path contains the hash of the model, so a new version never replaces
+    the file the 'ml_model' row still points to: the row is switched to the new path when it is committed, and
+    only then the previous file is removed (see 'remove_model_store_file').
+
+    @param user_id: The user ID of the model.
+    @param model_type: The type of the model.
+    @param model_format: The stored format.
+    @param model_file: The serialized model.
+    @return: The relative path, e.g., '7/sku_order_quantity_prediction_ml_model-3f9a0c1d2b4e5f60.joblib'.
+    """
+    version = hashlib.sha256(model_file).hexdigest()[:MODEL_VERSION_HASH_LENGTH]
+    return os.path.join(str(user_id), f"{model_type}-{version}.{MODEL_FILE_EXTENSIONS[model_format]}")
+
+
+def write_model_store_file(model_store_dir: str, model_path: str, model_file: bytes) -> None:
+    """
+    Write a model to the model store atomically (temporary file + rename), so that a reader never sees a
+    partially written file and a file already memory-mapped by a reader stays valid.
+
+    @param model_store_dir: The root directory of the model store.
+    @param model_path: The relative path of the model (see 'model_store_path').
+    @param model_file: The serialized model.
+    @return: None
+    """
+    full_path = os.path.join(model_store_dir, model_path)
+    os.makedirs(os.path.dirname(full_path), exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(full_path), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as tmp_file:
+            tmp_file.write(model_file)
+        os.replace(tmp_path, full_path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+
+def remove_model_store_file(model_store_dir: str, model_path: str) -> None:
+    """
+    Remove a model version that no 'ml_model' row points to any more. A reader that has already memory-mapped
+    the file keeps a valid mapping until it releases it.
+
+    @param model_store_dir: The root directory of the model store.
+    @param model_path: The relative path of the model (see 'model_store_path').
+    @return: None
+    """
+    try:
+        os.remove(os.path.join(model_store_dir, model_path))
+    except FileNotFoundError:
+        pass
+
+
+def load_stored_model(ml_model: MlModel, model_store_dir: Optional[str] = None):
+    """
+    Deserialize the model of an 'ml_model' row, from the row itself or from the model store.
+
+    @param ml_model: The stored MlModel (model_file or model_path, model_format).
+    @param model_store_dir: The root directory of the model store (required for rows with a 'model_path').
+    @return: The trained model.
+    @raises ValueError: If the row points to the model store and no store directory is configured.
+    """
+    if ml_model.model_path:
+        if not model_store_dir:
+            raise ValueError(f"Model stored at '{ml_model.model_path}', but no model store is configured.")
+        with open(os.path.join(model_store_dir, ml_model.model_path), "rb") as model_store_file:
+            return deserialize_model(model_store_file.read(), ml_model.model_format)
+    return deserialize_model(ml_model.model_file, ml_model.model_format)
+
+
+def benchmark_model_formats(model, compress_levels: tuple[int, ...] = (0, 1, 3), repeat: int = 3) -> list[dict]:
+    """
+    Measure the size, the serialization time and the load time of a model in every applicable format.
+
+    @param model: The trained model.
+    @param compress_levels: The joblib compression levels to measure.
+    @param repeat: Number of loads per format (the best time is kept).
+    @return: One dictionary per format: {format, compress, size_bytes, dump_seconds, load_seconds}.
+    """
+    candidates = [(MODEL_FORMAT_JOBLIB, level) for level in compress_levels]
+    if isinstance(model, XGBRegressor):
+        candidates += [(model_format, 0) for model_format in XGB_RAW_FORMATS]
+    results = []
+    for model_format, compress in candidates:
+        start_time = time.perf_counter()
+        model_file, _ = serialize_model(model, model_format, compress)
+        dump_seconds = time.perf_counter() - start_time
+        load_seconds = float("inf")
+        for _ in range(repeat):
+            start_time = time.perf_counter()
+            deserialize_model(model_file, model_format)
+            load_seconds = min(load_seconds, time.perf_counter() - start_time)
+        results.append({"format": model_format, "compress": compress, "size_bytes": len(model_file),
+                        "dump_seconds": dump_seconds, "load_seconds": load_seconds})
+    return results
@@ -0,0 +1,77 @@
+"""
+/*
+ * Copyright 2025 DOTSOFT SA, Inc All Rights Reserved.
+ *
+ * Author: Georgios Karanasios R&D Software Engineer
+ */
+"""
+import io
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.compose import ColumnTransformer
+from sklearn.impute import SimpleImputer
+from sklearn.preprocessing import OneHotEncoder
+
+TARGET_COLUMN = "order_item_unit_count"
+
+
+def add_week_column(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Convert 'order_date' to datetime and replace it with its ISO 'week'.
+    The Django backend applies the same conversion before calling the persisted preprocessor.
+
+    @param df: The DataFrame (may or may not contain 'order_date').
+    @return: The DataFrame with 'week' instead of 'order_date'.
+    """
+    if 'order_date' in df.columns:
+        df['order_date'] = pd.to_datetime(df['order_date'], errors='coerce')
+        df['week'] = df['order_date'].dt.isocalendar().week
+        df.drop('order_date', axis=1, inplace=True)
+    return df
+
+
+def fit_preprocessor(X: pd.DataFrame) -> ColumnTransformer:
+    """
+    Fit the preprocessing pipeline on the training features: mean imputation of the numeric columns and
+    one-hot encoding of the categorical (non-numeric) columns.
+    Only sklearn components are used, so the fitted pipeline can be unpickled by the Django backend and
+    applied with a pure 'transform' (same features as in training, no refit per request).
+
+    @param X: The training features (after 'add_week_column', without the target column).
+    @return: The fitted ColumnTransformer (its 'transform' outputs a DataFrame with the model's features).
+    """
+    numeric_columns = X.select_dtypes(include=[np.number]).columns.tolist()
+    categorical_columns = [column for column in X.columns if column not in numeric_columns]
+    preprocessor = ColumnTransformer(
+        transformers=[
+            ("numeric", SimpleImputer(strategy='mean', keep_empty_features=True), numeric_columns),
+            ("categorical", OneHotEncoder(handle_unknown='ignore', sparse_output=False), categorical_columns)
+        ],
+        verbose_feature_names_out=False
+    )
+    preprocessor.set_output(transform="pandas")
+    return preprocessor.fit(X)
+
+
+def serialize_preprocessor(preprocessor: ColumnTransformer) -> bytes:
+    """
+    Serialize a fitted preprocessor (stored in 'ml_model.preprocessor_file').
+
+    @param preprocessor: The fitted ColumnTransformer.
+    @return: The joblib bytes.
+    """
+    buffer = io.BytesIO()
+    joblib.dump(preprocessor, buffer)
+    return buffer.getvalue()
+
+
+def load_preprocessor(preprocessor_file: bytes) -> ColumnTransformer:
+    """
+    Deserialize a stored preprocessor.
+
+    @param preprocessor_file: The joblib bytes (from 'ml_model.preprocessor_file').
+    @return: The fitted ColumnTransformer.
+    """
+    return joblib.load(io.BytesIO(preprocessor_file))
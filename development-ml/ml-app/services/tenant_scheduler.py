@@ -0,0 +1,94 @@
+"""
+/*
+ * Copyright 2025 DOTSOFT SA, Inc All Rights Reserved.
+ *
+ * Author: Georgios Karanasios R&D Software Engineer
+ */
+"""
+import asyncio
+import time
+from typing import Awaitable, Callable, List
+
+from models.models import UserErpApi
+
+TENANT_STATUS_SUCCESS = "success"
+TENANT_STATUS_FAILED = "failed"
+TENANT_STATUS_TIMEOUT = "timeout"
+
+
+async def _run_tenant(
+        user_erp_api: UserErpApi,
+        run_tenant: Callable[[UserErpApi], Awaitable[None]],
+        semaphore: asyncio.Semaphore,
+        timeout_seconds: float
+) -> dict:
+    """
+    Run the pipeline of a single tenant, bounded by the semaphore and the timeout.
+    Any exception is caught and reported, so that it does not affect the other tenants.
+
+    @param user_erp_api: The ERP API configuration of the tenant.
+    @param run_tenant: The (async) pipeline to run for the tenant.
+    @param semaphore: Limits the number of tenants that run at the same time.
+    @param timeout_seconds: Maximum duration of the tenant's pipeline.
+    @return: A dictionary with the tenant's user_id, client_name, status, duration (seconds) and error.
+    """
+    async with semaphore:
+        start_time = time.perf_counter()
+        status, error = TENANT_STATUS_SUCCESS, None
+        try:
+            await asyncio.wait_for(run_tenant(user_erp_api), timeout=timeout_seconds)
+        except asyncio.TimeoutError:
+            status, error = TENANT_STATUS_TIMEOUT, f"Timed out after {timeout_seconds}s"
+        except Exception as exc:
+            status, error = TENANT_STATUS_FAILED, str(exc)
+        return {
+            "user_id": user_erp_api.user_id,
+            "client_name": user_erp_api.client_name,
+            "status": status,
+            "duration": time.perf_counter() - start_time,
+            "error": error
+        }
+
+
+async def run_tenants_concurrently(
+        user_erp_api_list: List[UserErpApi],
+        run_tenant: Callable[[UserErpApi], Awaitable[None]],
+        max_concurrency: int,
+        timeout_seconds: float
+) -> List[dict]:
+    """
+    Run the pipeline of multiple tenants concurrently on the event loop.
+    The I/O parts (ERP fetch, DataFrame assembly) overlap, while the CPU-heavy parts are expected to be
+    dispatched by 'run_tenant' to a (bounded) process pool.
+    Note: on timeout the tenant's coroutine is cancelled, but a job already running in the process pool
+    finishes in the background (its result is discarded).
+
+    @param user_erp_api_list: The ERP API configurations (one per tenant).
+    @param run_tenant: The (async) pipeline to run for every tenant.
+    @param max_concurrency: Maximum number of tenants that run at the same time.
+    @param timeout_seconds: Maximum duration of every tenant's pipeline.
+    @return: The per-tenant results (see '_run_tenant'), in the order of 'user_erp_api_list'.
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+    return await asyncio.gather(*(
+        _run_tenant(user_erp_api, run_tenant, semaphore, timeout_seconds) for user_erp_api in user_erp_api_list
+    ))
+
+
+def print_tenant_summary(results: List[dict], total_duration: float) -> None:
+    """
+    Print a summary of the per-tenant durations and statuses at the end of the run.
+
+    @param results: The per-tenant results returned by 'run_tenants_concurrently'.
+    @param total_duration: The wall-clock duration of the whole run (seconds).
+    @return: None
+    """
+    print("\n📊 Tenant summary:")
+    for result in sorted(results, key=lambda r: r["duration"], reverse=True):
+        line = (f"  - user_id={result['user_id']} ({result['client_name']}): "
+                f"{result['status']} in {result['duration']:.2f}s")
+        if result["error"]:
+            line += f" -> {result['error']}"
+        print(line)
+    succeeded = sum(1 for result in results if result["status"] == TENANT_STATUS_SUCCESS)
+    print(f"  {succeeded}/{len(results)} tenants succeeded, total run time {total_duration:.2f}s\n")
@@ -0,0 +1,218 @@
+"""
+/*
+ * Copyright 2025 DOTSOFT SA, Inc All Rights Reserved.
+ *
+ * Author: Georgios Karanasios R&D Software Engineer
+ */
+"""
+import time
+
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed, effective_n_jobs
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.experimental import enable_halving_search_cv  # noqa: F401 (enables HalvingRandomSearchCV)
+from sklearn.linear_model import LinearRegression, Ridge, BayesianRidge
+from sklearn.metrics import mean_absolute_percentage_error, mean_absolute_error
+from sklearn.model_selection import RandomizedSearchCV, HalvingRandomSearchCV, train_test_split
+from sklearn.svm import SVR
+from sklearn.tree import DecisionTreeRegressor
+from xgboost import XGBRegressor
+
+from utils.constants import SEARCH_STRATEGY_RANDOMIZED, SEARCH_STRATEGY_HALVING
+
+SEARCH_N_ITER = 10  # Number of sampled candidates per model family
+SEARCH_CV = 5  # Number of CV folds
+HALVING_FACTOR = 3  # Proportion of candidates kept (1/factor) on every successive halving iteration
+XGB_VALIDATION_SIZE = 0.2  # Part of the training set held out for the XGBoost early stopping
+
+# Parameter distributions of the hyperparameter searches (per model family)
+PARAM_DISTRIBUTIONS = {
+    'RandomForestRegressor': {
+        'n_estimators': [100, 200, 300],
+        'max_depth': [None, 10, 20, 30],
+        'min_samples_leaf': [1, 2, 4]
+    },
+    'DecisionTreeRegressor': {
+        'max_depth': [None, 10, 20, 30],
+        'min_samples_leaf': [1, 2, 4]
+    },
+    'LinearRegression': {},
+    'Ridge': {
+        'alpha': np.logspace(-4, 4, 10)
+    },
+    'BayesianRidge': {
+        'alpha_1': np.logspace(-6, -1, 6),
+        'alpha_2': np.logspace(-6, -1, 6),
+        'lambda_1': np.logspace(-6, -1, 6),
+        'lambda_2': np.logspace(-6, -1, 6)
+    },
+    'SVR': {
+        'C': np.logspace(-4, 4, 9),
+        'gamma': ['scale', 'auto']
+    },
+    'XGBRegressor': {
+        'n_estimators': [100, 200],
+        'max_depth': [3, 5, 7],
+        'learning_rate': [0.01, 0.1, 0.2]
+    }
+}
+
+
+def build_models(random_state: int, xgb_early_stopping_rounds: int = 0) -> dict:
+    """
+    Create a fresh (unfitted) estimator for every model family.
+    The estimators are single-threaded, because the parallelism is handled by the training engine.
+
+    @param random_state: Seed passed to every estimator that supports it (keeps results reproducible).
+    @param xgb_early_stopping_rounds: Early stopping rounds of the XGBoost model (0 disables early stopping).
+    @return: A dictionary {model_name: estimator}.
+    """
+    return {
+        "RandomForestRegressor": RandomForestRegressor(random_state=random_state, n_jobs=1),
+        "XGBRegressor": XGBRegressor(random_state=random_state, n_jobs=1,
+                                     early_stopping_rounds=xgb_early_stopping_rounds or None),
+        "DecisionTreeRegressor": DecisionTreeRegressor(random_state=random_state),
+        "LinearRegression": LinearRegression(),
+        "Ridge": Ridge(),
+        "BayesianRidge": BayesianRidge(),
+        "SVR": SVR()
+    }
+
+
+def _build_search(name: str, model, search_strategy: str, random_state: int, cv_n_jobs: int):
+    """
+    Create the hyperparameter search object of a model family for the given search strategy.
+
+    - 'randomized': RandomizedSearchCV, every sampled candidate is cross-validated on the full training set.
+    - 'halving': HalvingRandomSearchCV, the same number of candidates start on a small sample budget and only
+      the best 1/HALVING_FACTOR of them move on to the next (bigger) budget. Families without hyperparameters
+      (e.g., LinearRegression) have a single candidate, so they always use the randomized path.
+
+    @param name: The model family name (key of PARAM_DISTRIBUTIONS).
+    @param model: The unfitted estimator.
+    @param search_strategy: One of SEARCH_STRATEGY_RANDOMIZED, SEARCH_STRATEGY_HALVING.
+    @param random_state: Seed of the search.
+    @param cv_n_jobs: Number of jobs used for the CV folds/candidates of this family.
+    @return: The (unfitted) search object.
+    """
+    if search_strategy not in (SEARCH_STRATEGY_RANDOMIZED, SEARCH_STRATEGY_HALVING):
+        raise ValueError(f"Unknown search strategy '{search_strategy}'.")
+    if search_strategy == SEARCH_STRATEGY_HALVING and PARAM_DISTRIBUTIONS[name]:
+        return HalvingRandomSearchCV(model, PARAM_DISTRIBUTIONS[name], n_candidates=SEARCH_N_ITER,
+                                     factor=HALVING_FACTOR, resource='n_samples', cv=SEARCH_CV,
+                                     scoring='neg_mean_absolute_error', random_state=random_state,
+                                     n_jobs=cv_n_jobs)
+    return RandomizedSearchCV(model, PARAM_DISTRIBUTIONS[name], n_iter=SEARCH_N_ITER, cv=SEARCH_CV,
+                              scoring='neg_mean_absolute_error', random_state=random_state,
+                              n_jobs=cv_n_jobs)
+
+
+def _search_compute_saved(search, n_train_samples: int) -> float:
+    """
+    Estimate the share of compute saved by a search against the exhaustive (randomized) path, i.e.,
+    every candidate cross-validated on the full training set. The compute is measured in training samples fitted.
+
+    @param search: A fitted RandomizedSearchCV or HalvingRandomSearchCV.
+    @param n_train_samples: Number of samples of the (full) training set.
+    @return: The saved share of compute, in [0, 1) (0.0 for the randomized path).
+    """
+    if not isinstance(search, HalvingRandomSearchCV):
+        return 0.0
+    used = sum(c * r for c, r in zip(search.n_candidates_, search.n_resources_))
+    exhaustive = search.n_candidates_[0] * n_train_samples
+    return max(0.0, 1 - used / exhaustive)
+
+
+def _search_model_family(
+        name: str,
+        model,
+        X_train: pd.DataFrame,
+        y_train: pd.Series,
+        X_test: pd.DataFrame,
+        y_test: pd.Series,
+        random_state: int,
+        cv_n_jobs: int,
+        search_strategy: str
+) -> tuple[str, object, float, float, float]:
+    """
+    Run the hyperparameter search of a single model family and evaluate its best estimator on the test set.
+    Executed inside a worker process of the training engine. If the XGBoost model has early stopping enabled,
+    a validation split is held out from the training set and used as its 'eval_set'.
+
+    @param name: The model family name (key of PARAM_DISTRIBUTIONS).
+    @param model: The unfitted estimator.
+    @param X_train: Training features.
+    @param y_train: Training target.
+    @param X_test: Test features.
+    @param y_test: Test target.
+    @param random_state: Seed of the search.
+    @param cv_n_jobs: Number of jobs used for the CV folds/candidates of this family.
+    @param search_strategy: One of SEARCH_STRATEGY_RANDOMIZED, SEARCH_STRATEGY_HALVING.
+    @return: (name, best_estimator, mape, mae, elapsed_seconds)
+    """
+    start_time = time.perf_counter()
+    search = _build_search(name, model, search_strategy, random_state, cv_n_jobs)
+    if isinstance(model, XGBRegressor) and model.early_stopping_rounds:
+        X_fit, X_val, y_fit, y_val = train_test_split(X_train, y_train, test_size=XGB_VALIDATION_SIZE,
+                                                      random_state=random_state)
+        search.fit(X_fit, y_fit, eval_set=[(X_val, y_val)], verbose=False)
+        n_train_samples = len(X_fit)
+        best_n_estimators = search.best_estimator_.get_params()['n_estimators']
+        print(f"'{name}' early stopping: best iteration {search.best_estimator_.best_iteration + 1} "
+              f"of {best_n_estimators} boosting rounds")
+    else:
+        search.fit(X_train, y_train)
+        n_train_samples = len(X_train)
+    compute_saved = _search_compute_saved(search, n_train_samples)
+    if compute_saved:
+        print(f"'{name}' {search_strategy} search: {compute_saved:.0%} compute saved against the exhaustive path "
+              f"(candidates per iteration: {search.n_candidates_}, samples: {search.n_resources_})")
+    y_pred = search.best_estimator_.predict(X_test)
+    mape = mean_absolute_percentage_error(y_test, y_pred)
+    mae = mean_absolute_error(y_test, y_pred)
+    return name, search.best_estimator_, mape, mae, time.perf_counter() - start_time
+
+
+def run_model_family_searches(
+        X_train: pd.DataFrame,
+        y_train: pd.Series,
+        X_test: pd.DataFrame,
+        y_test: pd.Series,
+        n_jobs: int,
+        random_state: int,
+        search_strategy: str = SEARCH_STRATEGY_RANDOMIZED,
+        xgb_early_stopping_rounds: int = 0
+) -> dict:
+    """
+    Fan out the model families (and their CV folds) across a process pool (joblib/loky).
+    The available workers are split between the families (outer level) and the CV folds of each
+    family (inner level). Every family is seeded with 'random_state', so the selected model does not
+    depend on the number of workers.
+
+    @param X_train: Training features.
+    @param y_train: Training target.
+    @param X_test: Test features.
+    @param y_test: Test target.
+    @param n_jobs: Total number of workers (-1 means all the available CPU cores).
+    @param random_state: Seed used by the searches and the estimators.
+    @param search_strategy: One of SEARCH_STRATEGY_RANDOMIZED (default), SEARCH_STRATEGY_HALVING.
+    @param xgb_early_stopping_rounds: Early stopping rounds of the XGBoost model (0 disables early stopping).
+    @return: A dictionary {model_name: (best_estimator, mape, mae, elapsed_seconds)} in family order.
+    """
+    models = build_models(random_state, xgb_early_stopping_rounds)
+    total_workers = effective_n_jobs(n_jobs)
+    family_workers = min(len(models), total_workers)
+    cv_workers = max(1, total_workers // family_workers)
+
+    outputs = Parallel(n_jobs=family_workers, backend="loky")(
+        delayed(_search_model_family)(name, model, X_train, y_train, X_test, y_test, random_state, cv_workers,
+                                      search_strategy)
+        for name, model in models.items()
+    )
+
+    results = {}
+    for name, best_estimator, mape, mae, elapsed in outputs:
+        results[name] = (best_estimator, mape, mae, elapsed)
+        print(f"Model family '{name}' trained in {elapsed:.2f}s (MAE: {mae}, MAPE: {mape})")
+    return results
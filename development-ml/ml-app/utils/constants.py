@@ -1 +1,10 @@
 SKU_ORDER_QUANTITY_PREDICTION_MODEL_TYPE = "sku_order_quantity_prediction_ml_model"
+
+# Hyperparameter search strategies of the training pipeline
+SEARCH_STRATEGY_RANDOMIZED = "randomized"
+SEARCH_STRATEGY_HALVING = "halving"
+
+# Storage formats of 'ml_model.model_file' (a NULL 'model_format' is a legacy, uncompressed joblib file)
+MODEL_FORMAT_JOBLIB = "joblib"
+MODEL_FORMAT_XGB_JSON = "xgb_json"
+MODEL_FORMAT_XGB_UBJ = "xgb_ubj"
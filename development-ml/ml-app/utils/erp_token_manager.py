@@ -0,0 +1,98 @@
+"""
+/*
+ * Copyright 2025 DOTSOFT SA, Inc All Rights Reserved.
+ *
+ * Author: Georgios Karanasios R&D Software Engineer
+ */
+"""
+import asyncio
+import base64
+import json
+import time
+from typing import Awaitable, Callable, Optional
+
+from utils.settings import settings
+
+''' Cache of the ERP API Bearer tokens (the same module is used by the ML-App and the SKU Metrics App) '''
+
+
+def jwt_expires_at(token: str) -> Optional[float]:
+    """
+    Read the 'exp' claim (epoch seconds) of a JWT, without verifying its signature (the ERP verifies it).
+
+    @param token: The JWT.
+    @return: The expiration time, or None if the token has no (readable) 'exp' claim.
+    """
+    try:
+        payload = token.split(".")[1]
+        claims = json.loads(base64.urlsafe_b64decode(payload + "=" * (-len(payload) % 4)))
+        return float(claims["exp"])
+    except (IndexError, KeyError, TypeError, ValueError):
+        return None
+
+
+class ErpTokenManager:
+    """
+    Caches the ERP Bearer token of every tenant until shortly before its 'exp' claim, so that the whole pipeline
+    run (and the next runs) reuses it instead of logging in (DB lookup + ERP bcrypt check) on every ERP call.
+    Concurrent refreshes of the same tenant are collapsed into a single login.
+    """
+
+    def __init__(self, refresh_margin_seconds: int = settings.erp_token_refresh_margin_seconds):
+        """
+        @param refresh_margin_seconds: A token is refreshed when it expires in less than this margin.
+        """
+        self.refresh_margin_seconds = refresh_margin_seconds
+        self._tokens: dict[tuple[int, str], tuple[str, float]] = {}
+        self._locks: dict[tuple[int, str], asyncio.Lock] = {}
+        self.logins = 0
+
+    def _get_valid_token(self, key: tuple[int, str]) -> Optional[str]:
+        """
+        @param key: (user_id, auth_url) of the tenant.
+        @return: The cached token, or None if there is none or it is about to expire.
+        """
+        cached = self._tokens.get(key)
+        if cached and cached[1] - self.refresh_margin_seconds > time.time():
+            return cached[0]
+        return None
+
+    async def get_token(self, user_id: int, auth_url: str, login: Callable[[], Awaitable[str]]) -> str:
+        """
+        Return the cached token of a tenant, or log in (once, whatever the number of concurrent callers).
+
+        @param user_id: The ID of the user associated with the ERP API configuration.
+        @param auth_url: The client's API URL for getting the auth token.
+        @param login: The coroutine function requesting a new token from the ERP API.
+        @return: A valid Bearer token.
+        """
+        key = (user_id, auth_url)
+        token = self._get_valid_token(key)
+        if token:
+            return token
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            # Another caller may have refreshed the token while this one was waiting
+            token = self._get_valid_token(key)
+            if token:
+                return token
+            token = await login()
+            self.logins += 1
+            expires_at = jwt_expires_at(token)
+            if expires_at is not None:  # A token without 'exp' is not cached
+                self._tokens[key] = (token, expires_at)
+            return token
+
+    def invalidate(self, user_id: int, auth_url: str) -> None:
+        """
+        Drop the cached token of a tenant (e.g., rejected by the ERP API with 401).
+
+        @param user_id: The ID of the user associated with the ERP API configuration.
+        @param auth_url: The client's API URL for getting the auth token.
+        @return: None
+        """
+        self._tokens.pop((user_id, auth_url), None)
+
+
+# Shared by all the tenants and pipeline steps of the process
+erp_token_manager = ErpTokenManager()
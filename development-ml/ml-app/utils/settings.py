@@ -6,6 +6,8 @@
  */
 """
 
+from typing import Optional
+
 from dotenv import load_dotenv
 from pydantic_settings import BaseSettings
 
@@ -24,6 +26,32 @@ class Settings(BaseSettings):
     db_name: str
     secret_key: str
     django_secured_fields_key: str
+    # Training Configuration
+    training_n_jobs: Optional[int] = None  # Workers per tenant training (None = CPU cores / training_max_workers)
+    training_random_state: int = 42  # Seed of the train/test split, searches and estimators
+    training_search_strategy: str = "randomized"  # Hyperparameter search: 'randomized' or 'halving'
+    training_xgb_early_stopping_rounds: int = 0  # XGBoost early stopping on a validation split (0 = disabled)
+    training_incremental: bool = False  # Warm start the stored model with the new rows instead of a full search
+    training_incremental_estimators: int = 50  # Trees/boosting rounds added on every incremental training
+    training_drift_threshold: float = 0.25  # Relative MAE increase (on new rows) that triggers a full training
+    training_full_retrain_days: int = 7  # Full training on the runs within the first days of every month
+    training_max_workers: int = 2  # Tenants trained at the same time (CPU cores used = workers x training_n_jobs)
+    # Tenant Scheduling Configuration
+    tenant_max_concurrency: int = 4  # Tenants (ERP fetch, DataFrame assembly, training) running at the same time
+    tenant_timeout_seconds: int = 4 * 60 * 60  # Maximum duration of a tenant's pipeline
+    # Model Storage Configuration
+    model_storage_format: str = "joblib"  # 'joblib', or (XGBoost models only) 'xgb_json' / 'xgb_ubj'
+    model_compress_level: Optional[int] = None  # joblib zlib level (None = 0 in the model store for mmap, else 3)
+    model_store_dir: Optional[str] = None  # Store the model files in this directory instead of the database
+    # ERP API Client Configuration
+    erp_page_size: int = 5000  # Records per ERP page (the ERP data is fetched page by page)
+    erp_timeout_seconds: float = 60.0  # Timeout of every ERP API request
+    erp_max_connections: int = 4  # Pooled (keep-alive) connections per ERP API client
+    erp_token_refresh_margin_seconds: int = 60  # Cached ERP tokens are refreshed this long before 'exp'
+    erp_arrow_export: bool = True  # Stream the training data from the ERP Arrow export (JSON pages on 404 / False)
+    # ERP Sync Configuration
+    erp_sync_start_order_date: str = "2023-01-01T00:00:00"  # Start of the ERP history fetched by a full sync
+    erp_enrichment_wait_days: int = 7  # Delta training waits this long for the NULL SkuMetric columns of an order
 
     class Config:
         # Automatically load variables from .env
@@ -6,92 +6,133 @@
  */
 """
 import asyncio
+from datetime import datetime, timedelta
+from typing import Optional
 
 from models.models import UserErpApi
+from repositories.sku_metric_repository import SkuMetricRepository
 from repositories.user_erp_api_repository import UserErpApiRepository
 from services import add_holidays_weekends_weather, add_sku_number_user_id_sku_order_record_id, \
-    fetch_erp_development_service, add_review_sentiment_score_and_timestamp
+    fetch_erp_development_service, add_review_sentiment_score_and_timestamp, erp_sync
+from services.erp_sync import HighWaterMark
 from services.google_trends import add_google_trends
 from services.web_scraping import add_average_competition_price_external
 from utils.database_connection import AsyncSessionLocal
+from utils.settings import settings
+from utils.step_executor import Step, run_dag
 
-
-async def run_step(step_func, step_name: str, *args):
-    """
-    Runs a given asynchronous step function with the provided arguments.
-    Logs any exceptions that occur without interrupting subsequent steps.
-
-    @param step_func: The async function that executes the step logic.
-    @param step_name: A human-readable name for the step (for logging).
-    @param args: Arguments to pass to the step function.
-    """
-    print(f"\nWe are at {step_name}")
-    try:
-        await step_func(*args)
-    except Exception as e:
-        print(f"Error in {step_name}: {e}")
+# Consumer name of the SKU metrics in the 'erp_sync_state' table
+SKU_METRIC_SYNC_CONSUMER = "sku_metric"
 
 
-async def run_steps(user_id: int, erp_sku_order_development_data: list) -> None:
+async def run_steps(user_id: int, erp_sku_order_development_data: list) -> bool:
     """
-    Execute the data processing steps for SKU metrics.
+    Execute the data processing steps for SKU metrics: Step 1 creates the records, then the Steps 2-5
+    (independent of each other, they fill different columns) run concurrently.
 
     @params user_id: int
         The unique identifier of the user associated with the SKU order development data.
     @params erp_sku_order_development_data: list
         A list of dictionaries containing SKU order development data.
+    @return: True if Step 1 succeeded, i.e., the records are stored in 'sku_metric' (the other steps only fill
+             their columns: see 'synced_high_water_mark' for the missing weather, the other columns are retried on
+             the next full sync).
     """
-
-    # Step 1: Populate 'sku_number', 'user_id', and 'sku_order_record_id' first
-    await run_step(
-        add_sku_number_user_id_sku_order_record_id.main,
-        "Step 1 (add_sku_number_user_id_sku_order_record_id)",
-        *[user_id, erp_sku_order_development_data]
-    )
-    # Step 2: Populate 'is_holiday', 'is_weekend', 'rain', 'mean_temperature' columns
-    await run_step(
-        add_holidays_weekends_weather.main,
-        "Step 2 (add_holidays_weekends_weather)",
-        erp_sku_order_development_data
-    )
-    # Step 3: Populate 'trend_value' column
-    await run_step(
-        add_google_trends.main,
-        "Step 3 (add_google_trends)",
-        erp_sku_order_development_data
-    )
-    # Step 4: Populate 'add_average_competition_price_external' column
-    await run_step(
-        add_average_competition_price_external.main,
-        "Step 4 (add_average_competition_price_external)",
-        erp_sku_order_development_data
-    )
-    # Step 5: Populate 'review_sentiment_score' & 'review_sentiment_timestamp' columns
-    await run_step(
-        add_review_sentiment_score_and_timestamp.main,
-        "Step 5 (add_review_sentiment_score_and_timestamp)",
-        erp_sku_order_development_data
-    )
+    step_args = [user_id, erp_sku_order_development_data]
+    timeout = settings.sku_metric_step_timeout_seconds
+    add_records_step = "Step 1 (add_sku_number_user_id_sku_order_record_id)"
+    results = await run_dag([
+        # Step 1: Populate 'sku_number', 'user_id', and 'sku_order_record_id' first
+        Step(add_records_step, add_sku_number_user_id_sku_order_record_id.main, step_args),
+        # Step 2: Populate 'is_holiday', 'is_weekend', 'rain', 'mean_temperature' columns
+        Step("Step 2 (add_holidays_weekends_weather)", add_holidays_weekends_weather.main, step_args,
+             depends_on=[add_records_step], timeout_seconds=timeout),
+        # Step 3: Populate 'trend_value' column
+        Step("Step 3 (add_google_trends)", add_google_trends.main, step_args,
+             depends_on=[add_records_step], timeout_seconds=timeout),
+        # Step 4: Populate 'add_average_competition_price_external' column
+        Step("Step 4 (add_average_competition_price_external)", add_average_competition_price_external.main,
+             step_args, depends_on=[add_records_step], timeout_seconds=timeout),
+        # Step 5: Populate 'review_sentiment_score' & 'review_sentiment_timestamp' columns
+        Step("Step 5 (add_review_sentiment_score_and_timestamp)", add_review_sentiment_score_and_timestamp.main,
+             step_args, depends_on=[add_records_step], timeout_seconds=timeout),
+    ], max_concurrency=settings.sku_metric_max_concurrent_steps)
+    return results[add_records_step].succeeded
+
+
+async def synced_high_water_mark(user_id: int, erp_sku_order_development_data: list) -> Optional[HighWaterMark]:
+    """
+    The high-water mark up to which the records are synced. 'sku_metric' has no 'order_date', so Step 2 can only
+    add the missing weather of a record (e.g., a day the archive has not completed yet) when the ERP sends the
+    record again: the mark stops before the first record of the last 'weather_retry_days' days whose weather is
+    still NULL, and the next delta sync fetches it again. Older records do not hold the mark back (their weather
+    may never become available).
+
+    @param user_id: The user ID of the records.
+    @param erp_sku_order_development_data: The ERP records processed by the steps.
+    @return: The largest ('order_date', 'id') of the synced records, or None if there is none.
+    """
+    retry_after = datetime.now() - timedelta(days=settings.weather_retry_days)
+    recent_records = [
+        record for record in erp_sku_order_development_data
+        if record.get("order_date") is not None and datetime.fromisoformat(record["order_date"]) >= retry_after
+    ]
+    records_without_weather = []
+    if recent_records:
+        async with AsyncSessionLocal() as session:
+            records_without_weather = await SkuMetricRepository(session).filter_in_db_with_null_columns(
+                recent_records, ["mean_temperature", "rain"], "sku_order_record_id", user_id)
+    first_unsynced_mark = erp_sync.records_low_water_mark(records_without_weather)
+    if first_unsynced_mark is not None:
+        print(f"Records without weather from {first_unsynced_mark[0]} (id {first_unsynced_mark[1]}) onward: "
+              f"they are fetched again by the next sync.")
+    return erp_sync.records_high_water_mark(
+        erp_sync.keep_records_before_mark(erp_sku_order_development_data, first_unsynced_mark))
 
 
 async def populate_sku_metrics_table(user_erp_api: UserErpApi):
+    """
+    Sync the ERP SKU orders of a client into the 'sku_metric' table: a delta fetch of the records after the
+    stored high-water mark, or a full fetch of the history (first sync, or periodic reconciliation).
+
+    @param user_erp_api: A 'UserErpApi' object containing ERP API configuration for the user.
+    """
+    user_id = user_erp_api.user_id
     try:
-        # Initialize URLs
-        start_order_date = "?start_order_date=2023-01-01T00:00:00"  # Get data from 2023 and afterward
-        erp_api_get_sku_order_development_url = user_erp_api.sku_order_url
-        full_erp_api_get_sku_order_development_url = f"{erp_api_get_sku_order_development_url}{start_order_date}"
-        auth_url = user_erp_api.login_token_url
+        # Delta or full fetch, depending on the sync state of the client
+        erp_sync_state = await erp_sync.load_erp_sync_state(user_id, SKU_METRIC_SYNC_CONSUMER)
+        full_sync = not settings.erp_incremental_sync or erp_sync.is_full_sync_due(
+            erp_sync_state, settings.erp_full_sync_days)
         # Construct final URLs
-        erp_sku_order_development_data = await fetch_erp_development_service.fetch_erp_development_data(
-            full_erp_api_get_sku_order_development_url, auth_url, user_erp_api.user_id)
+        full_erp_api_get_sku_order_development_url = erp_sync.build_erp_sync_url(
+            user_erp_api.sku_order_url, erp_sync_state, full_sync)
+        auth_url = user_erp_api.login_token_url
+        print(f"{'Full' if full_sync else 'Delta'} ERP sync for user_id: {user_id} "
+              f"({full_erp_api_get_sku_order_development_url})")
+        try:
+            erp_sku_order_development_data = await fetch_erp_development_service.fetch_erp_development_data(
+                full_erp_api_get_sku_order_development_url, auth_url, user_id)
+        except ValueError:
+            erp_sku_order_development_data = []  # No data returned from the ERP API
+        if not full_sync:
+            erp_sku_order_development_data = erp_sync.keep_records_after_mark(
+                erp_sku_order_development_data, erp_sync_state)
+        if not erp_sku_order_development_data:
+            print(f"No new ERP data for user_id: {user_id}. SKU metrics are up to date.")
+            return
         # Start the data processing
-        print(f"Processing data for user_id: {user_erp_api.user_id}")
+        print(f"Processing {len(erp_sku_order_development_data)} records for user_id: {user_id}")
         # # TODO: Delete next line after testing
         # erp_sku_order_development_data = erp_sku_order_development_data[3:4]  # 4th row
-        await run_steps(user_erp_api.user_id, erp_sku_order_development_data)
-        print(f"\nData processing has finished for user_id: {user_erp_api.user_id}")
+        if await run_steps(user_id, erp_sku_order_development_data):
+            # Advance the high-water mark only when the records are stored (and up to the records with weather)
+            await erp_sync.save_erp_sync_state(
+                user_id, SKU_METRIC_SYNC_CONSUMER, erp_sync_state,
+                await synced_high_water_mark(user_id, erp_sku_order_development_data), full_sync
+            )
+        print(f"\nData processing has finished for user_id: {user_id}")
     except Exception as e:
-        print(f"Error in populate_sku_metrics_table for client with user id '{user_erp_api.user_id}': {e}")
+        print(f"Error in populate_sku_metrics_table for client with user id '{user_id}': {e}")
 
 
 async def main():
@@ -6,7 +6,7 @@
  */
 """
 
-from datetime import datetime
+from datetime import date, datetime
 from typing import Optional
 
 from pydantic import BaseModel
@@ -56,3 +56,34 @@ class UserErpApi(BaseModel):
     user_id: int
 
     model_config = {"from_attributes": True}
+
+
+class ErpSyncState(BaseModel):
+    """
+    The ERP sync state of a consumer (e.g., 'sku_metric') for a given user: the high-water mark
+    ('order_date', 'id') of the latest synced ERP record and the time of the last full reconciliation.
+    """
+    id: Optional[int] = None
+    consumer: str
+    last_order_date: Optional[datetime] = None
+    last_record_id: Optional[int] = None
+    last_full_sync_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+    user_id: int
+
+    model_config = {"from_attributes": True}
+
+
+class WeatherDaily(BaseModel):
+    """
+    The (cached) historical weather of a location on a day.
+    """
+    id: Optional[int] = None
+    latitude: float
+    longitude: float
+    weather_date: date
+    mean_temperature: float
+    rain: bool
+    created_at: Optional[datetime] = None
+
+    model_config = {"from_attributes": True}
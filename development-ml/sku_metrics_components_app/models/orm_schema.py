@@ -6,7 +6,7 @@
  */
 """
 
-from sqlalchemy import Column, Integer, String, TIMESTAMP, func, Boolean, Float, ForeignKey
+from sqlalchemy import Column, Integer, String, TIMESTAMP, func, Boolean, Float, ForeignKey, UniqueConstraint, Date
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 from sqlalchemy_utils import EncryptedType
@@ -74,3 +74,34 @@ class UserErpApiORM(Base):
     user_id = Column(Integer, ForeignKey('login_user.id', ondelete="CASCADE"), nullable=False, unique=True)
 
     user = relationship("LoginUserORM", back_populates="user_erp_api")
+
+
+class ErpSyncStateORM(Base):
+    __tablename__ = 'erp_sync_state'
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    consumer = Column(String, nullable=False)  # e.g., 'sku_metric' or 'sku_order_quantity_prediction_ml_model'
+    last_order_date = Column(TIMESTAMP, nullable=True)  # High-water mark: 'order_date' of the latest synced record
+    last_record_id = Column(Integer, nullable=True)  # High-water mark: ERP 'id' of the latest synced record
+    last_full_sync_at = Column(TIMESTAMP, nullable=True)  # Last full (reconciliation) fetch of the ERP history
+    updated_at = Column(TIMESTAMP, server_default=func.now(), onupdate=func.now(), nullable=False)
+    user_id = Column(Integer, ForeignKey('login_user.id', ondelete="CASCADE"), nullable=False)
+
+    # One sync state per consumer and user
+    __table_args__ = (UniqueConstraint('consumer', 'user_id', name='uq_erp_sync_state_consumer_user'),)
+
+class WeatherDailyORM(Base):
+    __tablename__ = 'weather_daily'
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    latitude = Column(Float, nullable=False)
+    longitude = Column(Float, nullable=False)
+    weather_date = Column(Date, nullable=False)
+    mean_temperature = Column(Float, nullable=False)  # Average of the hourly temperatures (Celsius) of the day
+    rain = Column(Boolean, nullable=False)  # True if there was any precipitation during the day
+    created_at = Column(TIMESTAMP, server_default=func.now(), nullable=False)
+
+    # Cache of the historical weather: one record per location and day
+    __table_args__ = (
+        UniqueConstraint('latitude', 'longitude', 'weather_date', name='uq_weather_daily_location_date'),
+    )
@@ -6,9 +6,10 @@
  */
 """
 
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Sequence
 
-from sqlalchemy import update, select, and_
+from sqlalchemy import update, select, and_, func, bindparam, any_, Integer
+from sqlalchemy.dialects.postgresql import ARRAY, insert
 from sqlalchemy.exc import NoResultFound
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -164,6 +165,81 @@ class SkuMetricRepository:
             await self.session.rollback()
             raise Exception(f"update_sku_metric_review_sentiment(): {e}")
 
+    async def bulk_upsert_sku_metrics(
+            self,
+            sku_metrics: List[SkuMetric],
+            columns: Sequence[str],
+            batch_size: int
+    ) -> int:
+        """
+        Inserts records in the `sku_metric` table in batches ('INSERT ... SELECT FROM unnest(...) ON CONFLICT
+        (sku_order_record_id) DO UPDATE'): a record whose `sku_order_record_id` exists already gets the given
+        columns updated. Every batch is a single statement, committed once.
+
+        @param sku_metrics: The pydantic SkuMetric objects containing the data of the records
+                            (a `sku_order_record_id` must appear once).
+        @param columns: The written columns, besides `sku_order_record_id` (e.g., ['sku_number', 'user_id']).
+        @param batch_size: The number of records per statement (and commit).
+        @return: The number of written records.
+        """
+        batch_columns = ("sku_order_record_id", *columns)
+        batch_values = _unnest_rows(batch_columns)
+        stmt = insert(SkuMetricORM.__table__).from_select(
+            batch_columns, select(*[batch_values.c[col] for col in batch_columns])
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[SkuMetricORM.sku_order_record_id],
+            set_={
+                **{col: stmt.excluded[col] for col in columns},
+                "updated_at": func.now(),
+            }
+        )
+        try:
+            for batch in _batches(sku_metrics, batch_size):
+                await self.session.execute(stmt, _array_params(batch, batch_columns))
+                await self.session.commit()
+            return len(sku_metrics)
+        except Exception as e:
+            await self.session.rollback()
+            raise Exception(f"bulk_upsert_sku_metrics(): {e}")
+
+    async def bulk_update_sku_metrics(
+            self,
+            sku_metrics: List[SkuMetric],
+            columns: Sequence[str],
+            batch_size: int
+    ) -> int:
+        """
+        Updates the given columns of records in the `sku_metric` table, matched by `sku_order_record_id`, in
+        batches ('UPDATE ... FROM unnest(...)'). Every batch is a single statement, committed once.
+
+        @param sku_metrics: The pydantic SkuMetric objects containing the data to update the records.
+        @param columns: The updated columns (e.g., ['trend_value']).
+        @param batch_size: The number of records per statement (and commit).
+        @return: The number of updated records (the records that do not exist in the DB are skipped).
+        """
+        batch_columns = ("sku_order_record_id", *columns)
+        batch_values = _unnest_rows(batch_columns)
+        stmt = (
+            update(SkuMetricORM)
+            .where(SkuMetricORM.sku_order_record_id == batch_values.c.sku_order_record_id)
+            .values({
+                **{col: batch_values.c[col] for col in columns},
+                "updated_at": func.now(),
+            })
+            .execution_options(synchronize_session=False)
+        )
+        updated = 0
+        try:
+            for batch in _batches(sku_metrics, batch_size):
+                result = await self.session.execute(stmt, _array_params(batch, batch_columns))
+                updated += result.rowcount
+                await self.session.commit()
+            return updated
+        except Exception as e:
+            await self.session.rollback()
+            raise Exception(f"bulk_update_sku_metrics(): {e}")
+
     async def filter_erp_records_not_in_db(
             self,
             erp_sku_order_development_data: List[Dict[str, Any]],
@@ -173,13 +249,18 @@ class SkuMetricRepository:
         Returns only those records from 'erp_sku_order_development_data'
         that do NOT exist in the 'sku_metric' table based on the given 'db_column_name'.
 
+        Only the ERP 'id's are looked up (an '= ANY(:ids)' array parameter), so the query scales with the ERP
+        records, not with the table. The lookup is not scoped by user: 'sku_order_record_id' is unique in the
+        whole table, so a record stored for any user already exists.
+
         @param erp_sku_order_development_data: A list of dictionaries from the ERP system.
         @param db_column_name: The column in `sku_metric` to compare against (e.g., 'sku_order_record_id').
         @return: A list of dictionaries (ERP records) that are not present in the DB.
         """
-        # Fetch all existing values of the given column from the database
+        db_column = getattr(SkuMetricORM, db_column_name)
+        # Fetch the existing values of the given column among the ERP 'id's
         result = await self.session.execute(
-            select(getattr(SkuMetricORM, db_column_name))
+            select(db_column).where(db_column == any_(_candidate_ids_param(erp_sku_order_development_data)))
         )
         existing_ids = {row[0] for row in result.all()}
         # Compare each ERP record's 'id' against these existing IDs
@@ -195,19 +276,23 @@ class SkuMetricRepository:
             self,
             erp_sku_order_development_data: List[Dict[str, Any]],
             db_null_column_names: List[str],
-            db_identity_unique_col_name: str
+            db_identity_unique_col_name: str,
+            user_id: int
     ) -> List[Dict[str, Any]]:
         """
         Returns only those ERP records that:
-          1) Already exist in `sku_metric` (matched by `db_unique_col` == ERP record["id"]).
+          1) Already exist in `sku_metric` for the given user (matched by `db_unique_col` == ERP record["id"]).
           2) Have ALL of the columns in `db_column_names` set to NULL in the DB.
 
         For example, if db_column_names = ["mean_temperature", "rain"],
         this method returns records in which both mean_temperature and rain are NULL in the DB.
+        Only the ERP 'id's are looked up (an '= ANY(:ids)' array parameter), so the query scales with the ERP
+        records, not with the table.
 
         @param erp_sku_order_development_data: A list of dictionaries from ERP data, each having an "id" that maps to db_unique_col.
         @param db_null_column_names: The list of columns to check for NULL in the DB.
         @param db_identity_unique_col_name: The DB column that maps to the "id" field in the ERP records (default "sku_order_record_id").
+        @param user_id: The user to whom the ERP records belong.
         @return: A filtered list of dictionaries from ERP data that meet the above criteria.
         """
         # Build an AND condition: each column must be NULL
@@ -219,9 +304,14 @@ class SkuMetricRepository:
                 raise ValueError(f"Column '{col}' does not exist in SkuMetricORM.")
             null_conditions.append(col_attr.is_(None))
 
-        # We'll fetch all DB rows whose db_null_column_names are all NULL
+        # We'll fetch the user's DB rows, among the ERP 'id's, whose db_null_column_names are all NULL
         # (and we only need the unique column to match back to ERP data).
-        stmt = select(getattr(SkuMetricORM, db_identity_unique_col_name)).where(and_(*null_conditions))
+        identity_column = getattr(SkuMetricORM, db_identity_unique_col_name)
+        stmt = select(identity_column).where(
+            SkuMetricORM.user_id == user_id,
+            identity_column == any_(_candidate_ids_param(erp_sku_order_development_data)),
+            and_(*null_conditions)
+        )
         result = await self.session.execute(stmt)
         existing_ids_with_nulls = {row[0] for row in result.fetchall()}
 
@@ -232,3 +322,46 @@ class SkuMetricRepository:
         ]
 
         return filtered_records
+
+
+def _candidate_ids_param(erp_sku_order_development_data: List[Dict[str, Any]]):
+    """
+    @param erp_sku_order_development_data: A list of dictionaries from ERP data.
+    @return: The (distinct) ERP 'id's as an integer array parameter (for '= ANY(:candidate_ids)').
+    """
+    candidate_ids = list({record["id"] for record in erp_sku_order_development_data if record.get("id") is not None})
+    return bindparam("candidate_ids", candidate_ids, type_=ARRAY(Integer))
+
+
+def _batches(sku_metrics: List[SkuMetric], batch_size: int):
+    """
+    @param sku_metrics: The pydantic SkuMetric objects.
+    @param batch_size: The maximum number of objects per batch.
+    @return: A generator of the consecutive batches of the objects.
+    """
+    for start in range(0, len(sku_metrics), batch_size):
+        yield sku_metrics[start:start + batch_size]
+
+
+def _unnest_rows(columns: Sequence[str]):
+    """
+    The rows of a batch as a derived table 'batch_values': one typed array parameter per column, zipped by
+    'unnest'. Unlike a VALUES list, the statement does not depend on the number of rows (or their data), so
+    it is compiled once and sent with a fixed number of parameters, whatever the batch size.
+
+    @param columns: The columns of the rows (names of `sku_metric` columns).
+    @return: The 'unnest(...) AS batch_values(...)' table-valued function.
+    """
+    table_columns = SkuMetricORM.__table__.c
+    return func.unnest(
+        *[bindparam(f"{col}_values", type_=ARRAY(table_columns[col].type)) for col in columns]
+    ).table_valued(*columns).render_derived(name="batch_values")
+
+
+def _array_params(sku_metrics: List[SkuMetric], columns: Sequence[str]) -> Dict[str, List[Any]]:
+    """
+    @param sku_metrics: The pydantic SkuMetric objects of a batch.
+    @param columns: The columns of the rows.
+    @return: The array parameters of '_unnest_rows' (one list of values per column).
+    """
+    return {f"{col}_values": [getattr(sku_metric, col) for sku_metric in sku_metrics] for col in columns}
@@ -0,0 +1,76 @@
+"""
+/*
+ * Copyright 2025 DOTSOFT SA, Inc All Rights Reserved.
+ *
+ * Author: Georgios Karanasios R&D Software Engineer
+ */
+"""
+from datetime import date
+from typing import Dict, Iterable, List
+
+from sqlalchemy import select, any_, bindparam, Date
+from sqlalchemy.dialects.postgresql import ARRAY, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models.models import WeatherDaily
+from models.orm_schema import WeatherDailyORM
+
+# Days per INSERT statement of 'save_weather_days'
+SAVE_BATCH_SIZE = 1000
+
+
+class WeatherDailyRepository:
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def get_weather_days(
+            self,
+            latitude: float,
+            longitude: float,
+            dates: Iterable[date]
+    ) -> Dict[date, WeatherDaily]:
+        """
+        Retrieves the cached weather of a location on the given dates.
+
+        @param latitude: The latitude of the location.
+        @param longitude: The longitude of the location.
+        @param dates: The dates.
+        @return: The WeatherDaily objects of the cached dates, by date (the dates that are not cached are missing).
+        """
+        try:
+            result = await self.session.execute(
+                select(WeatherDailyORM).where(
+                    WeatherDailyORM.latitude == latitude,
+                    WeatherDailyORM.longitude == longitude,
+                    WeatherDailyORM.weather_date == any_(bindparam("dates", list(set(dates)), type_=ARRAY(Date)))
+                )
+            )
+            return {
+                record.weather_date: WeatherDaily.model_validate(record) for record in result.scalars().all()
+            }
+        except Exception as e:
+            raise Exception(f"get_weather_days(): {e}")
+
+    async def save_weather_days(self, weather_days: List[WeatherDaily]) -> None:
+        """
+        Stores the weather of a location on some days (a day that is cached already is left as it is).
+
+        @param weather_days: The WeatherDaily objects.
+        """
+        rows = [
+            weather_day.model_dump(include={"latitude", "longitude", "weather_date", "mean_temperature", "rain"})
+            for weather_day in weather_days
+        ]
+        try:
+            # Multi-row INSERTs (a few years of days per statement, within the bind parameter limit)
+            for start in range(0, len(rows), SAVE_BATCH_SIZE):
+                await self.session.execute(
+                    insert(WeatherDailyORM)
+                    .values(rows[start:start + SAVE_BATCH_SIZE])
+                    .on_conflict_do_nothing(constraint="uq_weather_daily_location_date")
+                )
+            await self.session.commit()
+        except Exception as e:
+            await self.session.rollback()
+            raise Exception(f"save_weather_days(): {e}")
@@ -6,16 +6,28 @@
  */
 """
 
-from datetime import datetime
-from typing import List
+import asyncio
+from datetime import date, datetime
+from typing import Iterable, List, Tuple
 
 import holidays
+import httpx
 import pandas as pd
-import requests
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from models.models import SkuMetric
+from models.models import SkuMetric, WeatherDaily
 from repositories.sku_metric_repository import SkuMetricRepository
+from repositories.weather_daily_repository import WeatherDailyRepository
 from utils.database_connection import AsyncSessionLocal
+from utils.settings import settings
+
+# The location of the weather data
+ATHENS_LATITUDE = 37.9838
+ATHENS_LONGITUDE = 23.7275
+# The maximum number of days of an Open-Meteo request
+MAX_RANGE_DAYS = 366
+# Ranges separated by up to this many days (e.g., a weekend without orders) are fetched with one request
+MAX_GAP_DAYS = 3
 
 
 def get_public_holidays(year: int) -> List[datetime]:
@@ -49,83 +61,204 @@ def add_weekend_holiday_columns(df: pd.DataFrame) -> pd.DataFrame:
     return df
 
 
-def get_historical_weather_open_meteo(date: datetime.date) -> tuple[float | None, bool]:
+def group_contiguous_dates(
+        dates: Iterable[date], max_range_days: int = MAX_RANGE_DAYS, max_gap_days: int = MAX_GAP_DAYS
+) -> List[Tuple[date, date]]:
+    """
+    Group distinct dates into ranges of consecutive days (one Open-Meteo request per range). Ranges separated
+    by a small gap are merged: a few extra days in a response cost less than an extra request.
+
+    @param dates: The dates (duplicates are allowed).
+    @param max_range_days: The maximum number of days of a range (bounds the size of a response).
+    @param max_gap_days: The maximum number of missing days between two dates of the same range.
+    @return: A sorted list of (start_date, end_date) tuples, both inclusive.
+    """
+    ranges = []
+    for day in sorted(set(dates)):
+        if ranges and (day - ranges[-1][1]).days <= max_gap_days + 1 and (day - ranges[-1][0]).days < max_range_days:
+            ranges[-1] = (ranges[-1][0], day)
+        else:
+            ranges.append((day, day))
+    return ranges
+
+
+async def fetch_hourly_weather(client: httpx.AsyncClient, start_date: date, end_date: date) -> pd.DataFrame:
     """
-    Fetch historical weather data (temperature and precipitation/rain) for a given date using the Open-Meteo API.
+    Fetch historical hourly weather data (temperature and precipitation/rain) for a range of dates using the
+    Open-Meteo API.
 
-    @param date: A datetime.date object representing the date for which weather data is requested.
-    @return: A tuple containing:
-             - avg_temp (float or None): The average temperature (in Celsius) for the given date, or None if data is unavailable.
-             - rain (bool): True if there was any precipitation (rain) on the given date, False otherwise.
+    @param client: The HTTP client.
+    @param start_date: The first date of the range.
+    @param end_date: The last date of the range (inclusive).
+    @return: A DataFrame with the columns 'time', 'temperature_2m' and 'precipitation' (one row per hour),
+             empty if no data is available.
+    @raises httpx.HTTPStatusError: If the response status is not 2xx.
     """
-    # Base API URL for Open-Meteo historical weather data
-    url = "https://archive-api.open-meteo.com/v1/era5"
     params = {
-        'latitude': 37.9838,  # Athens latitude
-        'longitude': 23.7275,  # Athens longitude
-        'start_date': date.strftime('%Y-%m-%d'),  # Format start date as YYYY-MM-DD
-        'end_date': date.strftime('%Y-%m-%d'),  # Format end date as YYYY-MM-DD (same as start_date for one day)
+        'latitude': ATHENS_LATITUDE,
+        'longitude': ATHENS_LONGITUDE,
+        'start_date': start_date.strftime('%Y-%m-%d'),  # Format start date as YYYY-MM-DD
+        'end_date': end_date.strftime('%Y-%m-%d'),  # Format end date as YYYY-MM-DD
         'hourly': 'temperature_2m,precipitation'  # Request hourly temperature and precipitation data
     }
-    response = requests.get(url, params=params)
-    data = response.json()
-    # Check if hourly data is present in the response
-    if 'hourly' in data:
-        temperatures = data['hourly'].get('temperature_2m', [])  # Get hourly temperature data
-        precipitation = data['hourly'].get('precipitation', [])  # Get hourly precipitation data
-        # Calculate the average temperature if temperature data is available
-        if temperatures:
-            avg_temp = sum(temperatures) / len(temperatures)
-        else:
-            avg_temp = None
-        # Determine if there was any precipitation
-        rain = any(p > 0 for p in precipitation)
-        # Return the average temperature and rain status
-        return avg_temp, rain
-    else:
-        return None, None  # Return None values if no data is available
+    response = await client.get(settings.open_meteo_archive_url, params=params)
+    response.raise_for_status()
+    hourly = response.json().get('hourly') or {}
+    return pd.DataFrame({
+        'time': hourly.get('time', []),
+        'temperature_2m': hourly.get('temperature_2m', []),
+        'precipitation': hourly.get('precipitation', []),
+    })
+
+
+def aggregate_daily_weather(hourly_weather: pd.DataFrame) -> pd.DataFrame:
+    """
+    Aggregate hourly weather data per day.
+
+    @param hourly_weather: A DataFrame with the columns 'time', 'temperature_2m' and 'precipitation'.
+    @return: A DataFrame indexed by date with the columns:
+             - 'mean_temperature': The average temperature (in Celsius) of the day (NaN if unavailable).
+             - 'rain': True if there was any precipitation (rain) on the day, False otherwise, None if the day
+               has no precipitation data.
+             - 'is_complete': True if every hour of the day has data (the archive completes the latest days
+               a few days later, so only the complete days are cached).
+    """
+    days = pd.to_datetime(hourly_weather['time']).dt.date
+    precipitation = pd.to_numeric(hourly_weather['precipitation'])
+    hourly_weather = hourly_weather.assign(
+        temperature_2m=pd.to_numeric(hourly_weather['temperature_2m']),
+        precipitation=precipitation,
+        rain_hour=precipitation > 0,  # False for the hours without data too: see 'precipitation_hours'
+    )
+    daily_weather = hourly_weather.groupby(days).agg(
+        mean_temperature=('temperature_2m', 'mean'),
+        rain=('rain_hour', 'any'),
+        temperature_hours=('temperature_2m', 'count'),
+        precipitation_hours=('precipitation', 'count'),
+    )
+    # A day without precipitation data is not a day without rain
+    daily_weather['rain'] = daily_weather['rain'].astype(object).where(daily_weather['precipitation_hours'] > 0, None)
+    daily_weather['is_complete'] = (daily_weather['temperature_hours'] == 24) & (
+            daily_weather['precipitation_hours'] == 24)
+    return daily_weather[['mean_temperature', 'rain', 'is_complete']]
+
+
+async def fetch_daily_weather(date_ranges: List[Tuple[date, date]]) -> pd.DataFrame:
+    """
+    Fetch the daily weather of ranges of dates using the Open-Meteo API: one request per range, at most
+    'WEATHER_MAX_CONCURRENT_REQUESTS' at the same time.
+
+    @param date_ranges: The (start_date, end_date) ranges of dates (see 'group_contiguous_dates').
+    @return: The daily weather (see 'aggregate_daily_weather').
+    """
+    # The semaphore bounds the requests in flight, so the timeout covers a request, not its wait for a connection
+    semaphore = asyncio.Semaphore(settings.weather_max_concurrent_requests)
+    limits = httpx.Limits(max_connections=settings.weather_max_concurrent_requests)
+    timeout = httpx.Timeout(settings.weather_timeout_seconds, pool=None)
+
+    async def fetch(start_date: date, end_date: date) -> pd.DataFrame:
+        async with semaphore:
+            return await fetch_hourly_weather(client, start_date, end_date)
+
+    async with httpx.AsyncClient(timeout=timeout, limits=limits) as client:
+        hourly_weather = await asyncio.gather(*[fetch(start_date, end_date) for start_date, end_date in date_ranges])
+    return aggregate_daily_weather(pd.concat(hourly_weather, ignore_index=True))
+
+
+async def get_historical_weather_open_meteo(
+        session: AsyncSession,
+        dates: Iterable[date],
+        latitude: float = ATHENS_LATITUDE,
+        longitude: float = ATHENS_LONGITUDE
+) -> pd.DataFrame:
+    """
+    Get the daily weather of the given dates: from the weather cache ('weather_daily' table), and from the
+    Open-Meteo API for the dates that are not cached (one request per range of consecutive dates, sent
+    concurrently). The fetched complete days are added to the cache (the weather of a past day does not change);
+    the incomplete days (not completed by the archive yet) are returned as missing instead of with partial
+    weather. Their orders keep NULL weather, and the sync mark stops before them (see 'synced_high_water_mark' in
+    main.py), so the next delta sync sends them to Step 2 again.
+
+    @param session: An active AsyncSession instance for performing database operations.
+    @param dates: The dates for which weather data is requested (duplicates are allowed).
+    @param latitude: The latitude of the location.
+    @param longitude: The longitude of the location.
+    @return: A DataFrame indexed by the dates that have complete weather data, with the columns
+             'mean_temperature' and 'rain' (see 'aggregate_daily_weather').
+    """
+    requested_dates = set(dates)
+    weather_repo = WeatherDailyRepository(session)
+    cached_days = await weather_repo.get_weather_days(latitude, longitude, requested_dates)
+    date_ranges = group_contiguous_dates(requested_dates - cached_days.keys())
+    daily_weather = pd.DataFrame(
+        [(day.weather_date, day.mean_temperature, day.rain) for day in cached_days.values()],
+        columns=['date', 'mean_temperature', 'rain']
+    ).set_index('date')
+    if date_ranges:
+        fetched_weather = await fetch_daily_weather(date_ranges)
+        complete_days = fetched_weather[fetched_weather['is_complete']]
+        await weather_repo.save_weather_days([
+            WeatherDaily(latitude=latitude, longitude=longitude, weather_date=day,
+                         mean_temperature=row.mean_temperature, rain=row.rain)
+            for day, row in complete_days.iterrows()
+        ])
+        fetched_weather = complete_days[['mean_temperature', 'rain']]
+        daily_weather = pd.concat([daily_weather, fetched_weather]) if cached_days else fetched_weather
+    hit_rate = len(cached_days) / len(requested_dates) if requested_dates else 1.0
+    print(f"Weather cache: {len(cached_days)} of {len(requested_dates)} dates cached (hit rate {hit_rate:.1%}), "
+          f"{len(requested_dates) - len(cached_days)} dates fetched in {len(date_ranges)} request(s)")
+    return daily_weather
 
 
-def add_weather_columns(df: pd.DataFrame) -> pd.DataFrame:
+async def add_weather_columns(session: AsyncSession, df: pd.DataFrame) -> pd.DataFrame:
     """
     Add weather-related columns to a DataFrame based on historical weather data.
 
     This function adds two new columns:
     - 'mean_temperature': The average temperature (in Celsius) for the order date.
     - 'rain': A boolean column indicating if there was precipitation (rain) on the order date.
+    Both are None if the weather of the order date is unavailable or incomplete (the order is sent again by the
+    next delta sync: see 'synced_high_water_mark' in main.py).
 
+    @param session: An active AsyncSession instance for performing database operations (weather cache).
     @param df: A pandas DataFrame containing an 'order_date' column with datetime or date values.
     @return: The modified DataFrame with the two above additional columns:
     """
     # Convert the 'order_date' column to datetime and extract only the date part
     df['date'] = pd.to_datetime(df['order_date']).dt.date
-    # Fetch historical weather data (avg temperature and rain status) for each date from meteo
-    weather_data = df['date'].apply(get_historical_weather_open_meteo)
-    df['mean_temperature'] = weather_data.apply(lambda x: x[0])  # average temperature = first element of the tuple
-    df['rain'] = weather_data.apply(lambda x: x[1])  # rain status = second element of the tuple
+    # Get historical weather data (avg temperature and rain status) once per distinct date (cache, then meteo)
+    daily_weather = await get_historical_weather_open_meteo(session, df['date'])
+    # Map the weather of every date back to the orders
+    for column in ('mean_temperature', 'rain'):
+        values = df['date'].map(daily_weather[column])
+        df[column] = values.astype(object).where(values.notna(), None)
     # Return the DataFrame with the new columns added
     return df
 
 
-async def process_sku_orders(session: AsyncSessionLocal(), erp_sku_order_development_data: list) -> None:
+async def process_sku_orders(session: AsyncSessionLocal(), user_id: int, erp_sku_order_development_data: list) -> None:
     """
     Main function to process SKU orders:
       1. Process the SKU data to enrich it with weekend/holiday and weather information.
       2. Store the processed records in the 'sku_metric' table using SkuMetricRepository.
     @param session: An active AsyncSession instance for performing database operations
+    @param user_id: The unique identifier of the web app user to whom the data belongs
     @param erp_sku_order_development_data: A list containing the user's SKU order data retrieved from the ERP
     @return: None
     """
     try:
         # Initialize the repositories for SKU metrics
         sku_metric_repo = SkuMetricRepository(session)
-        # We do not want to work with DB records that already have populated these columns
+        # We do not want to work with DB records that already have their weather (the weekend/holiday columns
+        # are filled in the same write, so the records whose weather was unavailable are retried when the ERP
+        # sends them again: see 'synced_high_water_mark' in main.py)
         filtered_erp_sku_order_development_data = await sku_metric_repo.filter_in_db_with_null_columns(
             erp_sku_order_development_data,
-            ["is_weekend", "is_holiday", "mean_temperature", "rain"],
-            "sku_order_record_id")
+            ["mean_temperature", "rain"],
+            "sku_order_record_id",
+            user_id)
         if not filtered_erp_sku_order_development_data:
-            print("No rows found with NULL 'is_weekend, is_holiday, mean_temperature, rain'")
+            print("No rows found with NULL 'mean_temperature, rain'")
             return
         # Process the data in a DataFrame
         df = pd.DataFrame(filtered_erp_sku_order_development_data)
@@ -133,31 +266,34 @@ async def process_sku_orders(session: AsyncSessionLocal(), erp_sku_order_develop
         df = add_weekend_holiday_columns(df)
         print("add_weekend_holiday_columns: success")
         # Add weather-related columns to the DataFrame
-        df = add_weather_columns(df)
+        df = await add_weather_columns(session, df)
         print("add_weather_columns: success")
-        # Store each processed record in the 'sku_metric' df
-        for _, row in df.iterrows():
-            # Build the Pydantic SkuMetric model with the processed data
-            sku_metric = SkuMetric(
+        # Build the Pydantic SkuMetric models with the processed data
+        sku_metrics = [
+            SkuMetric(
                 is_weekend=row.get("is_weekend"),
                 is_holiday=row.get("is_holiday"),
                 mean_temperature=row.get("mean_temperature"),
                 rain=row.get("rain"),
                 sku_order_record_id=row.get("id")
             )
-            # Save or update the record in the database
-            await sku_metric_repo.update_sku_metric_holidays_weekends_weather(sku_metric)
+            for _, row in df.iterrows()
+        ]
+        # Update the records in the database (in batches)
+        await sku_metric_repo.bulk_update_sku_metrics(
+            sku_metrics, ["is_weekend", "is_holiday", "mean_temperature", "rain"],
+            settings.sku_metric_write_batch_size)
         print("Data of 'holidays, weekends, weather' added successfully in sku_metric.")
-    except requests.HTTPError as http_err:
-        raise requests.HTTPError(f"process_sku_orders(): HTTP error occurred when calling ERP API: {http_err}")
+    except httpx.HTTPError as http_err:
+        raise httpx.HTTPError(f"process_sku_orders(): HTTP error occurred when calling Open-Meteo API: {http_err}")
     except Exception as exc:
         raise Exception(f"process_sku_orders(): An unexpected error occurred: {exc}")
 
 
-async def main(erp_sku_order_development_data: list):
+async def main(user_id: int, erp_sku_order_development_data: list):
     try:
         async with AsyncSessionLocal() as session:
-            await process_sku_orders(session, erp_sku_order_development_data)
+            await process_sku_orders(session, user_id, erp_sku_order_development_data)
     except Exception as e:
         await session.rollback()
         raise e
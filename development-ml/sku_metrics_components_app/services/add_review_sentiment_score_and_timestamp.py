@@ -19,6 +19,8 @@ from repositories.sku_metric_repository import SkuMetricRepository
 from services.web_scraping import products_reviews_scraping
 from services.web_scraping.shared import translate_texts_to_english
 from utils.database_connection import AsyncSessionLocal
+from utils.settings import settings
+from utils.step_executor import check_step_deadline
 
 
 def analyze_sentiment(review: str) -> float:
@@ -85,8 +87,10 @@ async def process_reviews_sentiment_score_and_timestamp(session: AsyncSession, r
         print("No reviews data found to process sentiment.")
         return
     grouped = df.groupby("sku_order_record_id")
+    metric_updates = []
     # Iterate through each product group
     for sku_order_record_id, group in grouped:
+        check_step_deadline()  # Stop between products if the step is over its timeout
         scores = []
         # Iterate each product's reviews
         for _, row in group.iterrows():
@@ -116,25 +120,28 @@ async def process_reviews_sentiment_score_and_timestamp(session: AsyncSession, r
             avg_score = None
             sentiment = None
         # Build a SkuMetric object to update
-        metric_update = SkuMetric(
+        metric_updates.append(SkuMetric(
             sku_order_record_id=sku_order_record_id,
             review_sentiment_score=avg_score,
             review_sentiment_timestamp=datetime.now(),
-        )
-        # Update the DB
-        sku_metric_repo = SkuMetricRepository(session)
-        await sku_metric_repo.update_sku_metric_review_sentiment_score_and_timestamp(metric_update)
-
+        ))
+    # Update the DB (in batches)
+    sku_metric_repo = SkuMetricRepository(session)
+    await sku_metric_repo.bulk_update_sku_metrics(
+        metric_updates, ["review_sentiment_score", "review_sentiment_timestamp"],
+        settings.sku_metric_write_batch_size)
     print("Sentiment analysis updates completed.")
 
 
-async def main(erp_sku_order_development_data: list):
+async def main(user_id: int, erp_sku_order_development_data: list):
     """
     Main function to:
     1) Collect the scraped reviews by calling `product_reviews_scraping.py`.
     2) Calculate sentiment for each product's reviews.
     3) Update `review_sentiment_score` & `review_sentiment_timestamp` in DB.
 
+    @params user_id: int
+        The unique identifier of the web app user to whom the data belongs.
     @params erp_sku_order_development_data: list
         The ERP data for filtering records or matching SKUs. Possibly needed
         to filter or identify which SKUs to scrape.
@@ -142,7 +149,7 @@ async def main(erp_sku_order_development_data: list):
     try:
         async with AsyncSessionLocal() as session:
             # Step 1. Collect fresh product reviews
-            scraped_reviews = await products_reviews_scraping.main(erp_sku_order_development_data)
+            scraped_reviews = await products_reviews_scraping.main(user_id, erp_sku_order_development_data)
             # TODO: Delete next code line after testing
             # scraped_reviews = _get_scraped_reviews_mocks()
             if not scraped_reviews:
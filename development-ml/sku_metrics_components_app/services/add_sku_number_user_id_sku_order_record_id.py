@@ -11,6 +11,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from models.models import SkuMetric
 from repositories.sku_metric_repository import SkuMetricRepository
 from utils.database_connection import AsyncSessionLocal
+from utils.settings import settings
 
 
 async def add_sku_number_user_id_sku_order_record_id(
@@ -33,15 +34,17 @@ async def add_sku_number_user_id_sku_order_record_id(
         if not filtered_erp_sku_order_development_data:
             print("All given ERP SKU_ORDER records exist in the DB")
             return
-        # Going through each record
-        for record in filtered_erp_sku_order_development_data:
-            sku_metric = SkuMetric(
+        sku_metrics = [
+            SkuMetric(
                 sku_number=record["sku_number"],
                 sku_order_record_id=record["id"],  # Unique identifier from ERP sku_order_development data
                 user_id=user_id,  # Associated user ID
             )
-            # Create the record in the database
-            await sku_metric_repo.create_sku_metric(sku_metric)
+            for record in filtered_erp_sku_order_development_data
+        ]
+        # Create the records in the database (in batches)
+        await sku_metric_repo.bulk_upsert_sku_metrics(
+            sku_metrics, ["sku_number", "user_id"], settings.sku_metric_write_batch_size)
         print("sku_number, user_id, and sku_order_record_id added successfully in sku_metric.")
     except Exception as e:
         raise Exception(f"add_sku_number_user_id_sku_order_record_id(): {e}")
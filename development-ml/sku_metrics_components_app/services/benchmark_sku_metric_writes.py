@@ -0,0 +1,156 @@
+"""
+/*
+ * Copyright 2025 DOTSOFT SA, Inc All Rights Reserved.
+ *
+ * Author: Georgios Karanasios R&D Software Engineer
+ */
+"""
+
+import argparse
+import asyncio
+import time
+from datetime import datetime
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from models.models import SkuMetric
+from models.orm_schema import Base, LoginUserORM, SkuMetricORM
+from repositories.sku_metric_repository import SkuMetricRepository
+from utils.database_connection import engine
+from utils.settings import settings
+
+''' Benchmark of the 'sku_metric' writes: the per-row methods (one statement and commit per record) against the
+bulk methods (one statement and commit per batch), for the inserts of step 1 and the updates of steps 2-5.
+
+The tables are created in a scratch schema (dropped at the end), so the data of the app is not touched.
+Run it from the app folder: 'python -m services.benchmark_sku_metric_writes --rows 100000' '''
+
+BENCHMARK_SCHEMA = "sku_metric_benchmark"
+
+# The columns updated by step 2 (the widest update of the steps 2-5)
+UPDATED_COLUMNS = ["is_weekend", "is_holiday", "mean_temperature", "rain"]
+
+
+async def create_benchmark_schema() -> int:
+    """
+    Creates the scratch schema with the 'login_user' and 'sku_metric' tables, and a user.
+
+    @return: The user_id of the benchmark user.
+    """
+    async with engine.begin() as connection:
+        await connection.execute(text(f"DROP SCHEMA IF EXISTS {BENCHMARK_SCHEMA} CASCADE"))
+        await connection.execute(text(f"CREATE SCHEMA {BENCHMARK_SCHEMA}"))
+        await connection.run_sync(
+            lambda sync_connection: Base.metadata.create_all(
+                sync_connection.execution_options(schema_translate_map={None: BENCHMARK_SCHEMA}),
+                tables=[LoginUserORM.__table__, SkuMetricORM.__table__]
+            )
+        )
+        return (await connection.execute(text(
+            f"INSERT INTO {BENCHMARK_SCHEMA}.login_user (email, password, role, is_active) "
+            f"VALUES ('benchmark@example.com', '', 'user', true) RETURNING id"
+        ))).scalar_one()
+
+
+async def truncate_sku_metric():
+    async with engine.begin() as connection:
+        await connection.execute(text(f"TRUNCATE {BENCHMARK_SCHEMA}.sku_metric"))
+
+
+def build_sku_metrics(rows: int, user_id: int) -> tuple[list[SkuMetric], list[SkuMetric]]:
+    """
+    @param rows: The number of records.
+    @param user_id: The user_id of the records.
+    @return: The SkuMetric objects of the inserts (step 1) and of the updates (step 2) of the records.
+    """
+    inserts = [
+        SkuMetric(sku_number=record_id % 500, sku_order_record_id=record_id, user_id=user_id)
+        for record_id in range(1, rows + 1)
+    ]
+    updates = [
+        SkuMetric(
+            sku_order_record_id=record_id,
+            is_weekend=record_id % 7 >= 5,
+            is_holiday=record_id % 30 == 0,
+            mean_temperature=15 + record_id % 20 / 2,
+            rain=record_id % 3 == 0,
+        )
+        for record_id in range(1, rows + 1)
+    ]
+    return inserts, updates
+
+
+async def timed(label: str, rows: int, write) -> float:
+    """
+    Runs a write on a new session of the scratch schema and prints its time.
+
+    @param label: The label of the write.
+    @param rows: The number of written records.
+    @param write: An async function of a SkuMetricRepository that writes the records.
+    @return: The time of the write in seconds.
+    """
+    session_factory = async_sessionmaker(
+        engine.execution_options(schema_translate_map={None: BENCHMARK_SCHEMA}), expire_on_commit=False
+    )
+    async with session_factory() as session:
+        start = time.perf_counter()
+        await write(SkuMetricRepository(session))
+        elapsed = time.perf_counter() - start
+    print(f"  {label:<48} {rows:>8,} rows {elapsed:>9.2f} s {rows / elapsed:>10,.0f} rows/s")
+    return elapsed
+
+
+async def per_row_insert(sku_metric_repo: SkuMetricRepository, sku_metrics: list[SkuMetric]):
+    for sku_metric in sku_metrics:
+        await sku_metric_repo.create_sku_metric(sku_metric)
+
+
+async def per_row_update(sku_metric_repo: SkuMetricRepository, sku_metrics: list[SkuMetric]):
+    for sku_metric in sku_metrics:
+        await sku_metric_repo.update_sku_metric_holidays_weekends_weather(sku_metric)
+
+
+async def main():
+    """
+    Main entry point of the script that compares the per-row and the bulk writes of 'sku_metric'.
+    """
+    parser = argparse.ArgumentParser(description="Benchmark of the per-row and the bulk 'sku_metric' writes")
+    parser.add_argument("--rows", type=int, default=100000, help="Records written by the bulk methods")
+    parser.add_argument("--per-row-rows", type=int, default=None,
+                        help="Records written by the per-row methods (default: --rows)")
+    parser.add_argument("--batch-size", type=int, default=settings.sku_metric_write_batch_size,
+                        help="Records per statement (and commit) of the bulk methods")
+    args = parser.parse_args()
+    per_row_rows = args.per_row_rows or args.rows
+
+    print("\n" + "---- benchmark_sku_metric_writes.py ----")
+    started_at = datetime.now()
+    user_id = await create_benchmark_schema()
+    inserts, updates = build_sku_metrics(max(args.rows, per_row_rows), user_id)
+    try:
+        print("Step 1 (insert)")
+        await timed("create_sku_metric (commit per row)", per_row_rows,
+                    lambda repo: per_row_insert(repo, inserts[:per_row_rows]))
+        await truncate_sku_metric()
+        await timed(f"bulk_upsert_sku_metrics (batch {args.batch_size})", args.rows,
+                    lambda repo: repo.bulk_upsert_sku_metrics(
+                        inserts[:args.rows], ["sku_number", "user_id"], args.batch_size))
+        print("Step 2 (update of 4 columns)")
+        await timed("update_sku_metric_holidays_... (commit per row)", per_row_rows,
+                    lambda repo: per_row_update(repo, updates[:per_row_rows]))
+        await timed(f"bulk_update_sku_metrics (batch {args.batch_size})", args.rows,
+                    lambda repo: repo.bulk_update_sku_metrics(updates[:args.rows], UPDATED_COLUMNS, args.batch_size))
+        print("Step 1 again (upsert of existing records)")
+        await timed(f"bulk_upsert_sku_metrics (batch {args.batch_size})", args.rows,
+                    lambda repo: repo.bulk_upsert_sku_metrics(
+                        inserts[:args.rows], ["sku_number", "user_id"], args.batch_size))
+    finally:
+        async with engine.begin() as connection:
+            await connection.execute(text(f"DROP SCHEMA IF EXISTS {BENCHMARK_SCHEMA} CASCADE"))
+        await engine.dispose()
+    print(f"Total: {datetime.now() - started_at}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
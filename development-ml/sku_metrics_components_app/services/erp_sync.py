@@ -0,0 +1,236 @@
+"""
+/*
+ * Copyright 2025 DOTSOFT SA, Inc All Rights Reserved.
+ *
+ * Author: Georgios Karanasios R&D Software Engineer
+ */
+"""
+from datetime import datetime, timedelta
+from typing import Optional
+
+import pandas as pd
+
+from models.models import ErpSyncState
+from repositories.erp_sync_state_repository import ErpSyncStateRepository
+from utils.database_connection import AsyncSessionLocal
+from utils.settings import settings
+
+''' Incremental ERP sync (the same module is used by the ML-App and the SKU Metrics App).
+
+The 'erp_sync_state' table keeps, per consumer and user, the high-water mark ('order_date', 'id') of the latest
+synced ERP record. A delta fetch asks the ERP only for the records from that 'order_date' onward and keeps the
+ones after the mark. A periodic full fetch (reconciliation) catches the late edits and late inserts. '''
+
+HighWaterMark = tuple[datetime, int]
+
+
+async def load_erp_sync_state(user_id: int, consumer: str) -> Optional[ErpSyncState]:
+    """
+    Load the ERP sync state of a consumer for the given user.
+
+    @param user_id: The user ID.
+    @param consumer: The consumer of the ERP data (e.g., 'sku_metric').
+    @return: The ErpSyncState, or None if the consumer never synced the user's ERP data.
+    """
+    async with AsyncSessionLocal() as session:
+        return await ErpSyncStateRepository(session).get_erp_sync_state(user_id, consumer)
+
+
+def is_full_sync_due(erp_sync_state: Optional[ErpSyncState], full_sync_days: int) -> bool:
+    """
+    Check if a full fetch of the ERP history is needed: first sync, or last full reconciliation too old.
+
+    @param erp_sync_state: The stored ErpSyncState (None for the first sync).
+    @param full_sync_days: Days between two full reconciliations.
+    @return: True if the full ERP history must be fetched.
+    """
+    return (
+            erp_sync_state is None
+            or erp_sync_state.last_order_date is None
+            or erp_sync_state.last_full_sync_at is None
+            or datetime.now() - erp_sync_state.last_full_sync_at >= timedelta(days=full_sync_days)
+    )
+
+
+def build_erp_sync_url(sku_order_url: str, erp_sync_state: Optional[ErpSyncState], full_sync: bool) -> str:
+    """
+    Build the ERP URL of a sync: the full history from 'erp_sync_start_order_date', or (delta) the records
+    from the 'order_date' of the high-water mark onward (inclusive, see 'keep_records_after_mark').
+
+    @param sku_order_url: The ERP API URL of the SKU orders.
+    @param erp_sync_state: The stored ErpSyncState (None for the first sync).
+    @param full_sync: True to fetch the full history.
+    @return: The URL with the 'start_order_date' filter.
+    """
+    if full_sync or erp_sync_state is None or erp_sync_state.last_order_date is None:
+        start_order_date = settings.erp_sync_start_order_date
+    else:
+        start_order_date = erp_sync_state.last_order_date.strftime("%Y-%m-%dT%H:%M:%S")
+    return f"{sku_order_url}?start_order_date={start_order_date}"
+
+
+def _record_mark(record: dict) -> Optional[HighWaterMark]:
+    """
+    @param record: An ERP record (with 'order_date' as an ISO string and 'id').
+    @return: The ('order_date', 'id') of the record, or None if one of them is missing.
+    """
+    if record.get("order_date") is None or record.get("id") is None:
+        return None
+    return datetime.fromisoformat(record["order_date"]), record["id"]
+
+
+def _state_mark(erp_sync_state: Optional[ErpSyncState]) -> Optional[HighWaterMark]:
+    """
+    @param erp_sync_state: The stored ErpSyncState (None for the first sync).
+    @return: The stored high-water mark, or None if there is none.
+    """
+    if erp_sync_state is None or erp_sync_state.last_order_date is None or erp_sync_state.last_record_id is None:
+        return None
+    return erp_sync_state.last_order_date, erp_sync_state.last_record_id
+
+
+def keep_records_after_mark(records: list[dict], erp_sync_state: Optional[ErpSyncState]) -> list[dict]:
+    """
+    Keep the ERP records after the high-water mark (the delta fetch is inclusive on 'order_date').
+
+    @param records: The ERP records of a delta fetch.
+    @param erp_sync_state: The stored ErpSyncState.
+    @return: The records not synced yet.
+    """
+    state_mark = _state_mark(erp_sync_state)
+    if state_mark is None:
+        return records
+    return [record for record in records if (_record_mark(record) or state_mark) > state_mark]
+
+
+def keep_records_before_mark(records: list[dict], mark: Optional[HighWaterMark]) -> list[dict]:
+    """
+    Keep the ERP records before a mark, e.g., the first record that is not fully synced yet.
+
+    @param records: The ERP records.
+    @param mark: The ('order_date', 'id') to stop at (exclusive), or None to keep all the records.
+    @return: The records before the mark.
+    """
+    if mark is None:
+        return records
+    return [record for record in records if (_record_mark(record) or mark) < mark]
+
+
+def keep_rows_after_mark(df: pd.DataFrame, erp_sync_state: Optional[ErpSyncState]) -> pd.DataFrame:
+    """
+    DataFrame version of 'keep_records_after_mark' (columns 'order_date' and 'id').
+
+    @param df: The rows of a delta fetch.
+    @param erp_sync_state: The stored ErpSyncState.
+    @return: The rows not synced yet.
+    """
+    state_mark = _state_mark(erp_sync_state)
+    if state_mark is None or df.empty:
+        return df
+    return df[_rows_after(df, state_mark)].reset_index(drop=True)
+
+
+def keep_rows_before_mark(df: pd.DataFrame, mark: Optional[HighWaterMark]) -> pd.DataFrame:
+    """
+    Keep the rows before a mark (columns 'order_date' and 'id'), e.g., the first row that can not be synced yet.
+
+    @param df: The rows.
+    @param mark: The ('order_date', 'id') to stop at (exclusive), or None to keep all the rows.
+    @return: The rows before the mark.
+    """
+    if mark is None or df.empty:
+        return df
+    return df[~_rows_after(df, mark) & ~_rows_at(df, mark)].reset_index(drop=True)
+
+
+def _rows_after(df: pd.DataFrame, mark: HighWaterMark) -> pd.Series:
+    """
+    @param df: The rows (columns 'order_date' and 'id').
+    @param mark: An ('order_date', 'id').
+    @return: The boolean mask of the rows after the mark.
+    """
+    order_date, record_id = mark
+    order_dates = pd.to_datetime(df["order_date"])
+    return (order_dates > order_date) | ((order_dates == order_date) & (df["id"] > record_id))
+
+
+def _rows_at(df: pd.DataFrame, mark: HighWaterMark) -> pd.Series:
+    """
+    @param df: The rows (columns 'order_date' and 'id').
+    @param mark: An ('order_date', 'id').
+    @return: The boolean mask of the rows at the mark.
+    """
+    order_date, record_id = mark
+    return (pd.to_datetime(df["order_date"]) == order_date) & (df["id"] == record_id)
+
+
+def records_high_water_mark(records: list[dict]) -> Optional[HighWaterMark]:
+    """
+    @param records: ERP records (with 'order_date' as an ISO string and 'id').
+    @return: The largest ('order_date', 'id') of the records, or None if there is none.
+    """
+    return max(filter(None, map(_record_mark, records)), default=None)
+
+
+def records_low_water_mark(records: list[dict]) -> Optional[HighWaterMark]:
+    """
+    @param records: ERP records (with 'order_date' as an ISO string and 'id').
+    @return: The smallest ('order_date', 'id') of the records, or None if there is none.
+    """
+    return min(filter(None, map(_record_mark, records)), default=None)
+
+
+def rows_high_water_mark(df: pd.DataFrame) -> Optional[HighWaterMark]:
+    """
+    DataFrame version of 'records_high_water_mark' (columns 'order_date' and 'id').
+
+    @param df: The synced rows.
+    @return: The largest ('order_date', 'id') of the rows, or None if there is none.
+    """
+    marks = pd.DataFrame({"order_date": pd.to_datetime(df["order_date"]), "id": df["id"]}).dropna()
+    if marks.empty:
+        return None
+    latest = marks.sort_values(["order_date", "id"]).iloc[-1]
+    return latest["order_date"].to_pydatetime(), int(latest["id"])
+
+
+def rows_low_water_mark(df: pd.DataFrame) -> Optional[HighWaterMark]:
+    """
+    @param df: The rows (columns 'order_date' and 'id').
+    @return: The smallest ('order_date', 'id') of the rows, or None if there is none.
+    """
+    marks = pd.DataFrame({"order_date": pd.to_datetime(df["order_date"]), "id": df["id"]}).dropna()
+    if marks.empty:
+        return None
+    earliest = marks.sort_values(["order_date", "id"]).iloc[0]
+    return earliest["order_date"].to_pydatetime(), int(earliest["id"])
+
+
+async def save_erp_sync_state(
+        user_id: int,
+        consumer: str,
+        erp_sync_state: Optional[ErpSyncState],
+        high_water_mark: Optional[HighWaterMark],
+        full_sync: bool
+) -> None:
+    """
+    Advance the high-water mark of a consumer after a successful sync (it never moves backwards).
+
+    @param user_id: The user ID.
+    @param consumer: The consumer of the ERP data (e.g., 'sku_metric').
+    @param erp_sync_state: The ErpSyncState before the sync (None for the first sync).
+    @param high_water_mark: The largest ('order_date', 'id') of the synced records (None if there is none).
+    @param full_sync: True if the sync fetched the full history (a reconciliation).
+    @return: None
+    """
+    high_water_mark = max(filter(None, (_state_mark(erp_sync_state), high_water_mark)), default=None)
+    last_order_date, last_record_id = high_water_mark or (None, None)
+    new_erp_sync_state = ErpSyncState(
+        user_id=user_id,
+        consumer=consumer,
+        last_order_date=last_order_date,
+        last_record_id=last_record_id,
+        last_full_sync_at=datetime.now() if full_sync else erp_sync_state and erp_sync_state.last_full_sync_at
+    )
+    async with AsyncSessionLocal() as session:
+        await ErpSyncStateRepository(session).save_erp_sync_state(new_erp_sync_state)
@@ -5,76 +5,79 @@
  * Author: Georgios Karanasios R&D Software Engineer
  */
 """
-import requests
+from typing import AsyncIterator
+
+import httpx
 
 from repositories.user_erp_api_repository import UserErpApiRepository
 from repositories.user_repository import UserRepository
 from utils.database_connection import AsyncSessionLocal
 from utils.django_decryption import decrypt_django_user_password
+from utils.erp_client import ErpClient
+from utils.erp_token_manager import erp_token_manager
 
 
-async def fetch_erp_development_data(full_url: str, auth_url: str, user_id: int) -> dict:
+async def fetch_erp_development_data(full_url: str, auth_url: str, user_id: int) -> list[dict]:
     """
-    Fetches and validates ERP data for a specific client.
-
-    Steps:
-    1. Use the provided URLs to fetch ERP data from the API.
-    2. Extract the user ID and data records from the response.
-    3. Validate that the user exists in the database.
+    Fetches and validates ERP data for a specific client (all the pages, see 'iter_erp_development_pages').
 
     @param full_url: str - The full endpoint URL to fetch ERP data.
     @param auth_url: str - The authentication URL for the ERP API.
     @param user_id: The ID of the user associated with the 'development' data.
 
-    @return: dict - data_records
+    @return: list - data_records
     """
-
-    # Fetch data from ERP API
-    data_records = await _fetch_erp_development_data(full_url, auth_url, user_id)
-    # Extract 'user_id' and 'sku_order_data' from erp_data
-    if not user_id or not data_records:
-        raise ValueError("No (all) data returned from ERP API.")
-    # Check if the user exists in the database
-    if not await _is_user_exists_and_active(user_id):
-        raise Exception(f"User with ID {user_id} does not exist (or inactive) in the database.")
+    data_records = []
+    async for page_records in iter_erp_development_pages(full_url, auth_url, user_id):
+        data_records.extend(page_records)
     return data_records
 
 
-async def _fetch_erp_development_data(full_url: str, auth_url: str, user_id: int) -> dict:
+async def iter_erp_development_pages(full_url: str, auth_url: str, user_id: int) -> AsyncIterator[list[dict]]:
     """
-    Fetch data from the ERP API using the access token.
+    Fetches and validates ERP data for a specific client, page by page.
+
+    Steps:
+    1. Validate that the user exists in the database.
+    2. Use the provided URLs to fetch the ERP data pages from the API (one pooled HTTP client).
+    3. Yield every (non-empty) page of data records, as soon as it arrives.
 
-    @param full_url: The client's ERP API URL for getting the data
-    @param auth_url: The client's API URL for getting the auth token
+    @param full_url: str - The full endpoint URL to fetch ERP data.
+    @param auth_url: str - The authentication URL for the ERP API.
     @param user_id: The ID of the user associated with the 'development' data.
-    @return: A dictionary containing user_id and data records.
-    @raises Exception: If the request fails or the response is empty.
+
+    @return: An async generator of pages (lists of data records).
+    @raises ValueError: If the ERP API returns no data at all.
     """
+
+    # Check if the user exists in the database
+    if not user_id or not await _is_user_exists_and_active(user_id):
+        raise Exception(f"User with ID {user_id} does not exist (or inactive) in the database.")
+    has_data = False
     try:
-        # Await the asynchronous token retrieval
-        token = await _get_erp_api_token(auth_url, user_id)
-        headers = {"Authorization": f"Bearer {token}"}
-        response = requests.get(full_url, headers=headers)
-        response.raise_for_status()
-        erp_data = response.json()
-        # Extract data from json
-        data_records = erp_data.get("data", [])
-        # Check if the response is empty
-        if not user_id or not data_records:
-            return {}
-        # Return data records
-        return data_records
-    except requests.HTTPError as http_err:
+        async with ErpClient() as erp_client:
+            # The cached token of the tenant (a login only if there is none or it is about to expire)
+            token = await erp_token_manager.get_token(
+                user_id, auth_url, lambda: _get_erp_api_token(erp_client, auth_url, user_id)
+            )
+            headers = {"Authorization": f"Bearer {token}"}
+            async for data_records in erp_client.iter_pages(full_url, headers):
+                has_data = True
+                yield data_records
+    except httpx.HTTPError as http_err:
+        if isinstance(http_err, httpx.HTTPStatusError) and http_err.response.status_code == 401:
+            erp_token_manager.invalidate(user_id, auth_url)  # Rejected token: log in again on the next call
         raise Exception(f"fetch_erp_development_data(): {http_err}")
-    except Exception as exc:
-        raise Exception(f"fetch_erp_development_data(): {exc}")
+    if not has_data:
+        raise ValueError("No (all) data returned from ERP API.")
 
 
-async def _get_erp_api_token(auth_url: str, erp_user_id: int) -> str:
+async def _get_erp_api_token(erp_client: ErpClient, auth_url: str, erp_user_id: int) -> str:
     """
     Fetch an access token from the ERP API authentication endpoint.
     If a 401 Unauthorized error occurs, attempt to decrypt the password and retry.
 
+    @param erp_client: The ERP API client (its pooled connection is reused for the data requests).
     @param auth_url: The client's API URL for getting the auth token.
     @param erp_user_id: The ID of the user associated with the ERP API configuration.
     @return: A string representing the Bearer token.
@@ -95,17 +98,15 @@ async def _get_erp_api_token(auth_url: str, erp_user_id: int) -> str:
     }
 
     try:
-        response = requests.post(auth_url, data=payload)
-        response.raise_for_status()  # raise if response status is not 200
-    except requests.HTTPError as http_err:
+        response = await erp_client.post(auth_url, data=payload)  # raise if response status is not 2xx
+    except httpx.HTTPStatusError as http_err:
         # Check if the error is 401 Unauthorized
         if http_err.response.status_code == 401:
             # Attempt to decrypt the password considering as a Django account
             decrypted_password = decrypt_django_user_password()
             if decrypted_password:
                 payload["password"] = decrypted_password
-                response = requests.post(auth_url, data=payload)
-                response.raise_for_status()
+                response = await erp_client.post(auth_url, data=payload)
             else:
                 raise Exception("Failed to decrypt ERP API password to recover from 401 error.")
         else:
@@ -121,7 +121,7 @@ def expand_trend_data(trend_data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
 
 
 async def process_google_trends(
-        session: AsyncSession, erp_sku_order_development_data: List[Dict[str, Any]]
+        session: AsyncSession, user_id: int, erp_sku_order_development_data: List[Dict[str, Any]]
 ) -> None:
     """
     Process Google Trends data and update the database with trend values.
@@ -133,6 +133,8 @@ async def process_google_trends(
 
     @params session: AsyncSession
         The active asynchronous database session used to query and update the database.
+    @params user_id: int
+        The unique identifier of the web app user to whom the data belongs.
     @params erp_sku_order_development_data: List[Dict[str, Any]]
         A list of dictionaries representing SKU order data retrieved from the ERP.
     @return: None
@@ -149,7 +151,8 @@ async def process_google_trends(
             filtered_erp_sku_order_development_data = await sku_metric_repo.filter_in_db_with_null_columns(
                 erp_sku_order_development_data,
                 ["trend_value"],
-                "sku_order_record_id"
+                "sku_order_record_id",
+                user_id
             )
             if not filtered_erp_sku_order_development_data:
                 print("No rows found with NULL 'trend_value'.")
@@ -177,19 +180,23 @@ async def process_google_trends(
             mapped_df = map_trend_values_by_date(df,
                                                  expanded_trend_data)  # it has a "trend_value" column set for each row
 
-            # 4. Update the DB for each row that got a new Trend Value
-            for _, row in mapped_df.iterrows():
-                if row.get("trend_value") is not None:
-                    # Create SkuMetric object with the updated trend_value
-                    sku_metric = SkuMetric(
-                        sku_order_record_id=row["id"],
-                        trend_value=row["trend_value"]
-                    )
-                    await sku_metric_repo.update_sku_metric_trend_value(sku_metric)
+            # 4. Update the DB for the rows that got a new Trend Value (in batches)
+            sku_metrics = [
+                SkuMetric(
+                    sku_order_record_id=row["id"],
+                    trend_value=row["trend_value"]
+                )
+                for _, row in mapped_df.iterrows()
+                if row.get("trend_value") is not None
+            ]
+            await sku_metric_repo.bulk_update_sku_metrics(
+                sku_metrics, ["trend_value"], settings.sku_metric_write_batch_size)
 
             print("Google Trends values successfully updated in the DB.")
             break  # If processing is successful, exit the retry loop
 
+        except asyncio.TimeoutError:
+            raise  # The step is over its timeout (see 'check_step_deadline'): no retry
         except requests.HTTPError as http_err:
             print(f"Attempt {attempt} of {max_retries} failed due to HTTPError: {http_err}")
             if attempt == max_retries:
@@ -205,10 +212,10 @@ async def process_google_trends(
             await asyncio.sleep(2)
 
 
-async def main(erp_sku_order_development_data: list):
+async def main(user_id: int, erp_sku_order_development_data: list):
     try:
         async with AsyncSessionLocal() as session:
-            await process_google_trends(session, erp_sku_order_development_data)
+            await process_google_trends(session, user_id, erp_sku_order_development_data)
     except Exception as e:
         await session.rollback()
         raise e
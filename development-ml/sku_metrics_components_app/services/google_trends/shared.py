@@ -13,6 +13,8 @@ from typing import List, Dict, Any
 import pandas as pd
 import serpapi
 
+from utils.step_executor import check_step_deadline
+
 
 def load_search_terms_from_file(file_path: str) -> Dict[str, str]:
     """
@@ -149,6 +151,7 @@ def fetch_trends(
     all_extracted_data = []
     # Iterate through each category group
     for category, group_df in df.groupby("class_display_name"):
+        check_step_deadline()  # The SerpAPI requests block: stop between categories if the step is over its timeout
         # Check if the category exists in search_terms
         if category in search_terms:
             # Extract the search_term from the dictionary for the current category
@@ -0,0 +1,54 @@
+"""
+/*
+ * Copyright 2025 DOTSOFT SA, Inc All Rights Reserved.
+ *
+ * Author: Georgios Karanasios R&D Software Engineer
+ */
+"""
+
+import argparse
+import asyncio
+from datetime import date, timedelta
+
+from services.add_holidays_weekends_weather import get_historical_weather_open_meteo, ATHENS_LATITUDE, \
+    ATHENS_LONGITUDE
+from utils.database_connection import AsyncSessionLocal
+
+''' Bulk prefetch of the historical weather of a date range into the weather cache ('weather_daily' table), e.g.,
+before the onboarding of a new client, so that Step 2 (add_holidays_weekends_weather) does not call Open-Meteo.
+Run it from the app folder: 'python -m services.prefetch_weather --start-date 2023-01-01' '''
+
+
+async def prefetch_weather(start_date: date, end_date: date, latitude: float, longitude: float) -> None:
+    """
+    Caches the weather of every day of the range (the days that are cached already are not fetched again).
+
+    @param start_date: The first date of the range.
+    @param end_date: The last date of the range (inclusive).
+    @param latitude: The latitude of the location.
+    @param longitude: The longitude of the location.
+    """
+    dates = [start_date + timedelta(days=offset) for offset in range((end_date - start_date).days + 1)]
+    async with AsyncSessionLocal() as session:
+        daily_weather = await get_historical_weather_open_meteo(session, dates, latitude, longitude)
+    print(f"Weather available for {len(daily_weather)} of {len(dates)} dates ({start_date} - {end_date})")
+
+
+def main():
+    """
+    Main entry point of the script that prefetches the weather of a date range.
+    """
+    parser = argparse.ArgumentParser(description="Prefetch the historical weather into the weather cache")
+    parser.add_argument("--start-date", type=date.fromisoformat, required=True, help="First date (YYYY-MM-DD)")
+    parser.add_argument("--end-date", type=date.fromisoformat, default=date.today() - timedelta(days=1),
+                        help="Last date (YYYY-MM-DD, default: yesterday)")
+    parser.add_argument("--latitude", type=float, default=ATHENS_LATITUDE, help="Latitude of the location")
+    parser.add_argument("--longitude", type=float, default=ATHENS_LONGITUDE, help="Longitude of the location")
+    args = parser.parse_args()
+
+    print("\n" + "---- prefetch_weather.py ----")
+    asyncio.run(prefetch_weather(args.start_date, args.end_date, args.latitude, args.longitude))
+
+
+if __name__ == "__main__":
+    main()
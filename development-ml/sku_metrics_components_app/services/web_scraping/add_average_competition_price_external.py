@@ -18,6 +18,8 @@ from models.models import SkuMetric
 from repositories.sku_metric_repository import SkuMetricRepository
 from services.web_scraping.shared import restart_driver, setup_driver, get_best_matching_product
 from utils.database_connection import AsyncSessionLocal
+from utils.settings import settings
+from utils.step_executor import check_step_deadline
 
 
 def collect_prices(driver, product: Product) -> Optional[float]:
@@ -50,7 +52,22 @@ def collect_prices(driver, product: Product) -> Optional[float]:
     return avg_price
 
 
-async def process_web_scraping_prices(session: AsyncSession, erp_sku_order_development_data: List[dict]) -> None:
+async def _store_average_competition_prices(sku_metric_repo: SkuMetricRepository, sku_metrics: List[SkuMetric]):
+    """
+    Updates the `average_competition_price_external` of the scraped records in the DB, and empties the list.
+
+    @param sku_metric_repo: The SKU metric repository.
+    @param sku_metrics: The SkuMetric objects of the scraped records.
+    """
+    if sku_metrics:
+        await sku_metric_repo.bulk_update_sku_metrics(
+            sku_metrics, ["average_competition_price_external"], settings.sku_metric_write_batch_size)
+        sku_metrics.clear()
+
+
+async def process_web_scraping_prices(
+        session: AsyncSession, user_id: int, erp_sku_order_development_data: List[dict]
+) -> None:
     """
     Processes web scraping for competitor prices by filtering records
     with missing price data and scraping the necessary information.
@@ -59,6 +76,7 @@ async def process_web_scraping_prices(session: AsyncSession, erp_sku_order_devel
     2. For each record, scrape competitor reviews.
 
     @param session: The asynchronous database session.
+    @param user_id: The unique identifier of the web app user to whom the data belongs.
     @param erp_sku_order_development_data: List of dictionaries containing SKU order development data.
     """
 
@@ -68,46 +86,54 @@ async def process_web_scraping_prices(session: AsyncSession, erp_sku_order_devel
     filtered_erp_sku_order_development_data = await sku_metric_repo.filter_in_db_with_null_columns(
         erp_sku_order_development_data,
         db_null_column_names=["average_competition_price_external"],
-        db_identity_unique_col_name="sku_order_record_id"
+        db_identity_unique_col_name="sku_order_record_id",
+        user_id=user_id
     )
     if not filtered_erp_sku_order_development_data:
         print("No rows found with NULL 'average_competition_price_external'. Nothing to scrape.")
         return
     # Convert to DataFrame for convenience
     df = pd.DataFrame(filtered_erp_sku_order_development_data)
-    for _, row in df.iterrows():
-        record_id = row["id"]  # ERP data's 'id'
-        sku_number = row.get("sku_number")
-        sku_name = row.get("sku_name")
-        # print(f"\nScraping for SKU: {sku_name}, record_id: {record_id}")
-        # This returns a configured Selenium WebDriver to run in the browser (or terminal)
-        driver = setup_driver()
-        try:
-            # 1. # Retrieve the best matching product data for the current SKU
-            product = await get_best_matching_product(driver, sku_number, sku_name, record_id)
-            if not product.product_url:
-                print(f"No valid best product URL found for {sku_name}. Skipping price scraping.")
-                continue
-            # 2. Collect price data
-            avg_price = collect_prices(driver, product)
-            # 3. Update DB
-            sku_metric = SkuMetric(
-                sku_order_record_id=record_id,
-                average_competition_price_external=avg_price,
-            )
-            # Update the values in the DB
-            await sku_metric_repo.update_sku_metric_average_competition_price_external(sku_metric)
-        except Exception as e:
-            print(f"Error processing SKU: {sku_name}, Error: {e}")
-        finally:
-            driver.quit()
+    # The scraped prices not stored yet (stored per batch, so that a failure does not lose all the scraping)
+    sku_metrics = []
+    try:
+        for _, row in df.iterrows():
+            check_step_deadline()  # Selenium blocks: stop between SKUs if the step is over its timeout
+            record_id = row["id"]  # ERP data's 'id'
+            sku_number = row.get("sku_number")
+            sku_name = row.get("sku_name")
+            # print(f"\nScraping for SKU: {sku_name}, record_id: {record_id}")
+            # This returns a configured Selenium WebDriver to run in the browser (or terminal)
+            driver = setup_driver()
+            try:
+                # 1. # Retrieve the best matching product data for the current SKU
+                product = await get_best_matching_product(driver, sku_number, sku_name, record_id)
+                if not product.product_url:
+                    print(f"No valid best product URL found for {sku_name}. Skipping price scraping.")
+                    continue
+                # 2. Collect price data
+                avg_price = collect_prices(driver, product)
+                # 3. Update DB
+                sku_metrics.append(SkuMetric(
+                    sku_order_record_id=record_id,
+                    average_competition_price_external=avg_price,
+                ))
+                if len(sku_metrics) >= settings.sku_metric_write_batch_size:
+                    await _store_average_competition_prices(sku_metric_repo, sku_metrics)
+            except Exception as e:
+                print(f"Error processing SKU: {sku_name}, Error: {e}")
+            finally:
+                driver.quit()
+    finally:
+        # The scraped prices are stored even if the step stops early
+        await _store_average_competition_prices(sku_metric_repo, sku_metrics)
     print("'average_competition_price_external' was added successfully in sku_metric.")
 
 
-async def main(erp_sku_order_development_data: list):
+async def main(user_id: int, erp_sku_order_development_data: list):
     try:
         async with AsyncSessionLocal() as session:
-            await process_web_scraping_prices(session, erp_sku_order_development_data)
+            await process_web_scraping_prices(session, user_id, erp_sku_order_development_data)
     except Exception as e:
         await session.rollback()
         raise e
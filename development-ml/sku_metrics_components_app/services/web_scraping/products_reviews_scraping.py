@@ -18,6 +18,7 @@ from models.dto_models import Product, Review
 from repositories.sku_metric_repository import SkuMetricRepository
 from services.web_scraping.shared import setup_driver, get_best_matching_product, restart_driver
 from utils.database_connection import AsyncSessionLocal
+from utils.step_executor import check_step_deadline
 
 
 def get_review_data(driver: webdriver.Chrome, product: Product) -> List[Review]:
@@ -70,14 +71,16 @@ def scrape_product_reviews(driver: webdriver.Chrome, product: Product) -> List[R
             new_driver.quit()
 
 
-async def process_web_scraping_reviews(session: AsyncSession, erp_sku_order_development_data: List[dict]) -> list[
-                                                                                                                 Review] | None:
+async def process_web_scraping_reviews(
+        session: AsyncSession, user_id: int, erp_sku_order_development_data: List[dict]
+) -> list[Review] | None:
     """
     Processes web scraping for product reviews.
     1. Filter DB for records that do NOT have review_sentiment_score, review_sentiment_timestamp.
     2. For each record, scrape reviews
 
     @param session: The asynchronous database session.
+    @param user_id: The unique identifier of the web app user to whom the data belongs.
     @param erp_sku_order_development_data: List of dictionaries containing SKU order development data.
     """
 
@@ -87,7 +90,8 @@ async def process_web_scraping_reviews(session: AsyncSession, erp_sku_order_deve
     filtered_erp_sku_order_development_data = await sku_metric_repo.filter_in_db_with_null_columns(
         erp_sku_order_development_data,
         db_null_column_names=["review_sentiment_score", "review_sentiment_timestamp"],
-        db_identity_unique_col_name="sku_order_record_id"
+        db_identity_unique_col_name="sku_order_record_id",
+        user_id=user_id
     )
     if not filtered_erp_sku_order_development_data:
         print("No rows found with NULL 'review_sentiment_score' or 'review_sentiment_timestamp'. Nothing to scrape.")
@@ -95,6 +99,7 @@ async def process_web_scraping_reviews(session: AsyncSession, erp_sku_order_deve
     # Convert to DataFrame for convenience
     df = pd.DataFrame(filtered_erp_sku_order_development_data)
     for _, row in df.iterrows():
+        check_step_deadline()  # Selenium blocks: stop between SKUs if the step is over its timeout
         sku_order_record_id = row.get("id")  # ERP data's 'id'
         sku_number = row.get("sku_number")
         sku_name = row.get("sku_name")
@@ -112,10 +117,10 @@ async def process_web_scraping_reviews(session: AsyncSession, erp_sku_order_deve
         return product_reviews
 
 
-async def main(erp_sku_order_development_data: list) -> list[Review] | None:
+async def main(user_id: int, erp_sku_order_development_data: list) -> list[Review] | None:
     try:
         async with AsyncSessionLocal() as session:
-            return await process_web_scraping_reviews(session, erp_sku_order_development_data)
+            return await process_web_scraping_reviews(session, user_id, erp_sku_order_development_data)
     except Exception as e:
         await session.rollback()
         raise e
@@ -6,7 +6,11 @@
  */
 """
 
-from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import AsyncIterator
+
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncEngine, AsyncSession
 from sqlalchemy.ext.declarative import declarative_base
 
 from utils.settings import settings
@@ -24,7 +28,36 @@ SQLALCHEMY_DATABASE_URL = f"postgresql+asyncpg://{DB_USER}:{DB_PASSWORD}@{DB_HOS
 # Create an asynchronous engine
 engine = create_async_engine(SQLALCHEMY_DATABASE_URL, echo=False)
 
-# Create an async session
-AsyncSessionLocal = async_sessionmaker(engine, expire_on_commit=False)
+# The engine of the current context. The steps of 'run_steps' run concurrently on their own event loops (threads),
+# and the asyncpg connections are bound to the event loop that opened them, so every step uses its own engine
+# (see 'own_engine'); the rest of the app uses the global engine.
+_current_engine: ContextVar[AsyncEngine] = ContextVar("current_engine", default=engine)
+
+
+def AsyncSessionLocal(**kwargs) -> AsyncSession:
+    """
+    Create an async session on the engine of the current context.
+
+    @param kwargs: Extra arguments of the AsyncSession.
+    @return: The session (to be used as 'async with AsyncSessionLocal() as session').
+    """
+    return AsyncSession(_current_engine.get(), expire_on_commit=False, **kwargs)
+
+
+@asynccontextmanager
+async def own_engine() -> AsyncIterator[AsyncEngine]:
+    """
+    Use a new engine (connection pool) for the sessions of the current context, e.g., a step that runs on its
+    own event loop, and dispose it at the end.
+
+    @return: The engine.
+    """
+    context_engine = create_async_engine(SQLALCHEMY_DATABASE_URL, echo=False)
+    token = _current_engine.set(context_engine)
+    try:
+        yield context_engine
+    finally:
+        _current_engine.reset(token)
+        await context_engine.dispose()
 
 Base = declarative_base()
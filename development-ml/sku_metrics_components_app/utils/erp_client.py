@@ -0,0 +1,215 @@
+"""
+/*
+ * Copyright 2025 DOTSOFT SA, Inc All Rights Reserved.
+ *
+ * Author: Georgios Karanasios R&D Software Engineer
+ */
+"""
+import asyncio
+import io
+from typing import AsyncIterator, Optional, Sequence
+
+import httpx
+import pandas as pd
+import pyarrow as pa
+
+from utils.settings import settings
+
+''' Async HTTP client of the ERP API (the same module is used by the ML-App and the SKU Metrics App) '''
+
+
+class ErpClient:
+    """
+    Async ERP API client on a pooled 'httpx.AsyncClient' (keep-alive connections are reused by the token
+    request and every page). Use it as an async context manager:
+
+        async with ErpClient() as erp_client:
+            async for record in erp_client.iter_records(url, headers):
+                ...
+    """
+
+    def __init__(
+            self,
+            page_size: int = settings.erp_page_size,
+            timeout_seconds: float = settings.erp_timeout_seconds,
+            max_connections: int = settings.erp_max_connections
+    ):
+        """
+        @param page_size: Records per ERP page (the ERP 'page_size' query parameter).
+        @param timeout_seconds: Timeout of every HTTP request.
+        @param max_connections: Upper bound of the pooled connections.
+        """
+        self.page_size = page_size
+        self._client = httpx.AsyncClient(
+            timeout=timeout_seconds,
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections)
+        )
+
+    async def __aenter__(self) -> "ErpClient":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self._client.aclose()
+
+    async def post(self, url: str, data: dict) -> httpx.Response:
+        """
+        POST form data to the ERP API (e.g., the login token request).
+
+        @param url: The ERP API URL.
+        @param data: The form data.
+        @return: The response.
+        @raises httpx.HTTPStatusError: If the response status is not 2xx.
+        """
+        response = await self._client.post(url, data=data)
+        response.raise_for_status()
+        return response
+
+    async def _get_page(
+            self,
+            url: str,
+            headers: dict,
+            page: int,
+            cursor: Optional[str]
+    ) -> tuple[list[dict], Optional[str]]:
+        """
+        GET one page of records ('page'/'cursor'/'page_size' are merged with the query parameters of the URL).
+
+        @param url: The ERP API URL (may contain filters, e.g., '?start_order_date=...').
+        @param headers: The request headers (e.g., the Bearer token).
+        @param page: The page number (starting from 1), used if there is no cursor.
+        @param cursor: The 'next_cursor' of the previous page (keyset pagination), or None.
+        @return: The records of the page (the 'data' list of the response) and the 'next_cursor' of the response.
+        @raises httpx.HTTPStatusError: If the response status is not 2xx.
+        """
+        params = {"cursor": cursor} if cursor else {"page": page}
+        # Merged explicitly ('params=' would replace the query string of the URL, e.g., the date filters)
+        page_url = httpx.URL(url).copy_merge_params({**params, "page_size": self.page_size})
+        response = await self._client.get(page_url, headers=headers)
+        response.raise_for_status()
+        body = response.json()
+        return body.get("data") or [], body.get("next_cursor")
+
+    async def iter_pages(self, url: str, headers: dict) -> AsyncIterator[list[dict]]:
+        """
+        Walk the ERP pages one by one, until a page shorter than 'page_size'. Every page continues from the
+        'next_cursor' of the previous one (keyset pagination: no deep OFFSET scans on the ERP database), or
+        from the next page number if the ERP API returns no cursor. The next page is requested while the
+        caller processes the current one, so at most two pages are held in memory.
+
+        @param url: The ERP API URL (may contain filters, e.g., '?start_order_date=...').
+        @param headers: The request headers (e.g., the Bearer token).
+        @return: An async generator of pages (lists of records).
+        """
+        page = 1
+        next_page: Optional[asyncio.Task] = asyncio.create_task(self._get_page(url, headers, page, None))
+        try:
+            while next_page is not None:
+                records, cursor = await next_page
+                next_page = None
+                if len(records) == self.page_size:
+                    page += 1
+                    next_page = asyncio.create_task(self._get_page(url, headers, page, cursor))
+                if records:
+                    yield records
+        finally:
+            # The caller stopped early (or failed): do not leave the prefetch request running
+            if next_page is not None:
+                next_page.cancel()
+
+    async def iter_records(self, url: str, headers: dict) -> AsyncIterator[dict]:
+        """
+        Yield the ERP records one by one, page after page (see 'iter_pages').
+
+        @param url: The ERP API URL (may contain filters, e.g., '?start_order_date=...').
+        @param headers: The request headers (e.g., the Bearer token).
+        @return: An async generator of records.
+        """
+        async for records in self.iter_pages(url, headers):
+            for record in records:
+                yield record
+
+    async def iter_arrow_frames(self, url: str, headers: dict, columns: Sequence[str]) -> AsyncIterator[pd.DataFrame]:
+        """
+        Bulk-read the given columns of the ERP records from the Arrow export of the ERP API (typed columns:
+        no per-row JSON, no datetime parsing), one DataFrame per Arrow record batch.
+
+        @param url: The ERP API URL of the records (may contain filters, e.g., '?start_order_date=...'),
+                    the export is requested from its '/export' sub-path.
+        @param headers: The request headers (e.g., the Bearer token).
+        @param columns: The columns to export.
+        @return: An async generator of DataFrames (with the given columns).
+        @raises httpx.HTTPStatusError: If the response status is not 2xx (e.g., 404 if the ERP API has no export).
+        """
+        async with self._client.stream("GET", erp_export_url(url, columns), headers=headers) as response:
+            response.raise_for_status()
+            # The Arrow reader pulls the response bytes as it decodes them (in a worker thread), so only the
+            # current record batch is held in memory, not the whole export
+            source = _AsyncByteStreamReader(response.aiter_bytes(), asyncio.get_running_loop())
+            reader = await asyncio.to_thread(pa.ipc.open_stream, source)
+            while (record_batch := await asyncio.to_thread(_read_next_batch, reader)) is not None:
+                yield record_batch.to_pandas()
+
+
+class _AsyncByteStreamReader(io.RawIOBase):
+    """
+    Blocking file-like reader over an async byte iterator (e.g., an HTTP response body), for the readers that need
+    a file (e.g., 'pa.ipc.open_stream'). It must be read from a worker thread: every read waits for the next chunks
+    on the event loop.
+    """
+
+    def __init__(self, chunks: AsyncIterator[bytes], loop: asyncio.AbstractEventLoop):
+        """
+        @param chunks: The async byte iterator.
+        @param loop: The event loop the iterator runs on.
+        """
+        super().__init__()
+        self._chunks = chunks
+        self._loop = loop
+        self._buffer = bytearray()
+        self._exhausted = False
+
+    def readable(self) -> bool:
+        return True
+
+    def read(self, size: int = -1) -> bytes:
+        """
+        @param size: The number of bytes to read (-1 for all the remaining bytes).
+        @return: Exactly 'size' bytes, fewer only at the end of the stream (a short read is an end of stream
+                 for the Arrow reader).
+        """
+        while not self._exhausted and (size < 0 or len(self._buffer) < size):
+            try:
+                self._buffer += asyncio.run_coroutine_threadsafe(anext(self._chunks), self._loop).result()
+            except StopAsyncIteration:
+                self._exhausted = True
+        size = len(self._buffer) if size < 0 else min(size, len(self._buffer))
+        data = bytes(self._buffer[:size])
+        del self._buffer[:size]
+        return data
+
+
+def _read_next_batch(reader: pa.ipc.RecordBatchStreamReader) -> Optional[pa.RecordBatch]:
+    """
+    @param reader: An Arrow stream reader.
+    @return: The next record batch, or None at the end of the stream.
+    """
+    try:
+        return reader.read_next_batch()
+    except StopIteration:
+        return None
+
+
+def erp_export_url(url: str, columns: Sequence[str]) -> str:
+    """
+    Build the URL of the Arrow export of ERP records (e.g., '/api/sku_order_development/export').
+
+    @param url: The ERP API URL of the records (may contain filters, e.g., '?start_order_date=...').
+    @param columns: The columns to export.
+    @return: The export URL, with the filters of the URL and the columns.
+    """
+    records_url = httpx.URL(url)
+    return str(
+        records_url
+        .copy_with(path=f"{records_url.path.rstrip('/')}/export")
+        .copy_merge_params({"columns": list(columns), "format": "arrow"})
+    )
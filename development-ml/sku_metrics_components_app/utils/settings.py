@@ -6,6 +6,8 @@
  */
 """
 
+from typing import Optional
+
 from dotenv import load_dotenv
 from pydantic_settings import BaseSettings
 
@@ -25,6 +27,26 @@ class Settings(BaseSettings):
     serp_api_key: str
     secret_key: str
     django_secured_fields_key: str
+    # ERP API Client Configuration
+    erp_page_size: int = 5000  # Records per ERP page (the ERP data is fetched page by page)
+    erp_timeout_seconds: float = 60.0  # Timeout of every ERP API request
+    erp_max_connections: int = 4  # Pooled (keep-alive) connections per ERP API client
+    erp_token_refresh_margin_seconds: int = 60  # Cached ERP tokens are refreshed this long before 'exp'
+    # ERP Sync Configuration
+    erp_incremental_sync: bool = True  # Delta fetch after the stored high-water mark (False = always a full fetch)
+    erp_sync_start_order_date: str = "2023-01-01T00:00:00"  # Start of the ERP history fetched by a full sync
+    erp_full_sync_days: int = 7  # Days between two full ERP fetches (reconciliation of late edits/inserts)
+    # SKU Metric Writes Configuration
+    sku_metric_write_batch_size: int = 1000  # Records per bulk write statement (and commit) of 'sku_metric'
+    # Weather (Open-Meteo) Client Configuration
+    open_meteo_archive_url: str = "https://archive-api.open-meteo.com/v1/era5"  # Historical weather API
+    weather_max_concurrent_requests: int = 4  # Open-Meteo requests (date ranges) sent at the same time
+    weather_timeout_seconds: float = 60.0  # Timeout of every Open-Meteo request
+    weather_retry_days: int = 14  # Orders of the last days without weather are fetched again by the next delta sync
+    # SKU Metric Steps Configuration
+    sku_metric_max_concurrent_steps: int = 4  # Data processing steps that run at the same time (Steps 2-5 are independent)
+    # Steps 2-5 are stopped after this time (None = no limit), checked between their items (see 'check_step_deadline')
+    sku_metric_step_timeout_seconds: Optional[float] = None
 
     class Config:
         # Automatically load variables from .env
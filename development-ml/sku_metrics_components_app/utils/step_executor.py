@@ -0,0 +1,154 @@
+"""
+/*
+ * Copyright 2025 DOTSOFT SA, Inc All Rights Reserved.
+ *
+ * Author: Georgios Karanasios R&D Software Engineer
+ */
+"""
+import asyncio
+import time
+from contextvars import ContextVar
+from typing import Awaitable, Callable, Dict, List, Optional, Sequence
+
+from utils.database_connection import own_engine
+
+''' Dependency-aware (DAG) executor of the data processing steps.
+
+A step starts as soon as all the steps it depends on have succeeded, so independent steps run concurrently and
+the run takes the time of its longest chain of steps, not the sum of all the steps. The steps do blocking I/O
+(HTTP requests, Selenium, sleeps), so every step runs on its own event loop in a worker thread, with its own
+database engine (see 'own_engine'): a blocked step does not hold back the others.
+
+The timeout of a step is enforced at two levels: 'asyncio.wait_for' cancels the step at its next 'await', and
+the steps that spend their time in blocking calls (requests, Selenium, 'time.sleep') call 'check_step_deadline'
+between their items. A single blocking call that never returns is not interrupted. '''
+
+# The deadline ('time.monotonic()') of the step running in the current context, None for no limit
+_step_deadline: ContextVar[Optional[float]] = ContextVar("step_deadline", default=None)
+
+
+class Step:
+    """
+    A step of the DAG: an async function, its arguments and the names of the steps it depends on.
+    """
+
+    def __init__(
+            self,
+            name: str,
+            func: Callable[..., Awaitable],
+            args: Sequence = (),
+            depends_on: Sequence[str] = (),
+            timeout_seconds: Optional[float] = None
+    ):
+        """
+        @param name: A human-readable name for the step (for logging).
+        @param func: The async function that executes the step logic.
+        @param args: Arguments to pass to the step function.
+        @param depends_on: The names of the steps that must succeed before this step starts.
+        @param timeout_seconds: The step is stopped after this time (at its next 'await' or deadline check), or None
+                                for no limit.
+        """
+        self.name = name
+        self.func = func
+        self.args = args
+        self.depends_on = depends_on
+        self.timeout_seconds = timeout_seconds
+
+
+class StepResult:
+    """
+    The outcome of a step: succeeded, failed (including a timeout) or skipped (a dependency did not succeed).
+    """
+
+    def __init__(self, succeeded: bool, seconds: float = 0.0, error: Optional[str] = None, skipped: bool = False):
+        self.succeeded = succeeded
+        self.seconds = seconds
+        self.error = error
+        self.skipped = skipped
+
+
+def check_step_deadline() -> None:
+    """
+    Stops the running step if it is over its timeout. Called between the items of the steps that block the event
+    loop (which 'asyncio.wait_for' can not cancel), so the step stops after its current item.
+
+    @raises asyncio.TimeoutError: If the running step is over its timeout.
+    """
+    deadline = _step_deadline.get()
+    if deadline is not None and time.monotonic() > deadline:
+        raise asyncio.TimeoutError("The step is over its timeout")
+
+
+async def _run_in_own_loop(step: Step) -> None:
+    """
+    Runs a step with its own database engine (on the event loop of the worker thread), and its deadline.
+
+    @param step: The step.
+    """
+    if step.timeout_seconds is not None:
+        _step_deadline.set(time.monotonic() + step.timeout_seconds)
+    async with own_engine():
+        await asyncio.wait_for(step.func(*step.args), step.timeout_seconds)
+
+
+def _validate(steps: List[Step]) -> None:
+    """
+    @param steps: The steps of the DAG.
+    @raises ValueError: If a step name is repeated, a dependency is unknown, or the dependencies have a cycle.
+    """
+    names = [step.name for step in steps]
+    if len(set(names)) != len(names):
+        raise ValueError(f"Repeated step names: {names}")
+    dependencies = {step.name: set(step.depends_on) for step in steps}
+    for name, depends_on in dependencies.items():
+        if not depends_on <= dependencies.keys():
+            raise ValueError(f"Unknown dependencies of '{name}': {depends_on - dependencies.keys()}")
+    # Kahn's algorithm: all the steps are removed only if there is no cycle
+    while dependencies:
+        ready = [name for name, depends_on in dependencies.items() if not depends_on]
+        if not ready:
+            raise ValueError(f"Cyclic dependencies between the steps: {sorted(dependencies)}")
+        for name in ready:
+            del dependencies[name]
+        for depends_on in dependencies.values():
+            depends_on.difference_update(ready)
+
+
+async def run_dag(steps: List[Step], max_concurrency: int) -> Dict[str, StepResult]:
+    """
+    Runs the steps in dependency order, every step as soon as its dependencies have succeeded. A failed step
+    does not interrupt the others; only the steps that depend on it are skipped.
+
+    @param steps: The steps of the DAG.
+    @param max_concurrency: The maximum number of steps that run at the same time.
+    @return: The result of every step, by step name.
+    """
+    _validate(steps)
+    semaphore = asyncio.Semaphore(max_concurrency)
+    tasks: Dict[str, asyncio.Task] = {}
+
+    async def run(step: Step) -> StepResult:
+        dependency_results = [await tasks[name] for name in step.depends_on]
+        if not all(result.succeeded for result in dependency_results):
+            print(f"\nSkipping {step.name}: a step it depends on did not succeed")
+            return StepResult(succeeded=False, skipped=True)
+        async with semaphore:
+            print(f"\nWe are at {step.name}")
+            start = time.perf_counter()
+            try:
+                await asyncio.to_thread(asyncio.run, _run_in_own_loop(step))
+                result = StepResult(succeeded=True, seconds=time.perf_counter() - start)
+            except asyncio.TimeoutError:
+                result = StepResult(succeeded=False, seconds=time.perf_counter() - start,
+                                    error=f"timed out after {step.timeout_seconds} s")
+            except Exception as e:
+                result = StepResult(succeeded=False, seconds=time.perf_counter() - start, error=str(e))
+        if result.succeeded:
+            print(f"{step.name} finished in {result.seconds:.1f} s")
+        else:
+            print(f"Error in {step.name} (after {result.seconds:.1f} s): {result.error}")
+        return result
+
+    for step in steps:
+        tasks[step.name] = asyncio.create_task(run(step))
+    return {name: await task for name, task in tasks.items()}
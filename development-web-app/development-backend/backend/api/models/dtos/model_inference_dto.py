@@ -7,6 +7,7 @@
 """
 
 from dataclasses import dataclass
+from typing import Optional
 
 from ...models.dtos.merged_sku_metric_dto import MergedSkuMetricDto
 from ...models.sku_order_quantity_prediction import SkuOrderQuantityPrediction
@@ -20,3 +21,15 @@ class ModelInferenceDto:
     """
     merged_sku_metric_dto: MergedSkuMetricDto
     sku_order_quantity_prediction: SkuOrderQuantityPrediction
+
+
+@dataclass
+class BatchModelInferenceItemDto:
+    """
+    Holds the result of a single SKU of a batch inference: either the stored sku_order_quantity_prediction,
+    or the error that made this SKU fail (the rest of the batch is not affected).
+    """
+    sku_number: int
+    status: str
+    sku_order_quantity_prediction: Optional[SkuOrderQuantityPrediction] = None
+    error: Optional[str] = None
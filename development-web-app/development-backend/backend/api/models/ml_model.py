@@ -18,10 +18,13 @@ class MLModel(models.Model):
     id = models.AutoField(primary_key=True)
     model_type = models.CharField(max_length=255)  # e.g., 'sku_quantity_prediction_ml_model'
     model_name = models.CharField(max_length=255)  # e.g., 'DecisionTreeRegressor'
-    model_file = models.BinaryField()  # Stores the trained model file as binary data
+    model_file = models.BinaryField(null=True)  # Stores the trained model file as binary data (or see 'model_path')
     mape = models.FloatField()  # Mean Absolute Percentage Error
     mae = models.FloatField()  # Mean Absolute Error
     model_features = models.CharField()
+    preprocessor_file = models.BinaryField(null=True)  # Fitted preprocessing pipeline (ColumnTransformer)
+    model_format = models.CharField(null=True)  # Storage format of the model file (None = legacy joblib)
+    model_path = models.CharField(null=True)  # Relative path in the model store (instead of 'model_file')
     updated_at = models.DateTimeField(auto_now=True)
 
     # Foreign key to associate models with users
@@ -10,6 +10,7 @@ from rest_framework import serializers
 from rest_framework_dataclasses.serializers import DataclassSerializer
 
 from ..dtos.inventory_service_dto import InventoryOptimizationDto
+from ...utils.constant_vars import BATCH_INFERENCE_MAX_SKUS
 
 
 class SkuOrderQuantityPredictionDTOSerializer(serializers.Serializer):
@@ -128,3 +129,31 @@ class ModelInferenceDemandPredictionResultSerializer(serializers.Serializer):
     """
     merged_sku_metric = MergedSkuMetricSerializer()
     sku_order_quantity_prediction = SkuOrderQuantityPredictionDTOSerializer()
+
+
+class BatchModelInferenceInputSerializer(serializers.Serializer):
+    """
+    Serializer for the batch inference input: either a list of SKU numbers or all the SKUs of the user.
+    """
+    user_id = serializers.IntegerField()
+    sku_numbers = serializers.ListField(child=serializers.IntegerField(), required=False, allow_empty=False,
+                                        max_length=BATCH_INFERENCE_MAX_SKUS)
+    all_skus = serializers.BooleanField(required=False, default=False)
+
+    def validate(self, data):
+        """
+        Validates that exactly one of 'sku_numbers' and 'all_skus' is given.
+        """
+        if bool(data.get("sku_numbers")) == data.get("all_skus"):
+            raise serializers.ValidationError("Provide either 'sku_numbers' or 'all_skus': true.")
+        return data
+
+
+class BatchModelInferenceItemSerializer(serializers.Serializer):
+    """
+    Serializer for a single SKU result of a batch inference.
+    """
+    sku_number = serializers.IntegerField()
+    status = serializers.CharField()
+    sku_order_quantity_prediction = SkuOrderQuantityPredictionDTOSerializer(allow_null=True)
+    error = serializers.CharField(allow_null=True)
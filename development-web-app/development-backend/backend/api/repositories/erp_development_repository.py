@@ -6,13 +6,17 @@
  */
 """
 
+import hashlib
 import logging
 from typing import Optional
 
 import requests
+from django.core.cache import cache
 
 from .erp_development_repository_interface import ErpDevelopmentRepositoryInterface
 from .user_erp_api_repository import UserErpApiRepository
+from ..utils.constant_vars import CACHE_EXPIRE_TIME
+from ..utils.erp_token_cache import erp_token_cache
 
 logger = logging.getLogger(__name__)
 
@@ -24,6 +28,16 @@ class ErpDevelopmentRepository(ErpDevelopmentRepositoryInterface):
 
     @staticmethod
     def fetch_erp_api_token(user_id: int) -> Optional[str]:
+        """
+        Return the cached ERP access token of the specified user, or fetch a new one (see 'erp_token_cache').
+
+        :param user_id: The ID of the user whose token we want to retrieve.
+        :return: The token string if successful, or None otherwise.
+        """
+        return erp_token_cache.get_token(user_id, lambda: ErpDevelopmentRepository._login_erp_api(user_id))
+
+    @staticmethod
+    def _login_erp_api(user_id: int) -> Optional[str]:
         """
         Fetch an access token from the ERP API's 'login_token_url' for the specified user.
         If any error occurs, return None (no logging or raising here).
@@ -67,8 +81,43 @@ class ErpDevelopmentRepository(ErpDevelopmentRepositoryInterface):
                 resp = requests.post(url, headers=headers, json=payload, timeout=10)
             else:
                 resp = requests.get(url, headers=headers, timeout=10)
+            if resp.status_code == 401:
+                erp_token_cache.invalidate_token(token)  # Rejected token: log in again on the next call
             resp.raise_for_status()
             return resp.json() or {}
         except requests.RequestException as e:
             logger.error(str(e))
             return None
+
+    @staticmethod
+    def fetch_revalidated_data_from_erp(url: str, token: str, user_id: int) -> Optional[dict]:
+        """
+        GET an ERP endpoint that returns an ETag (e.g., the distribution routing data), revalidating the
+        previous response of the user with 'If-None-Match': on 304 (Not Modified) the cached JSON data is
+        returned, without downloading it again.
+
+        :param url: The full ERP API endpoint URL.
+        :param token: The Bearer token to authenticate.
+        :param user_id: The ID of the user who owns the ERP API config (the cache is per user and URL).
+        :return: The parsed JSON data dict, or None on error.
+        """
+        cache_key = f"erp_api_response:{user_id}:{hashlib.sha256(url.encode()).hexdigest()}"
+        cached = cache.get(cache_key)  # (etag, data) of the previous response
+        try:
+            headers = {"Authorization": f"Bearer {token}"}
+            if cached:
+                headers["If-None-Match"] = cached[0]
+            resp = requests.get(url, headers=headers, timeout=10)
+            if resp.status_code == 304 and cached:
+                return cached[1]
+            if resp.status_code == 401:
+                erp_token_cache.invalidate_token(token)  # Rejected token: log in again on the next call
+            resp.raise_for_status()
+            data = resp.json() or {}
+            etag = resp.headers.get("ETag")
+            if etag:
+                cache.set(cache_key, (etag, data), CACHE_EXPIRE_TIME)
+            return data
+        except requests.RequestException as e:
+            logger.error(str(e))
+            return None
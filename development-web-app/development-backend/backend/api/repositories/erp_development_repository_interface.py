@@ -19,3 +19,7 @@ class ErpDevelopmentRepositoryInterface(ABC):
     @abstractmethod
     def fetch_data_from_erp(self, url: str, token: str, method: str, payload=None) -> Optional[dict]:
         pass
+
+    @abstractmethod
+    def fetch_revalidated_data_from_erp(self, url: str, token: str, user_id: int) -> Optional[dict]:
+        pass
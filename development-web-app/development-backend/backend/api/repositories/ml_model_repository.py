@@ -7,6 +7,7 @@
 """
 
 import logging
+from datetime import datetime
 
 from django.core.exceptions import ObjectDoesNotExist
 
@@ -32,3 +33,15 @@ class MLModelRepository(MLModelRepositoryInterface):
             return model
         except ObjectDoesNotExist:
             return None
+
+    @staticmethod
+    def find_model_updated_at(user_id: int, model_type: str) -> datetime | None:
+        """
+        Retrieve only the 'updated_at' (version) of the stored model, without loading the model file.
+
+        :param user_id: int: The ID of the user who owns the model.
+        :param model_type: str: The type of the model.
+        :return: datetime | None: The 'updated_at' of the model if found, otherwise None.
+        """
+        return MLModel.objects.filter(user_id=user_id, model_type=model_type) \
+            .values_list('updated_at', flat=True).first()
@@ -7,6 +7,7 @@
 """
 
 from abc import ABC, abstractmethod
+from datetime import datetime
 
 from ..models.ml_model import MLModel
 
@@ -16,3 +17,7 @@ class MLModelRepositoryInterface(ABC):
     @abstractmethod
     def find_model_file_by_user_and_name(self, user_id: int, model_type: str) -> MLModel | None:
         pass
+
+    @abstractmethod
+    def find_model_updated_at(self, user_id: int, model_type: str) -> datetime | None:
+        pass
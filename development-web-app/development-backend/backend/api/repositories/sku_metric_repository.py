@@ -7,7 +7,8 @@
 """
 
 import logging
-from typing import List, Optional
+from collections import defaultdict
+from typing import Dict, List, Optional
 
 from django.core.exceptions import ObjectDoesNotExist
 
@@ -46,3 +47,32 @@ class SkuMetricRepository(SkuMetricRepositoryInterface):
             return SkuMetric.objects.get(sku_order_record_id=record_id)
         except ObjectDoesNotExist:
             return None
+
+    @staticmethod
+    def find_sku_order_record_ids_grouped_by_sku_number(user_id: int, sku_numbers: Optional[List[int]] = None) \
+            -> Dict[int, List[int]]:
+        """
+        Retrieve (in a single query) the 'sku_order_record_id' values of the user's SkuMetric records,
+        grouped by sku_number.
+
+        :param user_id: int: The ID of the user who owns the records.
+        :param sku_numbers: Optional[List[int]]: The SKU numbers to filter by (None means all the SKUs of the user).
+        :return: Dict[int, List[int]]: {sku_number: [sku_order_record_id, ...]}, SKUs without records are omitted.
+        """
+        queryset = SkuMetric.objects.filter(user_id=user_id, sku_number__isnull=False)
+        if sku_numbers is not None:
+            queryset = queryset.filter(sku_number__in=sku_numbers)
+        record_ids_by_sku_number = defaultdict(list)
+        for sku_number, record_id in queryset.values_list('sku_number', 'sku_order_record_id').order_by('sku_number'):
+            record_ids_by_sku_number[sku_number].append(record_id)
+        return dict(record_ids_by_sku_number)
+
+    @staticmethod
+    def find_all_by_sku_order_record_ids(record_ids: List[int]) -> Dict[int, SkuMetric]:
+        """
+        Retrieve (in a single query) the SkuMetric objects of the given sku_order_record_ids.
+
+        :param record_ids: List[int]: The sku_order_record_ids to filter by.
+        :return: Dict[int, SkuMetric]: {sku_order_record_id: SkuMetric}, missing records are omitted.
+        """
+        return SkuMetric.objects.in_bulk(record_ids, field_name='sku_order_record_id')
@@ -7,7 +7,7 @@
 """
 
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 from ..models.sku_metric import SkuMetric
 
@@ -21,3 +21,12 @@ class SkuMetricRepositoryInterface(ABC):
     @abstractmethod
     def find_by_sku_order_record_id(self, record_id: int) -> Optional[SkuMetric]:
         pass
+
+    @abstractmethod
+    def find_sku_order_record_ids_grouped_by_sku_number(self, user_id: int, sku_numbers: Optional[List[int]] = None) \
+            -> Dict[int, List[int]]:
+        pass
+
+    @abstractmethod
+    def find_all_by_sku_order_record_ids(self, record_ids: List[int]) -> Dict[int, SkuMetric]:
+        pass
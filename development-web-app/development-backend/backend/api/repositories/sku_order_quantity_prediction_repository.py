@@ -120,3 +120,21 @@ class SkuOrderQuantityPredictionRepository(SkuOrderQuantityPredictionRepositoryI
                  or an empty list if no matches are found.
         """
         return list(SkuOrderQuantityPrediction.objects.filter(sku_number=sku_number))
+
+    @staticmethod
+    def bulk_store_sku_order_quantity_predictions(
+            sku_order_quantity_predictions: List[SkuOrderQuantityPrediction]) -> None:
+        """
+        Stores multiple SkuOrderQuantityPrediction records with a single bulk upsert.
+        A record with the same sku_order_record_id (unique) is overwritten with the new prediction.
+
+        :param sku_order_quantity_predictions: List[SkuOrderQuantityPrediction]: The (unsaved) predictions.
+        :return: None
+        """
+        SkuOrderQuantityPrediction.objects.bulk_create(
+            sku_order_quantity_predictions,
+            update_conflicts=True,
+            unique_fields=['sku_order_record'],
+            update_fields=['model_name', 'sku_number', 'week_number', 'year_of_the_week', 'predicted_value', 'mae',
+                           'mape', 'user', 'updated_at']
+        )
@@ -33,3 +33,8 @@ class SkuOrderQuantityPredictionRepositoryInterface(ABC):
     @abstractmethod
     def find_sku_order_quantity_prediction_by_sku_number(self, sku_number: int) -> List[SkuOrderQuantityPrediction]:
         pass
+
+    @abstractmethod
+    def bulk_store_sku_order_quantity_predictions(self, sku_order_quantity_predictions: List[
+        SkuOrderQuantityPrediction]) -> None:
+        pass
@@ -14,6 +14,7 @@ from django.core.exceptions import ObjectDoesNotExist
 from .user_erp_api_repository_interface import UserErpApiRepositoryInterface
 from ..models.user_erp_api import UserErpApi
 from ..utils.constant_vars import CACHE_EXPIRE_TIME
+from ..utils.erp_token_cache import erp_token_cache
 
 
 class UserErpApiRepository(UserErpApiRepositoryInterface):
@@ -69,6 +70,7 @@ class UserErpApiRepository(UserErpApiRepositoryInterface):
             # Invalidate or update the cache
             cache_key = f"user_erp_api:{existing_record.user_id}"
             cache.set(cache_key, existing_record, CACHE_EXPIRE_TIME)
+            erp_token_cache.invalidate(existing_record.user_id)  # The credentials (or login URL) may have changed
             return existing_record
         # If no record exists, create a new one
         user_erp_api_record.save()
@@ -8,7 +8,7 @@
 """
 
 import logging
-from typing import List
+from typing import Dict, List, Tuple
 
 from ortools.linear_solver import pywraplp
 
@@ -54,11 +54,14 @@ class DistributionOptimizationWithTrafficService(DistributionOptimizationWithTra
         """
         Runs an OR-Tools integer linear program for multi-vehicle routing with traffic factors.
 
-        :param data: dict: Input data containing distance matrix, vehicle capacities, and traffic factors.
+        :param data: dict: Input data containing the distances and traffic factors (sparse 'edges' or dense matrices),
+                     vehicle capacities, and demands.
         :return: dict: A dictionary with 'total_cost' (float) and 'results' (list of routes) or an empty dict if infeasible.
         """
-        num_nodes = len(data['distance_matrix'])
+        num_nodes = len(data['demands'])
         num_vehicles = data['num_vehicles']
+        # distance * traffic_factor of the (from, to) pairs with a cost (the other pairs add nothing to the objective)
+        edge_costs = DistributionOptimizationWithTrafficService._get_edge_costs(data)
         depot = data['depot']
         # Create the solver.
         solver = pywraplp.Solver.CreateSolver('SCIP')
@@ -71,9 +74,8 @@ class DistributionOptimizationWithTrafficService(DistributionOptimizationWithTra
                         x[(i, j, k)] = solver.IntVar(0, data['vehicle_capacities'][k], f'x[{i},{j},{k}]')
         # Objective: Minimize the total cost of transportation, adjusted for traffic
         solver.Minimize(solver.Sum(
-            data['cost_per_trip_per_vehicle'][k] * x[(i, j, k)] * data['distance_matrix'][i][j] *
-            data['traffic_factors'][i][j]
-            for i in range(num_nodes) for j in range(num_nodes) for k in range(num_vehicles) if i != j))
+            data['cost_per_trip_per_vehicle'][k] * x[(i, j, k)] * edge_cost
+            for (i, j), edge_cost in edge_costs.items() for k in range(num_vehicles)))
         # Capacity constraints for each vehicle
         for k in range(num_vehicles):
             solver.Add(solver.Sum(x[(i, j, k)] for i in range(num_nodes) for j in range(num_nodes) if i != j)
@@ -110,6 +112,28 @@ class DistributionOptimizationWithTrafficService(DistributionOptimizationWithTra
         else:
             return {}
 
+    @staticmethod
+    def _get_edge_costs(data: dict) -> Dict[Tuple[int, int], float]:
+        """
+        Reads the cost (distance * traffic_factor) of every (from, to) pair with a route, from either the sparse
+        'edges' of the ERP data model (no N x N matrix is built) or the dense 'distance_matrix' / 'traffic_factors'.
+
+        :param data: dict: Input data containing either 'edges' or 'distance_matrix' and 'traffic_factors'.
+        :return: Dict[Tuple[int, int], float]: The non-zero costs by (from, to) index pair (i != j).
+        """
+        if 'edges' in data:
+            edges = data['edges']
+            pairs = zip(edges['source'], edges['destination'], edges['distance'], edges['traffic_factor'])
+        else:
+            pairs = (
+                (i, j, distance, data['traffic_factors'][i][j])
+                for i, row in enumerate(data['distance_matrix']) for j, distance in enumerate(row) if distance
+            )
+        edge_costs = {}
+        for i, j, distance, traffic_factor in pairs:
+            edge_costs[(i, j)] = distance * traffic_factor  # The last route of a pair wins (as in the matrices)
+        return {pair: cost for pair, cost in edge_costs.items() if cost and pair[0] != pair[1]}
+
     @staticmethod
     def _convert_to_distribution_optimizations(
             user_id: int, total_cost: float, route_list: list, location_data: list
@@ -7,7 +7,8 @@
 """
 
 import logging
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
 
 import inject
 
@@ -52,8 +53,19 @@ class ErpDevelopmentServiceFacade(ErpDevelopmentServiceFacadeInterface):
         token = self.erp_development_repository.fetch_erp_api_token(user_id)
         if not token:
             raise CustomLoggerException(f"Failed to retrieve ERP token for user_id={user_id}")
-        # Build the URL & Send a POST request with {'ids': sku_order_record_ids} as JSON.
-        url = user_erp_api.sku_order_latest_url
+        return self._fetch_most_recent_sku_order_record(user_erp_api.sku_order_latest_url, token,
+                                                        sku_order_record_ids)
+
+    def _fetch_most_recent_sku_order_record(self, url: str, token: str, sku_order_record_ids: List[int]) -> Dict | None:
+        """
+        Sends the 'latest SKU order record' request with an already acquired ERP token.
+
+        :param url: The ERP 'sku_order_latest_url' of the user.
+        :param token: The ERP Bearer token.
+        :param sku_order_record_ids: List of record IDs to pass in the payload.
+        :return: The 'data' portion from the ERP response (dict or None if no response).
+        """
+        # Send a POST request with {'ids': sku_order_record_ids} as JSON.
         payload = {"ids": sku_order_record_ids}
         logger.info(f"Sending POST to {url} with payload={payload}")
         json_resp = self.erp_development_repository.fetch_data_from_erp(url, token, method="POST", payload=payload)
@@ -99,15 +111,29 @@ class ErpDevelopmentServiceFacade(ErpDevelopmentServiceFacadeInterface):
         token = self.erp_development_repository.fetch_erp_api_token(user_id)
         if not token:
             raise CustomLoggerException(f"Failed to retrieve ERP token for user_id={user_id}")
-        # GET the routing data
-        url = user_erp_api.distribution_routing_url
-        json_resp = self.erp_development_repository.fetch_data_from_erp(url, token, method="GET")
+        # GET the routing data (not downloaded again if unchanged since the previous call, see ETag),
+        # with the sparse distances / traffic factors instead of the N x N matrices
+        url = self._add_query_params(user_erp_api.distribution_routing_url, {"matrix_format": "sparse"})
+        json_resp = self.erp_development_repository.fetch_revalidated_data_from_erp(url, token, user_id)
         # Return the 'data' portion or None if no response
         if not json_resp or "data" not in json_resp:
             logger.warning("No 'data' portion returned from ERP API for the distribution routing data.")
             return None
         return json_resp["data"]
 
+    @staticmethod
+    def _add_query_params(url: str, params: Dict[str, str]) -> str:
+        """
+        Adds query parameters to a URL (keeping the ones it already has).
+
+        :param url: The URL.
+        :param params: The query parameters to add (replacing the ones with the same name).
+        :return: The URL with the query parameters.
+        """
+        parts = urlsplit(url)
+        query = dict(parse_qsl(parts.query), **params)
+        return urlunsplit(parts._replace(query=urlencode(query)))
+
     def get_merged_sku_metric_info(self, sku_number: int, user_id: int) -> Optional[MergedSkuMetricDto]:
         """
         Retrieves merged SKU metric information by combining:
@@ -150,6 +176,55 @@ class ErpDevelopmentServiceFacade(ErpDevelopmentServiceFacadeInterface):
         # Step 4: Merge relevant data into a MergedSkuMetricDto and return it
         return self._merge_data(only_data, sku_metric_obj)
 
+    def get_merged_sku_metric_infos(self, sku_numbers: Optional[List[int]], user_id: int) \
+            -> Tuple[Dict[int, MergedSkuMetricDto], Dict[int, str]]:
+        """
+        Batch version of 'get_merged_sku_metric_info', for many SKUs of the same user.
+        The local record IDs and the local SkuMetric objects are loaded with one query each, and the ERP token is
+        acquired once. The ERP exposes the latest record per set of IDs only, so it is still called once per SKU.
+        A SKU that cannot be merged does not fail the batch, it is reported in the failures instead.
+
+        :param sku_numbers: Optional[List[int]]: The SKU numbers (None means all the SKUs of the user).
+        :param user_id: int: The user ID used to locate the records and the client config for the ERP calls.
+        :return: Tuple[Dict[int, MergedSkuMetricDto], Dict[int, str]]: ({sku_number: merged DTO},
+                 {sku_number: failure reason}).
+        :raises CustomLoggerException: If the ERP token cannot be retrieved.
+        """
+        merged_dtos, failures = {}, {}
+        # Step 1: Retrieve the local record IDs of all the SKUs
+        record_ids_by_sku_number = self.sku_metric_service.get_sku_order_record_ids_grouped_by_sku_number(
+            user_id, sku_numbers)
+        for sku_number in sku_numbers or []:
+            if sku_number not in record_ids_by_sku_number:
+                failures[sku_number] = f"No SkuMetric records found for sku_number={sku_number}."
+        if not record_ids_by_sku_number:
+            return merged_dtos, failures
+        # Step 2: ERP external calls (one token for the whole batch)
+        user_erp_api = self.user_erp_api_service.get_user_erp_api(user_id)
+        token = self.erp_development_repository.fetch_erp_api_token(user_id)
+        if not token:
+            raise CustomLoggerException(f"Failed to retrieve ERP token for user_id={user_id}")
+        erp_data_by_sku_number = {}
+        for sku_number, record_ids in record_ids_by_sku_number.items():
+            only_data = self._fetch_most_recent_sku_order_record(user_erp_api.sku_order_latest_url, token, record_ids)
+            if not only_data:
+                failures[sku_number] = "No data returned from external ERP for these record IDs."
+            elif not only_data.get("id"):
+                failures[sku_number] = "No 'id' field in external ERP data."
+            else:
+                erp_data_by_sku_number[sku_number] = only_data
+        # Step 3: Find the local SkuMetric objects of the ERP records (single query)
+        sku_metrics = self.sku_metric_service.get_all_by_sku_order_record_ids(
+            [only_data["id"] for only_data in erp_data_by_sku_number.values()])
+        # Step 4: Merge relevant data into MergedSkuMetricDto objects
+        for sku_number, only_data in erp_data_by_sku_number.items():
+            sku_metric_obj = sku_metrics.get(only_data["id"])
+            if not sku_metric_obj:
+                failures[sku_number] = f"No local SkuMetric found for record_id={only_data['id']}."
+                continue
+            merged_dtos[sku_number] = self._merge_data(only_data, sku_metric_obj)
+        return merged_dtos, failures
+
     @staticmethod
     def _merge_data(only_data, sku_metric_obj) -> MergedSkuMetricDto:
         """
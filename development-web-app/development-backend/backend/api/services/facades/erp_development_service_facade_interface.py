@@ -7,7 +7,7 @@
 """
 
 from abc import ABC, abstractmethod
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 
 from ...models.dtos.merged_sku_metric_dto import MergedSkuMetricDto
 
@@ -28,3 +28,8 @@ class ErpDevelopmentServiceFacadeInterface(ABC):
     @abstractmethod
     def get_merged_sku_metric_info(self, sku_number: int, user_id: int) -> Optional[MergedSkuMetricDto]:
         pass
+
+    @abstractmethod
+    def get_merged_sku_metric_infos(self, sku_numbers: Optional[List[int]], user_id: int) \
+            -> Tuple[Dict[int, MergedSkuMetricDto], Dict[int, str]]:
+        pass
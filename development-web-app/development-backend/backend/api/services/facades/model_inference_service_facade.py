@@ -9,7 +9,7 @@
 import json
 import logging
 from io import BytesIO
-from typing import Optional
+from typing import List, Optional
 
 import inject
 import joblib
@@ -22,11 +22,15 @@ from .erp_development_service_facade_interface import ErpDevelopmentServiceFacad
 from .model_inference_service_facade_interface import ModelInferenceServiceFacadeInterface
 from ..sku_metric_service_interface import SkuMetricServiceInterface
 from ...models.dtos.merged_sku_metric_dto import MergedSkuMetricDto
-from ...models.dtos.model_inference_dto import ModelInferenceDto
+from ...models.dtos.model_inference_dto import ModelInferenceDto, BatchModelInferenceItemDto
+from ...models.ml_model import MLModel
 from ...models.sku_order_quantity_prediction import SkuOrderQuantityPrediction
 from ...services.ml_model_service_interface import MLModelServiceInterface
 from ...services.sku_order_quantity_prediction_service_interface import SkuOrderQuantityPredictionServiceInterface
+from ...utils.constant_vars import BATCH_INFERENCE_STATUS_SUCCESS, BATCH_INFERENCE_STATUS_FAILED
 from ...utils.enums import MLModelName
+from ...utils.model_cache import LoadedMLModel, ml_model_cache
+from ...utils.model_storage import load_model_file, loaded_objects_size
 
 logger = logging.getLogger(__name__)
 
@@ -95,10 +99,72 @@ class ModelInferenceServiceFacade(ModelInferenceServiceFacadeInterface):
             sku_order_quantity_prediction=new_sku_order_quantity_prediction
         )
 
+    def run_batch_sku_order_quantity_inference(self, sku_numbers: Optional[List[int]], user_id: int) -> List[
+        BatchModelInferenceItemDto]:
+        """
+        Runs inference for SKU order quantity prediction on many SKUs at once.
+
+        Steps:
+        1) Fetch merged SKU metric data of all the SKUs (one ERP token, per-SKU failures are collected).
+        2) Load the trained model once (from the model cache).
+        3) Build one feature matrix and call 'predict' once.
+        4) Store all the predictions with a single bulk upsert.
+        5) Return one result per SKU (success with the prediction, or failure with its reason).
+
+        :param sku_numbers: Optional[List[int]]: The SKU numbers (None means all the SKUs of the user).
+        :param user_id: int: The user ID requesting the inference.
+        :return: List[BatchModelInferenceItemDto]: The per-SKU results, in the requested order (or by SKU number).
+        :raises ValueError: If the trained model cannot be found or loaded.
+        """
+        # Step 1: Get Merged data
+        merged_sku_metric_dtos, failures = self.erp_sku_metric_service.get_merged_sku_metric_infos(sku_numbers,
+                                                                                                   user_id)
+        results = {
+            sku_number: BatchModelInferenceItemDto(sku_number=sku_number, status=BATCH_INFERENCE_STATUS_FAILED,
+                                                   error=error)
+            for sku_number, error in failures.items()
+        }
+        if merged_sku_metric_dtos:
+            # Step 2: Load the model once for the whole batch
+            loaded_model = self._get_loaded_model(user_id, MLModelName.SKU_ORDER_QUANTITY_PREDICTION_MODEL.value)
+            if loaded_model is None:
+                raise ValueError("Failed to load the trained ML model.")
+            # Step 3: One feature matrix, one predict() call
+            input_data = self._build_feature_matrix(loaded_model, list(merged_sku_metric_dtos.values()))
+            predicted_values = loaded_model.model.predict(input_data.values)
+            # Step 4: Store all the results in sku_order_quantity_prediction
+            new_sku_order_quantity_predictions = {}
+            for (sku_number, merged_sku_metric_dto), predicted_value in zip(merged_sku_metric_dtos.items(),
+                                                                            predicted_values):
+                order_date = pd.Timestamp(merged_sku_metric_dto.order_date).isocalendar()
+                new_sku_order_quantity_predictions[sku_number] = SkuOrderQuantityPrediction(
+                    model_name=loaded_model.model_name,
+                    sku_number=merged_sku_metric_dto.sku_number,
+                    week_number=order_date.week,
+                    year_of_the_week=order_date.year,
+                    predicted_value=float(predicted_value),
+                    mae=loaded_model.mae,
+                    mape=loaded_model.mape,
+                    sku_order_record_id=merged_sku_metric_dto.sku_order_record_id,
+                    user_id=user_id
+                )
+            self.prediction_service.create_sku_order_quantity_predictions(
+                list(new_sku_order_quantity_predictions.values()))
+            for sku_number, new_sku_order_quantity_prediction in new_sku_order_quantity_predictions.items():
+                results[sku_number] = BatchModelInferenceItemDto(
+                    sku_number=sku_number, status=BATCH_INFERENCE_STATUS_SUCCESS,
+                    sku_order_quantity_prediction=new_sku_order_quantity_prediction)
+        logger.info(f"Batch inference for user_id={user_id}: {len(merged_sku_metric_dtos)} succeeded, "
+                    f"{len(failures)} failed.")
+        # Step 5: Return the per-SKU results
+        ordered_sku_numbers = list(dict.fromkeys(sku_numbers)) if sku_numbers is not None else sorted(results)
+        return [results[sku_number] for sku_number in ordered_sku_numbers]
+
     @staticmethod
     def _preprocess_data(df: pd.DataFrame) -> pd.DataFrame:
         """
         Handle missing values, encode categorical columns, and extract 'week' from 'order_date'.
+        Only used for models stored without a fitted preprocessing pipeline (see '_build_feature_vector').
 
         :param df: pd.DataFrame: The DataFrame to preprocess.
         :return: pd.DataFrame: The processed DataFrame with encoded categorical values and imputed missing data.
@@ -124,16 +190,61 @@ class ModelInferenceServiceFacade(ModelInferenceServiceFacadeInterface):
         # Return final DataFrame
         return df
 
-    def _build_feature_vector(self, model_features, merged_sku_metric_dto: MergedSkuMetricDto) -> pd.DataFrame:
+    @staticmethod
+    def _build_raw_input_row(merged_sku_metric_dto: MergedSkuMetricDto) -> dict:
         """
-        Builds a feature vector for inference using the stored model features.
+        Builds a row with the raw (df_development) columns used in training.
+        'order_date' is replaced by its ISO 'week', exactly as in the ML-App training.
 
-        :param model_features: list: The expected feature columns used during model training.
         :param merged_sku_metric_dto: MergedSkuMetricDto: The DTO containing SKU-related data.
-        :return: pd.DataFrame: A processed DataFrame with features aligned to the trained model's expectations.
+        :return: dict: The raw input row, before any preprocessing.
+        """
+        order_date_parsed = pd.Timestamp(merged_sku_metric_dto.order_date)
+        return {
+            "id": merged_sku_metric_dto.sku_order_record_id,
+            "sku_number": merged_sku_metric_dto.sku_number,
+            "sku_name": merged_sku_metric_dto.sku_name,
+            "class_display_name": merged_sku_metric_dto.class_display_name,
+            "order_item_price_in_main_currency": merged_sku_metric_dto.order_item_price_in_main_currency,
+            "cl_price": merged_sku_metric_dto.cl_price,
+            "is_weekend": merged_sku_metric_dto.is_weekend,
+            "is_holiday": merged_sku_metric_dto.is_holiday,
+            "mean_temperature": merged_sku_metric_dto.mean_temperature,
+            "rain": merged_sku_metric_dto.rain,
+            "average_competition_price_external": merged_sku_metric_dto.average_competition_price_external,
+            "review_sentiment_score": merged_sku_metric_dto.review_sentiment_score,
+            "review_sentiment_timestamp": merged_sku_metric_dto.review_sentiment_timestamp,
+            "trend_value": merged_sku_metric_dto.trend_value,
+            "week": order_date_parsed.isocalendar().week,
+        }
+
+    def _build_raw_input(self, merged_sku_metric_dto: MergedSkuMetricDto) -> pd.DataFrame:
+        """
+        Builds a single-row DataFrame with the raw (df_development) columns used in training.
+
+        :param merged_sku_metric_dto: MergedSkuMetricDto: The DTO containing SKU-related data.
+        :return: pd.DataFrame: The raw input, before any preprocessing.
         """
+        return pd.DataFrame([self._build_raw_input_row(merged_sku_metric_dto)])
 
-        # Prepare a DataFrame from the merged DTO.
+    def _build_feature_vector(self, loaded_model: LoadedMLModel,
+                              merged_sku_metric_dto: MergedSkuMetricDto) -> pd.DataFrame:
+        """
+        Builds a feature vector for inference.
+        If the training stored its fitted preprocessing pipeline, it is applied with a pure 'transform'
+        (same imputation values and encoded categories as in training, no fit per request).
+        Otherwise (models trained before the pipeline was persisted), the input is preprocessed on its own
+        and re-indexed to the stored model features.
+
+        :param loaded_model: LoadedMLModel: The deserialized model (preprocessor, model_features).
+        :param merged_sku_metric_dto: MergedSkuMetricDto: The DTO containing SKU-related data.
+        :return: pd.DataFrame: A processed DataFrame with features aligned to the trained model's expectations.
+        """
+        if loaded_model.preprocessor is not None:
+            preprocessor = loaded_model.preprocessor
+            input_df = self._build_raw_input(merged_sku_metric_dto)
+            return preprocessor.transform(input_df.reindex(columns=preprocessor.feature_names_in_))
+        # Legacy path: prepare a DataFrame from the merged DTO.
         order_date_parsed = pd.Timestamp(merged_sku_metric_dto.order_date)
         input_data = {
             "week": order_date_parsed.isocalendar().week,
@@ -155,10 +266,80 @@ class ModelInferenceServiceFacade(ModelInferenceServiceFacadeInterface):
         # Preprocess the input using the same _preprocess_data function.
         input_processed = self._preprocess_data(input_df)
         # **Crucial step:** re-index the preprocessed input to match the expected training features.
-        input_processed = input_processed.reindex(columns=model_features, fill_value=0)
+        input_processed = input_processed.reindex(columns=loaded_model.model_features, fill_value=0)
 
         return input_processed
 
+    def _build_feature_matrix(self, loaded_model: LoadedMLModel,
+                              merged_sku_metric_dtos: List[MergedSkuMetricDto]) -> pd.DataFrame:
+        """
+        Builds the feature matrix of a batch inference (one row per DTO).
+        With a stored preprocessing pipeline, the raw rows are transformed at once; otherwise every row goes
+        through the legacy per-row path (see '_build_feature_vector'), so results match the single inference.
+
+        :param loaded_model: LoadedMLModel: The deserialized model (preprocessor, model_features).
+        :param merged_sku_metric_dtos: List[MergedSkuMetricDto]: The DTOs containing SKU-related data.
+        :return: pd.DataFrame: A processed DataFrame with features aligned to the trained model's expectations.
+        """
+        if loaded_model.preprocessor is not None:
+            preprocessor = loaded_model.preprocessor
+            input_df = pd.DataFrame([self._build_raw_input_row(dto) for dto in merged_sku_metric_dtos])
+            return preprocessor.transform(input_df.reindex(columns=preprocessor.feature_names_in_))
+        return pd.concat([self._build_feature_vector(loaded_model, dto) for dto in merged_sku_metric_dtos],
+                         ignore_index=True)
+
+    @staticmethod
+    def _load_ml_model(ml_model: MLModel) -> LoadedMLModel:
+        """
+        Deserializes the stored model file (any storage format, see 'load_model_file') and preprocessing pipeline.
+
+        :param ml_model: MLModel: The stored model record.
+        :return: LoadedMLModel: The deserialized model, along with its stored metrics and features.
+        """
+        preprocessor_file = ml_model.preprocessor_file
+        model = load_model_file(ml_model)
+        preprocessor = joblib.load(BytesIO(preprocessor_file)) if preprocessor_file else None
+        return LoadedMLModel(
+            model_name=ml_model.model_name,
+            model=model,
+            preprocessor=preprocessor,
+            model_features=json.loads(ml_model.model_features),
+            mape=ml_model.mape,
+            mae=ml_model.mae,
+            size_bytes=loaded_objects_size(model, preprocessor)
+        )
+
+    def _get_loaded_model(self, user_id: int, model_type: str) -> LoadedMLModel | None:
+        """
+        Returns the deserialized model from the in-process cache, if it holds the current version of the model.
+        Only 'updated_at' is queried to check the freshness; the model file is fetched and deserialized on a miss.
+
+        :param user_id: int: The ID of the user who owns the model.
+        :param model_type: str: The type of the model.
+        :return: LoadedMLModel | None: The deserialized model, or None if the stored files cannot be loaded.
+        :raises ValueError: If no model is found for the given user_id and model_type.
+        """
+        updated_at = self.ml_model_service.get_trained_model_updated_at(user_id, model_type)
+        loaded_model = ml_model_cache.get(user_id, model_type, updated_at)
+        if loaded_model is None:
+            ml_model = self.ml_model_service.get_trained_model(user_id, model_type)
+            try:
+                loaded_model = self._load_ml_model(ml_model)
+            except Exception as e:
+                logger.error(f"Failed to load the stored model: {str(e)}")
+                return None
+            ml_model_cache.put(user_id, model_type, ml_model.updated_at, loaded_model)
+        logger.debug(f"ML model cache stats: {ml_model_cache.stats()}")
+        return loaded_model
+
+    def get_model_cache_stats(self) -> dict:
+        """
+        Returns the counters of the in-process cache of deserialized models.
+
+        :return: dict: hits, misses, evictions, hit_rate, entries, size_bytes, max_bytes, max_entries.
+        """
+        return ml_model_cache.stats()
+
     def _run_inference(self, user_id, merged_sku_metric_dto: MergedSkuMetricDto) -> tuple[str, float, float, float] | \
                                                                                     tuple[MergedSkuMetricDto, None]:
         """
@@ -177,28 +358,18 @@ class ModelInferenceServiceFacade(ModelInferenceServiceFacadeInterface):
                    - None
         :raises ValueError: If an error occurs during model prediction.
         """
-        # Retrieve MLModel record
-        ml_model = self.ml_model_service.get_trained_model(user_id,
-                                                           MLModelName.SKU_ORDER_QUANTITY_PREDICTION_MODEL.value)
-        # Retrieve the model features used in training
-        model_features = json.loads(ml_model.model_features)
-        # Load the trained model
-        try:
-            loaded_model = joblib.load(BytesIO(ml_model.model_file))
-        except Exception as e:
-            logger.error(f"Failed to load joblib model: {str(e)}")
+        # Retrieve the deserialized model (from the cache, or the DB on a miss)
+        loaded_model = self._get_loaded_model(user_id, MLModelName.SKU_ORDER_QUANTITY_PREDICTION_MODEL.value)
+        if loaded_model is None:
             return merged_sku_metric_dto, None
-        # We also retrieve the stored mape & mae from the MLModel
-        model_mape = ml_model.mape
-        model_mae = ml_model.mae
         # Prepare features for inference (collecting them into a list or array)
-        input_data = self._build_feature_vector(model_features, merged_sku_metric_dto)
+        input_data = self._build_feature_vector(loaded_model, merged_sku_metric_dto)
         # Inference
         try:
-            predicted_value = loaded_model.predict(input_data.values)[0]
+            predicted_value = loaded_model.model.predict(input_data.values)[0]
         except Exception as e:
             logger.error(f"Error during predict(): {e}")
             raise
         logger.info(f"Inference predicted_value={predicted_value}")
         # Return
-        return ml_model.model_name, predicted_value, model_mape, model_mae
+        return loaded_model.model_name, predicted_value, loaded_model.mape, loaded_model.mae
@@ -7,8 +7,9 @@
 """
 
 from abc import ABC, abstractmethod
+from typing import List, Optional
 
-from ...models.dtos.model_inference_dto import ModelInferenceDto
+from ...models.dtos.model_inference_dto import ModelInferenceDto, BatchModelInferenceItemDto
 
 
 class ModelInferenceServiceFacadeInterface(ABC):
@@ -19,3 +20,12 @@ class ModelInferenceServiceFacadeInterface(ABC):
     @abstractmethod
     def run_sku_order_quantity_inference(self, sku_number: int, user_id: int) -> ModelInferenceDto:
         pass
+
+    @abstractmethod
+    def run_batch_sku_order_quantity_inference(self, sku_numbers: Optional[List[int]], user_id: int) -> List[
+        BatchModelInferenceItemDto]:
+        pass
+
+    @abstractmethod
+    def get_model_cache_stats(self) -> dict:
+        pass
@@ -7,6 +7,7 @@
 """
 
 import logging
+from datetime import datetime
 
 import inject
 
@@ -40,3 +41,18 @@ class MLModelService(MLModelServiceInterface):
             logger.warning(f"No ML model found for user_id={user_id} and model_type='{model_type}'.")
             raise ValueError("ML model not found in DB.")
         return ml_model
+
+    def get_trained_model_updated_at(self, user_id: int, model_type: str) -> datetime:
+        """
+        Calls the repository to retrieve only the version ('updated_at') of the model (cheap freshness check).
+
+        :param user_id: int: The ID of the user who owns the model.
+        :param model_type: str: The type of the model.
+        :return: datetime: The 'updated_at' of the model.
+        :raises ValueError: If no model is found for the given user_id and model_type.
+        """
+        updated_at = self.ml_model_repository.find_model_updated_at(user_id, model_type)
+        if not updated_at:
+            logger.warning(f"No ML model found for user_id={user_id} and model_type='{model_type}'.")
+            raise ValueError("ML model not found in DB.")
+        return updated_at
@@ -7,6 +7,7 @@
 """
 
 from abc import ABC, abstractmethod
+from datetime import datetime
 
 from ..models.ml_model import MLModel
 
@@ -16,3 +17,7 @@ class MLModelServiceInterface(ABC):
     @abstractmethod
     def get_trained_model(self, user_id: int, model_type: str) -> MLModel:
         pass
+
+    @abstractmethod
+    def get_trained_model_updated_at(self, user_id: int, model_type: str) -> datetime:
+        pass
@@ -7,7 +7,7 @@
 """
 
 import logging
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 import inject
 
@@ -54,3 +54,23 @@ class SkuMetricService(SkuMetricServiceInterface):
         if not sku_metric:
             logger.warning(f"SkuMetric with record_id={sku_order_record_id} not found.")
         return sku_metric
+
+    def get_sku_order_record_ids_grouped_by_sku_number(self, user_id: int, sku_numbers: Optional[List[int]] = None) \
+            -> Dict[int, List[int]]:
+        """
+        Retrieves the user's 'sku_order_record_id' values grouped by SKU number (used by the batch inference).
+
+        :param user_id: int: The ID of the user who owns the records.
+        :param sku_numbers: Optional[List[int]]: The SKU numbers to filter by (None means all the SKUs of the user).
+        :return: Dict[int, List[int]]: {sku_number: [sku_order_record_id, ...]}, SKUs without records are omitted.
+        """
+        return self.sku_metric_repository.find_sku_order_record_ids_grouped_by_sku_number(user_id, sku_numbers)
+
+    def get_all_by_sku_order_record_ids(self, record_ids: List[int]) -> Dict[int, SkuMetric]:
+        """
+        Retrieves multiple SkuMetric objects by sku_order_record_id.
+
+        :param record_ids: List[int]: The sku_order_record_ids to filter by.
+        :return: Dict[int, SkuMetric]: {sku_order_record_id: SkuMetric}, missing records are omitted.
+        """
+        return self.sku_metric_repository.find_all_by_sku_order_record_ids(record_ids)
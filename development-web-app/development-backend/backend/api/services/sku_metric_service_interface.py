@@ -7,7 +7,7 @@
 """
 
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 from ..models.sku_metric import SkuMetric
 
@@ -24,3 +24,12 @@ class SkuMetricServiceInterface(ABC):
     @abstractmethod
     def get_by_sku_order_record_id(self, sku_order_record_id: int) -> Optional[SkuMetric]:
         pass
+
+    @abstractmethod
+    def get_sku_order_record_ids_grouped_by_sku_number(self, user_id: int, sku_numbers: Optional[List[int]] = None) \
+            -> Dict[int, List[int]]:
+        pass
+
+    @abstractmethod
+    def get_all_by_sku_order_record_ids(self, record_ids: List[int]) -> Dict[int, SkuMetric]:
+        pass
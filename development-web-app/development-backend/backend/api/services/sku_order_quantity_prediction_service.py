@@ -52,6 +52,18 @@ class SkuOrderQuantityPredictionService(SkuOrderQuantityPredictionServiceInterfa
         """
         self.sku_order_quantity_prediction_repository.store_sku_order_quantity_prediction(sku_order_quantity_prediction)
 
+    def create_sku_order_quantity_predictions(self, sku_order_quantity_predictions: List[
+        SkuOrderQuantityPrediction]) -> None:
+        """
+        Saves multiple SkuOrderQuantityPrediction records in the database (single bulk upsert).
+
+        :param sku_order_quantity_predictions: List[SkuOrderQuantityPrediction]: The forecast records to be stored.
+        :return: None
+        """
+        if sku_order_quantity_predictions:
+            self.sku_order_quantity_prediction_repository.bulk_store_sku_order_quantity_predictions(
+                sku_order_quantity_predictions)
+
     def get_sku_order_quantity_prediction_by_record_id(self, record_id: int) -> Optional[SkuOrderQuantityPrediction]:
         """
         Retrieves a single SkuOrderQuantityPrediction by its sku_order_record_id.
@@ -31,3 +31,8 @@ class SkuOrderQuantityPredictionServiceInterface(ABC):
     @abstractmethod
     def calculate_demand_parameters(self, sku_number: int) -> tuple[None, None] | tuple[float, float]:
         pass
+
+    @abstractmethod
+    def create_sku_order_quantity_predictions(self, sku_order_quantity_predictions: List[
+        SkuOrderQuantityPrediction]) -> None:
+        pass
@@ -6,10 +6,25 @@
  */
 """
 
+import base64
+import json
 import os
+import tempfile
+import threading
+import time
+from datetime import datetime
+from io import BytesIO
 
 import django
+import joblib
 import numpy as np
+import pandas as pd
+from sklearn.compose import ColumnTransformer
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.linear_model import Ridge
+from sklearn.impute import SimpleImputer
+from sklearn.preprocessing import OneHotEncoder
+from xgboost import XGBRegressor
 
 # Set the DJANGO_SETTINGS_MODULE environment variable
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend.backend.settings')
@@ -19,7 +34,8 @@ django.setup()
 
 from unittest.mock import Mock, patch
 from factory import Factory, Faker, SubFactory
-from django.test import TestCase
+from django.core.cache import cache as django_cache
+from django.test import TestCase, override_settings
 from django.core.exceptions import ObjectDoesNotExist
 from api.services.user_service import UserService
 from api.services.user_privilege_service import UserPrivilegeService
@@ -28,7 +44,10 @@ from api.services.sku_metric_service import SkuMetricService
 from api.services.ml_model_service import MLModelService
 from api.services.inventory_optimization_service import InventoryOptimizationService
 from api.services.distribution_optimization_service import DistributionOptimizationService
+from api.services.distribution_optimization_with_traffic_service import DistributionOptimizationWithTrafficService
 from api.services.user_erp_api_service import UserErpApiService
+from api.services.facades.model_inference_service_facade import ModelInferenceServiceFacade
+from api.models.dtos.merged_sku_metric_dto import MergedSkuMetricDto
 from api.models.login_user import LoginUser
 from api.models.sku_metric import SkuMetric
 from api.models.dtos.user_dto import UserDto
@@ -44,6 +63,10 @@ from api.utils.enums import Role
 from api.utils.custom_exceptions import CustomLoggerException
 from api.utils.constant_messages import USER_EMAIL_NOT_FOUND, USER_ID_NOT_FOUND
 from api.utils.dto_converters import user_dto_to_login_user
+from api.utils.model_cache import LoadedMLModel, MLModelCache, ml_model_cache
+from api.utils.model_storage import load_model_file, stored_model_size, loaded_objects_size
+from api.utils.erp_token_cache import ErpTokenCache
+from api.repositories.erp_development_repository import ErpDevelopmentRepository
 from api.utils.constant_messages import INVALID_CREDENTIALS
 
 
@@ -570,6 +593,15 @@ class SkuOrderQuantityPredictionServiceTest(TestCase):
         self.repository.find_sku_order_quantity_prediction_by_sku_number.assert_called_once_with(sku_number)
 
 
+    def test_create_sku_order_quantity_predictions_uses_a_single_bulk_write(self):
+        # Arrange
+        predictions = [SkuOrderQuantityPredictionFactory.build(), SkuOrderQuantityPredictionFactory.build()]
+        # Act
+        self.service.create_sku_order_quantity_predictions(predictions)
+        self.service.create_sku_order_quantity_predictions([])
+        # Assert
+        self.repository.bulk_store_sku_order_quantity_predictions.assert_called_once_with(predictions)
+
 # Unit Tests for SkuMetricService
 class SkuMetricServiceTest(TestCase):
     def setUp(self):
@@ -661,6 +693,14 @@ class MLModelServiceTest(TestCase):
         self.assertIn("ML model not found in DB.", str(context.exception))
         self.repository.find_model_file_by_user_and_name.assert_called_once_with(user_id, model_type)
 
+    def test_get_trained_model_updated_at_not_found(self):
+        # Arrange
+        self.repository.find_model_updated_at.return_value = None
+        # Act & Assert
+        with self.assertRaises(ValueError):
+            self.service.get_trained_model_updated_at(456, "NonExistentModel")
+        self.repository.find_model_file_by_user_and_name.assert_not_called()
+
 
 # Unit Tests for InventoryOptimizationService
 class InventoryOptimizationServiceTest(TestCase):
@@ -792,3 +832,343 @@ class UserErpApiServiceTest(TestCase):
         # Assert
         self.assertEqual(result.client_name, "Updated Client")
         self.user_erp_api_repository.store_or_update_user_erp_api_record.assert_called_once_with(updated_record)
+
+
+# Unit Tests for ModelInferenceServiceFacade
+class ModelInferenceServiceFacadeTest(TestCase):
+    def setUp(self):
+        # Arrange
+        self.facade = ModelInferenceServiceFacade(Mock(), Mock(), Mock(), Mock())
+        training_df = pd.DataFrame({
+            "id": [1, 2, 3],
+            "sku_name": ["a", "b", "a"],
+            "mean_temperature": [10.0, 20.0, None],
+            "is_weekend": [True, False, True],
+            "week": [1, 2, 3],
+        })
+        self.preprocessor = ColumnTransformer(
+            transformers=[
+                ("numeric", SimpleImputer(strategy='mean'), ["id", "mean_temperature", "week"]),
+                ("categorical", OneHotEncoder(handle_unknown='ignore', sparse_output=False),
+                 ["sku_name", "is_weekend"])
+            ],
+            verbose_feature_names_out=False
+        ).set_output(transform="pandas").fit(training_df)
+        self.loaded_model = LoadedMLModel(model_name="Ridge", model=Mock(), preprocessor=self.preprocessor,
+                                          model_features=[], mape=0.1, mae=1.0, size_bytes=1)
+
+    def test_build_feature_vector_with_stored_preprocessor(self):
+        # Arrange
+        dto = MergedSkuMetricDto(sku_order_record_id=7, order_date=datetime(2025, 1, 8), sku_name="b",
+                                 is_weekend=False, mean_temperature=None)
+        # Act
+        result = self.facade._build_feature_vector(self.loaded_model, dto)
+        # Assert: same features as in training, imputed with the training mean (no refit on the single row)
+        self.assertEqual(list(result.columns), list(self.preprocessor.get_feature_names_out()))
+        self.assertEqual(result.iloc[0]["mean_temperature"], 15.0)
+        self.assertEqual(result.iloc[0]["sku_name_b"], 1.0)
+        self.assertEqual(result.iloc[0]["is_weekend_True"], 0.0)
+        self.assertEqual(result.iloc[0]["week"], 2)
+
+    def test_build_feature_vector_unknown_category_is_ignored(self):
+        # Arrange
+        dto = MergedSkuMetricDto(sku_order_record_id=8, order_date=datetime(2025, 1, 8), sku_name="unknown",
+                                 is_weekend=True, mean_temperature=30.0)
+        # Act
+        result = self.facade._build_feature_vector(self.loaded_model, dto)
+        # Assert
+        self.assertEqual(result.iloc[0]["sku_name_a"] + result.iloc[0]["sku_name_b"], 0.0)
+        self.assertEqual(result.iloc[0]["mean_temperature"], 30.0)
+
+    def test_get_loaded_model_deserializes_once_per_version(self):
+        # Arrange
+        ml_model_cache.clear()
+        model_buffer = BytesIO()
+        joblib.dump({"model": "stub"}, model_buffer)
+        ml_model = MLModelFactory.build(model_file=model_buffer.getvalue(), model_features='["week"]',
+                                        updated_at=datetime(2025, 1, 1))
+        self.facade.ml_model_service.get_trained_model_updated_at.return_value = ml_model.updated_at
+        self.facade.ml_model_service.get_trained_model.return_value = ml_model
+        # Act
+        first = self.facade._get_loaded_model(1, "sku_model")
+        second = self.facade._get_loaded_model(1, "sku_model")
+        # Assert: the blob is fetched (and deserialized) only on the first call
+        self.assertIs(first, second)
+        self.facade.ml_model_service.get_trained_model.assert_called_once_with(1, "sku_model")
+        self.assertEqual(self.facade.get_model_cache_stats()["hits"], 1)
+        self.assertEqual(self.facade.get_model_cache_stats()["misses"], 1)
+        # Act: a retrained model has a new 'updated_at', so it is a miss and replaces the stale entry
+        ml_model.updated_at = datetime(2025, 1, 2)
+        self.facade.ml_model_service.get_trained_model_updated_at.return_value = ml_model.updated_at
+        third = self.facade._get_loaded_model(1, "sku_model")
+        # Assert
+        self.assertIsNot(first, third)
+        self.assertEqual(self.facade.get_model_cache_stats()["entries"], 1)
+        ml_model_cache.clear()
+
+    def test_run_batch_inference_predicts_once_and_reports_failures(self):
+        # Arrange
+        merged_dtos = {
+            11: MergedSkuMetricDto(sku_order_record_id=1, sku_number=11, order_date=datetime(2025, 1, 8),
+                                   sku_name="a", is_weekend=False, mean_temperature=12.0),
+            12: MergedSkuMetricDto(sku_order_record_id=2, sku_number=12, order_date=datetime(2025, 1, 8),
+                                   sku_name="b", is_weekend=True, mean_temperature=None)
+        }
+        self.facade.erp_sku_metric_service.get_merged_sku_metric_infos.return_value = (
+            merged_dtos, {13: "No SkuMetric records found for sku_number=13."})
+        self.loaded_model.model.predict.return_value = np.array([4.0, 6.0])
+        # Act
+        with patch.object(self.facade, "_get_loaded_model", return_value=self.loaded_model):
+            results = self.facade.run_batch_sku_order_quantity_inference([13, 11, 12], user_id=5)
+        # Assert: one predict() call on a 2-row matrix, one bulk write, results in the requested order
+        self.loaded_model.model.predict.assert_called_once()
+        self.assertEqual(self.loaded_model.model.predict.call_args[0][0].shape[0], 2)
+        stored = self.facade.prediction_service.create_sku_order_quantity_predictions.call_args[0][0]
+        self.assertEqual([prediction.sku_order_record_id for prediction in stored], [1, 2])
+        self.assertEqual([result.sku_number for result in results], [13, 11, 12])
+        self.assertEqual([result.status for result in results], ["failed", "success", "success"])
+        self.assertEqual(results[0].error, "No SkuMetric records found for sku_number=13.")
+        self.assertEqual(results[2].sku_order_quantity_prediction.predicted_value, 6.0)
+
+    def test_run_batch_inference_without_merged_data_skips_the_model(self):
+        # Arrange
+        self.facade.erp_sku_metric_service.get_merged_sku_metric_infos.return_value = ({}, {21: "No data."})
+        # Act
+        with patch.object(self.facade, "_get_loaded_model") as get_loaded_model:
+            results = self.facade.run_batch_sku_order_quantity_inference([21], user_id=5)
+        # Assert
+        get_loaded_model.assert_not_called()
+        self.facade.prediction_service.create_sku_order_quantity_predictions.assert_not_called()
+        self.assertEqual(results[0].status, "failed")
+
+
+class MLModelCacheTest(TestCase):
+    @staticmethod
+    def _loaded_model(size_bytes: int) -> LoadedMLModel:
+        return LoadedMLModel(model_name="Ridge", model=Mock(), preprocessor=None, model_features=[],
+                             mape=0.1, mae=1.0, size_bytes=size_bytes)
+
+    def test_evicts_least_recently_used_when_memory_bound_is_exceeded(self):
+        # Arrange
+        cache = MLModelCache(max_bytes=100, max_entries=10)
+        version = datetime(2025, 1, 1)
+        cache.put(1, "sku_model", version, self._loaded_model(40))
+        cache.put(2, "sku_model", version, self._loaded_model(40))
+        cache.get(1, "sku_model", version)
+        # Act
+        cache.put(3, "sku_model", version, self._loaded_model(40))
+        # Assert: user 2 was the least recently used entry
+        self.assertIsNone(cache.get(2, "sku_model", version))
+        self.assertIsNotNone(cache.get(1, "sku_model", version))
+        self.assertEqual(cache.stats()["evictions"], 1)
+        self.assertEqual(cache.stats()["size_bytes"], 80)
+
+    def test_evicts_when_entry_bound_is_exceeded(self):
+        # Arrange
+        cache = MLModelCache(max_bytes=1000, max_entries=1)
+        version = datetime(2025, 1, 1)
+        # Act
+        cache.put(1, "sku_model", version, self._loaded_model(1))
+        cache.put(2, "sku_model", version, self._loaded_model(1))
+        # Assert
+        self.assertIsNone(cache.get(1, "sku_model", version))
+        self.assertEqual(cache.stats()["entries"], 1)
+
+    def test_model_bigger_than_capacity_is_not_cached(self):
+        # Arrange
+        cache = MLModelCache(max_bytes=10, max_entries=10)
+        version = datetime(2025, 1, 1)
+        # Act
+        cache.put(1, "sku_model", version, self._loaded_model(11))
+        # Assert
+        self.assertIsNone(cache.get(1, "sku_model", version))
+        stats = cache.stats()
+        self.assertEqual(stats["hits"], 0)
+        self.assertEqual(stats["misses"], 1)
+        self.assertEqual(stats["hit_rate"], 0.0)
+        self.assertEqual(stats["entries"], 0)
+        self.assertEqual(stats["size_bytes"], 0)
+
+
+class ModelStorageTest(TestCase):
+    def setUp(self):
+        # Arrange
+        self.X = np.arange(40, dtype=float).reshape(20, 2)
+        self.y = self.X.sum(axis=1)
+
+    def test_load_compressed_joblib_model_file(self):
+        # Arrange
+        model = Ridge().fit(self.X, self.y)
+        buffer = BytesIO()
+        joblib.dump(model, buffer, compress=3)
+        ml_model = MLModelFactory.build(model_file=buffer.getvalue(), model_format="joblib")
+        # Act
+        loaded = load_model_file(ml_model)
+        # Assert
+        np.testing.assert_allclose(loaded.predict(self.X), model.predict(self.X))
+        self.assertEqual(stored_model_size(ml_model), len(buffer.getvalue()))
+
+    def test_loaded_size_is_not_shrunk_by_the_compression(self):
+        # Arrange
+        model = RandomForestRegressor(n_estimators=20, random_state=0).fit(self.X, self.y)
+        buffer = BytesIO()
+        joblib.dump(model, buffer, compress=3)
+        ml_model = MLModelFactory.build(model_file=buffer.getvalue(), model_format="joblib")
+        # Act
+        loaded = load_model_file(ml_model)
+        # Assert: the cache accounts the deserialized model, not its compressed blob
+        self.assertGreater(loaded_objects_size(loaded, None), stored_model_size(ml_model))
+
+    def test_load_native_xgboost_model_file_keeps_hyperparameters(self):
+        # Arrange
+        model = XGBRegressor(n_estimators=5, max_depth=2, n_jobs=1).fit(self.X, self.y)
+        booster = model.get_booster().copy()
+        booster.set_attr(sklearn_params=json.dumps({"max_depth": 2}))
+        ml_model = MLModelFactory.build(model_file=bytes(booster.save_raw(raw_format="ubj")), model_format="xgb_ubj")
+        # Act
+        loaded = load_model_file(ml_model)
+        # Assert
+        np.testing.assert_allclose(loaded.predict(self.X), model.predict(self.X))
+        self.assertEqual(loaded.get_params()["max_depth"], 2)
+
+    def test_load_model_store_file_memory_mapped(self):
+        # Arrange
+        model = Ridge().fit(self.X, self.y)
+        with tempfile.TemporaryDirectory() as model_store_dir:
+            os.makedirs(os.path.join(model_store_dir, "7"))
+            joblib.dump(model, os.path.join(model_store_dir, "7", "model.joblib"))
+            ml_model = MLModelFactory.build(model_file=None, model_format="joblib", model_path="7/model.joblib")
+            # Act
+            with override_settings(ML_MODEL_STORE_DIR=model_store_dir):
+                loaded = load_model_file(ml_model)
+                size = stored_model_size(ml_model)
+            # Assert
+            self.assertIsInstance(loaded.coef_, np.memmap)
+            np.testing.assert_allclose(loaded.predict(self.X), model.predict(self.X))
+            self.assertEqual(size, os.path.getsize(os.path.join(model_store_dir, "7", "model.joblib")))
+
+    def test_load_model_store_file_without_store_dir(self):
+        # Arrange
+        ml_model = MLModelFactory.build(model_file=None, model_path="7/model.joblib")
+        # Act & Assert
+        with override_settings(ML_MODEL_STORE_DIR=None):
+            with self.assertRaises(ValueError):
+                load_model_file(ml_model)
+
+
+class ErpTokenCacheTest(TestCase):
+    def setUp(self):
+        django_cache.clear()
+        self.token_cache = ErpTokenCache(refresh_margin_seconds=60)
+
+    @staticmethod
+    def _jwt(expires_in: int) -> str:
+        claims = json.dumps({"sub": "erp", "exp": time.time() + expires_in}).encode()
+        return f"header.{base64.urlsafe_b64encode(claims).decode().rstrip('=')}.signature"
+
+    def test_token_is_reused_until_shortly_before_expiry(self):
+        # Arrange
+        login = Mock(side_effect=[self._jwt(3600), self._jwt(30), self._jwt(3600)])
+        # Act
+        first = self.token_cache.get_token(1, login)
+        second = self.token_cache.get_token(1, login)
+        self.token_cache.invalidate(1)
+        about_to_expire = self.token_cache.get_token(1, login)
+        refreshed = self.token_cache.get_token(1, login)
+        # Assert: a token expiring within the refresh margin is not cached
+        self.assertEqual(first, second)
+        self.assertNotEqual(about_to_expire, refreshed)
+        self.assertEqual(login.call_count, 3)
+
+    def test_concurrent_refreshes_log_in_once(self):
+        # Arrange
+        token = self._jwt(3600)
+
+        def slow_login():
+            time.sleep(0.05)
+            return token
+
+        login = Mock(side_effect=slow_login)
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(self.token_cache.get_token(1, login)))
+                   for _ in range(8)]
+        # Act
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        # Assert
+        self.assertEqual(results, [token] * 8)
+        login.assert_called_once()
+
+    def test_rejected_token_and_failed_login_are_not_kept(self):
+        # Arrange
+        token = self._jwt(3600)
+        login = Mock(side_effect=[None, token, self._jwt(7200)])
+        # Act
+        failed = self.token_cache.get_token(1, login)
+        cached = self.token_cache.get_token(1, login)
+        self.token_cache.invalidate_token(token)
+        refreshed = self.token_cache.get_token(1, login)
+        # Assert
+        self.assertIsNone(failed)
+        self.assertEqual(cached, token)
+        self.assertNotEqual(refreshed, token)
+        self.assertEqual(login.call_count, 3)
+
+
+class ErpRevalidatedDataTest(TestCase):
+    def setUp(self):
+        django_cache.clear()
+
+    @patch("api.repositories.erp_development_repository.requests.get")
+    def test_unchanged_data_is_not_downloaded_again(self, mock_get):
+        # Arrange
+        data = {"user_id": 1, "data": {"depot": 0, "distance_matrix": [[0.0]]}}
+        mock_get.side_effect = [
+            Mock(status_code=200, headers={"ETag": '"v1"'}, json=Mock(return_value=data)),
+            Mock(status_code=304, headers={"ETag": '"v1"'}),
+        ]
+        url = "http://erp/api/distribution_routing_data"
+        # Act
+        first = ErpDevelopmentRepository.fetch_revalidated_data_from_erp(url, "token", 1)
+        second = ErpDevelopmentRepository.fetch_revalidated_data_from_erp(url, "token", 1)
+        # Assert: the second call revalidates the first response instead of downloading it
+        self.assertEqual(first, data)
+        self.assertEqual(second, data)
+        self.assertNotIn("If-None-Match", mock_get.call_args_list[0].kwargs["headers"])
+        self.assertEqual(mock_get.call_args_list[1].kwargs["headers"]["If-None-Match"], '"v1"')
+
+
+class DistributionOptimizationWithTrafficServiceTest(TestCase):
+    @staticmethod
+    def _routing_data(**distances):
+        return {
+            "demands": [0, 3, 4, 2],
+            "vehicle_capacities": [10, 6],
+            "cost_per_trip_per_vehicle": [1.0, 1.5],
+            "num_vehicles": 2,
+            "depot": 0,
+            "location_data": [{"location_id": i, "location_name": f"L{i}"} for i in range(4)],
+            **distances,
+        }
+
+    def test_sparse_edges_give_the_same_solution_as_dense_matrices(self):
+        # Arrange: the same routes, as dense matrices and as sparse edges
+        edges = {"source": [0, 0, 0, 1, 2, 3], "destination": [1, 2, 3, 2, 3, 1],
+                 "distance": [4.0, 6.0, 5.0, 2.0, 3.0, 1.0], "traffic_factor": [1.2, 1.0, 1.5, 1.1, 1.0, 2.0]}
+        distance_matrix = [[0.0] * 4 for _ in range(4)]
+        traffic_factors = [[1.0] * 4 for _ in range(4)]
+        for i, j, distance, traffic_factor in zip(*edges.values()):
+            distance_matrix[i][j] = distance
+            traffic_factors[i][j] = traffic_factor
+        dense = self._routing_data(distance_matrix=distance_matrix, traffic_factors=traffic_factors)
+        sparse = self._routing_data(edges=edges)
+        service = DistributionOptimizationWithTrafficService
+        # Act
+        dense_solution = service._get_distribution_optimization_with_traffic(dense)
+        sparse_solution = service._get_distribution_optimization_with_traffic(sparse)
+        # Assert
+        self.assertEqual(service._get_edge_costs(dense), service._get_edge_costs(sparse))
+        self.assertAlmostEqual(dense_solution["total_cost"], sparse_solution["total_cost"])
+
@@ -1 +1,7 @@
 CACHE_EXPIRE_TIME = 86400  # 24 hours = 86400 seconds
+ML_MODEL_CACHE_MAX_BYTES = 512 * 1024 * 1024  # Memory bound (deserialized sizes) of the ML model cache
+ML_MODEL_CACHE_MAX_ENTRIES = 64  # Maximum number of deserialized ML models kept in memory
+BATCH_INFERENCE_MAX_SKUS = 1000  # Maximum number of SKU numbers accepted by a single batch inference request
+BATCH_INFERENCE_STATUS_SUCCESS = "success"
+BATCH_INFERENCE_STATUS_FAILED = "failed"
+ERP_TOKEN_REFRESH_MARGIN_SECONDS = 60  # Cached ERP tokens are refreshed this long before their 'exp' claim
@@ -0,0 +1,109 @@
+"""
+/*
+ * Copyright 2025 DOTSOFT SA, Inc All Rights Reserved.
+ *
+ * Author: Georgios Karanasios R&D Software Engineer
+ */
+"""
+
+import base64
+import hashlib
+import json
+import threading
+import time
+from typing import Callable, Optional
+
+from django.core.cache import cache
+
+from .constant_vars import ERP_TOKEN_REFRESH_MARGIN_SECONDS
+
+
+def jwt_expires_at(token: str) -> Optional[float]:
+    """
+    Read the 'exp' claim (epoch seconds) of a JWT, without verifying its signature (the ERP verifies it).
+
+    :param token: str: The JWT.
+    :return: Optional[float]: The expiration time, or None if the token has no (readable) 'exp' claim.
+    """
+    try:
+        payload = token.split(".")[1]
+        claims = json.loads(base64.urlsafe_b64decode(payload + "=" * (-len(payload) % 4)))
+        return float(claims["exp"])
+    except (IndexError, KeyError, TypeError, ValueError):
+        return None
+
+
+class ErpTokenCache:
+    """
+    Caches the ERP Bearer token of every user (in the Django cache) until shortly before its 'exp' claim,
+    so that the ERP calls of a request (and of the next requests) reuse it instead of logging in every time.
+    Concurrent refreshes of the same user (in the process) are collapsed into a single login.
+    """
+
+    def __init__(self, refresh_margin_seconds: int = ERP_TOKEN_REFRESH_MARGIN_SECONDS):
+        """
+        :param refresh_margin_seconds: int: A token is refreshed when it expires in less than this margin.
+        """
+        self.refresh_margin_seconds = refresh_margin_seconds
+        self._locks: dict[int, threading.Lock] = {}
+        self._locks_lock = threading.Lock()
+
+    @staticmethod
+    def _cache_key(user_id: int) -> str:
+        return f"erp_api_token:{user_id}"
+
+    @staticmethod
+    def _token_cache_key(token: str) -> str:
+        return f"erp_api_token_user:{hashlib.sha256(token.encode()).hexdigest()}"
+
+    def get_token(self, user_id: int, login: Callable[[], Optional[str]]) -> Optional[str]:
+        """
+        Return the cached token of a user, or log in (once, whatever the number of concurrent callers).
+
+        :param user_id: int: The ID of the user whose token we want.
+        :param login: Callable: Requests a new token from the ERP API (returns None on failure).
+        :return: Optional[str]: A valid token, or None if the login failed.
+        """
+        token = cache.get(self._cache_key(user_id))
+        if token:
+            return token
+        with self._locks_lock:
+            lock = self._locks.setdefault(user_id, threading.Lock())
+        with lock:
+            # Another thread may have refreshed the token while this one was waiting
+            token = cache.get(self._cache_key(user_id))
+            if token:
+                return token
+            token = login()
+            expires_at = jwt_expires_at(token) if token else None
+            if expires_at is not None:  # Failed logins and tokens without 'exp' are not cached
+                timeout = expires_at - self.refresh_margin_seconds - time.time()
+                if timeout > 0:
+                    cache.set(self._cache_key(user_id), token, timeout)
+                    cache.set(self._token_cache_key(token), user_id, timeout)  # For 'invalidate_token'
+            return token
+
+    def invalidate(self, user_id: int) -> None:
+        """
+        Drop the cached token of a user (e.g., rejected by the ERP API, or new ERP API credentials).
+
+        :param user_id: int: The ID of the user.
+        :return: None
+        """
+        cache.delete(self._cache_key(user_id))
+
+    def invalidate_token(self, token: str) -> None:
+        """
+        Drop a cached token rejected by the ERP API (e.g., 401 after a key rotation), whichever user it belongs to.
+
+        :param token: str: The rejected token.
+        :return: None
+        """
+        user_id = cache.get(self._token_cache_key(token))
+        if user_id is not None and cache.get(self._cache_key(user_id)) == token:
+            self.invalidate(user_id)
+        cache.delete(self._token_cache_key(token))
+
+
+# Shared by all the (per-request) ErpDevelopmentRepository calls of the process
+erp_token_cache = ErpTokenCache()
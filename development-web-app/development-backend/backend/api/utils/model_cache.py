@@ -0,0 +1,132 @@
+"""
+/*
+ * Copyright 2025 DOTSOFT SA, Inc All Rights Reserved.
+ *
+ * Author: Georgios Karanasios R&D Software Engineer
+ */
+"""
+
+import logging
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Optional
+
+from .constant_vars import ML_MODEL_CACHE_MAX_BYTES, ML_MODEL_CACHE_MAX_ENTRIES
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class LoadedMLModel:
+    """
+    A deserialized ML model (and its fitted preprocessing pipeline), ready for inference.
+    'size_bytes' is the estimated memory held by the deserialized objects (see 'loaded_objects_size'), not the
+    size of the (possibly compressed) stored blobs.
+    """
+    model_name: str
+    model: Any
+    preprocessor: Optional[Any]
+    model_features: list[str]
+    mape: float
+    mae: float
+    size_bytes: int
+
+
+class MLModelCache:
+    """
+    Thread-safe, memory-bounded LRU cache of deserialized ML models.
+    Entries are keyed by (user_id, model_type, updated_at), so a retrained model (new 'updated_at')
+    is a new key and the stale entry of the same model is dropped when the new one is stored.
+    """
+
+    def __init__(self, max_bytes: int = ML_MODEL_CACHE_MAX_BYTES, max_entries: int = ML_MODEL_CACHE_MAX_ENTRIES):
+        """
+        :param max_bytes: int: Upper bound of the (estimated, deserialized) memory held by all the entries.
+        :param max_entries: int: Upper bound of the number of entries.
+        """
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self._entries: OrderedDict[tuple[int, str, datetime], LoadedMLModel] = OrderedDict()
+        self._lock = threading.Lock()
+        self._current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, user_id: int, model_type: str, updated_at: datetime) -> LoadedMLModel | None:
+        """
+        Return the cached model and mark it as the most recently used one.
+
+        :param user_id: int: The ID of the user who owns the model.
+        :param model_type: str: The type of the model.
+        :param updated_at: datetime: The 'updated_at' of the stored model (its version).
+        :return: LoadedMLModel | None: The cached model, or None on a miss.
+        """
+        key = (user_id, model_type, updated_at)
+        with self._lock:
+            loaded_model = self._entries.get(key)
+            if loaded_model is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return loaded_model
+
+    def put(self, user_id: int, model_type: str, updated_at: datetime, loaded_model: LoadedMLModel) -> None:
+        """
+        Store a model, drop the older versions of the same (user_id, model_type) and evict the least recently
+        used entries until both bounds hold. A model bigger than 'max_bytes' on its own is not cached.
+
+        :param user_id: int: The ID of the user who owns the model.
+        :param model_type: str: The type of the model.
+        :param updated_at: datetime: The 'updated_at' of the stored model (its version).
+        :param loaded_model: LoadedMLModel: The deserialized model.
+        :return: None
+        """
+        if loaded_model.size_bytes > self.max_bytes:
+            logger.warning(f"ML model of user_id={user_id} ({loaded_model.size_bytes} bytes) exceeds the cache "
+                           f"capacity ({self.max_bytes} bytes), it will not be cached.")
+            return
+        with self._lock:
+            for key in [key for key in self._entries if key[:2] == (user_id, model_type)]:
+                self._current_bytes -= self._entries.pop(key).size_bytes
+            self._entries[(user_id, model_type, updated_at)] = loaded_model
+            self._current_bytes += loaded_model.size_bytes
+            while self._current_bytes > self.max_bytes or len(self._entries) > self.max_entries:
+                _, evicted_model = self._entries.popitem(last=False)
+                self._current_bytes -= evicted_model.size_bytes
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """
+        Remove all the entries and reset the counters.
+
+        :return: None
+        """
+        with self._lock:
+            self._entries.clear()
+            self._current_bytes = 0
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> dict:
+        """
+        :return: dict: The hit/miss/eviction counters, the hit rate and the current size of the cache.
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "entries": len(self._entries),
+                "size_bytes": self._current_bytes,
+                "max_bytes": self.max_bytes,
+                "max_entries": self.max_entries,
+            }
+
+
+# Shared by all the (per-request) ModelInferenceServiceFacade instances of the process
+ml_model_cache = MLModelCache()
@@ -0,0 +1,105 @@
+"""
+/*
+ * Copyright 2025 DOTSOFT SA, Inc All Rights Reserved.
+ *
+ * Author: Georgios Karanasios R&D Software Engineer
+ */
+"""
+
+import json
+import os
+import pickle
+from io import BytesIO
+
+import joblib
+from django.conf import settings
+from xgboost import XGBRegressor
+
+from ..models.ml_model import MLModel
+
+# Storage formats written by the ML-App ('services/model_storage.py'), None is a legacy (joblib) model file
+XGB_MODEL_FORMATS = ("xgb_json", "xgb_ubj")
+XGB_PARAMS_ATTRIBUTE = "sklearn_params"
+
+
+def _model_store_file_path(ml_model: MLModel) -> str:
+    """
+    Resolves the 'model_path' of a model against the model store shared with the ML-App.
+
+    :param ml_model: MLModel: The stored model record (with a 'model_path').
+    :return: str: The absolute path of the model file.
+    :raises ValueError: If no model store is configured.
+    """
+    if not settings.ML_MODEL_STORE_DIR:
+        raise ValueError(f"Model stored at '{ml_model.model_path}', but ML_MODEL_STORE_DIR is not configured.")
+    return os.path.join(settings.ML_MODEL_STORE_DIR, ml_model.model_path)
+
+
+def load_model_file(ml_model: MLModel):
+    """
+    Deserializes the trained model of an 'ml_model' record, whatever its storage format:
+
+    - joblib (compressed or not) from the 'model_file' column;
+    - native XGBoost boosters (JSON/UBJ), with the scikit-learn hyperparameters stored by the ML-App;
+    - files of the model store ('model_path'): uncompressed joblib files are memory-mapped (read-only), so the
+      tree arrays are shared through the page cache instead of being copied into every worker process.
+
+    :param ml_model: MLModel: The stored model record.
+    :return: The trained model.
+    """
+    if ml_model.model_path:
+        source = _model_store_file_path(ml_model)
+    else:
+        source = bytearray(ml_model.model_file) if ml_model.model_format in XGB_MODEL_FORMATS \
+            else BytesIO(ml_model.model_file)
+    if ml_model.model_format in XGB_MODEL_FORMATS:
+        model = XGBRegressor()
+        model.load_model(source)
+        params = model.get_booster().attr(XGB_PARAMS_ATTRIBUTE)
+        if params:
+            model.set_params(**json.loads(params))
+        return model
+    if ml_model.model_path:
+        return joblib.load(source, mmap_mode='r')
+    return joblib.load(source)
+
+
+def stored_model_size(ml_model: MLModel) -> int:
+    """
+    Returns the size (bytes) of the stored model file, from the 'model_file' column or the model store.
+
+    :param ml_model: MLModel: The stored model record.
+    :return: int: The size in bytes.
+    """
+    if ml_model.model_path:
+        return os.path.getsize(_model_store_file_path(ml_model))
+    return len(ml_model.model_file)
+
+
+class _ByteCounter:
+    """
+    File-like sink that only counts the bytes written to it.
+    """
+
+    def __init__(self):
+        self.size = 0
+
+    def write(self, data) -> None:
+        self.size += memoryview(data).nbytes
+
+
+def loaded_objects_size(*objects) -> int:
+    """
+    Estimates the memory held by deserialized objects (e.g., a model and its preprocessing pipeline) as the
+    length of their uncompressed pickle, counted without building it. Unlike the stored size, it does not shrink
+    with the compression of the stored file. For a memory-mapped model it is an upper bound: the mapped arrays
+    are counted, although their pages are shared between the worker processes.
+
+    :param objects: The deserialized objects (None entries are ignored).
+    :return: int: The estimated size in bytes.
+    """
+    counter = _ByteCounter()
+    for obj in objects:
+        if obj is not None:
+            pickle.dump(obj, counter, protocol=pickle.HIGHEST_PROTOCOL)
+    return counter.size
@@ -19,7 +19,8 @@ from ..models.serializers.models_serializers import SkuInputSerializer
 from ..models.serializers.predictions_serializers import (
     ModelInferenceInputSerializer,
     ModelInferenceDemandPredictionResultSerializer, InventoryOptimizationResultSerializer,
-    InventoryOptimizationInputSerializer, DistributionOptimizationInputSerializer
+    InventoryOptimizationInputSerializer, DistributionOptimizationInputSerializer,
+    BatchModelInferenceInputSerializer, BatchModelInferenceItemSerializer
 )
 from ..services.facades.distribution_optimization_routing_facade_interface import \
     DistributionOptimizationRoutingFacadeInterface
@@ -28,7 +29,8 @@ from ..services.facades.model_inference_service_facade_interface import ModelInf
 from ..utils.constant_messages import SKU_ORDER_QUANTITY_PREDICTION_FETCH_FAILED_EN, SKU_ORDER_QUANTITY_FETCH_FAILED_GR, \
     INVENTORY_OPTIMIZATION_FETCH_FAILED_EN, INVENTORY_OPTIMIZATION_FETCH_FAILED_GR, \
     DISTRIBUTION_OPTIMIZATION_FETCH_FAILED_EN, DISTRIBUTION_OPTIMIZATION_FETCH_FAILED_GR, \
-    INVENTORY_PARAMS_FETCH_FAILED_EN, INVENTORY_PARAMS_FETCH_FAILED_GR
+    INVENTORY_PARAMS_FETCH_FAILED_EN, INVENTORY_PARAMS_FETCH_FAILED_GR, GENERAL_FETCH_FAILED_GR
+from ..utils.constant_vars import BATCH_INFERENCE_STATUS_SUCCESS
 from ..utils.custom_exceptions import CustomLoggerException
 from ..utils.decorators import create_role_privilege_permission
 from ..utils.enums import Role, UserPrivileges
@@ -59,6 +61,11 @@ class PredictionsViewSet(viewsets.ViewSet):
         required_privileges=[UserPrivileges.ROUTING.value]
     )
 
+    admin_permissions = create_role_privilege_permission(
+        required_role=Role.ADMIN.value,
+        required_privileges=[UserPrivileges.ADMIN_PRIVILEGE.value]
+    )
+
     @inject.autoparams()
     def __init__(self,
                  model_inference_service_facade: ModelInferenceServiceFacadeInterface,
@@ -113,6 +120,64 @@ class PredictionsViewSet(viewsets.ViewSet):
             logger.error(f"Unexpected error: {str(e)}", exc_info=True)
             return Response({"error": SKU_ORDER_QUANTITY_FETCH_FAILED_GR}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+    @action(detail=False, methods=['post'], permission_classes=[forecasting_permissions])
+    def run_batch_inference(self, request) -> Response:
+        """
+        POST endpoint to run SKU order quantity inference on many SKUs at once
+        ({"user_id": ..., "sku_numbers": [...]} or {"user_id": ..., "all_skus": true}).
+
+        Returns 200 with one result per SKU (SKUs that failed carry their error, without failing the batch),
+        or 400/500 depending on errors of the whole request.
+
+        :param request: Request: The HTTP request object containing the batch inference input.
+        :return: Response: The HTTP response containing the per-SKU results and their success/failure counts.
+        :raises ValidationError: If the input data validation fails.
+        :raises CustomLoggerException: If a domain-specific exception occurs.
+        :raises Exception: If an unexpected error occurs.
+        """
+        input_serializer = BatchModelInferenceInputSerializer(data=request.data)
+        try:
+            # 1. Validate the input
+            input_serializer.is_valid(raise_exception=True)
+            user_id = input_serializer.validated_data['user_id']
+            sku_numbers = input_serializer.validated_data.get('sku_numbers')
+            # 2. Run the batch inference (None means all the SKUs of the user)
+            results = self.model_inference_service.run_batch_sku_order_quantity_inference(
+                None if input_serializer.validated_data['all_skus'] else sku_numbers, user_id)
+            # 3. Serialize final response
+            succeeded = sum(1 for result in results if result.status == BATCH_INFERENCE_STATUS_SUCCESS)
+            return Response({
+                "succeeded": succeeded,
+                "failed": len(results) - succeeded,
+                "results": BatchModelInferenceItemSerializer(results, many=True).data
+            }, status=status.HTTP_200_OK)
+        except ValidationError as e:
+            logger.error(SKU_ORDER_QUANTITY_PREDICTION_FETCH_FAILED_EN)
+            logger.error(e.detail, exc_info=True)
+            return Response({"error": SKU_ORDER_QUANTITY_FETCH_FAILED_GR}, status=status.HTTP_400_BAD_REQUEST)
+        except CustomLoggerException as e:
+            logger.error(SKU_ORDER_QUANTITY_PREDICTION_FETCH_FAILED_EN)
+            logger.error(e.message, exc_info=True)
+            return Response({"error": SKU_ORDER_QUANTITY_FETCH_FAILED_GR}, status=status.HTTP_400_BAD_REQUEST)
+        except Exception as e:
+            logger.error(f"Unexpected error: {str(e)}", exc_info=True)
+            return Response({"error": SKU_ORDER_QUANTITY_FETCH_FAILED_GR}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+    @action(detail=False, methods=['get'], permission_classes=[admin_permissions])
+    def model_cache_stats(self, request) -> Response:
+        """
+        GET endpoint exposing the counters of the in-process cache of deserialized ML models
+        (hits, misses, evictions, hit rate and current size) of the serving process.
+
+        :param request: Request: The HTTP request object.
+        :return: Response: The HTTP response containing the cache counters.
+        """
+        try:
+            return Response(self.model_inference_service.get_model_cache_stats(), status=status.HTTP_200_OK)
+        except Exception as e:
+            logger.error(f"Unexpected error: {str(e)}", exc_info=True)
+            return Response({"error": GENERAL_FETCH_FAILED_GR}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
     @action(detail=False, methods=['post'], permission_classes=[forecasting_and_inventory_permissions])
     def get_sku_inventory_params(self, request) -> Response:
         """
@@ -151,4 +151,7 @@ CORS_ALLOW_ALL_ORIGINS = True
 CORS_ALLOWS_CREDENTIALS = True
 
 SECURED_FIELDS_KEY = os.getenv("SECURED_FIELDS_KEY")
-SECURED_FIELDS_HASH_SALT = os.getenv("SECURED_FIELDS_HASH_SALT")
\ No newline at end of file
+SECURED_FIELDS_HASH_SALT = os.getenv("SECURED_FIELDS_HASH_SALT")
+
+# Directory of the model store shared with the ML-App ('MODEL_STORE_DIR'), for the models stored as files
+ML_MODEL_STORE_DIR = os.getenv("ML_MODEL_STORE_DIR")
@@ -7,7 +7,7 @@
 """
 
 from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, TIMESTAMP, func, UniqueConstraint, LargeBinary, \
-    Float
+    Float, Date
 from sqlalchemy.orm import relationship
 
 from app.utils.database_connection import Base
@@ -141,12 +141,15 @@ class MLModel(Base):
     id = Column(Integer, primary_key=True, autoincrement=True)
     model_type = Column(String, nullable=False)  # e.g., 'sku_quantity_prediction_ml_model'
     model_name = Column(String, nullable=False)  # e.g., 'DecisionTreeRegressor'
-    model_file = Column(LargeBinary, nullable=False)  # store .sav file as binary
+    model_file = Column(LargeBinary, nullable=True)  # store .sav file as binary (NULL if stored in the model store)
     mape = Column(Float, nullable=False)  # Mean Absolute Percentage Error
     mae = Column(Float, nullable=False)  # Mean Absolute Error
     updated_at = Column(TIMESTAMP, server_default=func.now(), onupdate=func.now(), nullable=False)
     user_id = Column(Integer, ForeignKey('login_user.id', ondelete="CASCADE"), nullable=False)
     model_features = Column(String, nullable=False)  # features used for training
+    preprocessor_file = Column(LargeBinary, nullable=True)  # fitted preprocessing pipeline (ColumnTransformer)
+    model_format = Column(String, nullable=True)  # storage format of the model (NULL = legacy joblib)
+    model_path = Column(String, nullable=True)  # relative path in the model store (instead of 'model_file')
 
     user = relationship("LoginUser", back_populates="ml_models")
 
@@ -173,3 +176,35 @@ class UserErpApi(Base):
     user_id = Column(Integer, ForeignKey('login_user.id', ondelete="CASCADE"), nullable=False, unique=True)
 
     user = relationship("LoginUser", back_populates="user_erp_api")
+
+
+class ErpSyncState(Base):
+    __tablename__ = 'erp_sync_state'
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    consumer = Column(String, nullable=False)  # e.g., 'sku_metric' or 'sku_order_quantity_prediction_ml_model'
+    last_order_date = Column(TIMESTAMP, nullable=True)  # High-water mark: 'order_date' of the latest synced record
+    last_record_id = Column(Integer, nullable=True)  # High-water mark: ERP 'id' of the latest synced record
+    last_full_sync_at = Column(TIMESTAMP, nullable=True)  # Last full (reconciliation) fetch of the ERP history
+    updated_at = Column(TIMESTAMP, server_default=func.now(), onupdate=func.now(), nullable=False)
+    user_id = Column(Integer, ForeignKey('login_user.id', ondelete="CASCADE"), nullable=False)
+
+    # One sync state per consumer and user
+    __table_args__ = (UniqueConstraint('consumer', 'user_id', name='uq_erp_sync_state_consumer_user'),)
+
+
+class WeatherDaily(Base):
+    __tablename__ = 'weather_daily'
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    latitude = Column(Float, nullable=False)
+    longitude = Column(Float, nullable=False)
+    weather_date = Column(Date, nullable=False)
+    mean_temperature = Column(Float, nullable=False)  # Average of the hourly temperatures (Celsius) of the day
+    rain = Column(Boolean, nullable=False)  # True if there was any precipitation during the day
+    created_at = Column(TIMESTAMP, server_default=func.now(), nullable=False)
+
+    # Cache of the historical weather: one record per location and day
+    __table_args__ = (
+        UniqueConstraint('latitude', 'longitude', 'weather_date', name='uq_weather_daily_location_date'),
+    )
@@ -12,6 +12,14 @@ from sqlalchemy import text
 from app.models import Base
 from app.utils.database_connection import AsyncSessionLocal
 
+# Idempotent schema changes for tables that already exist ('create_all' does not alter existing tables)
+SCHEMA_UPGRADE_QUERIES = [
+    "ALTER TABLE ml_model ADD COLUMN IF NOT EXISTS preprocessor_file BYTEA",
+    "ALTER TABLE ml_model ADD COLUMN IF NOT EXISTS model_format VARCHAR",
+    "ALTER TABLE ml_model ADD COLUMN IF NOT EXISTS model_path VARCHAR",
+    "ALTER TABLE ml_model ALTER COLUMN model_file DROP NOT NULL",
+]
+
 
 async def insert_privileges(session):
     """
@@ -31,6 +39,18 @@ async def insert_privileges(session):
         print("✅ Privileges inserted!")
 
 
+async def upgrade_tables(session):
+    """
+    Creates the tables of models.py that do not exist yet (e.g., 'erp_sync_state', 'weather_daily'), and applies
+    the (idempotent) schema changes of SCHEMA_UPGRADE_QUERIES, e.g., new columns of existing tables.
+    """
+    conn = await session.connection()
+    await conn.run_sync(Base.metadata.create_all, checkfirst=True)  # Only the missing tables are created
+    for query in SCHEMA_UPGRADE_QUERIES:
+        await session.execute(text(query))
+    print("✅ Tables upgraded!")
+
+
 async def main():
     async with AsyncSessionLocal() as session:
         async with session.begin():  # Begin transaction
@@ -45,7 +65,8 @@ async def main():
                     await insert_privileges(session)
                     print("✅ The tables were newly created!")
                 else:
-                    print("⚠️ Tables already exist. Skipping creation.")
+                    print("⚠️ Tables already exist. Creating only the missing ones.")
+                    await upgrade_tables(session)
             except Exception:
                 raise  # Re-raise to trigger rollback
 